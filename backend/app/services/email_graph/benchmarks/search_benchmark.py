@@ -0,0 +1,331 @@
+"""
+Benchmark du moteur de recherche sur des boîtes mail synthétiques.
+
+Mesure, pour chaque taille de boîte : la génération, la construction du
+graphe, la construction des index, la latence des requêtes par mode
+(p50/p95/p99) et la mémoire résidente. Le rapport JSON peut être comparé
+à un rapport précédent pour détecter les régressions entre commits.
+
+Usage:
+    python -m backend.app.services.email_graph.benchmarks.search_benchmark \\
+        --sizes 10000 100000 --output rapport.json --compare rapport_precedent.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Import conditionnel de psutil (mémoire résidente courante)
+try:
+    import psutil
+
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+from ..processor import EmailGraphProcessor
+from ..search.search_manager import GraphSearchEngine
+from .synthetic_mailbox import SyntheticMailboxGenerator, PROJECTS
+
+REPORT_VERSION = 1
+
+TEXT_QUERIES = ["facture", "projet planning", "réunion notes", "rapport performance",
+                "newsletter actualités", "urgent action", "livraison commande", "intelligence artificielle"]
+TOPICS = ["facturation", "projet", "meeting", "rapport", "newsletter", "important", "ia"]
+
+
+def memory_usage_mb():
+    """
+    Mémoire résidente du processus en Mo
+
+    Sans psutil, le pic de mémoire résidente (module resource) est utilisé à la place.
+
+    Returns:
+        float|None: Mémoire en Mo arrondie, None si aucune mesure n'est disponible
+    """
+    if PSUTIL_AVAILABLE:
+        return round(psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024), 1)
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    # ru_maxrss est en Ko sous Linux, en octets sous macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def percentiles(latencies):
+    """Résumé des latences en millisecondes"""
+    values = np.asarray(latencies, dtype=float)
+    return {
+        'count': int(len(values)),
+        'mean_ms': round(float(values.mean()), 3),
+        'p50_ms': round(float(np.percentile(values, 50)), 3),
+        'p95_ms': round(float(np.percentile(values, 95)), 3),
+        'p99_ms': round(float(np.percentile(values, 99)), 3),
+        'max_ms': round(float(values.max()), 3)
+    }
+
+
+def build_queries(emails, central_user, queries_per_mode, seed):
+    """
+    Construit des requêtes reproductibles pour chaque mode de recherche
+
+    Args:
+        emails (list): Emails de la boîte synthétique
+        central_user (str): Email de l'utilisateur central
+        queries_per_mode (int): Nombre de requêtes par mode
+        seed (int): Graine aléatoire
+
+    Returns:
+        dict: mode -> liste de requêtes sémantiques
+    """
+    rng = random.Random(seed)
+    senders = [email["From"] for email in emails if email["From"] != central_user] or [central_user]
+    dates = [email["Date"][:10] for email in emails]
+
+    def text():
+        query = rng.choice(TEXT_QUERIES)
+        return f"{query} {rng.choice(PROJECTS).lower()}" if rng.random() < 0.3 else query
+
+    def window():
+        start = datetime.fromisoformat(rng.choice(dates))
+        return {'date_from': start.isoformat(),
+                'date_to': (start + timedelta(days=rng.choice([1, 7, 30]))).isoformat()}
+
+    builders = {
+        'content': lambda: {'query_type': 'semantic', 'semantic_text': text(), 'filters': {}},
+        'temporal': lambda: {'query_type': 'time_range', 'semantic_text': '', 'filters': window()},
+        'contact': lambda: {'query_type': 'contact', 'semantic_text': '',
+                            'filters': {'contact_email': rng.choice(senders)}},
+        'contact_name': lambda: {'query_type': 'contact', 'semantic_text': '',
+                                 'filters': {'contact_name': rng.choice(senders).split('.')[0]}},
+        'topic': lambda: {'query_type': 'combined', 'semantic_text': '',
+                          'filters': {'topic_ids': [rng.choice(TOPICS)]}},
+        'combined': lambda: {'query_type': 'combined', 'semantic_text': text(),
+                             'filters': rng.choice([{'is_unread': True}, {'has_attachments': True},
+                                                    {'message_type': 'received'}, {'is_important': True}])},
+    }
+
+    return {
+        mode: [dict(builder(), limit=20) for _ in range(queries_per_mode)]
+        for mode, builder in builders.items()
+    }
+
+
+def time_queries(engine, queries, use_cache=False):
+    """
+    Mesure la latence de chaque requête
+
+    Args:
+        engine (GraphSearchEngine): Moteur indexé
+        queries (list): Requêtes sémantiques
+        use_cache (bool): Mesurer les requêtes déjà en cache (après un premier passage)
+
+    Returns:
+        dict: Percentiles de latence et nombre moyen de résultats
+    """
+    latencies = []
+    result_counts = []
+
+    if use_cache:
+        for query in queries:
+            engine.search_page(query)
+
+    for query in queries:
+        if not use_cache:
+            engine.clear_caches()
+        start = time.perf_counter()
+        page = engine.search_page(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+        result_counts.append(page.total)
+
+    stats = percentiles(latencies)
+    stats['mean_results'] = round(float(np.mean(result_counts)), 1)
+    return stats
+
+
+def run_size(size, queries_per_mode=50, seed=0, index_path=None, with_analysis=False):
+    """
+    Exécute le benchmark pour une taille de boîte
+
+    Args:
+        size (int): Nombre de messages
+        queries_per_mode (int): Nombre de requêtes par mode
+        seed (int): Graine aléatoire
+        index_path (str): Répertoire des index persistés (optionnel)
+        with_analysis (bool): Mesurer aussi l'analyse complète du graphe
+
+    Returns:
+        dict: Mesures de cette taille
+    """
+    gc.collect()
+    run = {'messages': size, 'memory_mb': {'start': memory_usage_mb()}}
+    generator = SyntheticMailboxGenerator(seed=seed)
+
+    start = time.perf_counter()
+    emails = generator.generate(size)
+    run['generation_s'] = round(time.perf_counter() - start, 3)
+
+    start = time.perf_counter()
+    processor = EmailGraphProcessor()
+    processor.central_user_email = generator.central_user
+    processor.user_manager.set_central_user(generator.central_user)
+    processor.graph_building_service.build_graph_from_emails(emails, generator.central_user)
+    run['graph_build_s'] = round(time.perf_counter() - start, 3)
+    run['memory_mb']['after_graph'] = memory_usage_mb()
+    run['graph'] = {'nodes': processor.graph.number_of_nodes(), 'edges': processor.graph.number_of_edges()}
+
+    # L'analyse complète (centralité d'intermédiarité exacte) est mesurée à part : elle domine
+    # le temps de process_graph et devient inutilisable au-delà de quelques milliers de messages
+    if with_analysis:
+        start = time.perf_counter()
+        processor.analysis_service.analyze_complete_graph(generator.central_user, len(emails))
+        run['graph_analysis_s'] = round(time.perf_counter() - start, 3)
+
+    start = time.perf_counter()
+    engine = GraphSearchEngine(processor.graph, index_path=index_path)
+    run['index_build_s'] = round(time.perf_counter() - start, 3)
+    run['memory_mb']['after_index'] = memory_usage_mb()
+    run['index_stats'] = engine.get_search_statistics().get('index_stats', {})
+
+    queries = build_queries(emails, generator.central_user, queries_per_mode, seed)
+    run['queries'] = {mode: time_queries(engine, mode_queries) for mode, mode_queries in queries.items()}
+    run['queries']['content_cached'] = time_queries(engine, queries['content'], use_cache=True)
+    run['memory_mb']['peak'] = memory_usage_mb()
+
+    return run
+
+
+def git_commit():
+    """Commit courant du dépôt, si disponible"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(sizes, queries_per_mode=50, seed=0, index_path=None, with_analysis=False):
+    """
+    Exécute le benchmark pour plusieurs tailles et construit le rapport
+
+    Args:
+        sizes (list): Tailles de boîtes (nombre de messages)
+        queries_per_mode (int): Nombre de requêtes par mode
+        seed (int): Graine aléatoire
+        index_path (str): Répertoire des index persistés (optionnel)
+        with_analysis (bool): Mesurer aussi l'analyse complète du graphe
+
+    Returns:
+        dict: Rapport JSON-sérialisable
+    """
+    report = {
+        'report_version': REPORT_VERSION,
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'queries_per_mode': queries_per_mode,
+        'with_analysis': with_analysis,
+        'runs': []
+    }
+
+    for size in sizes:
+        print(f"📊 Benchmark {size} messages...")
+        run = run_size(size, queries_per_mode, seed, index_path, with_analysis)
+        report['runs'].append(run)
+        print(f"   graphe {run['graph_build_s']}s, index {run['index_build_s']}s, "
+              f"mémoire {run['memory_mb']['peak']} Mo")
+        for mode, stats in run['queries'].items():
+            print(f"   {mode:<15} p50 {stats['p50_ms']:>9.2f} ms  p95 {stats['p95_ms']:>9.2f} ms  "
+                  f"p99 {stats['p99_ms']:>9.2f} ms")
+
+    return report
+
+
+def compare_reports(baseline, current, threshold=0.2):
+    """
+    Compare deux rapports et liste les métriques dégradées
+
+    Args:
+        baseline (dict): Rapport de référence
+        current (dict): Nouveau rapport
+        threshold (float): Dégradation relative tolérée
+
+    Returns:
+        list: Régressions (taille, métrique, ancienne valeur, nouvelle valeur)
+    """
+    regressions = []
+    baseline_runs = {run['messages']: run for run in baseline.get('runs', [])}
+
+    for run in current.get('runs', []):
+        previous = baseline_runs.get(run['messages'])
+        if previous is None:
+            continue
+
+        metrics = {key: run[key] for key in ('graph_build_s', 'graph_analysis_s', 'index_build_s') if key in run}
+        previous_metrics = {key: previous.get(key) for key in metrics}
+        for mode, stats in run['queries'].items():
+            for key in ('p50_ms', 'p95_ms'):
+                metrics[f"{mode}.{key}"] = stats[key]
+                previous_metrics[f"{mode}.{key}"] = previous.get('queries', {}).get(mode, {}).get(key)
+        metrics['memory_mb.peak'] = run['memory_mb']['peak']
+        previous_metrics['memory_mb.peak'] = previous.get('memory_mb', {}).get('peak')
+
+        for name, value in metrics.items():
+            old = previous_metrics.get(name)
+            if old and value is not None and value > old * (1 + threshold):
+                regressions.append((run['messages'], name, old, value))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark du moteur de recherche du graphe d\'emails')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000],
+                        help='Tailles de boîtes mail (ex: 10000 100000 1000000)')
+    parser.add_argument('--queries', type=int, default=50, help='Requêtes par mode')
+    parser.add_argument('--seed', type=int, default=0, help='Graine aléatoire')
+    parser.add_argument('--index-path', help='Répertoire des index persistés')
+    parser.add_argument('--with-analysis', action='store_true',
+                        help='Mesurer aussi l\'analyse complète du graphe (lente)')
+    parser.add_argument('--output', help='Fichier JSON du rapport')
+    parser.add_argument('--compare', help='Rapport JSON de référence')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Dégradation relative tolérée')
+    args = parser.parse_args()
+
+    report = run_benchmark(args.sizes, args.queries, args.seed, args.index_path, args.with_analysis)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"✅ Rapport écrit: {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_reports(baseline, report, args.threshold)
+        for size, name, old, new in regressions:
+            print(f"⚠️ Régression {size} messages, {name}: {old} -> {new}")
+        if regressions:
+            raise SystemExit(1)
+        print("✅ Aucune régression")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Générateur reproductible de boîtes mail synthétiques pour les benchmarks.
+
+Les distributions imitent une boîte réelle : popularité des contacts en loi
+de Zipf, taille des threads géométrique (réponses alternées entre les
+participants), topics pondérés, dates plus denses sur la période récente,
+copies et pièces jointes occasionnelles. Une même graine et une même
+taille produisent toujours la même boîte.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+CENTRAL_USER = "user@company.com"
+
+FIRST_NAMES = [
+    "Marie", "Pierre", "Jean", "Sophie", "Luc", "Camille", "Julien", "Claire", "Nicolas", "Emma",
+    "Thomas", "Léa", "Antoine", "Chloé", "Hugo", "Sarah", "Louis", "Manon", "Paul", "Julie"
+]
+LAST_NAMES = [
+    "Dupont", "Martin", "Bernard", "Dubois", "Moreau", "Laurent", "Simon", "Michel", "Lefebvre", "Leroy",
+    "Roux", "David", "Bertrand", "Morel", "Fournier", "Girard", "Bonnet", "Lambert", "Fontaine", "Rousseau"
+]
+DOMAINS = ["company.com", "client.com", "partner.com", "gmail.com", "service.com", "news.com"]
+
+# (poids, sujet, contenu, topics, pièce jointe possible)
+TEMPLATES = [
+    (8, "Facture {ref}", "Veuillez trouver ci-joint la facture {ref} pour les services du mois.",
+     ["facturation"], "facture_{ref}.pdf"),
+    (10, "Projet {project} - Mise à jour", "Le projet {project} avance bien, voici le planning révisé.",
+     ["projet"], "planning_{project}.xlsx"),
+    (9, "Réunion équipe {project}", "Compte-rendu de la réunion et notes importantes sur {project}.",
+     ["meeting"], "notes_{ref}.docx"),
+    (7, "Rapport mensuel {project}", "Voici le rapport de performance du mois pour {project}.",
+     ["rapport"], "rapport_{ref}.pdf"),
+    (12, "Newsletter Tech {ref}", "Les dernières actualités technologiques et news du secteur.",
+     ["newsletter"], None),
+    (4, "Urgent - Action requise {ref}", "Ce message nécessite votre attention immédiate, c'est critique.",
+     ["important"], None),
+    (3, "Veille IA {ref}", "Sélection d'articles sur l'intelligence artificielle et les modèles de langage.",
+     ["ia"], None),
+    (10, "Question rapide", "Est-ce que tu as un moment pour en parler demain ?", [], None),
+    (6, "Confirmation de livraison {ref}", "Votre commande a été expédiée et sera livrée demain.",
+     [], "bon_livraison_{ref}.pdf"),
+]
+PROJECTS = ["Apollo", "Orion", "Atlas", "Hermès", "Zéphyr", "Nova", "Titan", "Vega"]
+
+
+class SyntheticMailboxGenerator:
+    """Génère des emails au format d'entrée du processeur de graphe"""
+
+    def __init__(self, seed=0, central_user=CENTRAL_USER, history_days=730):
+        """
+        Initialise le générateur
+
+        Args:
+            seed (int): Graine aléatoire
+            central_user (str): Email de l'utilisateur central
+            history_days (int): Profondeur de l'historique en jours
+        """
+        self.seed = seed
+        self.central_user = central_user
+        self.history_days = history_days
+        self.end_date = datetime(2025, 6, 30, 18, 0, 0)
+
+    def make_contacts(self, rng, count):
+        """
+        Crée les contacts et leurs poids de popularité (loi de Zipf)
+
+        Args:
+            rng (random.Random): Générateur aléatoire
+            count (int): Nombre de contacts
+
+        Returns:
+            tuple: (liste de (email, nom), poids cumulés)
+        """
+        contacts = []
+        for i in range(count):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            contacts.append((f"{first.lower()}.{last.lower()}{i}@{rng.choice(DOMAINS)}", f"{first} {last}"))
+
+        weights = [1.0 / (rank + 1) ** 1.1 for rank in range(len(contacts))]
+        cumulative = []
+        total = 0.0
+        for weight in weights:
+            total += weight
+            cumulative.append(total)
+        return contacts, cumulative
+
+    def generate(self, count):
+        """
+        Génère une boîte mail
+
+        Args:
+            count (int): Nombre de messages
+
+        Returns:
+            list: Emails (dicts au format du processeur)
+        """
+        rng = random.Random(self.seed)
+        contacts, contact_weights = self.make_contacts(rng, max(50, count // 20))
+        template_weights = [template[0] for template in TEMPLATES]
+
+        emails = []
+        thread_number = 0
+
+        while len(emails) < count:
+            thread_size = min(self._thread_size(rng), count - len(emails))
+            thread_id = f"thread{thread_number:07d}"
+            thread_number += 1
+
+            _, subject, content, topics, attachment = rng.choices(TEMPLATES, weights=template_weights)[0]
+            ref = f"{rng.randint(2023, 2025)}-{rng.randint(1, 999):03d}"
+            project = rng.choice(PROJECTS)
+            subject = subject.format(ref=ref, project=project)
+            content = content.format(ref=ref, project=project)
+            attachment = attachment.format(ref=ref, project=project) if attachment else None
+
+            contact_email, _ = rng.choices(contacts, cum_weights=contact_weights)[0]
+            cc_list = []
+            if rng.random() < 0.2:
+                cc_list = sorted({rng.choices(contacts, cum_weights=contact_weights)[0][0]
+                                  for _ in range(rng.randint(1, 3))} - {contact_email})
+
+            # Les messages récents sont plus nombreux (âge exponentiel)
+            age_days = min(rng.expovariate(3.0 / self.history_days), self.history_days)
+            date = self.end_date - timedelta(days=age_days, minutes=rng.randint(0, 600))
+            sent = rng.random() < 0.3
+
+            for position in range(thread_size):
+                message_index = len(emails)
+                from_email, to_email = (self.central_user, contact_email) if sent else (contact_email, self.central_user)
+                has_attachment = attachment is not None and position == 0 and rng.random() < 0.6
+                is_recent = age_days < 14
+
+                emails.append({
+                    "Message-ID": f"msg{message_index:07d}@synthetic.local",
+                    "Thread-ID": thread_id,
+                    "From": from_email,
+                    "To": to_email,
+                    "Cc": ",".join(cc_list),
+                    "Subject": subject if position == 0 else f"RE: {subject}",
+                    "Content": content if position == 0 else f"Merci pour ton message. {content}",
+                    "Date": date.isoformat(),
+                    "has_attachments": has_attachment,
+                    "attachment_count": 1 if has_attachment else 0,
+                    "Attachments": [{"filename": attachment}] if has_attachment else [],
+                    "is_important": "important" in topics or rng.random() < 0.03,
+                    "is_unread": not sent and rng.random() < (0.6 if is_recent else 0.05),
+                    "is_archived": not is_recent and rng.random() < 0.4,
+                    "topics": list(topics),
+                    "Labels": ["SENT"] if sent else ["INBOX", "WORK" if topics else "PERSONAL"],
+                })
+
+                # Réponse alternée quelques heures plus tard
+                sent = not sent
+                date += timedelta(hours=rng.expovariate(1 / 6.0))
+
+        return emails
+
+    @staticmethod
+    def _thread_size(rng):
+        """Taille de thread géométrique (moyenne ~2.2 messages)"""
+        size = 1
+        while rng.random() < 0.55 and size < 50:
+            size += 1
+        return size
@@ -3,11 +3,12 @@ Module de recherche dans le graphe d'emails
 """
 
 from .search_manager import GraphSearchEngine
-from .result_service import SearchResult
+from .result_service import SearchResult, SearchPage
 from .config import SearchMode
 
 __all__ = [
     'GraphSearchEngine',
     'SearchResult',
+    'SearchPage',
     'SearchMode'
 ]
\ No newline at end of file
@@ -16,7 +16,8 @@ SCORING_WEIGHTS = {
     'content': 0.4,
     'temporal': 0.2,
     'user': 0.3,
-    'graph': 0.1
+    'graph': 0.1,
+    'dense': 0.3  # Similarité d'embeddings (0 si aucun modèle n'est disponible)
 }
 
 # Configuration TF-IDF
@@ -27,6 +28,38 @@ TFIDF_CONFIG = {
     'freshness_decay_days': 30  # Decay temporel en jours
 }
 
+# Configuration de l'analyseur de texte (indexation et requêtes)
+TEXT_ANALYZER_CONFIG = {
+    # Mots vides de 3 lettres et plus (les plus courts sont exclus par le motif de tokenisation).
+    # Reprend les mots vides de semantic_search/patterns.py, complétés des mots-outils courants.
+    'stopwords': {
+        'fr': [
+            'email', 'emails', 'mail', 'mails', 'message', 'messages', 'courriel', 'courriels',
+            'les', 'des', 'une', 'avec', 'sans', 'dans', 'par', 'pour', 'sur', 'mais', 'donc', 'car',
+            'que', 'qui', 'quoi', 'dont', 'est', 'sont', 'été', 'être', 'avoir', 'ont', 'aux', 'ces',
+            'cet', 'cette', 'ses', 'son', 'leur', 'leurs', 'nous', 'vous', 'ils', 'elles',
+            'elle', 'lui', 'moi', 'toi', 'mon', 'ton', 'mes', 'tes', 'nos', 'vos', 'votre', 'notre',
+            'pas', 'plus', 'tout', 'tous', 'toute', 'toutes', 'très', 'aussi', 'bien', 'comme',
+            'entre', 'sous', 'chez', 'vers', 'fait', 'peu', 'encore', 'alors', 'ainsi', 'voici', 'voilà'
+        ],
+        'en': [
+            'email', 'emails', 'mail', 'mails', 'message', 'messages', 'from', 'with', 'without',
+            'for', 'and', 'but', 'the', 'this', 'that', 'these', 'those', 'are', 'was', 'were', 'been',
+            'being', 'have', 'has', 'had', 'not', 'you', 'your', 'our', 'their', 'they', 'them',
+            'his', 'her', 'its', 'will', 'would', 'can', 'could', 'should', 'there', 'here', 'about',
+            'into', 'than', 'then', 'also', 'just', 'all', 'any', 'some', 'which', 'what', 'when'
+        ]
+    },
+    'fold_accents': True,  # Normalisation Unicode (NFKD) et suppression des accents
+    'stemming': False,  # Racinisation légère FR/EN (pluriels et e final)
+    'strip_markup': True,  # Supprime balises HTML, entités, URLs et fragments base64
+    'max_token_length': 30,  # Tokens plus longs ignorés (identifiants, hashes)
+    'max_body_chars': 20000,  # Caractères du contenu analysés par message
+    'max_tokens': 2000,  # Tokens indexés par message
+    'max_df_ratio': 0.5,  # Termes présents dans plus de cette part des messages retirés de l'index
+    'max_df_min_documents': 200  # Taille minimale du corpus pour appliquer le seuil max-df
+}
+
 # Configuration du scoring temporel
 TEMPORAL_CONFIG = {
     'default_hour': 23,
@@ -44,11 +77,36 @@ TOPIC_MAPPINGS = {
     'rapport': ['report', 'rapport']
 }
 
+# Configuration de l'index inversé des topics
+TOPIC_INDEX_CONFIG = {
+    'weights': {
+        'topics': 2.0,  # Topic explicite du message
+        'subject': 1.5,  # Terme présent dans le sujet
+        'content': 1.0  # Terme présent dans le contenu
+    },
+    'max_cached_terms': 256  # Termes hors TOPIC_MAPPINGS calculés à la demande et conservés
+}
+
+# Configuration de la recherche dense par embeddings
+EMBEDDING_CONFIG = {
+    'enabled': False,  # Recherche dense optionnelle (sentence-transformers), activée aussi par un encodeur fourni
+    'model_name': 'paraphrase-mpnet-base-v2',
+    'device': 'cpu',
+    'batch_size': 64,
+    'snippet_chars': 300,  # Longueur du contenu encodé si le message n'a pas de snippet
+    'top_k': 100,  # Messages retenus par la recherche dense
+    'min_similarity': 0.3,  # Similarité cosinus minimale
+    'search_chunk_size': 16384  # Lignes converties en float32 à la fois pendant la recherche
+}
+
 # Configuration des snippets
 SNIPPET_CONFIG = {
-    'max_length': 150,
+    'max_length': 150,  # Largeur maximale de la fenêtre de termes recherchée
     'context_before': 50,
-    'context_after': 100
+    'context_after': 100,
+    'highlight_pre': '<mark>',  # Balises de mise en évidence (contenu échappé en HTML)
+    'highlight_post': '</mark>',
+    'max_cached_offsets': 1024  # Messages dont les positions des tokens sont conservées
 }
 
 # Configuration PageRank
@@ -56,4 +114,63 @@ PAGERANK_CONFIG = {
     'alpha': 0.85,
     'max_iter': 100,
     'tol': 1e-06
-}
\ No newline at end of file
+}
+
+# Rôle des destinataires selon le type de relation message -> utilisateur
+RECIPIENT_EDGE_ROLES = {
+    'RECEIVED': 'to',
+    'CC': 'cc',
+    'BCC': 'bcc'
+}
+
+# Configuration de l'index de filtres booléens (bitmaps)
+FILTER_INDEX_CONFIG = {
+    'initial_capacity': 1024,  # Taille initiale des bitmaps, doublée si nécessaire
+    'bitmap_filters': ('message_type', 'attachment_types', 'has_attachments', 'is_unread',
+                       'is_important', 'is_archived', 'labels')
+}
+
+# Configuration de l'index des contacts
+CONTACT_INDEX_CONFIG = {
+    'min_trigram_query_length': 3  # En dessous, les correspondances partielles parcourent les valeurs
+}
+
+# Configuration du planificateur de la recherche combinée
+COMBINED_SEARCH_CONFIG = {
+    'parallel': False,  # Exécuter les étapes indépendantes (mode union) sur un pool de threads
+    'max_workers': 4
+}
+
+# Configuration du profilage des recherches
+PROFILING_CONFIG = {
+    'enabled': False,  # Profiler toutes les recherches (sinon seulement sur demande)
+    'sample_rate': 1.0,  # Part des recherches profilées lorsque le profilage est actif
+    'histogram_bounds_ms': (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+}
+
+# Configuration de la pagination des résultats
+PAGINATION_CONFIG = {
+    'max_cached_rankings': 32  # Classements conservés pour servir les pages suivantes
+}
+
+# Configuration du cache des résultats de recherche
+QUERY_CACHE_CONFIG = {
+    'max_entries': 256,  # Pages de résultats conservées (LRU)
+    'ttl_seconds': 300  # Durée de vie d'une entrée, None pour désactiver l'expiration
+}
+
+# Configuration de la persistance des index sur disque
+INDEX_STORE_CONFIG = {
+    'format_version': 8,
+    'manifest_name': 'manifest.json',
+    'use_graph_version': True,  # Utilise graph.graph['version'] si défini, sinon une somme de contrôle
+    'delta_batch_messages': 50,  # Mises à jour incrémentales regroupées avant l'écriture d'un segment
+    'max_delta_segments': 32,  # Segments incrémentaux avant compaction par une sauvegarde complète
+    'max_delta_ratio': 0.1  # Part de messages hors tableaux tolérée avant compaction
+}
+
+# Configuration de l'indexation incrémentale
+INCREMENTAL_INDEX_CONFIG = {
+    'pagerank_staleness_ratio': 0.05,  # Part de nouveaux messages tolérée avant recalcul du PageRank
+    'pagerank_min_pending': 50  # Nombre minimal de messages en attente avant recalcul
+}
@@ -0,0 +1,139 @@
+"""
+Index de recherche des contacts par email et par nom.
+
+Remplace le parcours linéaire des utilisateurs : table exacte des emails et
+des noms, table des prénoms et index de trigrammes pour les correspondances
+partielles. Les scores de correspondance sont identiques au parcours :
+1.0 (exact), 0.9 (nom partiel), 0.85 (prénom), 0.8 (email partiel).
+"""
+
+from collections import defaultdict
+
+from .config import CONTACT_INDEX_CONFIG
+
+
+def _trigrams(value):
+    """Trigrammes de caractères d'une chaîne"""
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+class _FieldIndex:
+    """Index d'un champ texte (email ou nom) : valeurs exactes et trigrammes"""
+
+    def __init__(self):
+        self.values = []
+        self.exact = defaultdict(list)
+        self.trigrams = defaultdict(set)
+        self.lengths = set()
+
+    def add(self, position, value):
+        self.values.append(value)
+        self.exact[value].append(position)
+        self.lengths.add(len(value))
+        for trigram in _trigrams(value):
+            self.trigrams[trigram].add(position)
+
+    def containing(self, query):
+        """Positions dont la valeur contient la requête"""
+        if len(query) < CONTACT_INDEX_CONFIG['min_trigram_query_length']:
+            return {position for position, value in enumerate(self.values) if query in value}
+
+        postings = sorted((self.trigrams.get(trigram, set()) for trigram in _trigrams(query)), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return {position for position in candidates if query in self.values[position]}
+
+    def contained_in(self, query):
+        """Positions dont la valeur est une sous-chaîne de la requête (y compris vide)"""
+        positions = set()
+        substrings = {
+            query[start:start + length]
+            for length in self.lengths if length <= len(query)
+            for start in range(len(query) - length + 1)
+        }
+        for substring in substrings:
+            positions.update(self.exact.get(substring, ()))
+        return positions
+
+
+class ContactLookupIndex:
+    """Index des utilisateurs pour la recherche de contacts"""
+
+    def __init__(self):
+        self.user_ids = []
+        self._emails = _FieldIndex()
+        self._names = _FieldIndex()
+        self._first_tokens = defaultdict(list)
+
+    @classmethod
+    def build(cls, user_nodes):
+        """
+        Construit l'index à partir des nœuds utilisateurs
+
+        Args:
+            user_nodes (dict): user_id -> attributs du nœud
+
+        Returns:
+            ContactLookupIndex: Index construit
+        """
+        index = cls()
+        for user_id, user_data in user_nodes.items():
+            index.add_user(user_id, user_data)
+        return index
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    def add_user(self, user_id, user_data):
+        """
+        Ajoute un utilisateur à l'index
+
+        Args:
+            user_id (str): ID de l'utilisateur
+            user_data (dict): Attributs du nœud utilisateur
+        """
+        position = len(self.user_ids)
+        email = user_data.get('email', '').lower()
+        name = user_data.get('name', '').lower()
+
+        self.user_ids.append(user_id)
+        self._emails.add(position, email)
+        self._names.add(position, name)
+
+        tokens = name.split()
+        if ' ' in name and tokens:
+            self._first_tokens[tokens[0]].append(position)
+
+    def find(self, contact_email, contact_name):
+        """
+        Trouve les utilisateurs correspondant à un email et/ou un nom
+
+        Args:
+            contact_email (str): Email recherché (en minuscules)
+            contact_name (str): Nom recherché (en minuscules)
+
+        Returns:
+            list: Couples (user_id, score) dans l'ordre d'indexation des utilisateurs
+        """
+        scores = {}
+
+        # Match par email
+        if contact_email:
+            for position in self._emails.containing(contact_email) | self._emails.contained_in(contact_email):
+                scores[position] = 0.8
+            for position in self._emails.exact.get(contact_email, ()):
+                scores[position] = 1.0
+
+        # Match par nom, seulement pour les utilisateurs sans match par email
+        if contact_name:
+            name_scores = {}
+            for position in self._first_tokens.get(contact_name, ()):
+                name_scores[position] = 0.85
+            for position in self._names.containing(contact_name) | self._names.contained_in(contact_name):
+                name_scores[position] = 0.9
+            for position in self._names.exact.get(contact_name, ()):
+                name_scores[position] = 1.0
+
+            for position, score in name_scores.items():
+                scores.setdefault(position, score)
+
+        return [(self.user_ids[position], scores[position]) for position in sorted(scores)]
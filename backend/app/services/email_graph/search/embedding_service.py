@@ -0,0 +1,189 @@
+"""
+Service de recherche dense par embeddings des messages.
+
+Le sujet et l'extrait de chaque message sont encodés par lots sur CPU
+(sentence-transformers, même modèle que le module IA), normalisés puis
+stockés en float16. La recherche est un produit matriciel exact par blocs.
+"""
+
+import numpy as np
+
+from ..logging_service import logger
+from .config import EMBEDDING_CONFIG
+
+# Import conditionnel de sentence-transformers
+try:
+    from sentence_transformers import SentenceTransformer
+
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+
+class SearchEmbeddingService:
+    """Service pour l'encodage des messages et la recherche par similarité"""
+
+    def __init__(self, encoder=None):
+        """
+        Initialise le service d'embeddings
+
+        Args:
+            encoder (callable): Fonction textes -> matrice de vecteurs, remplace le modèle par défaut
+        """
+        self.encoder = encoder
+        self._model = None
+        self.message_ids = []
+        self.positions = {}
+        self.vectors = None
+
+    def set_encoder(self, encoder):
+        """Met à jour la fonction d'encodage"""
+        self.encoder = encoder
+
+    @property
+    def enabled(self):
+        """Indique si un encodeur est disponible"""
+        if self.encoder is not None:
+            return True
+        return EMBEDDING_CONFIG['enabled'] and SENTENCE_TRANSFORMERS_AVAILABLE
+
+    def is_ready(self):
+        """Indique si des vecteurs sont disponibles pour la recherche"""
+        return self.enabled and self.vectors is not None and len(self.message_ids) > 0
+
+    def __len__(self):
+        return len(self.message_ids)
+
+    def reset(self):
+        """Réinitialise les vecteurs indexés"""
+        self.message_ids = []
+        self.positions = {}
+        self.vectors = None
+
+    @staticmethod
+    def message_text(message_data):
+        """Texte encodé pour un message : sujet et extrait"""
+        snippet = message_data.get('snippet') or message_data.get('content', '')[:EMBEDDING_CONFIG['snippet_chars']]
+        return f"{message_data.get('subject', '')} {snippet}".strip()
+
+    def encode(self, texts):
+        """
+        Encode des textes en vecteurs normalisés
+
+        Args:
+            texts (list): Textes à encoder
+
+        Returns:
+            np.ndarray: Matrice float32 (textes x dimension), lignes de norme 1
+        """
+        if self.encoder is not None:
+            vectors = np.asarray(self.encoder(texts), dtype=np.float32)
+        else:
+            vectors = np.asarray(self._load_model().encode(
+                texts,
+                batch_size=EMBEDDING_CONFIG['batch_size'],
+                convert_to_numpy=True,
+                show_progress_bar=False
+            ), dtype=np.float32)
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _load_model(self):
+        """Charge le modèle sentence-transformers à la première utilisation"""
+        if self._model is None:
+            logger.logger.info(f"Chargement du modèle d'embeddings {EMBEDDING_CONFIG['model_name']}...")
+            self._model = SentenceTransformer(EMBEDDING_CONFIG['model_name'], device=EMBEDDING_CONFIG['device'])
+        return self._model
+
+    def build(self, message_nodes):
+        """
+        Encode tous les messages par lots
+
+        Args:
+            message_nodes (dict): message_id -> attributs du nœud
+        """
+        self.reset()
+        self.add_messages(message_nodes, list(message_nodes))
+        logger.logger.info(f"Embeddings calculés: {len(self.message_ids)} messages")
+
+    def add_messages(self, message_nodes, message_ids):
+        """
+        Encode et ajoute des messages à la matrice
+
+        Args:
+            message_nodes (dict): message_id -> attributs du nœud
+            message_ids (list): IDs des messages à ajouter
+        """
+        message_ids = [m for m in message_ids if m not in self.positions]
+        if not message_ids:
+            return
+
+        batch_size = EMBEDDING_CONFIG['batch_size']
+        batches = []
+        for start in range(0, len(message_ids), batch_size):
+            texts = [self.message_text(message_nodes[m]) for m in message_ids[start:start + batch_size]]
+            batches.append(self.encode(texts).astype(np.float16))
+
+        new_vectors = np.vstack(batches)
+        self.vectors = new_vectors if self.vectors is None else np.vstack((self.vectors, new_vectors))
+
+        for message_id in message_ids:
+            self.positions[message_id] = len(self.message_ids)
+            self.message_ids.append(message_id)
+
+    def load_vectors(self, message_ids, vectors):
+        """
+        Utilise une matrice déjà calculée (par exemple mappée depuis le disque)
+
+        Args:
+            message_ids (iterable): IDs des messages dans l'ordre des lignes
+            vectors (np.ndarray): Matrice float16 des embeddings
+        """
+        self.message_ids = list(message_ids)
+        self.positions = {message_id: i for i, message_id in enumerate(self.message_ids)}
+        self.vectors = vectors
+
+    def search(self, query, top_k=None, min_similarity=None):
+        """
+        Recherche exacte des messages les plus proches de la requête
+
+        Args:
+            query (str): Texte de la requête
+            top_k (int): Nombre maximum de messages retournés
+            min_similarity (float): Similarité cosinus minimale
+
+        Returns:
+            dict: message_id -> similarité cosinus, par similarité décroissante
+        """
+        if not query or not self.is_ready():
+            return {}
+
+        top_k = top_k or EMBEDDING_CONFIG['top_k']
+        if min_similarity is None:
+            min_similarity = EMBEDDING_CONFIG['min_similarity']
+
+        similarities = self.similarities(self.encode([query])[0])
+
+        k = min(top_k, len(similarities))
+        candidates = np.argpartition(-similarities, k - 1)[:k] if k < len(similarities) else np.arange(k)
+        candidates = candidates[np.argsort(-similarities[candidates], kind='stable')]
+
+        return {
+            self.message_ids[i]: float(similarities[i])
+            for i in candidates.tolist()
+            if similarities[i] >= min_similarity
+        }
+
+    def similarities(self, query_vector):
+        """Similarités cosinus avec tous les messages, calculées par blocs en float32"""
+        query_vector = np.asarray(query_vector, dtype=np.float32)
+        chunk_size = EMBEDDING_CONFIG['search_chunk_size']
+        similarities = np.empty(len(self.message_ids), dtype=np.float32)
+
+        for start in range(0, len(self.message_ids), chunk_size):
+            chunk = np.asarray(self.vectors[start:start + chunk_size], dtype=np.float32)
+            similarities[start:start + len(chunk)] = chunk @ query_vector
+
+        return similarities
@@ -0,0 +1,219 @@
+"""
+Index de filtres booléens sous forme de bitmaps NumPy.
+
+Chaque attribut filtrable (envoyé/reçu par l'utilisateur central, pièces jointes,
+important, non lu, archivé, extension de pièce jointe, label) est un tableau de
+booléens aligné sur la position des messages. Les filtres combinés s'évaluent
+en opérations vectorisées AND/OR/NOT avant le scoring.
+"""
+
+import numpy as np
+
+from .config import FILTER_INDEX_CONFIG
+
+
+class FilterBitmapIndex:
+    """Bitmaps par attribut filtrable, alignés sur les positions des messages"""
+
+    def __init__(self):
+        self.message_ids = []
+        self.positions = {}
+        self._bitmaps = {}
+        self._capacity = FILTER_INDEX_CONFIG['initial_capacity']
+
+    def __len__(self):
+        return len(self.message_ids)
+
+    @staticmethod
+    def message_attributes(message_data, sent_by_central=False, received_by_central=False):
+        """
+        Calcule les noms des bitmaps auxquels appartient un message
+
+        Args:
+            message_data (dict): Attributs du nœud message
+            sent_by_central (bool): Message envoyé par l'utilisateur central
+            received_by_central (bool): Message reçu par l'utilisateur central
+
+        Returns:
+            set: Noms des bitmaps à activer
+        """
+        attributes = set()
+
+        if sent_by_central:
+            attributes.add('sent_by_central')
+        if received_by_central:
+            attributes.add('received_by_central')
+        if message_data.get('has_attachments', False):
+            attributes.add('has_attachments')
+        if message_data.get('is_important'):
+            attributes.add('important')
+        if message_data.get('is_unread', True):
+            attributes.add('unread')
+        if message_data.get('is_archived', False):
+            attributes.add('archived')
+
+        for attachment in message_data.get('attachments', []) or []:
+            filename = attachment.get('filename', '') if isinstance(attachment, dict) else str(attachment)
+            if '.' in filename:
+                attributes.add(f"attachment_ext:{filename.split('.')[-1].lower()}")
+
+        for label in message_data.get('labels', []) or []:
+            attributes.add(f"label:{label}")
+
+        return attributes
+
+    def set_message(self, message_id, attributes):
+        """
+        Ajoute un message ou remplace ses attributs
+
+        Args:
+            message_id (str): ID du message
+            attributes (set): Noms des bitmaps à activer pour ce message
+        """
+        position = self.positions.get(message_id)
+
+        if position is None:
+            position = len(self.message_ids)
+            if position >= self._capacity:
+                self._grow(max(self._capacity * 2, position + 1))
+            self.message_ids.append(message_id)
+            self.positions[message_id] = position
+        else:
+            for bitmap in self._bitmaps.values():
+                bitmap[position] = False
+
+        for name in attributes:
+            if name not in self._bitmaps:
+                self._bitmaps[name] = np.zeros(self._capacity, dtype=bool)
+            self._bitmaps[name][position] = True
+
+    def _grow(self, capacity):
+        """Agrandit tous les bitmaps pour l'indexation incrémentale"""
+        for name, bitmap in self._bitmaps.items():
+            grown = np.zeros(capacity, dtype=bool)
+            grown[:len(bitmap)] = bitmap
+            self._bitmaps[name] = grown
+        self._capacity = capacity
+
+    def bitmap(self, name):
+        """Bitmap d'un attribut, restreint aux messages indexés (vide si inconnu)"""
+        bitmap = self._bitmaps.get(name)
+        if bitmap is None:
+            return np.zeros(len(self.message_ids), dtype=bool)
+        return bitmap[:len(self.message_ids)]
+
+    def _any_of(self, names):
+        """OU logique de plusieurs bitmaps"""
+        mask = np.zeros(len(self.message_ids), dtype=bool)
+        for name in names:
+            mask |= self.bitmap(name)
+        return mask
+
+    def evaluate(self, filters):
+        """
+        Évalue les filtres booléens en un masque vectorisé
+
+        Args:
+            filters (dict): Filtres de la requête
+
+        Returns:
+            np.ndarray|None: Masque des messages retenus, None si aucun filtre bitmap n'est actif
+        """
+        masks = []
+
+        message_type = filters.get('message_type')
+        if message_type == 'sent':
+            masks.append(self.bitmap('sent_by_central'))
+        elif message_type == 'received':
+            masks.append(self.bitmap('received_by_central'))
+
+        if filters.get('attachment_types'):
+            masks.append(self._any_of(f"attachment_ext:{ext}" for ext in filters['attachment_types']))
+
+        has_attachments = filters.get('has_attachments')
+        if has_attachments is True:
+            masks.append(self.bitmap('has_attachments'))
+        elif has_attachments is False:
+            masks.append(~self.bitmap('has_attachments'))
+        elif has_attachments is not None:
+            masks.append(np.zeros(len(self.message_ids), dtype=bool))
+
+        if filters.get('is_unread'):
+            masks.append(self.bitmap('unread'))
+
+        is_important = filters.get('is_important')
+        if is_important:
+            masks.append(self.bitmap('important'))
+        elif is_important is False:
+            masks.append(~self.bitmap('important'))
+
+        if filters.get('is_archived'):
+            masks.append(self.bitmap('archived'))
+
+        if filters.get('labels'):
+            masks.append(self._any_of(f"label:{label}" for label in filters['labels']))
+
+        if not masks:
+            return None
+
+        mask = masks[0].copy()
+        for other in masks[1:]:
+            mask &= other
+        return mask
+
+    def contains(self, mask, message_id):
+        """Indique si un message est retenu par un masque"""
+        position = self.positions.get(message_id)
+        return position is not None and bool(mask[position])
+
+    def select(self, mask):
+        """Retourne les IDs des messages retenus par un masque"""
+        return [self.message_ids[position] for position in np.flatnonzero(mask).tolist()]
+
+    def to_arrays(self, message_ids=None):
+        """
+        Sérialise les bitmaps compressés (un bit par message)
+
+        Args:
+            message_ids (list): Ordre des messages dans les bitmaps sérialisés
+                                (par défaut l'ordre des positions de l'index)
+
+        Returns:
+            tuple: (noms des bitmaps, tableau uint8 de forme (bitmaps, octets))
+        """
+        order = None if message_ids is None else np.array(
+            [self.positions[message_id] for message_id in message_ids], dtype=np.int64
+        )
+        count = len(self.message_ids) if order is None else len(order)
+
+        names = sorted(self._bitmaps)
+        packed = np.zeros((len(names), (count + 7) // 8), dtype=np.uint8)
+        for i, name in enumerate(names):
+            bitmap = self.bitmap(name)
+            packed[i] = np.packbits(bitmap if order is None else bitmap[order])
+        return names, packed
+
+    @classmethod
+    def from_arrays(cls, message_ids, names, packed):
+        """
+        Reconstruit l'index depuis les bitmaps sérialisés
+
+        Args:
+            message_ids (list): IDs des messages dans l'ordre des positions
+            names (list): Noms des bitmaps
+            packed (np.ndarray): Bitmaps compressés
+
+        Returns:
+            FilterBitmapIndex: Index reconstruit
+        """
+        index = cls()
+        index.message_ids = list(message_ids)
+        index.positions = {message_id: i for i, message_id in enumerate(index.message_ids)}
+        index._capacity = max(index._capacity, len(index.message_ids))
+
+        for i, name in enumerate(names):
+            bitmap = np.zeros(index._capacity, dtype=bool)
+            bitmap[:len(index.message_ids)] = np.unpackbits(packed[i], count=len(index.message_ids)).astype(bool)
+            index._bitmaps[name] = bitmap
+
+        return index
@@ -0,0 +1,682 @@
+"""
+Persistance des index de recherche sur disque avec rechargement mmap.
+
+Les index sont sérialisés en tableaux NumPy (vocabulaire, postings, table des
+documents, index temporel, PageRank) puis rechargés en `mmap_mode='r'` :
+seules les pages réellement consultées par les requêtes sont lues.
+"""
+
+import os
+import json
+import hashlib
+from bisect import bisect_left
+from collections.abc import MutableMapping, MutableSet
+
+import numpy as np
+
+from ..logging_service import logger
+from .filter_index import FilterBitmapIndex
+from .text_analyzer import TextAnalyzer
+from .config import INDEX_STORE_CONFIG, TFIDF_CONFIG, TOPIC_MAPPINGS, TOPIC_INDEX_CONFIG, EMBEDDING_CONFIG
+
+
+def compute_graph_fingerprint(graph):
+    """
+    Calcule l'empreinte du graphe utilisée pour valider un index persisté
+
+    Args:
+        graph: Graphe NetworkX contenant les emails
+
+    Returns:
+        str: Version explicite du graphe ou somme de contrôle structurelle
+    """
+    if INDEX_STORE_CONFIG['use_graph_version'] and graph.graph.get('version') is not None:
+        return f"version:{graph.graph['version']}"
+
+    digest = hashlib.blake2b(digest_size=16)
+
+    for node_id, data in graph.nodes(data=True):
+        node_type = data.get('type', '')
+        digest.update(f"{node_id}\x1f{node_type}".encode('utf-8', 'surrogatepass'))
+
+        if node_type == 'message':
+            # Contenu complet : une modification de même longueur invalide aussi l'index
+            digest.update(
+                f"\x1f{data.get('date', '')}\x1f{data.get('subject', '')}"
+                f"\x1f{data.get('content', '')}".encode('utf-8', 'surrogatepass')
+            )
+        digest.update(b'\x1e')
+
+    for source, target, edge_data in graph.edges(data=True):
+        digest.update(f"{source}\x1f{target}\x1f{edge_data.get('type', '')}\x1e".encode('utf-8', 'surrogatepass'))
+
+    return f"checksum:{digest.hexdigest()}"
+
+
+class StringTable:
+    """Table de chaînes encodées en un blob UTF-8 + offsets, décodées à la demande"""
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    @staticmethod
+    def encode(strings):
+        """
+        Encode une liste de chaînes en tableaux sérialisables
+
+        Args:
+            strings (list): Chaînes à encoder (triées si la table sert à la recherche)
+
+        Returns:
+            tuple: (blob uint8, offsets int64)
+        """
+        encoded = [s.encode('utf-8', 'surrogatepass') for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        if encoded:
+            np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        return blob, offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position):
+        start, end = int(self.offsets[position]), int(self.offsets[position + 1])
+        return self.blob[start:end].tobytes().decode('utf-8', 'surrogatepass')
+
+    def index(self, value):
+        """Position d'une chaîne dans une table triée, -1 si absente"""
+        position = bisect_left(self, value)
+        if position < len(self) and self[position] == value:
+            return position
+        return -1
+
+
+class PostingsView(MutableMapping):
+    """
+    Vue paresseuse clé -> conteneur sur des postings mmap.
+
+    Les listes sont décodées au premier accès puis conservées dans un cache
+    modifiable, ce qui permet aux services d'utiliser la vue comme les
+    defaultdict construits en mémoire.
+    """
+
+    def __init__(self, keys, offsets, values, value_table, weights=None, container=set):
+        self.key_table = keys
+        self.offsets = offsets
+        self.values = values
+        self.value_table = value_table
+        self.weights = weights
+        self.container = container
+        self._cache = {}
+        self._deleted = set()
+        self._extra_keys = 0
+
+    def _decode(self, position):
+        start, end = int(self.offsets[position]), int(self.offsets[position + 1])
+        ids = [self.value_table[i] for i in self.values[start:end].tolist()]
+
+        if self.container is dict:
+            return dict(zip(ids, self.weights[start:end].tolist()))
+        return self.container(ids)
+
+    def __getitem__(self, key):
+        if key in self._cache:
+            return self._cache[key]
+
+        if key in self._deleted:
+            self._deleted.discard(key)
+            value = self.container()
+        else:
+            position = self.key_table.index(key)
+            if position >= 0:
+                value = self._decode(position)
+            else:
+                value = self.container()
+                self._extra_keys += 1
+
+        self._cache[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self._deleted:
+            self._deleted.discard(key)
+        elif key not in self:
+            self._extra_keys += 1
+        self._cache[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._cache.pop(key, None)
+        if self.key_table.index(key) >= 0:
+            self._deleted.add(key)
+        else:
+            self._extra_keys -= 1
+
+    def __contains__(self, key):
+        if key in self._cache:
+            return True
+        return key not in self._deleted and self.key_table.index(key) >= 0
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __iter__(self):
+        for position in range(len(self.key_table)):
+            key = self.key_table[position]
+            if key not in self._deleted:
+                yield key
+        for key in self._cache:
+            if key not in self._deleted and self.key_table.index(key) < 0:
+                yield key
+
+    def __len__(self):
+        return len(self.key_table) - len(self._deleted) + self._extra_keys
+
+
+class ScalarView(MutableMapping):
+    """
+    Vue clé -> valeur numérique sur un tableau mmap aligné sur une table de clés.
+
+    Avec une `value_table`, le tableau contient des positions dans cette table
+    (-1 pour une clé sans valeur) et la vue retourne les chaînes décodées.
+    """
+
+    def __init__(self, keys, array, default=None, value_table=None):
+        self.key_table = keys
+        self.array = array
+        self.default = default
+        self.value_table = value_table
+        self._overlay = {}
+
+    def _position(self, key):
+        position = self.key_table.index(key)
+        if position >= 0 and self.value_table is not None and self.array[position] < 0:
+            return -1
+        return position
+
+    def __getitem__(self, key):
+        if key in self._overlay:
+            return self._overlay[key]
+
+        position = self._position(key)
+        if position >= 0:
+            value = self.array[position].item()
+            return self.value_table[value] if self.value_table is not None else value
+        if self.default is not None:
+            return self.default
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        self._overlay[key] = value
+
+    def __delitem__(self, key):
+        raise TypeError("ScalarView ne supporte pas la suppression")
+
+    def __contains__(self, key):
+        return key in self._overlay or self._position(key) >= 0
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __iter__(self):
+        for position in range(len(self.key_table)):
+            if self.value_table is None or self.array[position] >= 0:
+                yield self.key_table[position]
+        for key in self._overlay:
+            if self._position(key) < 0:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class MembershipView(MutableSet):
+    """Vue ensemble sur une table de chaînes triée, modifiable par surcouche"""
+
+    def __init__(self, keys):
+        self.key_table = keys
+        self._added = set()
+        self._removed = set()
+
+    def __contains__(self, key):
+        if key in self._added:
+            return True
+        return key not in self._removed and self.key_table.index(key) >= 0
+
+    def __iter__(self):
+        for position in range(len(self.key_table)):
+            key = self.key_table[position]
+            if key not in self._removed:
+                yield key
+        yield from self._added
+
+    def __len__(self):
+        return len(self.key_table) - len(self._removed) + len(self._added)
+
+    def add(self, key):
+        if key in self._removed:
+            self._removed.discard(key)
+        elif key not in self:
+            self._added.add(key)
+
+    def discard(self, key):
+        if key in self._added:
+            self._added.discard(key)
+        elif key not in self._removed and self.key_table.index(key) >= 0:
+            self._removed.add(key)
+
+
+class SearchIndexStore:
+    """Sauvegarde et rechargement des index de recherche dans un répertoire"""
+
+    def __init__(self, directory):
+        self.directory = str(directory)
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.directory, INDEX_STORE_CONFIG['manifest_name'])
+
+    def read_manifest(self):
+        """Lit le manifeste du store, None s'il est absent ou illisible"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_valid_for(self, fingerprint):
+        """Vérifie que l'index persisté correspond au graphe et au format courant"""
+        manifest = self.read_manifest()
+        return (
+            manifest is not None and
+            manifest.get('format_version') == INDEX_STORE_CONFIG['format_version'] and
+            manifest.get('fingerprint') == fingerprint and
+            manifest.get('analyzer') == self._analyzer_signature()
+        )
+
+    def save(self, indexing_service, fingerprint):
+        """
+        Sérialise les index du service d'indexation
+
+        Args:
+            indexing_service: Service d'indexation construit
+            fingerprint (str): Empreinte du graphe indexé
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        previous = self.read_manifest() or {}
+        generation = previous.get('generation', 0) + 1
+
+        arrays = {}
+        doc_ids = list(indexing_service.message_nodes.keys())
+        doc_positions = {message_id: i for i, message_id in enumerate(doc_ids)}
+        arrays['docs_blob'], arrays['docs_offsets'] = StringTable.encode(doc_ids)
+
+        # Vocabulaire + postings (tf) + df alignés sur le vocabulaire
+        vocabulary = sorted(indexing_service.inverted_index.keys())
+        arrays['vocab_blob'], arrays['vocab_offsets'] = StringTable.encode(vocabulary)
+        arrays['postings_offsets'], arrays['postings_docs'], arrays['postings_tf'] = self._encode_postings(
+            indexing_service.inverted_index, vocabulary, doc_positions, weighted=True
+        )
+        arrays['df'] = np.array([indexing_service.document_frequency.get(t, 0) for t in vocabulary], dtype=np.int32)
+        arrays['pruned_blob'], arrays['pruned_offsets'] = StringTable.encode(sorted(indexing_service.pruned_terms))
+
+        # Index temporel et relations utilisateur/thread
+        for name in ('temporal_index', 'user_sent_index', 'user_received_index', 'thread_messages_index',
+                     'subject_term_index'):
+            mapping = getattr(indexing_service, name)
+            keys = sorted(mapping.keys())
+            arrays[f'{name}_blob'], arrays[f'{name}_keys'] = StringTable.encode(keys)
+            arrays[f'{name}_offsets'], arrays[f'{name}_docs'], _ = self._encode_postings(
+                mapping, keys, doc_positions, weighted=False
+            )
+
+        # Vecteur PageRank et centralité de degré
+        user_ids = list(indexing_service.user_nodes.keys())
+        arrays['users_blob'], arrays['users_offsets'] = StringTable.encode(user_ids)
+        arrays['user_pagerank'] = np.array(
+            [indexing_service.user_pagerank.get(u, np.nan) for u in user_ids], dtype=np.float64
+        )
+        arrays['user_degree'] = np.array(
+            [indexing_service.user_degree_centrality.get(u, 0) for u in user_ids], dtype=np.int64
+        )
+
+        # Tables plates message -> expéditeur / destinataires / thread, triées par message
+        thread_ids = list(indexing_service.thread_nodes.keys())
+        user_positions = {user_id: i for i, user_id in enumerate(user_ids)}
+        thread_positions = {thread_id: i for i, thread_id in enumerate(thread_ids)}
+        relation_keys = sorted(doc_ids)
+        arrays['threads_blob'], arrays['threads_offsets'] = StringTable.encode(thread_ids)
+        arrays['relation_keys_blob'], arrays['relation_keys_offsets'] = StringTable.encode(relation_keys)
+        arrays['message_sender'] = self._encode_positions(
+            indexing_service.message_sender_index, relation_keys, user_positions
+        )
+        arrays['message_thread'] = self._encode_positions(
+            indexing_service.message_thread_index, relation_keys, thread_positions
+        )
+        for role, mapping in indexing_service.message_recipients_index.items():
+            arrays[f'recipients_{role}_offsets'], arrays[f'recipients_{role}_users'], _ = self._encode_postings(
+                {message_id: mapping.get(message_id, []) for message_id in relation_keys},
+                relation_keys, user_positions, weighted=False
+            )
+        for name in ('sent_by_central', 'received_by_central'):
+            arrays[f'{name}_blob'], arrays[f'{name}_offsets'] = StringTable.encode(
+                sorted(getattr(indexing_service, name))
+            )
+
+        # Index des topics du vocabulaire TOPIC_MAPPINGS (contributions précalculées)
+        topic_terms = sorted(indexing_service.topic_index.keys())
+        arrays['topic_terms_blob'], arrays['topic_terms_offsets'] = StringTable.encode(topic_terms)
+        arrays['topic_offsets'], arrays['topic_docs'], arrays['topic_scores'] = self._encode_postings(
+            indexing_service.topic_index, topic_terms, doc_positions, weighted=True
+        )
+
+        # Bitmaps des filtres booléens, alignés sur la table des documents
+        filter_names, arrays['filter_bitmaps'] = indexing_service.filter_index.to_arrays(doc_ids)
+        arrays['filter_names_blob'], arrays['filter_names_offsets'] = StringTable.encode(filter_names)
+
+        # Matrice des embeddings (float16), lignes alignées sur la table des documents
+        embedding_service = indexing_service.embedding_service
+        if embedding_service.is_ready() and len(embedding_service) == len(doc_ids):
+            rows = [embedding_service.positions[message_id] for message_id in doc_ids]
+            arrays['embeddings'] = np.asarray(embedding_service.vectors, dtype=np.float16)[rows]
+
+        files = {}
+        for name, array in arrays.items():
+            files[name] = self._write_array(f"{name}-{generation}.npy", array)
+
+        manifest = {
+            'format_version': INDEX_STORE_CONFIG['format_version'],
+            'generation': generation,
+            'fingerprint': fingerprint,
+            'analyzer': self._analyzer_signature(),
+            'total_messages': len(doc_ids),
+            'base_messages': len(doc_ids),
+            'embedding_model': EMBEDDING_CONFIG['model_name'] if 'embeddings' in arrays else None,
+            'files': files,
+            'deltas': []
+        }
+        self._write_json(self.manifest_path, manifest)
+
+        # Les anciens fichiers peuvent être supprimés même s'ils sont encore mappés
+        for filename in list(previous.get('files', {}).values()) + previous.get('deltas', []):
+            try:
+                os.remove(os.path.join(self.directory, filename))
+            except OSError:
+                pass
+
+        logger.logger.info(f"Index de recherche persistés: {self.directory} (génération {generation})")
+
+    def append_delta(self, added_ids, refreshed_ids, previous_fingerprint, fingerprint):
+        """
+        Persiste une mise à jour incrémentale sans réécrire les tableaux
+
+        Les IDs des messages ajoutés et des messages dont les attributs filtrables
+        ont changé sont écrits dans un segment JSON ; le manifeste reçoit le
+        segment et la nouvelle empreinte. Au rechargement, ces messages sont
+        réindexés depuis le graphe.
+
+        Args:
+            added_ids (list): Messages ajoutés depuis la dernière écriture
+            refreshed_ids (list): Messages dont les attributs filtrables ont changé
+            previous_fingerprint (str): Empreinte des index déjà persistés
+            fingerprint (str): Empreinte du graphe courant
+
+        Returns:
+            bool: False si le store doit être réécrit par une sauvegarde complète
+        """
+        manifest = self.read_manifest()
+        if manifest is None or not self.is_valid_for(previous_fingerprint):
+            return False
+
+        deltas = manifest.get('deltas', [])
+        total_messages = manifest['total_messages'] + len(added_ids)
+        delta_messages = total_messages - manifest['base_messages']
+        if len(deltas) >= INDEX_STORE_CONFIG['max_delta_segments'] or \
+                delta_messages > INDEX_STORE_CONFIG['max_delta_ratio'] * max(manifest['base_messages'], 1):
+            return False
+
+        filename = f"delta-{manifest['generation']}-{len(deltas) + 1}.json"
+        self._write_json(os.path.join(self.directory, filename),
+                         {'added': list(added_ids), 'refreshed': list(refreshed_ids)})
+
+        manifest.update(fingerprint=fingerprint, total_messages=total_messages, deltas=deltas + [filename])
+        self._write_json(self.manifest_path, manifest)
+        return True
+
+    def save_embeddings(self, embedding_service):
+        """
+        Ajoute à l'index persisté la matrice des embeddings encodée après sa sauvegarde
+
+        Les lignes suivent la table des documents du manifeste ; les messages des
+        segments incrémentaux sont encodés à nouveau au rechargement.
+
+        Args:
+            embedding_service (SearchEmbeddingService): Service dont les vecteurs sont prêts
+
+        Returns:
+            bool: True si la matrice a été écrite
+        """
+        manifest = self.read_manifest()
+        if manifest is None or not embedding_service.is_ready():
+            return False
+
+        try:
+            docs = StringTable(
+                np.load(os.path.join(self.directory, manifest['files']['docs_blob']), mmap_mode='r'),
+                np.load(os.path.join(self.directory, manifest['files']['docs_offsets']), mmap_mode='r')
+            )
+        except (OSError, ValueError, KeyError) as e:
+            logger.logger.warning(f"Table des documents illisible, embeddings non persistés: {e}")
+            return False
+
+        rows = [embedding_service.positions.get(docs[i]) for i in range(len(docs))]
+        if any(row is None for row in rows):
+            return False
+
+        previous = manifest['files'].get('embeddings')
+        manifest['files']['embeddings'] = self._write_array(
+            f"embeddings-{manifest['generation']}.npy", np.asarray(embedding_service.vectors, dtype=np.float16)[rows]
+        )
+        manifest['embedding_model'] = EMBEDDING_CONFIG['model_name']
+        self._write_json(self.manifest_path, manifest)
+
+        if previous and previous != manifest['files']['embeddings']:
+            try:
+                os.remove(os.path.join(self.directory, previous))
+            except OSError:
+                pass
+        return True
+
+    def _read_deltas(self, manifest):
+        """Lit les segments incrémentaux du manifeste, None si l'un d'eux est illisible"""
+        added_ids = []
+        refreshed_ids = []
+        for filename in manifest.get('deltas', []):
+            try:
+                with open(os.path.join(self.directory, filename), 'r', encoding='utf-8') as f:
+                    segment = json.load(f)
+            except (OSError, ValueError):
+                return None
+            added_ids.extend(segment['added'])
+            refreshed_ids.extend(segment['refreshed'])
+        return added_ids, refreshed_ids
+
+    def _write_array(self, filename, array):
+        """Écrit un tableau .npy de manière atomique et retourne son nom de fichier"""
+        tmp_path = os.path.join(self.directory, filename + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.save(f, array)
+        os.replace(tmp_path, os.path.join(self.directory, filename))
+        return filename
+
+    @staticmethod
+    def _write_json(path, data):
+        """Écrit un fichier JSON de manière atomique"""
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def load(self, indexing_service, fingerprint):
+        """
+        Recharge les index en mémoire mappée si l'empreinte correspond
+
+        Args:
+            indexing_service: Service d'indexation à alimenter
+            fingerprint (str): Empreinte du graphe courant
+
+        Returns:
+            bool: True si les index ont été rechargés
+        """
+        if not self.is_valid_for(fingerprint):
+            return False
+
+        manifest = self.read_manifest()
+        if manifest.get('total_messages') != len(indexing_service.message_nodes):
+            return False
+
+        # Les messages des segments incrémentaux sont absents des tableaux : ils sont réindexés ensuite
+        deltas = self._read_deltas(manifest)
+        if deltas is None:
+            return False
+        added_ids, refreshed_ids = deltas
+        if any(message_id not in indexing_service.message_nodes for message_id in added_ids):
+            return False
+        for message_id in added_ids:
+            del indexing_service.message_nodes[message_id]
+
+        try:
+            arrays = {
+                name: np.load(os.path.join(self.directory, filename), mmap_mode='r')
+                for name, filename in manifest['files'].items()
+            }
+        except (OSError, ValueError) as e:
+            logger.logger.warning(f"Index persisté illisible, reconstruction: {e}")
+            return False
+
+        docs = StringTable(arrays['docs_blob'], arrays['docs_offsets'])
+        vocabulary = StringTable(arrays['vocab_blob'], arrays['vocab_offsets'])
+
+        indexing_service.inverted_index = PostingsView(
+            vocabulary, arrays['postings_offsets'], arrays['postings_docs'], docs,
+            weights=arrays['postings_tf'], container=dict
+        )
+        indexing_service.document_frequency = ScalarView(vocabulary, arrays['df'], default=0)
+        pruned = StringTable(arrays['pruned_blob'], arrays['pruned_offsets'])
+        indexing_service.pruned_terms = {pruned[i] for i in range(len(pruned))}
+
+        containers = {
+            'temporal_index': list,
+            'user_sent_index': set,
+            'user_received_index': set,
+            'thread_messages_index': set,
+            'subject_term_index': set
+        }
+        for name, container in containers.items():
+            keys = StringTable(arrays[f'{name}_blob'], arrays[f'{name}_keys'])
+            setattr(indexing_service, name, PostingsView(
+                keys, arrays[f'{name}_offsets'], arrays[f'{name}_docs'], docs, container=container
+            ))
+
+        users = StringTable(arrays['users_blob'], arrays['users_offsets'])
+        pagerank = arrays['user_pagerank'].tolist()
+        degree = arrays['user_degree'].tolist()
+        indexing_service.user_pagerank = {
+            users[i]: value for i, value in enumerate(pagerank) if value == value  # ignore NaN
+        }
+        indexing_service.user_degree_centrality = {users[i]: value for i, value in enumerate(degree)}
+
+        threads = StringTable(arrays['threads_blob'], arrays['threads_offsets'])
+        relation_keys = StringTable(arrays['relation_keys_blob'], arrays['relation_keys_offsets'])
+        indexing_service.message_sender_index = ScalarView(
+            relation_keys, arrays['message_sender'], value_table=users
+        )
+        indexing_service.message_thread_index = ScalarView(
+            relation_keys, arrays['message_thread'], value_table=threads
+        )
+        indexing_service.message_recipients_index = {
+            role: PostingsView(
+                relation_keys, arrays[f'recipients_{role}_offsets'], arrays[f'recipients_{role}_users'],
+                users, container=list
+            )
+            for role in indexing_service.message_recipients_index
+        }
+        for name in ('sent_by_central', 'received_by_central'):
+            setattr(indexing_service, name, MembershipView(
+                StringTable(arrays[f'{name}_blob'], arrays[f'{name}_offsets'])
+            ))
+
+        topic_terms = StringTable(arrays['topic_terms_blob'], arrays['topic_terms_offsets'])
+        indexing_service.topic_index = PostingsView(
+            topic_terms, arrays['topic_offsets'], arrays['topic_docs'], docs,
+            weights=arrays['topic_scores'], container=dict
+        )
+
+        # Les positions des bitmaps suivent la table des documents persistée, pas l'ordre du graphe
+        filter_names = StringTable(arrays['filter_names_blob'], arrays['filter_names_offsets'])
+        indexing_service.filter_index = FilterBitmapIndex.from_arrays(
+            [docs[i] for i in range(len(docs))],
+            [filter_names[i] for i in range(len(filter_names))],
+            arrays['filter_bitmaps']
+        )
+
+        # Embeddings mappés depuis le disque s'ils ont été calculés avec le même modèle
+        if 'embeddings' in arrays and manifest.get('embedding_model') == EMBEDDING_CONFIG['model_name'] \
+                and indexing_service.embedding_service.enabled:
+            indexing_service.embedding_service.load_vectors(
+                [docs[i] for i in range(len(docs))], arrays['embeddings']
+            )
+
+        # Rejouer les segments incrémentaux depuis le graphe
+        if added_ids:
+            indexing_service.index_messages(added_ids)
+        if refreshed_ids:
+            indexing_service.refresh_message_attributes(refreshed_ids)
+
+        logger.logger.info(f"Index de recherche rechargés depuis {self.directory} "
+                           f"({manifest['total_messages']} messages)")
+        return True
+
+    @staticmethod
+    def _encode_postings(mapping, keys, doc_positions, weighted):
+        """Encode un mapping clé -> messages en (offsets, docs, poids)"""
+        offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+        docs = []
+        weights = []
+
+        for i, key in enumerate(keys):
+            postings = mapping[key]
+            if weighted:
+                for message_id, weight in postings.items():
+                    docs.append(doc_positions[message_id])
+                    weights.append(weight)
+            else:
+                docs.extend(doc_positions[message_id] for message_id in postings)
+            offsets[i + 1] = len(docs)
+
+        return (
+            offsets,
+            np.array(docs, dtype=np.int32),
+            np.array(weights, dtype=np.float32) if weighted else None
+        )
+
+    @staticmethod
+    def _encode_positions(mapping, keys, value_positions):
+        """Encode un mapping clé -> identifiant en positions alignées sur les clés (-1 si absent)"""
+        return np.array(
+            [value_positions.get(mapping.get(key), -1) for key in keys], dtype=np.int32
+        )
+
+    @staticmethod
+    def _analyzer_signature():
+        """Signature de la tokenisation, invalide l'index si elle change"""
+        return {
+            'pattern': TFIDF_CONFIG['pattern'],
+            'min_term_length': TFIDF_CONFIG['min_term_length'],
+            'text_analyzer': TextAnalyzer().signature(),
+            'topic_mappings': TOPIC_MAPPINGS,
+            'topic_weights': TOPIC_INDEX_CONFIG['weights']
+        }
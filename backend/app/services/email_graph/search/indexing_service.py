@@ -4,27 +4,53 @@ Service de construction et gestion des index de recherche.
 
 import re
 import math
+import threading
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import networkx as nx
 
 from ..logging_service import logger
 from ..shared_utils import parse_email_date
-from .config import TFIDF_CONFIG, PAGERANK_CONFIG
+from .filter_index import FilterBitmapIndex
+from .contact_index import ContactLookupIndex
+from .embedding_service import SearchEmbeddingService
+from .text_analyzer import TextAnalyzer
+from .config import (
+    TFIDF_CONFIG, PAGERANK_CONFIG, INCREMENTAL_INDEX_CONFIG, RECIPIENT_EDGE_ROLES,
+    TOPIC_MAPPINGS, TOPIC_INDEX_CONFIG, SNIPPET_CONFIG
+)
 
 
 class SearchIndexingService:
     """Service pour la construction et la gestion des index de recherche"""
 
-    def __init__(self, graph):
+    def __init__(self, graph, embedding_encoder=None):
+        self.embedding_service = SearchEmbeddingService(embedding_encoder)
+        self.embeddings_unsaved = False
+        self._embeddings_failed = False
+        self._embeddings_lock = threading.Lock()
+        self.analyzer = TextAnalyzer()
         self.user_degree_centrality = None
         self.user_pagerank = None
-        self.idf_scores = None
+        self.pending_metric_updates = 0
+        self.index_version = 0
         self.document_frequency = None
+        self.pruned_terms = None
         self.thread_messages_index = None
+        self.message_sender_index = None
+        self.message_recipients_index = None
+        self.message_thread_index = None
+        self.sent_by_central = None
+        self.received_by_central = None
+        self.filter_index = None
+        self.contact_index = None
+        self.topic_index = None
+        self.topic_term_cache = None
+        self.token_offsets_cache = None
         self.user_received_index = None
         self.user_sent_index = None
         self.inverted_index = None
+        self.subject_term_index = None
         self.temporal_index = None
         self.thread_nodes = None
         self.user_nodes = None
@@ -38,6 +64,9 @@ class SearchIndexingService:
 
     def reset_indexes(self):
         """Réinitialise tous les index"""
+        # Version des index, incrémentée à chaque modification (invalide les caches)
+        self.index_version += 1
+
         # Index par type de nœud
         self.message_nodes = {}
         self.user_nodes = {}
@@ -46,8 +75,11 @@ class SearchIndexingService:
         # Index temporel (clé temporelle -> messages)
         self.temporal_index = defaultdict(list)
 
-        # Index textuel inversé (terme -> messages)
-        self.inverted_index = defaultdict(set)
+        # Index textuel inversé (terme -> {message: tf normalisé})
+        self.inverted_index = defaultdict(dict)
+
+        # Postings dont le terme figure dans le sujet normalisé (terme -> messages), pour le bonus de sujet
+        self.subject_term_index = defaultdict(set)
 
         # Index utilisateur -> messages
         self.user_sent_index = defaultdict(set)
@@ -56,48 +88,461 @@ class SearchIndexingService:
         # Index thread -> messages
         self.thread_messages_index = defaultdict(set)
 
-        # TF-IDF
+        # Tables plates message -> relations (évitent les parcours du graphe à la requête)
+        self.message_sender_index = {}
+        self.message_recipients_index = {role: defaultdict(list) for role in RECIPIENT_EDGE_ROLES.values()}
+        self.message_thread_index = {}
+        self.sent_by_central = set()
+        self.received_by_central = set()
+
+        # Bitmaps des attributs filtrables
+        self.filter_index = FilterBitmapIndex()
+
+        # Index des contacts, construit à la première recherche par contact
+        self.contact_index = None
+
+        # Index des topics (terme -> {message: score}) pour le vocabulaire de TOPIC_MAPPINGS,
+        # les autres termes sont calculés à la demande et conservés dans un cache borné
+        self.topic_index = {term: {} for term in self.topic_vocabulary()}
+        self.topic_term_cache = OrderedDict()
+
+        # Positions des tokens du contenu (terme -> [(début, fin)]) et formes par terme analysé,
+        # calculées pour les snippets
+        self.token_offsets_cache = OrderedDict()
+
+        # Embeddings des messages pour la recherche dense, encodés à la première recherche dense
+        self.embedding_service.reset()
+        self.embeddings_unsaved = False
+        self._embeddings_failed = False
+
+        # TF-IDF (l'IDF est dérivé à la demande de N et DF)
         self.document_frequency = defaultdict(int)
-        self.idf_scores = {}
+
+        # Termes retirés par le seuil max-df, ignorés aussi pour les messages ajoutés ensuite
+        self.pruned_terms = set()
 
         # Métriques du graphe
         self.user_pagerank = {}
         self.user_degree_centrality = {}
+        self.pending_metric_updates = 0
 
     def build_all_indexes(self):
         """Construit tous les index nécessaires pour la recherche rapide"""
         logger.logger.info("Construction des index de recherche...")
 
         self.reset_indexes()
-        total_messages = 0
 
         # Première passe : collecter les données et construire les index de base
+        self._collect_nodes()
+        for node_id, data in self.message_nodes.items():
+            self._index_message(node_id, data)
+        self._prune_vocabulary()
+
+        # Calculer les métriques du graphe
+        self._calculate_graph_metrics()
+
+        logger.logger.info(f"Index créés: {len(self.message_nodes)} messages, "
+                           f"{len(self.user_nodes)} utilisateurs, {len(self.thread_nodes)} threads")
+
+    def index_messages(self, message_ids):
+        """
+        Ajoute de nouveaux messages aux index existants sans reconstruction complète
+
+        Args:
+            message_ids (iterable): IDs des messages ajoutés au graphe
+
+        Returns:
+            int: Nombre de messages effectivement indexés
+        """
+        indexed_ids = []
+        touched_users = set()
+
+        for message_id in message_ids:
+            if message_id in self.message_nodes or not self.graph.has_node(message_id):
+                continue
+
+            data = self.graph.nodes[message_id]
+            if data.get('type') != 'message':
+                continue
+
+            self.message_nodes[message_id] = data
+            touched_users.update(self._register_message_neighbours(message_id))
+            self._index_message(message_id, data)
+            indexed_ids.append(message_id)
+
+        indexed = len(indexed_ids)
+        if not indexed:
+            return 0
+
+        self.index_version += 1
+
+        # Sans vecteurs, les nouveaux messages seront encodés avec les autres à la première recherche dense
+        if self.embedding_service.is_ready():
+            self._add_embeddings(indexed_ids)
+
+        # La centralité de degré est locale : mise à jour exacte des utilisateurs touchés
+        for user_id in touched_users:
+            self.user_degree_centrality[user_id] = self.graph.in_degree(user_id) + self.graph.out_degree(user_id)
+
+        # Le PageRank est global : rafraîchi seulement quand le budget de fraîcheur est épuisé
+        self.pending_metric_updates += indexed
+        if self._graph_metrics_are_stale():
+            self._calculate_graph_metrics()
+        else:
+            logger.logger.info(f"PageRank différé: {self.pending_metric_updates} messages en attente")
+
+        logger.logger.info(f"Index mis à jour: {indexed} nouveaux messages")
+        return indexed
+
+    def find_unindexed_messages(self):
+        """
+        Compare le graphe aux index pour déterminer si une mise à jour incrémentale suffit
+
+        Parcourt tous les nœuds du graphe : à utiliser quand l'appelant ne connaît
+        pas les messages ajoutés.
+
+        Returns:
+            list|None: IDs des nouveaux messages, ou None si des nœuds indexés ont disparu
+        """
+        graph_messages = [node_id for node_id, data in self.graph.nodes(data=True)
+                          if data.get('type') == 'message']
+
+        if len(graph_messages) < len(self.message_nodes):
+            return None
+
+        # Les index ne restent valides que si tous les nœuds indexés existent encore
+        for nodes in (self.message_nodes, self.user_nodes, self.thread_nodes):
+            if any(not self.graph.has_node(node_id) for node_id in nodes):
+                return None
+
+        return [message_id for message_id in graph_messages if message_id not in self.message_nodes]
+
+    def rebind_graph(self):
+        """
+        Rattache les index aux attributs des nœuds d'un nouveau graphe
+
+        Seuls les messages dont les attributs filtrables diffèrent sont signalés,
+        et l'index des contacts n'est invalidé que si un email ou un nom a changé.
+
+        Returns:
+            list|None: IDs des messages à rafraîchir, ou None si des nœuds indexés ont disparu
+        """
+        changed_messages = []
+        contacts_changed = False
+
+        for nodes in (self.message_nodes, self.user_nodes, self.thread_nodes):
+            for node_id, data in nodes.items():
+                if not self.graph.has_node(node_id):
+                    return None
+
+                new_data = self.graph.nodes[node_id]
+                if new_data is data:
+                    continue
+
+                if nodes is self.message_nodes:
+                    if FilterBitmapIndex.message_attributes(data) != FilterBitmapIndex.message_attributes(new_data):
+                        changed_messages.append(node_id)
+                elif nodes is self.user_nodes:
+                    if (data.get('email'), data.get('name')) != (new_data.get('email'), new_data.get('name')):
+                        contacts_changed = True
+                nodes[node_id] = new_data
+
+        if contacts_changed:
+            self.contact_index = None
+
+        return changed_messages
+
+    def refresh_message_attributes(self, message_ids=None):
+        """
+        Réindexe les attributs filtrables (lu, important, labels...) de messages déjà indexés
+
+        Args:
+            message_ids (iterable): IDs des messages modifiés, tous si None
+        """
+        if message_ids is None:
+            message_ids = list(self.message_nodes)
+
+        for message_id in message_ids:
+            if message_id in self.message_nodes:
+                self._index_message_filters(message_id, self.message_nodes[message_id])
+            self.token_offsets_cache.pop(message_id, None)
+
+        self.index_version += 1
+
+    def refresh_graph_metrics(self):
+        """Force le recalcul des métriques différées (PageRank)"""
+        if self.pending_metric_updates:
+            self._calculate_graph_metrics()
+
+    @staticmethod
+    def topic_vocabulary():
+        """Termes de topic précalculés : clés et synonymes de TOPIC_MAPPINGS"""
+        vocabulary = set()
+        for topic, synonyms in TOPIC_MAPPINGS.items():
+            vocabulary.add(topic.lower())
+            vocabulary.update(synonym.lower() for synonym in synonyms)
+        return sorted(vocabulary)
+
+    def get_topic_postings(self, term):
+        """
+        Retourne les messages associés à un terme de topic avec leur contribution au score
+
+        Args:
+            term (str): Terme de topic en minuscules
+
+        Returns:
+            dict: message_id -> contribution (topics explicites, sujet, contenu)
+        """
+        if term in self.topic_index:
+            return self.topic_index[term]
+
+        if term in self.topic_term_cache:
+            self.topic_term_cache.move_to_end(term)
+            return self.topic_term_cache[term]
+
+        # Terme inconnu : un parcours unique, puis conservé pour les requêtes suivantes
+        postings = {}
+        for message_id, data in self.message_nodes.items():
+            score = self._topic_term_score(term, *self._topic_fields(data))
+            if score > 0:
+                postings[message_id] = score
+
+        self.topic_term_cache[term] = postings
+        while len(self.topic_term_cache) > TOPIC_INDEX_CONFIG['max_cached_terms']:
+            self.topic_term_cache.popitem(last=False)
+
+        return postings
+
+    def get_token_offsets(self, message_id):
+        """
+        Retourne les positions des tokens du contenu d'un message
+
+        Les positions sont calculées en un seul passage sur le contenu à la première
+        demande, puis conservées dans un cache LRU borné.
+
+        Args:
+            message_id (str): ID du message
+
+        Returns:
+            dict: terme en minuscules -> liste de (début, fin) dans le contenu original
+        """
+        return self._token_positions(message_id)[0]
+
+    def get_term_tokens(self, message_id):
+        """
+        Retourne les formes du contenu d'un message regroupées par terme analysé
+
+        Calculées avec les positions des tokens (même passage, même cache) : les termes
+        d'une requête y sont cherchés directement, sans parcourir tous les tokens du message.
+
+        Args:
+            message_id (str): ID du message
+
+        Returns:
+            dict: terme analysé -> tokens en minuscules (clés de get_token_offsets), par première occurrence
+        """
+        return self._token_positions(message_id)[1]
+
+    def _token_positions(self, message_id):
+        """Positions des tokens et formes par terme analysé, conservées dans un cache LRU borné"""
+        if message_id in self.token_offsets_cache:
+            self.token_offsets_cache.move_to_end(message_id)
+            return self.token_offsets_cache[message_id]
+
+        content = self.message_nodes.get(message_id, {}).get('content', '') or ''
+
+        # Le motif couvre majuscules et minuscules : les positions restent celles du texte original
+        offsets = defaultdict(list)
+        for match in re.finditer(TFIDF_CONFIG['pattern'], content):
+            offsets[match.group().lower()].append(match.span())
+        offsets = dict(offsets)
+
+        # Terme analysé de chaque forme distincte (formes accentuées ou fléchies d'un même terme)
+        term_tokens = defaultdict(list)
+        for token in offsets:
+            term = self.analyzer.term(token)
+            if term is not None:
+                term_tokens[term].append(token)
+        positions = (offsets, dict(term_tokens))
+
+        self.token_offsets_cache[message_id] = positions
+        while len(self.token_offsets_cache) > SNIPPET_CONFIG['max_cached_offsets']:
+            self.token_offsets_cache.popitem(last=False)
+        return positions
+
+    def get_contact_index(self):
+        """
+        Retourne l'index des contacts, construit à la demande
+
+        Returns:
+            ContactLookupIndex: Index des utilisateurs par email et par nom
+        """
+        if self.contact_index is None:
+            self.contact_index = ContactLookupIndex.build(self.user_nodes)
+        return self.contact_index
+
+    def get_idf(self, term):
+        """
+        Calcule l'IDF d'un terme à partir du nombre de messages et de sa fréquence documentaire
+
+        Args:
+            term (str): Terme indexé
+
+        Returns:
+            float: Score IDF
+        """
+        return math.log(len(self.message_nodes) / (1 + self.document_frequency.get(term, 0)))
+
+    def load_indexes(self, store, fingerprint):
+        """
+        Recharge les index depuis un store persisté sans retokeniser les messages
+
+        Args:
+            store (SearchIndexStore): Store contenant les index sérialisés
+            fingerprint (str): Empreinte du graphe courant
+
+        Returns:
+            bool: True si les index ont été rechargés, False s'il faut reconstruire
+        """
+        self.reset_indexes()
+        self._collect_nodes()
+
+        if not store.load(self, fingerprint):
+            return False
+
+        logger.logger.info(f"Index rechargés: {len(self.message_nodes)} messages, "
+                           f"{len(self.user_nodes)} utilisateurs, {len(self.thread_nodes)} threads")
+        return True
+
+    def ensure_embeddings(self):
+        """
+        Encode les messages à la première recherche dense
+
+        L'encodage de toute la boîte est coûteux : il n'est fait ni à la construction
+        ni au rechargement des index, mais à la première requête qui en a besoin.
+
+        Returns:
+            bool: True si des vecteurs sont disponibles pour la recherche
+        """
+        if self.embedding_service.is_ready():
+            return True
+        if not self.embedding_service.enabled or self._embeddings_failed or not self.message_nodes:
+            return False
+
+        with self._embeddings_lock:
+            if not self.embedding_service.is_ready():
+                self._build_embeddings()
+                self.embeddings_unsaved = self.embedding_service.is_ready()
+        return self.embedding_service.is_ready()
+
+    def _build_embeddings(self):
+        """Encode tous les messages si un modèle d'embeddings est disponible"""
+        if not self.embedding_service.enabled or not self.message_nodes:
+            return
+
+        try:
+            self.embedding_service.build(self.message_nodes)
+        except Exception as e:
+            # Pas de nouvel essai à chaque requête : la prochaine reconstruction réessaiera
+            logger.logger.error(f"Erreur calcul des embeddings, recherche dense désactivée: {e}")
+            self.embedding_service.reset()
+            self._embeddings_failed = True
+
+    def _add_embeddings(self, message_ids):
+        """Encode les nouveaux messages indexés"""
+        try:
+            self.embedding_service.add_messages(self.message_nodes, message_ids)
+        except Exception as e:
+            logger.logger.error(f"Erreur calcul des embeddings des nouveaux messages: {e}")
+
+    def _collect_nodes(self):
+        """Répartit les nœuds du graphe par type"""
         for node_id, data in self.graph.nodes(data=True):
             node_type = data.get('type', '')
 
             if node_type == 'message':
                 self.message_nodes[node_id] = data
-                total_messages += 1
-
-                self._index_message_temporal(node_id, data)
-                self._index_message_textual(node_id, data)
-                self._index_message_user_relations(node_id)
-                self._index_message_thread_relations(node_id)
-
             elif node_type == 'user':
                 self.user_nodes[node_id] = data
-
             elif node_type == 'thread':
                 self.thread_nodes[node_id] = data
 
-        # Calculer les scores IDF
-        self._calculate_idf_scores(total_messages)
+    def _register_message_neighbours(self, message_id):
+        """Enregistre les utilisateurs et threads reliés à un nouveau message"""
+        user_ids = set()
+        neighbours = [u for u, _ in self.graph.in_edges(message_id)] + [v for _, v in self.graph.out_edges(message_id)]
 
-        # Calculer les métriques du graphe
-        self._calculate_graph_metrics()
+        for node_id in neighbours:
+            data = self.graph.nodes[node_id]
+            node_type = data.get('type', '')
 
-        logger.logger.info(f"Index créés: {len(self.message_nodes)} messages, "
-                           f"{len(self.user_nodes)} utilisateurs, {len(self.thread_nodes)} threads")
+            if node_type == 'user':
+                if node_id not in self.user_nodes:
+                    self.user_nodes[node_id] = data
+                    if self.contact_index is not None:
+                        self.contact_index.add_user(node_id, data)
+                user_ids.add(node_id)
+            elif node_type == 'thread':
+                self.thread_nodes.setdefault(node_id, data)
+
+        return user_ids
+
+    def _graph_metrics_are_stale(self):
+        """Indique si les messages en attente dépassent le budget de fraîcheur du PageRank"""
+        budget = max(
+            INCREMENTAL_INDEX_CONFIG['pagerank_min_pending'],
+            INCREMENTAL_INDEX_CONFIG['pagerank_staleness_ratio'] * len(self.message_nodes)
+        )
+        return self.pending_metric_updates >= budget
+
+    def _index_message(self, message_id, data):
+        """Indexe un message dans tous les index de base"""
+        self._index_message_temporal(message_id, data)
+        self._index_message_textual(message_id, data)
+        self._index_message_user_relations(message_id)
+        self._index_message_thread_relations(message_id)
+        self._index_message_filters(message_id, data)
+        self._index_message_topics(message_id, data)
+
+    def _index_message_topics(self, message_id, data):
+        """Indexe les contributions de topic d'un message pour les termes connus"""
+        fields = self._topic_fields(data)
+
+        for postings in (self.topic_index, self.topic_term_cache):
+            for term in list(postings.keys()):
+                score = self._topic_term_score(term, *fields)
+                if score > 0:
+                    postings[term][message_id] = score
+
+    @staticmethod
+    def _topic_fields(data):
+        """Champs en minuscules utilisés pour le scoring des topics"""
+        return (
+            {t.lower() for t in data.get('topics', [])},
+            data.get('subject', '').lower(),
+            data.get('content', '').lower()
+        )
+
+    @staticmethod
+    def _topic_term_score(term, topics, subject, content):
+        """Contribution d'un terme au score de topic d'un message"""
+        weights = TOPIC_INDEX_CONFIG['weights']
+        score = 0.0
+        if term in topics:
+            score += weights['topics']
+        if term in subject:
+            score += weights['subject']
+        if term in content:
+            score += weights['content']
+        return score
+
+    def _index_message_filters(self, message_id, data):
+        """Indexe les attributs filtrables d'un message dans les bitmaps"""
+        self.filter_index.set_message(message_id, FilterBitmapIndex.message_attributes(
+            data,
+            sent_by_central=message_id in self.sent_by_central,
+            received_by_central=message_id in self.received_by_central
+        ))
 
     def _index_message_temporal(self, message_id, data):
         """Indexe un message par sa date"""
@@ -124,27 +569,48 @@ class SearchIndexingService:
 
     def _index_message_textual(self, message_id, data):
         """Indexe le contenu textuel d'un message"""
-        # Combiner sujet et contenu
-        text = f"{data.get('subject', '')} {data.get('content', '')}".lower()
-
-        # Tokenisation selon la configuration
-        tokens = re.findall(TFIDF_CONFIG['pattern'], text)
+        # Termes du sujet et du contenu (mots vides retirés, accents supprimés, contenu borné)
+        terms = self.analyzer.analyze_message(data.get('subject', ''), data.get('content', ''))
 
         # Compter les occurrences pour TF
         term_frequency = defaultdict(int)
-        for token in tokens:
-            if len(token) >= TFIDF_CONFIG['min_term_length']:
-                term_frequency[token] += 1
-                self.inverted_index[token].add(message_id)
+        for term in terms:
+            if term not in self.pruned_terms:
+                term_frequency[term] += 1
 
-        # Stocker TF normalisé
+        # Stocker TF normalisé dans les postings et mettre à jour DF
+        subject = self.analyzer.normalize_field(data.get('subject', ''))
         max_freq = max(term_frequency.values()) if term_frequency else 1
-        data['_tf'] = {term: freq / max_freq for term, freq in term_frequency.items()}
+        for term, freq in term_frequency.items():
+            self.inverted_index[term][message_id] = freq / max_freq
+            self.document_frequency[term] += 1
+
+            # Terme présent dans le sujet (sous-chaîne du sujet normalisé, comme les radicaux)
+            if term in subject:
+                self.subject_term_index[term].add(message_id)
+
+    def _prune_vocabulary(self):
+        """
+        Retire de l'index les termes présents dans trop de messages (seuil max-df)
+
+        Ces termes ont un IDF proche de zéro et les plus longues listes de postings.
+        Le seuil n'est appliqué qu'aux corpus assez grands pour que la fréquence soit significative.
+        """
+        config = self.analyzer.config
+        total_messages = len(self.message_nodes)
+        if total_messages < config['max_df_min_documents']:
+            return
+
+        max_df = config['max_df_ratio'] * total_messages
+        pruned = [term for term, df in self.document_frequency.items() if df > max_df]
+        for term in pruned:
+            del self.inverted_index[term]
+            del self.document_frequency[term]
+            self.subject_term_index.pop(term, None)
+        self.pruned_terms.update(pruned)
 
-        # Mettre à jour DF
-        for term in set(tokens):
-            if len(term) >= TFIDF_CONFIG['min_term_length']:
-                self.document_frequency[term] += 1
+        if pruned:
+            logger.logger.info(f"Vocabulaire élagué: {len(pruned)} terme(s) au-delà du seuil max-df")
 
     def _index_message_user_relations(self, message_id):
         """Indexe les relations entre messages et utilisateurs"""
@@ -152,23 +618,46 @@ class SearchIndexingService:
         for user_id, _, edge_data in self.graph.in_edges(message_id, data=True):
             if edge_data.get('type') == 'SENT':
                 self.user_sent_index[user_id].add(message_id)
+                self.message_sender_index.setdefault(message_id, user_id)
+
+                if self._is_central_user(user_id):
+                    self.sent_by_central.add(message_id)
 
         # Messages reçus
         for _, user_id, edge_data in self.graph.out_edges(message_id, data=True):
-            if edge_data.get('type') in ['RECEIVED', 'CC', 'BCC']:
+            role = RECIPIENT_EDGE_ROLES.get(edge_data.get('type'))
+            if role:
                 self.user_received_index[user_id].add(message_id)
+                self.message_recipients_index[role][message_id].append(user_id)
+
+                if self._is_central_user(user_id):
+                    self.received_by_central.add(message_id)
 
     def _index_message_thread_relations(self, message_id):
         """Indexe les relations entre messages et threads"""
         for _, thread_id, edge_data in self.graph.out_edges(message_id, data=True):
             if edge_data.get('type') == 'PART_OF_THREAD':
                 self.thread_messages_index[thread_id].add(message_id)
+                self.message_thread_index.setdefault(message_id, thread_id)
+
+    def _is_central_user(self, user_id):
+        """Indique si un utilisateur est l'utilisateur central de la boîte"""
+        return self.user_nodes.get(user_id, {}).get('is_central_user', False)
+
+    def get_message_recipients(self, message_id):
+        """
+        Retourne les destinataires d'un message par rôle
 
-    def _calculate_idf_scores(self, total_messages):
-        """Calcule les scores IDF pour chaque terme"""
-        self.idf_scores = {}
-        for term, doc_count in self.document_frequency.items():
-            self.idf_scores[term] = math.log(total_messages / (1 + doc_count))
+        Args:
+            message_id (str): ID du message
+
+        Returns:
+            dict: Listes d'IDs utilisateur pour 'to', 'cc' et 'bcc'
+        """
+        return {
+            role: self.message_recipients_index[role].get(message_id, [])
+            for role in RECIPIENT_EDGE_ROLES.values()
+        }
 
     def _calculate_graph_metrics(self):
         """Calcule les métriques du graphe pour le scoring"""
@@ -200,6 +689,8 @@ class SearchIndexingService:
             out_degree = self.graph.out_degree(user_id)
             self.user_degree_centrality[user_id] = in_degree + out_degree
 
+        self.pending_metric_updates = 0
+
     def get_index_stats(self):
         """Retourne les statistiques des index"""
         return {
@@ -208,5 +699,8 @@ class SearchIndexingService:
             'threads': len(self.thread_nodes),
             'temporal_keys': len(self.temporal_index),
             'unique_terms': len(self.inverted_index),
-            'user_pagerank_entries': len(self.user_pagerank)
+            'pruned_terms': len(self.pruned_terms),
+            'user_pagerank_entries': len(self.user_pagerank),
+            'pending_metric_updates': self.pending_metric_updates,
+            'embedded_messages': len(self.embedding_service)
         }
\ No newline at end of file
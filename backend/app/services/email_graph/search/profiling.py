@@ -0,0 +1,258 @@
+"""
+Profilage des recherches : durée et nombre de candidats par étape.
+
+Un profil est actif pour le thread courant pendant une recherche ; les services
+y enregistrent leurs étapes avec `current_profile().stage(...)`. Lorsque le
+profilage est désactivé (ou que la requête n'est pas échantillonnée), le profil
+courant est un objet neutre dont les méthodes ne font rien.
+"""
+
+import bisect
+import random
+import threading
+import time
+
+from .config import PROFILING_CONFIG
+
+_local = threading.local()
+
+
+class _NullStage:
+    """Contexte neutre utilisé quand le profilage est inactif"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set_count(self, count):
+        pass
+
+
+class _NullProfile:
+    """Profil neutre : aucune mesure"""
+
+    enabled = False
+    _stage = _NullStage()
+
+    def stage(self, name, count=None):
+        return self._stage
+
+    def annotate(self, **values):
+        pass
+
+
+NULL_PROFILE = _NullProfile()
+
+
+class _Stage:
+    """Mesure d'une étape, ajoutée au profil à la sortie du contexte"""
+
+    __slots__ = ('profile', 'name', 'count', 'start')
+
+    def __init__(self, profile, name, count):
+        self.profile = profile
+        self.name = name
+        self.count = count
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profile.add(self.name, (time.perf_counter() - self.start) * 1000, self.count)
+        return False
+
+    def set_count(self, count):
+        """Nombre de candidats produits par l'étape"""
+        self.count = count
+
+
+class SearchProfile:
+    """Durées et nombres de candidats des étapes d'une recherche"""
+
+    enabled = True
+
+    def __init__(self):
+        self.stages = []
+        self.annotations = {}
+        self.start = time.perf_counter()
+        self.total_ms = None
+
+    def stage(self, name, count=None):
+        """
+        Contexte mesurant une étape
+
+        Args:
+            name (str): Nom de l'étape
+            count (int): Nombre de candidats, modifiable avec set_count
+
+        Returns:
+            Contexte de mesure
+        """
+        return _Stage(self, name, count)
+
+    def add(self, name, duration_ms, count=None):
+        """Ajoute une mesure, cumulée si l'étape a déjà été mesurée"""
+        for entry in self.stages:
+            if entry['name'] == name:
+                entry['ms'] += duration_ms
+                entry['calls'] += 1
+                if count is not None:
+                    entry['count'] = count if entry['count'] is None else entry['count'] + count
+                return
+        self.stages.append({'name': name, 'ms': duration_ms, 'count': count, 'calls': 1})
+
+    def annotate(self, **values):
+        """Ajoute des informations sur la recherche (mode, cache...)"""
+        self.annotations.update(values)
+
+    def finish(self):
+        """Termine la mesure de la recherche"""
+        self.total_ms = (time.perf_counter() - self.start) * 1000
+
+    def to_dict(self):
+        """Convertit le profil en dictionnaire"""
+        return {
+            **self.annotations,
+            'total_ms': round(self.total_ms or 0.0, 3),
+            'stages': [
+                {'name': entry['name'], 'ms': round(entry['ms'], 3), 'count': entry['count'], 'calls': entry['calls']}
+                for entry in self.stages
+            ]
+        }
+
+
+def current_profile():
+    """Profil actif pour le thread courant (neutre si aucun)"""
+    return getattr(_local, 'profile', NULL_PROFILE)
+
+
+class LatencyHistogram:
+    """Histogramme de latences à seuils fixes (ms)"""
+
+    def __init__(self, bounds):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, fraction):
+        """Borne supérieure du seuil contenant le percentile demandé"""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count, 3) if self.count else 0.0,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': round(self.max, 3),
+            'buckets': {
+                (f"<={bound}" if i < len(self.bounds) else f">{self.bounds[-1]}"): bucket_count
+                for i, (bound, bucket_count) in enumerate(zip(self.bounds + [self.bounds[-1]], self.counts))
+            }
+        }
+
+
+class SearchProfiler:
+    """Active les profils des recherches et agrège les histogrammes par étape"""
+
+    def __init__(self, enabled=None, sample_rate=None):
+        """
+        Initialise le profileur
+
+        Args:
+            enabled (bool): Profilage actif (PROFILING_CONFIG par défaut)
+            sample_rate (float): Part des recherches profilées lorsqu'il est actif
+        """
+        self.enabled = PROFILING_CONFIG['enabled'] if enabled is None else enabled
+        self.sample_rate = PROFILING_CONFIG['sample_rate'] if sample_rate is None else sample_rate
+        self.histograms = {}
+        self.stage_candidates = {}
+        self.profiled_searches = 0
+
+    def set_enabled(self, enabled, sample_rate=None):
+        """Active ou désactive le profilage"""
+        self.enabled = enabled
+        if sample_rate is not None:
+            self.sample_rate = sample_rate
+
+    def begin(self, force=None):
+        """
+        Démarre le profil d'une recherche
+
+        Args:
+            force (bool): True pour profiler cette recherche, False pour l'exclure,
+                None pour suivre la configuration et l'échantillonnage
+
+        Returns:
+            SearchProfile|_NullProfile: Profil actif pour le thread courant
+        """
+        if force is None:
+            force = self.enabled and (self.sample_rate >= 1.0 or random.random() < self.sample_rate)
+        profile = SearchProfile() if force else NULL_PROFILE
+        _local.profile = profile
+        return profile
+
+    def end(self, profile):
+        """Termine le profil courant et l'agrège aux histogrammes"""
+        _local.profile = NULL_PROFILE
+        if not profile.enabled:
+            return
+
+        profile.finish()
+        self.profiled_searches += 1
+        self._observe('total', profile.total_ms)
+        for entry in profile.stages:
+            self._observe(entry['name'], entry['ms'])
+            if entry['count'] is not None:
+                self.stage_candidates[entry['name']] = self.stage_candidates.get(entry['name'], 0) + entry['count']
+
+    def _observe(self, name, value):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram(PROFILING_CONFIG['histogram_bounds_ms'])
+        histogram.observe(value)
+
+    def reset(self):
+        """Vide les histogrammes"""
+        self.histograms = {}
+        self.stage_candidates = {}
+        self.profiled_searches = 0
+
+    def get_stats(self):
+        """Histogrammes agrégés par étape et nombre moyen de candidats"""
+        return {
+            'enabled': self.enabled,
+            'sample_rate': self.sample_rate,
+            'profiled_searches': self.profiled_searches,
+            'stages': {
+                name: {
+                    **histogram.to_dict(),
+                    'mean_candidates': round(self.stage_candidates[name] / histogram.count, 1)
+                    if name in self.stage_candidates and histogram.count else None
+                }
+                for name, histogram in self.histograms.items()
+            }
+        }
@@ -0,0 +1,107 @@
+"""
+Cache LRU/TTL des requêtes de recherche, invalidé par la version des index.
+"""
+
+import time
+from collections import OrderedDict
+
+
+class QueryResultCache:
+    """
+    Cache LRU avec expiration, vidé dès que la version des index change.
+
+    Les entrées sont associées à la version des index au moment du calcul :
+    toute modification des index (reconstruction, indexation incrémentale,
+    rafraîchissement des attributs) rend le cache entier obsolète.
+    """
+
+    def __init__(self, max_entries, ttl_seconds=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._version = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _sync_version(self, version):
+        """Vide le cache si la version des index a changé"""
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+                self._entries.clear()
+            self._version = version
+
+    def get(self, key, version):
+        """
+        Retourne la valeur en cache pour une clé
+
+        Args:
+            key: Clé canonique de la requête
+            version: Version courante des index
+
+        Returns:
+            Valeur en cache ou None
+        """
+        self._sync_version(version)
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, stored_at = entry
+        if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, version, value):
+        """
+        Ajoute une valeur au cache
+
+        Args:
+            key: Clé canonique de la requête
+            version: Version des index utilisée pour le calcul
+            value: Valeur à conserver
+        """
+        self._sync_version(version)
+
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Vide le cache sans réinitialiser les statistiques"""
+        if self._entries:
+            self.invalidations += 1
+        self._entries.clear()
+
+    def get_stats(self):
+        """Retourne les statistiques du cache"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations
+        }
@@ -0,0 +1,247 @@
+"""
+Planificateur de la recherche combinée.
+
+Chaque sous-recherche (filtres booléens, contenu, topics, utilisateur, période)
+reçoit une estimation du nombre de messages qu'elle produit, à partir des
+tailles des postings. Quand les résultats sont intersectés, les étapes sont
+exécutées de la plus sélective à la moins sélective et chacune ne calcule que
+les messages retenus par les précédentes. Quand ils sont réunis, les étapes
+sont indépendantes et peuvent s'exécuter sur un pool de threads.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from ..logging_service import logger
+from .config import COMBINED_SEARCH_CONFIG, EMBEDDING_CONFIG, SCORING_WEIGHTS, TOPIC_MAPPINGS
+from .profiling import current_profile
+from .scoring_service import ScoreArrays, ScoreTable
+
+# Ordre de fusion des scores, identique à l'ordre historique des sous-recherches
+STAGE_ORDER = ('content', 'topics', 'user', 'temporal')
+
+
+class CombinedSearchPlanner:
+    """Ordonne et exécute les sous-recherches de search_combined"""
+
+    def __init__(self, search_service):
+        self.search = search_service
+        self.last_plan = []
+
+    @property
+    def indexing(self):
+        return self.search.indexing
+
+    def execute(self, query, filters):
+        """
+        Exécute la recherche combinée
+
+        Args:
+            query (str): Requête textuelle
+            filters (dict): Filtres multiples
+
+        Returns:
+            ScoreTable: Scores combinés par message_id
+        """
+        with current_profile().stage('planning'):
+            stages = self._plan(query, filters)
+        intersect = self._has_multiple_filters(filters)
+        self.last_plan = []
+
+        # Filtres d'état et de négation : évalués d'abord sur les bitmaps, ils bornent toutes les étapes
+        candidates = None
+        if filters.get('has_attachments') is False or filters.get('is_important') is False \
+                or filters.get('message_type'):
+            candidates = self.search.filter_mask(filters)
+            self.last_plan.append(('filters', None, int(np.count_nonzero(candidates))))
+
+        if intersect:
+            stage_results = self._run_sequential(stages, query, filters, candidates)
+        else:
+            stage_results = self._run_independent(stages, query, filters, candidates)
+
+        if stage_results is None:
+            return ScoreTable(self.indexing.filter_index)
+
+        # Intersection ou union des messages de chaque étape, en masques sur les positions de l'index
+        size = len(self.indexing.filter_index)
+        masks = [results.mask(size) for results in stage_results.values()]
+        if masks:
+            valid_messages = np.logical_and.reduce(masks) if intersect else np.logical_or.reduce(masks)
+        else:
+            valid_messages = np.zeros(size, dtype=bool) if candidates is None else candidates
+
+        self._add_query_content(stage_results, query)
+        return self._merge(stage_results, valid_messages)
+
+    def _plan(self, query, filters):
+        """Liste les étapes actives avec leur estimation, de la plus sélective à la moins sélective"""
+        stages = []
+        if query:
+            stages.append(('content', self._estimate_content(query)))
+        if filters.get('topic_ids'):
+            stages.append(('topics', self._estimate_topics(filters)))
+        if any(filters.get(key) for key in ('contact_name', 'contact_email', 'recipient_name', 'recipient_email')):
+            stages.append(('user', self._estimate_user(filters)))
+        if filters.get('date_from'):
+            stages.append(('temporal', self._estimate_temporal(filters)))
+
+        # Tri stable : à estimation égale, l'ordre historique est conservé
+        return sorted(stages, key=lambda stage: stage[1])
+
+    @staticmethod
+    def _has_multiple_filters(filters):
+        """Plusieurs critères actifs : les résultats des étapes sont intersectés"""
+        active_filters = [
+            filters.get('topic_ids'),
+            filters.get('has_attachments') is not None,
+            filters.get('contact_name') or filters.get('contact_email'),
+            filters.get('recipient_name') or filters.get('recipient_email'),
+            filters.get('date_from'),
+            filters.get('message_type')
+        ]
+        return sum(1 for active in active_filters if active) > 1
+
+    def _run_stage(self, name, filters, candidates, query=''):
+        """Exécute une sous-recherche restreinte aux candidats"""
+        if name == 'content':
+            return self.search.search_by_content(query, filters, candidates)
+        if name == 'topics':
+            return self.search.search_by_topic(filters, '', candidates)
+        if name == 'user':
+            return self.search.search_by_user(filters, '', candidates)
+        return self.search.search_by_temporal(filters, '', candidates)
+
+    def _run_sequential(self, stages, query, filters, candidates):
+        """
+        Exécute les étapes dans l'ordre du plan en réduisant les candidats
+
+        Returns:
+            dict|None: Résultats par étape, None si plus aucun candidat
+        """
+        stage_results = {}
+        size = len(self.indexing.filter_index)
+        for name, estimate in stages:
+            if candidates is not None and not candidates.any():
+                self.last_plan.append((name, estimate, None))
+                return None
+
+            with current_profile().stage(f'combined.{name}') as stage:
+                results = self._run_stage(name, filters, candidates, query)
+                stage.set_count(len(results))
+            stage_results[name] = results
+            candidates = results.mask(size)
+            self.last_plan.append((name, estimate, len(results)))
+
+        return stage_results
+
+    def _run_independent(self, stages, query, filters, candidates):
+        """Exécute les étapes indépendantes, en parallèle si configuré"""
+        profile = current_profile()
+        if COMBINED_SEARCH_CONFIG['parallel'] and len(stages) > 1:
+            # Les threads du pool n'ont pas de profil actif : seule la durée totale est mesurée
+            with profile.stage('combined.parallel') as stage:
+                with ThreadPoolExecutor(max_workers=COMBINED_SEARCH_CONFIG['max_workers']) as executor:
+                    futures = {
+                        name: executor.submit(self._run_stage, name, filters, candidates, query)
+                        for name, _ in stages
+                    }
+                    stage_results = {name: future.result() for name, future in futures.items()}
+                stage.set_count(sum(len(results) for results in stage_results.values()))
+        else:
+            stage_results = {}
+            for name, _ in stages:
+                with profile.stage(f'combined.{name}') as stage:
+                    stage_results[name] = self._run_stage(name, filters, candidates, query)
+                    stage.set_count(len(stage_results[name]))
+
+        for name, estimate in stages:
+            self.last_plan.append((name, estimate, len(stage_results[name])))
+        return stage_results
+
+    def _add_query_content(self, stage_results, query):
+        """
+        Reporte le score de contenu de la requête sur les étapes utilisateur et période
+
+        Équivaut à exécuter ces étapes avec la requête textuelle, sans recalculer la
+        recherche par contenu déjà faite par l'étape 'content'.
+        """
+        content_results = stage_results.get('content')
+        if not query or content_results is None:
+            return
+
+        for name in ('user', 'temporal'):
+            if name in stage_results:
+                stage_results[name].assign_from(content_results, 'content')
+
+    def _merge(self, stage_results, valid_messages):
+        """Additionne les vecteurs de scores des étapes pour les messages du masque, dans l'ordre de l'index"""
+        combined_results = ScoreArrays(self.indexing.filter_index)
+
+        for name in STAGE_ORDER:
+            if name in stage_results:
+                combined_results.add_table(stage_results[name], valid_messages)
+
+        return combined_results.to_table()
+
+    def _estimate_content(self, query):
+        """Nombre de postings des termes de la requête (et résultats denses)"""
+        estimate = 0
+        for token in self.indexing.analyzer.query_terms(query):
+            if token in self.indexing.inverted_index:
+                estimate += len(self.indexing.inverted_index[token])
+        if SCORING_WEIGHTS['dense'] > 0 and self.indexing.embedding_service.enabled:
+            estimate += EMBEDDING_CONFIG['top_k']
+        return estimate
+
+    def _estimate_topics(self, filters):
+        """Nombre de postings des topics et de leurs synonymes"""
+        terms = set()
+        for topic_id in filters.get('topic_ids', []):
+            terms.add(topic_id.lower())
+            terms.update(TOPIC_MAPPINGS.get(topic_id.lower(), []))
+        return sum(len(self.indexing.get_topic_postings(term)) for term in terms)
+
+    def _estimate_user(self, filters):
+        """Nombre de messages des utilisateurs correspondants (index des contacts)"""
+        contacts = self.indexing.get_contact_index()
+        estimate = 0
+
+        contact_email = filters.get('contact_email', '').lower()
+        contact_name = filters.get('contact_name', '').lower()
+        if contact_email or contact_name:
+            for user_id, _ in contacts.find(contact_email, contact_name):
+                estimate += len(self.indexing.user_sent_index.get(user_id, ()))
+                estimate += len(self.indexing.user_received_index.get(user_id, ()))
+
+        recipient_email = filters.get('recipient_email', '').lower()
+        recipient_name = filters.get('recipient_name', '').lower()
+        if recipient_email or recipient_name:
+            for user_id, _ in contacts.find(recipient_email, recipient_name):
+                estimate += len(self.indexing.user_received_index.get(user_id, ()))
+
+        return estimate
+
+    def _estimate_temporal(self, filters):
+        """Nombre de messages des jours de la période"""
+        try:
+            date_from = datetime.fromisoformat(filters['date_from'])
+            date_to = datetime.fromisoformat(filters['date_to']) if filters.get('date_to') \
+                else date_from.replace(hour=23, minute=59)
+        except Exception as e:
+            logger.logger.warning(f"Estimation temporelle impossible: {e}")
+            return 0
+
+        # Borné par le nombre de messages : au-delà, l'index des jours est parcouru entièrement
+        total_messages = len(self.indexing.message_nodes)
+        if (date_to - date_from).days > total_messages:
+            return total_messages
+
+        estimate = 0
+        current_date = date_from
+        while current_date <= date_to:
+            estimate += len(self.indexing.temporal_index.get(current_date.strftime('%Y-%m-%d'), ()))
+            current_date += timedelta(days=1)
+        return estimate
@@ -2,13 +2,16 @@
 Service de création et d'enrichissement des résultats de recherche.
 """
 
-import re
+import heapq
+from html import escape
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+from collections import defaultdict
 from dataclasses import dataclass, field
 
 from ..logging_service import logger
 from .config import SNIPPET_CONFIG, SCORING_WEIGHTS
+from .profiling import current_profile
 
 
 @dataclass
@@ -24,6 +27,7 @@ class SearchResult:
     temporal_score: float = 0.0
     user_score: float = 0.0
     graph_score: float = 0.0
+    dense_score: float = 0.0
 
     # Métadonnées du message
     subject: str = ""
@@ -49,6 +53,7 @@ class SearchResult:
     participants_count: int = 0
     sender_centrality: float = 0.0
     content_snippet: str = ""
+    highlighted_snippet: str = ""
     matched_terms: List[str] = field(default_factory=list)
 
     def to_dict(self) -> Dict[str, Any]:
@@ -61,7 +66,8 @@ class SearchResult:
                 'content': round(self.content_score, 3),
                 'temporal': round(self.temporal_score, 3),
                 'user': round(self.user_score, 3),
-                'graph': round(self.graph_score, 3)
+                'graph': round(self.graph_score, 3),
+                'dense': round(self.dense_score, 3)
             },
             'metadata': {
                 'subject': self.subject,
@@ -92,10 +98,35 @@ class SearchResult:
                 }
             },
             'snippet': self.content_snippet,
+            'highlighted_snippet': self.highlighted_snippet,
             'matched_terms': self.matched_terms
         }
 
 
+@dataclass
+class SearchPage:
+    """Page de résultats de recherche avec les informations de pagination"""
+    results: List[SearchResult]
+    total: int
+    offset: int
+    limit: int
+    next_cursor: Optional[str] = None
+    profile: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convertit la page en dictionnaire (section debug seulement si la recherche a été profilée)"""
+        page = {
+            'results': [result.to_dict() for result in self.results],
+            'total': self.total,
+            'offset': self.offset,
+            'limit': self.limit,
+            'next_cursor': self.next_cursor
+        }
+        if self.profile is not None:
+            page['debug'] = {'profile': self.profile}
+        return page
+
+
 class SearchResultService:
     """Service pour la création et l'enrichissement des résultats de recherche"""
 
@@ -108,35 +139,52 @@ class SearchResultService:
         self.indexing = indexing_service
         self.scoring = scoring_service
 
-    def create_search_results(self, search_results, query, limit=10):
+    def rank_search_results(self, search_results):
         """
-        Crée une liste de résultats enrichis et triés
+        Calcule les scores totaux des candidats sans les enrichir
+
+        Args:
+            search_results (dict): Résultats de recherche par message_id
+
+        Returns:
+            FusedScores: Scores totaux des candidats indexés
+        """
+        return self.scoring.fuse_scores(search_results)
+
+    def create_search_results(self, search_results, query, limit=10, offset=0, ranking=None):
+        """
+        Crée la page de résultats enrichis et triés
+
+        Seuls les messages retenus dans la page sont enrichis (snippet, destinataires, thread).
 
         Args:
             search_results (dict): Résultats de recherche par message_id
             query (str): Requête de recherche originale
             limit (int): Nombre maximum de résultats
+            offset (int): Nombre de résultats à sauter
+            ranking (FusedScores): Classement déjà calculé par rank_search_results
 
         Returns:
             List[SearchResult]: Liste des résultats triés
         """
-        enriched_results = []
+        if ranking is None:
+            ranking = self.rank_search_results(search_results)
 
-        # Calculer les scores totaux
-        total_scores = self.scoring.calculate_total_scores(search_results)
+        profile = current_profile()
+        with profile.stage('top_k') as stage:
+            top = ranking.top(offset, limit)
+            stage.set_count(len(top))
 
-        # Créer les résultats enrichis
-        for message_id, scores in search_results.items():
-            total_score = total_scores.get(message_id, 0.0)
-            result = self._create_single_result(message_id, scores, total_score, query)
-
-            if result:
-                enriched_results.append(result)
+        enriched_results = []
+        with profile.stage('enrichment') as stage:
+            for message_id, total_score in top:
+                result = self._create_single_result(message_id, search_results[message_id], total_score, query)
 
-        # Trier par score total décroissant
-        enriched_results.sort(key=lambda r: r.total_score, reverse=True)
+                if result:
+                    enriched_results.append(result)
+            stage.set_count(len(enriched_results))
 
-        return enriched_results[:limit]
+        return enriched_results
 
     def _create_single_result(self, message_id, scores, total_score, query):
         """
@@ -166,7 +214,7 @@ class SearchResultService:
 
         # Créer le snippet et extraire les termes correspondants
         content = message_data.get('content', '')
-        snippet, matched_terms = self._create_content_snippet(content, query)
+        snippet, matched_terms, highlighted = self._create_content_snippet(message_id, content, query)
 
         # Parser la date
         timestamp = self._parse_message_timestamp(message_data.get('date', ''))
@@ -180,6 +228,7 @@ class SearchResultService:
             temporal_score=scores.get('temporal', 0),
             user_score=scores.get('user', 0),
             graph_score=scores.get('graph', 0),
+            dense_score=scores.get('dense', 0),
             subject=message_data.get('subject', ''),
             content=content,
             sender_email=sender_info['email'],
@@ -199,25 +248,23 @@ class SearchResultService:
             participants_count=recipients_info['total_count'],
             sender_centrality=sender_info['centrality'],
             content_snippet=snippet,
+            highlighted_snippet=highlighted,
             matched_terms=matched_terms
         )
 
     def _extract_sender_info(self, message_id):
         """Extrait les informations de l'expéditeur"""
-        sender_id = None
         sender_name = ""
         sender_email = ""
         sender_centrality = 0.0
 
-        # Chercher l'expéditeur via les relations du graphe
-        for user_id, _, edge_data in self.indexing.graph.in_edges(message_id, data=True):
-            if edge_data.get('type') == 'SENT':
-                sender_id = user_id
-                sender_data = self.indexing.user_nodes.get(user_id, {})
-                sender_name = sender_data.get('name', '')
-                sender_email = sender_data.get('email', '')
-                sender_centrality = self.indexing.user_pagerank.get(user_id, 0.0)
-                break
+        # Expéditeur précalculé à l'indexation
+        sender_id = self.indexing.message_sender_index.get(message_id)
+        if sender_id is not None:
+            sender_data = self.indexing.user_nodes.get(sender_id, {})
+            sender_name = sender_data.get('name', '')
+            sender_email = sender_data.get('email', '')
+            sender_centrality = self.indexing.user_pagerank.get(sender_id, 0.0)
 
         # Fallback sur les données du message
         if not sender_email:
@@ -232,26 +279,21 @@ class SearchResultService:
 
     def _extract_recipients_info(self, message_id):
         """Extrait les informations des destinataires"""
-        recipients = []
-        cc_recipients = []
-        bcc_recipients = []
-
-        # Chercher les destinataires via les relations du graphe
-        for _, user_id, edge_data in self.indexing.graph.out_edges(message_id, data=True):
-            edge_type = edge_data.get('type')
-            if edge_type in ['RECEIVED', 'CC', 'BCC']:
+        recipients_by_role = {}
+
+        # Destinataires précalculés à l'indexation
+        for role, user_ids in self.indexing.get_message_recipients(message_id).items():
+            recipients_by_role[role] = []
+            for user_id in user_ids:
                 user_data = self.indexing.user_nodes.get(user_id, {})
-                recipient_info = {
+                recipients_by_role[role].append({
                     'email': user_data.get('email', ''),
                     'name': user_data.get('name', '')
-                }
+                })
 
-                if edge_type == 'RECEIVED':
-                    recipients.append(recipient_info)
-                elif edge_type == 'CC':
-                    cc_recipients.append(recipient_info)
-                elif edge_type == 'BCC':
-                    bcc_recipients.append(recipient_info)
+        recipients = recipients_by_role['to']
+        cc_recipients = recipients_by_role['cc']
+        bcc_recipients = recipients_by_role['bcc']
 
         total_count = len(recipients) + len(cc_recipients) + len(bcc_recipients) + 1  # +1 pour l'expéditeur
 
@@ -264,64 +306,128 @@ class SearchResultService:
 
     def _extract_thread_info(self, message_id):
         """Extrait les informations du thread"""
-        thread_id = None
         thread_size = 1
 
-        # Chercher le thread via les relations
-        for _, tid, edge_data in self.indexing.graph.out_edges(message_id, data=True):
-            if edge_data.get('type') == 'PART_OF_THREAD':
-                thread_id = tid
-                thread_size = len(self.indexing.thread_messages_index.get(tid, []))
-                break
+        # Thread précalculé à l'indexation
+        thread_id = self.indexing.message_thread_index.get(message_id)
+        if thread_id is not None:
+            thread_size = len(self.indexing.thread_messages_index.get(thread_id, []))
 
         return {
             'thread_id': thread_id,
             'size': thread_size
         }
 
-    def _create_content_snippet(self, content, query):
+    def _create_content_snippet(self, message_id, content, query):
         """
-        Crée un extrait du contenu avec les termes recherchés mis en évidence
+        Crée un extrait du contenu centré sur la meilleure fenêtre de termes recherchés
+
+        Les positions des tokens et leurs formes par terme analysé sont lues depuis le cache
+        de l'index : le coût dépend du nombre d'occurrences des termes de la requête, pas de
+        la longueur du message.
 
         Args:
+            message_id (str): ID du message
             content (str): Contenu du message
             query (str): Requête de recherche
 
         Returns:
-            tuple: (snippet, matched_terms)
+            tuple: (snippet, matched_terms, snippet avec mise en évidence HTML)
         """
         if not content or not query:
-            return self._truncate_content(content), []
+            snippet = self._truncate_content(content)
+            return snippet, [], escape(snippet)
+
+        query_terms = self.indexing.analyzer.query_terms(query)
+        offsets = self.indexing.get_token_offsets(message_id)
+        term_tokens = self.indexing.get_term_tokens(message_id)
+
+        # Occurrences regroupées par terme analysé (formes accentuées ou fléchies d'un même terme)
+        occurrences = {}
+        for term in query_terms:
+            for token in term_tokens.get(term, ()):
+                spans = offsets[token]
+                occurrences.setdefault(term, []).append((spans[0][0], token, spans))
+
+        if not occurrences:
+            snippet = self._truncate_content(content)
+            return snippet, [], escape(snippet)
+
+        # Termes trouvés (forme du contenu), par ordre de première occurrence
+        forms = sorted(min(variants) for variants in occurrences.values())
+        matched_terms = [token for _, token, _ in forms]
+        occurrences = {
+            term: sorted(span for _, _, spans in variants for span in spans)
+            for term, variants in occurrences.items()
+        }
 
-        # Trouver les termes de la requête
-        query_tokens = set(re.findall(r'\b[a-zA-Z0-9À-ÿ]{3,}\b', query.lower()))
-        content_lower = content.lower()
+        window_start, window_end, matches = self._best_match_window(occurrences)
 
-        # Trouver la première occurrence d'un terme
-        best_position = len(content)
-        matched_terms = []
+        start = max(0, window_start - SNIPPET_CONFIG['context_before'])
+        end = min(len(content), max(window_end, window_start + SNIPPET_CONFIG['context_after']))
 
-        for token in query_tokens:
-            pos = content_lower.find(token)
-            if pos != -1 and pos < best_position:
-                best_position = pos
-                matched_terms.append(token)
+        snippet = content[start:end]
+        highlighted = self._highlight(content, start, end, matches)
+        if start > 0:
+            snippet = "..." + snippet
+            highlighted = "..." + highlighted
+        if end < len(content):
+            snippet = snippet + "..."
+            highlighted = highlighted + "..."
 
-        # Créer l'extrait centré sur le terme trouvé
-        if best_position < len(content):
-            start = max(0, best_position - SNIPPET_CONFIG['context_before'])
-            end = min(len(content), best_position + SNIPPET_CONFIG['context_after'])
+        return snippet, matched_terms, highlighted
 
-            snippet = content[start:end]
-            if start > 0:
-                snippet = "..." + snippet
-            if end < len(content):
-                snippet = snippet + "..."
+    @staticmethod
+    def _best_match_window(occurrences):
+        """
+        Cherche la fenêtre couvrant le plus de termes distincts de la requête
 
-            return snippet, list(set(matched_terms))
+        Args:
+            occurrences (dict): terme -> positions (début, fin) triées
 
-        # Retourner le début du contenu
-        return self._truncate_content(content), []
+        Returns:
+            tuple: (début, fin, occurrences (début, fin) contenues dans la fenêtre)
+        """
+        max_width = SNIPPET_CONFIG['max_length']
+        spans = list(heapq.merge(*(
+            [(span_start, span_end, token) for span_start, span_end in spans]
+            for token, spans in occurrences.items()
+        )))
+
+        counts = defaultdict(int)
+        best = None  # (termes distincts, occurrences, -début), bornes
+        left = 0
+
+        for right, (_, right_end, token) in enumerate(spans):
+            counts[token] += 1
+            while right_end - spans[left][0] > max_width and left < right:
+                counts[spans[left][2]] -= 1
+                if not counts[spans[left][2]]:
+                    del counts[spans[left][2]]
+                left += 1
+
+            key = (len(counts), right - left + 1, -spans[left][0])
+            if best is None or key > best[0]:
+                best = (key, left, right)
+
+        _, left, right = best
+        window = spans[left:right + 1]
+        return window[0][0], max(span_end for _, span_end, _ in window), [
+            (span_start, span_end) for span_start, span_end, _ in window
+        ]
+
+    @staticmethod
+    def _highlight(content, start, end, matches):
+        """Échappe l'extrait en HTML et entoure les occurrences des balises de mise en évidence"""
+        parts = []
+        position = start
+        for match_start, match_end in matches:
+            parts.append(escape(content[position:match_start]))
+            parts.append(SNIPPET_CONFIG['highlight_pre'] + escape(content[match_start:match_end])
+                         + SNIPPET_CONFIG['highlight_post'])
+            position = match_end
+        parts.append(escape(content[position:end]))
+        return ''.join(parts)
 
     def _truncate_content(self, content):
         """Tronque le contenu à la longueur maximum"""
@@ -2,14 +2,249 @@
 Service de calcul des scores et métriques de recherche.
 """
 
-import re
 import math
 from datetime import datetime
 from collections import defaultdict
+from collections.abc import Mapping, Sequence
+
+import numpy as np
 
 from .config import TFIDF_CONFIG, SCORING_WEIGHTS
 
 
+def candidate_mask(filter_index, candidates):
+    """
+    Masque des candidats sur les positions de l'index de filtres
+
+    Args:
+        filter_index (FilterBitmapIndex): Index dont les positions servent de doc ids
+        candidates (np.ndarray|set): Masque booléen ou IDs des messages, None pour tous
+
+    Returns:
+        np.ndarray|None: Masque aligné sur les positions, None si aucune restriction
+    """
+    if candidates is None:
+        return None
+
+    size = len(filter_index)
+    if isinstance(candidates, np.ndarray):
+        if len(candidates) >= size:
+            return candidates[:size]
+        mask = np.zeros(size, dtype=bool)
+        mask[:len(candidates)] = candidates
+        return mask
+
+    mask = np.zeros(size, dtype=bool)
+    positions = filter_index.positions
+    doc_ids = [positions[message_id] for message_id in candidates if message_id in positions]
+    mask[doc_ids] = True
+    return mask
+
+
+class ScoreTable(Mapping):
+    """
+    Composants de score des messages retenus, alignés sur leurs positions dans l'index de filtres
+
+    Les positions (doc ids) sont triées et chaque composant est un vecteur aligné sur elles,
+    accompagné du masque des messages pour lesquels il est défini. Vue comme un dict
+    message_id -> {type: score}, dans l'ordre de l'index.
+    """
+
+    def __init__(self, filter_index, doc_ids=None, components=None, assigned=None):
+        self.filter_index = filter_index
+        self.doc_ids = np.zeros(0, dtype=np.int64) if doc_ids is None else doc_ids
+        self.components = components if components is not None else {}
+        self.assigned = assigned if assigned is not None else {}
+
+    def _locate(self, message_id):
+        """Rang d'un message dans la table, -1 s'il n'est pas retenu"""
+        position = self.filter_index.positions.get(message_id)
+        if position is None:
+            return -1
+        i = int(np.searchsorted(self.doc_ids, position))
+        return i if i < len(self.doc_ids) and self.doc_ids[i] == position else -1
+
+    def __getitem__(self, message_id):
+        i = self._locate(message_id)
+        if i < 0:
+            raise KeyError(message_id)
+        return {
+            score_type: float(values[i])
+            for score_type, values in self.components.items() if self.assigned[score_type][i]
+        }
+
+    def __contains__(self, message_id):
+        return self._locate(message_id) >= 0
+
+    def __iter__(self):
+        message_ids = self.filter_index.message_ids
+        for position in self.doc_ids.tolist():
+            yield message_ids[position]
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def mask(self, size):
+        """Masque booléen des messages retenus sur les positions de l'index"""
+        mask = np.zeros(size, dtype=bool)
+        mask[self.doc_ids] = True
+        return mask
+
+    def assign_from(self, other, score_type):
+        """
+        Reporte un composant d'une autre table sur les messages communs aux deux
+
+        Args:
+            other (ScoreTable): Table source
+            score_type (str): Composant à reporter (0 s'il n'est pas défini dans la source)
+        """
+        _, mine, theirs = np.intersect1d(self.doc_ids, other.doc_ids, assume_unique=True, return_indices=True)
+
+        values = self.components.get(score_type)
+        values = np.zeros(len(self.doc_ids), dtype=np.float64) if values is None else values.copy()
+        assigned = self.assigned.get(score_type)
+        assigned = np.zeros(len(self.doc_ids), dtype=bool) if assigned is None else assigned.copy()
+
+        source = other.components.get(score_type)
+        values[mine] = 0.0 if source is None else np.where(other.assigned[score_type][theirs], source[theirs], 0.0)
+        assigned[mine] = True
+
+        self.components[score_type] = values
+        self.assigned[score_type] = assigned
+
+
+class ScoreArrays:
+    """Composants de score en cours de calcul, en vecteurs denses sur toutes les positions de l'index"""
+
+    def __init__(self, filter_index):
+        self.filter_index = filter_index
+        self.size = len(filter_index)
+        self.present = np.zeros(self.size, dtype=bool)
+        self.components = {}
+        self.assigned = {}
+
+    def __len__(self):
+        return int(np.count_nonzero(self.present))
+
+    def locate(self, message_ids):
+        """Positions des messages dans l'index, -1 pour les messages non indexés"""
+        positions = self.filter_index.positions
+        doc_ids = np.fromiter((positions.get(message_id, -1) for message_id in message_ids), dtype=np.int64)
+        doc_ids[doc_ids >= self.size] = -1
+        return doc_ids
+
+    def _component(self, score_type):
+        if score_type not in self.components:
+            self.components[score_type] = np.zeros(self.size, dtype=np.float64)
+            self.assigned[score_type] = np.zeros(self.size, dtype=bool)
+        return self.components[score_type]
+
+    def set(self, score_type, doc_ids, values):
+        """Définit un composant pour des positions"""
+        self._component(score_type)[doc_ids] = values
+        self.assigned[score_type][doc_ids] = True
+        self.present[doc_ids] = True
+
+    def add(self, score_type, doc_ids, values):
+        """Ajoute à un composant pour des positions distinctes"""
+        self._component(score_type)[doc_ids] += values
+        self.assigned[score_type][doc_ids] = True
+        self.present[doc_ids] = True
+
+    def maximum(self, score_type, doc_ids, values):
+        """Conserve le maximum d'un composant (0 s'il n'était pas défini)"""
+        np.maximum.at(self._component(score_type), doc_ids, values)
+        self.assigned[score_type][doc_ids] = True
+        self.present[doc_ids] = True
+
+    def keep(self, mask):
+        """Ne conserve que les messages du masque"""
+        dropped = self.present & ~mask
+        self.present &= mask
+        for score_type, values in self.components.items():
+            values[dropped] = 0.0
+            self.assigned[score_type][dropped] = False
+
+    def restrict(self, candidates):
+        """Restreint aux candidats (masque ou IDs), tous si None"""
+        mask = candidate_mask(self.filter_index, candidates)
+        if mask is not None:
+            self.keep(mask)
+
+    def add_table(self, table, mask):
+        """Additionne les composants définis d'une table pour les messages du masque"""
+        selected = mask[table.doc_ids]
+        for score_type, values in table.components.items():
+            rows = selected & table.assigned[score_type]
+            self.add(score_type, table.doc_ids[rows], values[rows])
+
+    def to_table(self):
+        """Extrait les messages retenus en table compacte"""
+        doc_ids = np.flatnonzero(self.present)
+        return ScoreTable(
+            self.filter_index, doc_ids,
+            {score_type: values[doc_ids] for score_type, values in self.components.items()},
+            {score_type: assigned[doc_ids] for score_type, assigned in self.assigned.items()}
+        )
+
+
+class DocIdSequence(Sequence):
+    """IDs des messages à des positions de l'index, résolus à la demande"""
+
+    def __init__(self, message_ids, doc_ids):
+        self.message_ids = message_ids
+        self.doc_ids = doc_ids
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.message_ids[position] for position in self.doc_ids[i].tolist()]
+        return self.message_ids[int(self.doc_ids[i])]
+
+
+class FusedScores:
+    """Scores totaux des candidats sous forme de vecteur aligné sur leurs IDs"""
+
+    def __init__(self, message_ids, totals):
+        self.message_ids = message_ids
+        self.totals = totals
+
+    def __len__(self):
+        return len(self.message_ids)
+
+    def top(self, offset, limit):
+        """
+        Sélectionne une page du classement par score décroissant
+
+        Les égalités sont départagées par l'ordre des candidats, comme un tri stable.
+
+        Args:
+            offset (int): Rang du premier résultat
+            limit (int): Nombre de résultats
+
+        Returns:
+            list: Couples (message_id, score total)
+        """
+        k = min(offset + limit, len(self.totals))
+        if k <= 0:
+            return []
+
+        negated = -self.totals
+        if k < len(negated):
+            # Seuil du k-ième meilleur score, puis candidats au-dessus et premiers ex aequo
+            threshold = negated[np.argpartition(negated, k - 1)[k - 1]]
+            above = np.flatnonzero(negated < threshold)
+            ties = np.flatnonzero(negated == threshold)[:k - len(above)]
+            candidates = np.concatenate((above, ties))
+        else:
+            candidates = np.arange(len(negated))
+
+        order = candidates[np.lexsort((candidates, negated[candidates]))]
+        return [(self.message_ids[i], float(self.totals[i])) for i in order[offset:k].tolist()]
+
+
 class SearchScoringService:
     """Service pour le calcul des scores de recherche"""
 
@@ -20,51 +255,76 @@ class SearchScoringService:
         """Met à jour le service d'indexation"""
         self.indexing = indexing_service
 
-    def calculate_content_scores(self, query, filters):
+    def calculate_content_scores(self, query, filters, candidates=None):
         """
         Calcule les scores de contenu avec TF-IDF
 
+        La normalisation porte sur tous les messages contenant un terme : restreindre
+        les candidats ne change pas leurs scores, seul le bonus de fraîcheur est évité
+        pour les autres messages.
+
         Args:
             query (str): Requête textuelle
             filters (dict): Filtres à appliquer
+            candidates (np.ndarray|set): Messages à retourner (masque ou IDs), tous si None
 
         Returns:
-            dict: Scores par message_id
+            ScoreArrays: Composants 'content' et 'temporal' par position
         """
-        results = defaultdict(lambda: defaultdict(float))
+        scores = ScoreArrays(self.indexing.filter_index)
 
         if not query:
-            return results
+            return scores
 
-        # Tokeniser la requête
-        query_tokens = set(re.findall(TFIDF_CONFIG['pattern'], query.lower()))
+        # Termes de la requête, analysés comme le contenu indexé
+        query_tokens = self.indexing.analyzer.query_terms(query)
+        message_nodes = self.indexing.message_nodes
 
-        # Calculer les scores TF-IDF pour chaque document
-        for token in query_tokens:
-            if token in self.indexing.inverted_index:
-                idf = self.indexing.idf_scores.get(token, 1.0)
+        content = np.zeros(scores.size, dtype=np.float64)
+        matched = np.zeros(scores.size, dtype=bool)
 
-                for message_id in self.indexing.inverted_index[token]:
-                    message_data = self.indexing.message_nodes.get(message_id, {})
+        # Calculer les scores TF-IDF de chaque terme sur les positions de ses postings
+        for token in query_tokens:
+            postings = self.indexing.inverted_index.get(token)
+            if postings is None:
+                continue
 
-                    # TF-IDF score
-                    tf = message_data.get('_tf', {}).get(token, 0)
-                    tfidf_score = tf * idf
-                    results[message_id]['content'] += tfidf_score
+            idf = self.indexing.get_idf(token)
+            doc_ids = scores.locate(postings)
+            tf = np.fromiter(postings.values(), dtype=np.float64, count=len(postings))
 
-                    # Bonus si le terme est dans le sujet
-                    subject = message_data.get('subject', '').lower()
-                    if token in subject:
-                        results[message_id]['content'] += TFIDF_CONFIG['subject_bonus'] * idf
+            indexed = doc_ids >= 0
+            doc_ids, tf = doc_ids[indexed], tf[indexed]
+            content[doc_ids] += tf * idf
+            matched[doc_ids] = True
 
-                    # Bonus pour la fraîcheur
-                    freshness_score = self._calculate_freshness_score(message_data)
-                    results[message_id]['temporal'] = freshness_score * 0.3
+            # Bonus si le terme est dans le sujet (postings marqués à l'indexation)
+            subject_ids = scores.locate(self.indexing.subject_term_index.get(token, ()))
+            content[subject_ids[subject_ids >= 0]] += TFIDF_CONFIG['subject_bonus'] * idf
 
         # Normaliser les scores de contenu
-        self._normalize_content_scores(results)
+        if matched.any():
+            max_content_score = content[matched].max()
+            if max_content_score > 0:
+                content /= max_content_score
+
+        mask = candidate_mask(self.indexing.filter_index, candidates)
+        if mask is not None:
+            matched &= mask
+
+        doc_ids = np.flatnonzero(matched)
+        scores.set('content', doc_ids, content[doc_ids])
+
+        # Bonus pour la fraîcheur, calculé une fois par message retenu
+        message_ids = self.indexing.filter_index.message_ids
+        freshness = np.fromiter(
+            (self._calculate_freshness_score(message_nodes.get(message_ids[position], {}))
+             for position in doc_ids.tolist()),
+            dtype=np.float64, count=len(doc_ids)
+        )
+        scores.set('temporal', doc_ids, freshness * 0.3)
 
-        return results
+        return scores
 
     def calculate_temporal_scores(self, message_ids, date_from, date_to=None):
         """
@@ -76,20 +336,24 @@ class SearchScoringService:
             date_to (datetime): Date de fin
 
         Returns:
-            dict: Scores temporels par message_id
+            ScoreArrays: Composant 'temporal' par position
         """
-        results = defaultdict(float)
+        scores = ScoreArrays(self.indexing.filter_index)
 
         if not date_to:
             date_to = date_from.replace(hour=23, minute=59)
 
         total_range = (date_to - date_from).total_seconds()
 
-        for message_id in message_ids:
+        message_ids = list(message_ids)
+        doc_ids = []
+        values = []
+        positions = scores.locate(message_ids)
+        for message_id, position in zip(message_ids, positions.tolist()):
             message_data = self.indexing.message_nodes.get(message_id, {})
             date_str = message_data.get('date')
 
-            if not date_str:
+            if not date_str or position < 0:
                 continue
 
             try:
@@ -102,12 +366,14 @@ class SearchScoringService:
                 else:
                     temporal_score = 1.0
 
-                results[message_id] = max(0.0, temporal_score)
+                doc_ids.append(position)
+                values.append(max(0.0, temporal_score))
 
             except Exception:
                 continue
 
-        return results
+        scores.set('temporal', np.array(doc_ids, dtype=np.int64), np.array(values, dtype=np.float64))
+        return scores
 
     def calculate_user_scores(self, user_matches, role_weights=None):
         """
@@ -118,27 +384,25 @@ class SearchScoringService:
             role_weights (dict): Poids par rôle (sent/received)
 
         Returns:
-            dict: Scores utilisateur par message_id
+            ScoreArrays: Composant 'user' par position
         """
         if role_weights is None:
             role_weights = {'sent': 1.0, 'received': 0.7}
 
-        results = defaultdict(float)
+        scores = ScoreArrays(self.indexing.filter_index)
 
         for user_id, user_match_score in user_matches:
             user_importance = self.indexing.user_pagerank.get(user_id, 0.5)
 
-            # Messages envoyés
-            for message_id in self.indexing.user_sent_index.get(user_id, []):
-                score = user_match_score * user_importance * role_weights['sent']
-                results[message_id] = max(results[message_id], score)
-
-            # Messages reçus
-            for message_id in self.indexing.user_received_index.get(user_id, []):
-                score = user_match_score * user_importance * role_weights['received']
-                results[message_id] = max(results[message_id], score)
+            # Messages envoyés puis reçus
+            role_indexes = (('sent', self.indexing.user_sent_index), ('received', self.indexing.user_received_index))
+            for role, index in role_indexes:
+                doc_ids = scores.locate(index.get(user_id, ()))
+                doc_ids = doc_ids[doc_ids >= 0]
+                score = user_match_score * user_importance * role_weights[role]
+                scores.maximum('user', doc_ids, np.full(len(doc_ids), score))
 
-        return results
+        return scores
 
     def calculate_graph_scores(self, message_ids):
         """
@@ -148,19 +412,48 @@ class SearchScoringService:
             message_ids (list): IDs des messages
 
         Returns:
-            dict: Scores de graphe par message_id
+            ScoreArrays: Composant 'graph' par position
         """
-        results = defaultdict(float)
+        scores = ScoreArrays(self.indexing.filter_index)
+        message_ids = list(message_ids)
+        positions = scores.locate(message_ids)
+
+        doc_ids = []
+        values = []
+        for message_id, position in zip(message_ids, positions.tolist()):
+            # Expéditeur précalculé à l'indexation
+            sender_id = self.indexing.message_sender_index.get(message_id)
+            if sender_id is not None and position >= 0:
+                doc_ids.append(position)
+                values.append(self.indexing.user_pagerank.get(sender_id, 0.0))
+
+        scores.set('graph', np.array(doc_ids, dtype=np.int64), np.array(values, dtype=np.float64))
+        return scores
+
+    def fuse_scores(self, search_results):
+        """
+        Fusionne les composants de score en un vecteur de scores totaux
 
-        for message_id in message_ids:
-            # Trouver l'expéditeur
-            for user_id, _, edge_data in self.indexing.graph.in_edges(message_id, data=True):
-                if edge_data.get('type') == 'SENT':
-                    user_importance = self.indexing.user_pagerank.get(user_id, 0.0)
-                    results[message_id] = user_importance
-                    break
+        Args:
+            search_results (ScoreTable|dict): Scores par message_id puis par type
 
-        return results
+        Returns:
+            FusedScores: Scores totaux des candidats indexés, dans l'ordre des candidats
+        """
+        if isinstance(search_results, ScoreTable):
+            # Composants déjà alignés sur les positions : somme pondérée directe
+            message_ids = DocIdSequence(search_results.filter_index.message_ids, search_results.doc_ids)
+            return FusedScores(message_ids, self._weighted_sum(search_results.components, len(message_ids)))
+
+        message_ids = [message_id for message_id in search_results if message_id in self.indexing.message_nodes]
+        components = {
+            score_type: np.fromiter(
+                (search_results[message_id].get(score_type, 0.0) for message_id in message_ids),
+                dtype=np.float64, count=len(message_ids)
+            )
+            for score_type in SCORING_WEIGHTS
+        }
+        return FusedScores(message_ids, self._weighted_sum(components, len(message_ids)))
 
     def calculate_total_scores(self, score_components):
         """
@@ -172,23 +465,30 @@ class SearchScoringService:
         Returns:
             dict: Scores totaux par message_id
         """
-        total_scores = defaultdict(float)
-
         # Rassembler tous les message_ids
-        all_message_ids = set()
-        for scores in score_components.values():
-            all_message_ids.update(scores.keys())
-
-        # Calculer le score total pour chaque message
-        for message_id in all_message_ids:
-            total_score = 0.0
-            for score_type, weight in SCORING_WEIGHTS.items():
-                score = score_components.get(score_type, {}).get(message_id, 0.0)
-                total_score += score * weight
-
-            total_scores[message_id] = total_score
-
-        return total_scores
+        all_message_ids = list(dict.fromkeys(
+            message_id for scores in score_components.values() for message_id in scores
+        ))
+
+        components = {
+            score_type: np.fromiter(
+                (score_components.get(score_type, {}).get(message_id, 0.0) for message_id in all_message_ids),
+                dtype=np.float64, count=len(all_message_ids)
+            )
+            for score_type in SCORING_WEIGHTS
+        }
+        totals = self._weighted_sum(components, len(all_message_ids))
+
+        return defaultdict(float, zip(all_message_ids, totals.tolist()))
+
+    @staticmethod
+    def _weighted_sum(components, size):
+        """Somme pondérée des vecteurs de composants, dans l'ordre de SCORING_WEIGHTS (absents = 0)"""
+        totals = np.zeros(size, dtype=np.float64)
+        for score_type, weight in SCORING_WEIGHTS.items():
+            if score_type in components:
+                totals += components[score_type] * weight
+        return totals
 
     def _calculate_freshness_score(self, message_data):
         """Calcule le score de fraîcheur d'un message"""
@@ -202,14 +502,3 @@ class SearchScoringService:
             return math.exp(-days_old / TFIDF_CONFIG['freshness_decay_days'])
         except Exception:
             return 0.0
-
-    def _normalize_content_scores(self, results):
-        """Normalise les scores de contenu"""
-        max_content_score = max(
-            (scores['content'] for scores in results.values()),
-            default=1.0
-        )
-
-        if max_content_score > 0:
-            for message_id in results:
-                results[message_id]['content'] /= max_content_score
\ No newline at end of file
@@ -2,15 +2,22 @@
 Gestionnaire principal du moteur de recherche dans le graphe NetworkX.
 """
 
+import json
+import base64
+import hashlib
 import networkx as nx
-from typing import Dict, Any, List
+from dataclasses import replace
+from typing import Dict, Any, List, Optional, Callable
 
 from ..logging_service import logger
-from .config import SearchMode
+from .config import SearchMode, PAGINATION_CONFIG, QUERY_CACHE_CONFIG, INDEX_STORE_CONFIG
+from .index_store import SearchIndexStore, compute_graph_fingerprint
 from .indexing_service import SearchIndexingService
 from .scoring_service import SearchScoringService
 from .search_service import SearchService
-from .result_service import SearchResultService, SearchResult
+from .result_service import SearchResultService, SearchResult, SearchPage
+from .query_cache import QueryResultCache
+from .profiling import SearchProfiler, current_profile
 
 
 class GraphSearchEngine:
@@ -19,28 +26,58 @@ class GraphSearchEngine:
     Gère la recherche par contenu, temporelle et par utilisateur selon le scoring de pertinence.
     """
 
-    def __init__(self, graph: nx.MultiDiGraph):
+    def __init__(self, graph: nx.MultiDiGraph, index_path: Optional[str] = None,
+                 embedding_encoder: Optional[Callable[[List[str]], Any]] = None):
         """
         Initialise le moteur de recherche
 
         Args:
             graph: Graphe NetworkX contenant les emails
+            index_path: Répertoire des index persistés (rechargés si le graphe n'a pas changé)
+            embedding_encoder: Fonction textes -> vecteurs remplaçant le modèle sentence-transformers
         """
         self.graph = graph
+        self.index_store = SearchIndexStore(index_path) if index_path else None
+
+        # Empreinte des index persistés et mises à jour incrémentales pas encore écrites
+        self._store_fingerprint = None
+        self._pending_added = []
+        self._pending_refreshed = set()
 
         # Initialiser les services
-        self.indexing_service = SearchIndexingService(graph)
+        self.indexing_service = SearchIndexingService(graph, embedding_encoder)
         self.scoring_service = SearchScoringService(self.indexing_service)
         self.search_service = SearchService(self.indexing_service, self.scoring_service)
         self.result_service = SearchResultService(self.indexing_service, self.scoring_service)
 
+        # Pages déjà servies et classements réutilisés pour les pages suivantes,
+        # invalidés à chaque changement de version des index
+        self._result_cache = QueryResultCache(
+            QUERY_CACHE_CONFIG['max_entries'], QUERY_CACHE_CONFIG['ttl_seconds']
+        )
+        self._ranking_cache = QueryResultCache(
+            PAGINATION_CONFIG['max_cached_rankings'], QUERY_CACHE_CONFIG['ttl_seconds']
+        )
+
+        # Profilage des recherches (désactivé par défaut, activable par requête)
+        self.profiler = SearchProfiler()
+
         # Construire les index
         self._build_indexes()
         self._calculate_node_metrics()
 
     def _build_indexes(self):
         """Construit tous les index nécessaires pour la recherche rapide"""
-        self.indexing_service.build_all_indexes()
+        if self.index_store is None:
+            self.indexing_service.build_all_indexes()
+            return
+
+        fingerprint = compute_graph_fingerprint(self.graph)
+        if not self.indexing_service.load_indexes(self.index_store, fingerprint):
+            logger.logger.info("Index persistés absents ou obsolètes, reconstruction...")
+            self.indexing_service.build_all_indexes()
+            self.index_store.save(self.indexing_service, fingerprint)
+        self._store_fingerprint = fingerprint
 
     def _calculate_node_metrics(self):
         """Calcule les métriques du graphe pour le scoring"""
@@ -58,24 +95,143 @@ class GraphSearchEngine:
         Returns:
             Liste des résultats triés par pertinence avec métadonnées complètes
         """
-        query_type = semantic_query.get('query_type', 'semantic')
+        return self.search_page(semantic_query).results
+
+    def search_page(self, semantic_query: Dict[str, Any], offset: Optional[int] = None,
+                    cursor: Optional[str] = None, profile: Optional[bool] = None) -> SearchPage:
+        """
+        Recherche paginée : seuls les résultats de la page demandée sont enrichis
+
+        Les pages déjà servies sont retournées depuis le cache ; pour une nouvelle
+        page, le classement en cache évite de relancer la recherche et le scoring.
+
+        Args:
+            semantic_query: Requête parsée contenant type, texte, filtres, etc.
+            offset: Position du premier résultat (par défaut semantic_query['offset'] ou 0)
+            cursor: Curseur retourné par la page précédente (prioritaire sur offset)
+            profile: True pour joindre le profil des étapes à la page, None selon la configuration
+
+        Returns:
+            Page de résultats avec le nombre total de candidats et le curseur suivant
+        """
+        search_profile = self.profiler.begin(profile)
+        try:
+            page = self._search_page(semantic_query, offset, cursor)
+        finally:
+            self.profiler.end(search_profile)
+
+        if search_profile.enabled:
+            page = replace(page, profile=search_profile.to_dict())
+        return page
+
+    def _search_page(self, semantic_query: Dict[str, Any], offset: Optional[int],
+                     cursor: Optional[str]) -> SearchPage:
+        """Exécute la recherche paginée (voir search_page)"""
         semantic_text = semantic_query.get('semantic_text', '')
-        filters = semantic_query.get('filters', {})
         limit = semantic_query.get('limit', 10)
+        query_key = self._ranking_key(semantic_query)
 
-        # Déterminer le mode de recherche
-        mode = self._determine_search_mode(query_type, filters)
+        if cursor:
+            offset = self._decode_cursor(cursor, query_key)
+        elif offset is None:
+            offset = semantic_query.get('offset', 0)
+
+        index_version = self.indexing_service.index_version
+        page_key = (query_key, limit, offset)
+        cached_page = self._result_cache.get(page_key, index_version)
+        if cached_page is not None:
+            current_profile().annotate(cache='page')
+            logger.logger.info(f"Recherche servie depuis le cache: {len(cached_page.results)} résultats")
+            return replace(cached_page, results=list(cached_page.results))
 
-        # Exécuter la recherche selon le mode
-        search_results = self._execute_search_by_mode(mode, semantic_text, filters)
+        search_results, ranking = self._get_ranking(semantic_query, query_key)
 
-        # Créer et enrichir les résultats
+        # Créer et enrichir les résultats de la page
         enriched_results = self.result_service.create_search_results(
-            search_results, semantic_text, limit
+            search_results, semantic_text, limit, offset, ranking
         )
 
+        next_offset = offset + limit
+        next_cursor = self._encode_cursor(query_key, next_offset) if next_offset < len(ranking) else None
+
         logger.logger.info(f"Recherche terminée: {len(enriched_results)} résultats trouvés")
-        return enriched_results
+        page = SearchPage(
+            results=enriched_results,
+            total=len(ranking),
+            offset=offset,
+            limit=limit,
+            next_cursor=next_cursor
+        )
+        self._result_cache.put(page_key, index_version, page)
+        return replace(page, results=list(page.results))
+
+    def _get_ranking(self, semantic_query: Dict[str, Any], query_key: str):
+        """Retourne (résultats, classement) depuis le cache ou en exécutant la recherche"""
+        index_version = self.indexing_service.index_version
+        profile = current_profile()
+        cached_ranking = self._ranking_cache.get(query_key, index_version)
+        if cached_ranking is not None:
+            profile.annotate(cache='ranking')
+            return cached_ranking
+
+        query_type = semantic_query.get('query_type', 'semantic')
+        semantic_text = semantic_query.get('semantic_text', '')
+        filters = semantic_query.get('filters', {})
+
+        # Déterminer le mode de recherche
+        with profile.stage('mode_detection'):
+            mode = self._determine_search_mode(query_type, filters)
+        profile.annotate(mode=mode.value)
+
+        # Exécuter la recherche selon le mode puis classer sans enrichir
+        with profile.stage(f'candidates.{mode.value}') as stage:
+            search_results = self._execute_search_by_mode(mode, semantic_text, filters)
+            stage.set_count(len(search_results))
+
+        # Embeddings encodés par cette première recherche dense : conservés avec les index persistés
+        if self.indexing_service.embeddings_unsaved:
+            self._save_embeddings()
+
+        with profile.stage('fusion') as stage:
+            ranking = self.result_service.rank_search_results(search_results)
+            stage.set_count(len(ranking))
+
+        self._ranking_cache.put(query_key, index_version, (search_results, ranking))
+        return search_results, ranking
+
+    @staticmethod
+    def _ranking_key(semantic_query: Dict[str, Any]) -> str:
+        """
+        Clé canonique d'une requête, indépendante de la page demandée
+
+        Seuls le type, le texte normalisé (casse et espaces) et les filtres triés
+        sont retenus : la tokenisation et les snippets ignorent casse et espaces.
+        """
+        canonical = {
+            'query_type': semantic_query.get('query_type', 'semantic'),
+            'semantic_text': ' '.join(str(semantic_query.get('semantic_text') or '').lower().split()),
+            'filters': semantic_query.get('filters') or {}
+        }
+        return hashlib.sha1(json.dumps(canonical, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _encode_cursor(query_key: str, offset: int) -> str:
+        """Encode un curseur opaque lié à la requête"""
+        payload = json.dumps({'q': query_key, 'o': offset}).encode('utf-8')
+        return base64.urlsafe_b64encode(payload).decode('ascii')
+
+    @staticmethod
+    def _decode_cursor(cursor: str, query_key: str) -> int:
+        """Décode un curseur et vérifie qu'il appartient à la requête"""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            offset = int(payload['o'])
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Curseur de pagination invalide: {cursor}") from e
+
+        if payload.get('q') != query_key or offset < 0:
+            raise ValueError("Curseur de pagination invalide pour cette requête")
+        return offset
 
     def _determine_search_mode(self, query_type: str, filters: Dict[str, Any]) -> SearchMode:
         """Détermine le mode de recherche optimal"""
@@ -121,6 +277,10 @@ class GraphSearchEngine:
         """
         return {
             'index_stats': self.indexing_service.get_index_stats(),
+            'index_version': self.indexing_service.index_version,
+            'profiling': self.profiler.get_stats(),
+            'query_cache': self._result_cache.get_stats(),
+            'ranking_cache': self._ranking_cache.get_stats(),
             'graph_info': {
                 'nodes': self.graph.number_of_nodes(),
                 'edges': self.graph.number_of_edges(),
@@ -129,21 +289,40 @@ class GraphSearchEngine:
             }
         }
 
+    def clear_caches(self):
+        """
+        Vide les caches de pages et de classements (les index ne sont pas modifiés)
+        """
+        self._result_cache.clear()
+        self._ranking_cache.clear()
+
     def rebuild_indexes(self):
         """
         Reconstruit tous les index (utile après modification du graphe)
         """
         logger.logger.info("Reconstruction des index de recherche...")
         self.indexing_service.build_all_indexes()
+        self._pending_added = []
+        self._pending_refreshed = set()
+        if self.index_store is not None:
+            self._store_fingerprint = compute_graph_fingerprint(self.graph)
+            self.index_store.save(self.indexing_service, self._store_fingerprint)
         logger.logger.info("Index reconstruits avec succès")
 
-    def update_graph(self, new_graph: nx.MultiDiGraph):
+    def update_graph(self, new_graph: nx.MultiDiGraph, added_message_ids: Optional[List[str]] = None,
+                     changed_message_ids: Optional[List[str]] = None):
         """
-        Met à jour le graphe et reconstruit les index
+        Met à jour le graphe et les index
+
+        Les nouveaux messages sont indexés de manière incrémentale ; une reconstruction
+        complète n'a lieu que si des nœuds indexés ont disparu du graphe.
 
         Args:
             new_graph: Nouveau graphe NetworkX
+            added_message_ids: Messages ajoutés, si connus (évite de parcourir tout le graphe)
+            changed_message_ids: Messages existants dont les attributs filtrables ont changé
         """
+        graph_changed = new_graph is not self.graph
         self.graph = new_graph
 
         # Mettre à jour tous les services
@@ -152,8 +331,87 @@ class GraphSearchEngine:
         self.search_service.set_services(self.indexing_service, self.scoring_service)
         self.result_service.set_services(self.indexing_service, self.scoring_service)
 
-        # Reconstruire les index
-        self.rebuild_indexes()
+        changed_ids = set(changed_message_ids or ())
+
+        # Les nœuds indexés pointent vers les attributs de l'ancien graphe : seuls les
+        # messages dont les attributs filtrables diffèrent sont rafraîchis
+        if graph_changed:
+            rebound_changed_ids = self.indexing_service.rebind_graph()
+            if rebound_changed_ids is None:
+                logger.logger.info("Nœuds indexés absents du graphe, reconstruction complète")
+                self.rebuild_indexes()
+                return
+            changed_ids.update(rebound_changed_ids)
+
+        if added_message_ids is None:
+            added_message_ids = self.indexing_service.find_unindexed_messages()
+            if added_message_ids is None:
+                logger.logger.info("Nœuds indexés absents du graphe, reconstruction complète")
+                self.rebuild_indexes()
+                return
+
+        if changed_ids:
+            self.indexing_service.refresh_message_attributes(changed_ids)
+            self._queue_delta(refreshed_ids=changed_ids)
+
+        self.index_messages(added_message_ids)
+
+    def index_messages(self, message_ids: List[str]) -> int:
+        """
+        Rend de nouveaux messages du graphe cherchables sans reconstruire les index
+
+        Les messages sont cherchables immédiatement ; leur persistance est regroupée
+        en segments incrémentaux (voir flush_index).
+
+        Args:
+            message_ids: IDs des messages ajoutés au graphe
+
+        Returns:
+            Nombre de messages indexés
+        """
+        message_nodes = self.indexing_service.message_nodes
+        candidates = [message_id for message_id in dict.fromkeys(message_ids) if message_id not in message_nodes]
+
+        indexed = self.indexing_service.index_messages(candidates)
+        if indexed:
+            self._queue_delta(added_ids=[message_id for message_id in candidates if message_id in message_nodes])
+        return indexed
+
+    def _queue_delta(self, added_ids=(), refreshed_ids=()):
+        """Accumule une mise à jour incrémentale et l'écrit quand le lot est plein"""
+        if self.index_store is None:
+            return
+
+        self._pending_added.extend(added_ids)
+        self._pending_refreshed.update(refreshed_ids)
+        if len(self._pending_added) + len(self._pending_refreshed) >= INDEX_STORE_CONFIG['delta_batch_messages']:
+            self.flush_index()
+
+    def _save_embeddings(self):
+        """Ajoute au store les embeddings encodés depuis la dernière sauvegarde"""
+        self.indexing_service.embeddings_unsaved = False
+        if self.index_store is not None:
+            self.index_store.save_embeddings(self.indexing_service.embedding_service)
+
+    def flush_index(self):
+        """
+        Persiste les mises à jour incrémentales en attente
+
+        Un segment ne contient que les IDs des messages concernés (réindexés depuis
+        le graphe au rechargement) ; les tableaux ne sont réécrits que lorsque les
+        segments accumulés dépassent le seuil de compaction. À appeler avant l'arrêt
+        pour éviter une reconstruction au prochain démarrage.
+        """
+        if self.index_store is None or not (self._pending_added or self._pending_refreshed):
+            return
+
+        fingerprint = compute_graph_fingerprint(self.graph)
+        if not self.index_store.append_delta(self._pending_added, sorted(self._pending_refreshed),
+                                             self._store_fingerprint, fingerprint):
+            self.index_store.save(self.indexing_service, fingerprint)
+        self._store_fingerprint = fingerprint
+        self._pending_added = []
+        self._pending_refreshed = set()
 
     # Méthodes de compatibilité (pour maintenir l'API existante)
     def _search_by_content(self, query: str, filters: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
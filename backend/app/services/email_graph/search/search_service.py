@@ -4,11 +4,15 @@ Services de recherche par type (contenu, temporel, utilisateur, etc.).
 
 import re
 from datetime import datetime, timedelta
-from collections import defaultdict
+
+import numpy as np
 
 from ..logging_service import logger
 from ..shared_utils import process_email_list
-from .config import TOPIC_MAPPINGS
+from .config import TOPIC_MAPPINGS, FILTER_INDEX_CONFIG, SCORING_WEIGHTS
+from .query_planner import CombinedSearchPlanner
+from .scoring_service import ScoreArrays, ScoreTable, candidate_mask
+from .profiling import current_profile
 
 
 class SearchService:
@@ -17,63 +21,76 @@ class SearchService:
     def __init__(self, indexing_service, scoring_service):
         self.indexing = indexing_service
         self.scoring = scoring_service
+        self.planner = CombinedSearchPlanner(self)
 
     def set_services(self, indexing_service, scoring_service):
         """Met à jour les services"""
         self.indexing = indexing_service
         self.scoring = scoring_service
 
-    def search_by_content(self, query, filters):
+    def search_by_content(self, query, filters, candidates=None):
         """
         Recherche par contenu avec TF-IDF et scoring avancé
 
         Args:
             query (str): Requête textuelle
             filters (dict): Filtres à appliquer
+            candidates (np.ndarray|set): Messages retenus par les étapes précédentes, tous si None
 
         Returns:
-            dict: Scores par message_id
+            ScoreTable: Scores par message_id
         """
         if not query:
-            return {}
+            return ScoreTable(self.indexing.filter_index)
 
         # Déléguer le calcul des scores au service de scoring
-        results = self.scoring.calculate_content_scores(query, filters)
+        scores = self.scoring.calculate_content_scores(query, filters, candidates)
+
+        # Compléter par la recherche dense (embeddings) si un modèle est disponible et pondéré :
+        # la requête n'est encodée que si le score dense compte dans la fusion
+        dense_results = {}
+        if SCORING_WEIGHTS['dense'] > 0 and self.indexing.ensure_embeddings():
+            dense_results = self.indexing.embedding_service.search(query)
+        if dense_results:
+            doc_ids = scores.locate(dense_results)
+            similarities = np.fromiter(dense_results.values(), dtype=np.float64, count=len(dense_results))
+            selected = doc_ids >= 0
+            mask = candidate_mask(self.indexing.filter_index, candidates)
+            if mask is not None:
+                selected[selected] = mask[doc_ids[selected]]
+            scores.set('dense', doc_ids[selected], similarities[selected])
 
         # Appliquer les filtres
-        filtered_results = {}
-        for message_id, scores in results.items():
-            message_data = self.indexing.message_nodes.get(message_id, {})
-            if self._apply_message_filters(message_id, message_data, filters):
-                filtered_results[message_id] = dict(scores)
+        with current_profile().stage('filtering') as stage:
+            self._filter_scores(scores, filters)
+            stage.set_count(len(scores))
 
-        return filtered_results
+        return scores.to_table()
 
-    def search_by_temporal(self, filters, query=''):
+    def search_by_temporal(self, filters, query='', candidates=None):
         """
         Recherche par période temporelle avec scoring
 
         Args:
             filters (dict): Filtres incluant date_from et date_to
             query (str): Requête textuelle optionnelle
+            candidates (np.ndarray|set): Messages retenus par les étapes précédentes, tous si None
 
         Returns:
-            dict: Scores par message_id
+            ScoreTable: Scores par message_id
         """
         date_from_str = filters.get('date_from')
         date_to_str = filters.get('date_to')
 
         if not date_from_str:
-            return {}
+            return ScoreTable(self.indexing.filter_index)
 
         try:
             date_from = datetime.fromisoformat(date_from_str)
             date_to = datetime.fromisoformat(date_to_str) if date_to_str else date_from.replace(hour=23, minute=59)
         except Exception as e:
             logger.logger.error(f"Erreur parsing dates temporelles: {e}")
-            return {}
-
-        results = defaultdict(lambda: defaultdict(float))
+            return ScoreTable(self.indexing.filter_index)
 
         # Rechercher dans l'index temporel
         current_date = date_from
@@ -84,38 +101,44 @@ class SearchService:
             candidate_messages.update(self.indexing.temporal_index.get(day_key, []))
             current_date += timedelta(days=1)
 
+        mask = candidate_mask(self.indexing.filter_index, candidates)
+        if mask is not None:
+            candidate_messages = [
+                message_id for message_id in candidate_messages
+                if self.indexing.filter_index.contains(mask, message_id)
+            ]
+
         # Calculer les scores temporels
         temporal_scores = self.scoring.calculate_temporal_scores(
             list(candidate_messages), date_from, date_to
         )
 
-        # Filtrer et enrichir les résultats
-        for message_id, temporal_score in temporal_scores.items():
-            message_data = self.indexing.message_nodes.get(message_id, {})
+        # Scores de contenu calculés une seule fois pour tous les messages de la période
+        content_results = self.search_by_content(query, filters, candidates) if query else None
 
-            if not self._apply_message_filters(message_id, message_data, filters):
-                continue
-
-            results[message_id]['temporal'] = temporal_score
+        # Filtrer et enrichir les résultats
+        with current_profile().stage('filtering') as stage:
+            self._filter_scores(temporal_scores, filters)
+            results = temporal_scores.to_table()
 
             # Ajouter score de contenu si requête fournie
-            if query:
-                content_results = self.search_by_content(query, filters)
-                if message_id in content_results:
-                    results[message_id]['content'] = content_results[message_id].get('content', 0)
+            if content_results is not None:
+                results.assign_from(content_results, 'content')
+            stage.set_count(len(results))
 
-        return dict(results)
+        return results
 
-    def search_by_user(self, filters, query=''):
+    def search_by_user(self, filters, query='', candidates=None):
         """
         Recherche par utilisateur avec support expéditeur/destinataire
 
         Args:
             filters (dict): Filtres incluant contact_email, recipient_email, etc.
             query (str): Requête textuelle optionnelle
+            candidates (np.ndarray|set): Messages retenus par les étapes précédentes, tous si None
 
         Returns:
-            dict: Scores par message_id
+            ScoreTable: Scores par message_id
         """
         # Gérer les différents types de recherche utilisateur
         contact_email = filters.get('contact_email', '').lower()  # Expéditeur
@@ -123,47 +146,45 @@ class SearchService:
         recipient_email = filters.get('recipient_email', '').lower()  # Destinataire
         recipient_name = filters.get('recipient_name', '').lower()
 
-        results = defaultdict(lambda: defaultdict(float))
+        scores = ScoreArrays(self.indexing.filter_index)
 
         # Recherche par expéditeur
         if contact_email or contact_name:
             sender_users = self._find_matching_users(contact_email, contact_name)
-            sender_scores = self.scoring.calculate_user_scores(
+            scores = self.scoring.calculate_user_scores(
                 sender_users,
                 role_weights={'sent': 1.0, 'received': 0.0}  # Seulement les messages envoyés
             )
-
-            for msg_id, score in sender_scores.items():
-                results[msg_id]['user'] = score
+            scores.restrict(candidates)
 
         #  Recherche par destinataire
         if recipient_email or recipient_name:
             recipient_users = self._find_matching_users(recipient_email, recipient_name)
+            compiled_filters = self._compile_filters(filters)
+            mask = candidate_mask(self.indexing.filter_index, candidates)
 
             # Chercher dans les messages où ces utilisateurs sont destinataires
             for user_id, match_score in recipient_users:
                 # Messages où l'utilisateur est destinataire (TO, CC, BCC)
-                for message_id in self._find_messages_to_recipient(user_id):
-                    message_data = self.indexing.message_nodes.get(message_id, {})
+                doc_ids = scores.locate(self._find_messages_to_recipient(user_id))
+                doc_ids = doc_ids[doc_ids >= 0]
+                if mask is not None:
+                    doc_ids = doc_ids[mask[doc_ids]]
 
-                    if self._apply_message_filters(message_id, message_data, filters):
-                        results[message_id]['user'] = max(
-                            results[message_id]['user'],
-                            match_score * 0.9
-                        )
+                doc_ids = self._filter_positions(doc_ids, compiled_filters)
+                scores.maximum('user', doc_ids, np.full(len(doc_ids), match_score * 0.9))
+
+        results = scores.to_table()
 
         # Ajouter scores de contenu si requête fournie
         if query:
-            content_results = self.search_by_content(query, filters)
-            for message_id in results:
-                if message_id in content_results:
-                    results[message_id]['content'] = content_results[message_id].get('content', 0)
+            results.assign_from(self.search_by_content(query, filters, candidates), 'content')
 
-        return dict(results)
+        return results
 
     def _find_messages_to_recipient(self, user_id):
         """
-        NOUVEAU: Trouve tous les messages envoyés à un utilisateur spécifique
+        Trouve tous les messages envoyés à un utilisateur spécifique
 
         Args:
             user_id (str): ID de l'utilisateur destinataire
@@ -171,48 +192,108 @@ class SearchService:
         Returns:
             set: IDs des messages
         """
-        messages = set()
+        # L'index des messages reçus couvre les relations RECEIVED, CC et BCC
+        return set(self.indexing.user_received_index.get(user_id, ()))
 
-        # Chercher toutes les relations entrantes vers cet utilisateur
-        for message_id, _, edge_data in self.indexing.graph.in_edges(user_id, data=True):
-            edge_type = edge_data.get('type')
-            if edge_type in ['RECEIVED', 'CC', 'BCC']:
-                messages.add(message_id)
+    def _compile_filters(self, filters):
+        """
+        Évalue une fois les filtres booléens sur les bitmaps de l'index
 
-        return messages
+        Args:
+            filters (dict): Filtres de la requête
 
-    def _apply_message_filters(self, message_id, message_data, filters):
-        """Applique les filtres additionnels à un message (version améliorée)"""
+        Returns:
+            tuple: (masque des messages ou None, filtres restant à vérifier par message)
+        """
+        mask = self.indexing.filter_index.evaluate(filters)
+        if mask is None:
+            return None, filters
 
-        # Filtres existants...
+        residual_filters = {
+            key: value for key, value in filters.items()
+            if key not in FILTER_INDEX_CONFIG['bitmap_filters']
+        }
+        return mask, residual_filters
+
+    def _filter_positions(self, doc_ids, compiled_filters):
+        """
+        Restreint des positions aux messages vérifiant des filtres compilés par _compile_filters
+
+        Args:
+            doc_ids (np.ndarray): Positions des messages dans l'index de filtres
+            compiled_filters (tuple): Masque des bitmaps et filtres restants
+
+        Returns:
+            np.ndarray: Positions retenues
+        """
+        mask, residual_filters = compiled_filters
+        if mask is not None:
+            doc_ids = doc_ids[mask[doc_ids]]
+
+        message_ids = self.indexing.filter_index.message_ids
+        message_nodes = self.indexing.message_nodes
+        passes = np.fromiter(
+            (self._apply_message_filters(message_ids[position], message_nodes.get(message_ids[position], {}),
+                                         residual_filters)
+             for position in doc_ids.tolist()),
+            dtype=bool, count=len(doc_ids)
+        )
+        return doc_ids[passes]
+
+    def _filter_scores(self, scores, filters):
+        """Ne conserve dans des scores en cours de calcul que les messages vérifiant les filtres"""
+        kept = self._filter_positions(np.flatnonzero(scores.present), self._compile_filters(filters))
+        mask = np.zeros(scores.size, dtype=bool)
+        mask[kept] = True
+        scores.keep(mask)
+
+    def filter_mask(self, filters, candidates=None):
+        """
+        Masque des messages vérifiant les filtres, évalués sur les bitmaps puis message par message
+
+        Args:
+            filters (dict): Filtres de la requête
+            candidates (np.ndarray|set): Messages retenus par les étapes précédentes, tous si None
 
-        # NOUVEAU: Filtre type de message (sent/received)
+        Returns:
+            np.ndarray: Masque aligné sur les positions de l'index de filtres
+        """
+        filter_index = self.indexing.filter_index
+        with current_profile().stage('filtering') as stage:
+            doc_ids = np.arange(len(filter_index), dtype=np.int64)
+            mask = candidate_mask(filter_index, candidates)
+            if mask is not None:
+                doc_ids = doc_ids[mask]
+
+            matching = np.zeros(len(filter_index), dtype=bool)
+            matching[self._filter_positions(doc_ids, self._compile_filters(filters))] = True
+            stage.set_count(int(np.count_nonzero(matching)))
+        return matching
+
+    def scan_filters(self, filters, candidates=None):
+        """
+        Messages vérifiant les filtres, évalués sur les bitmaps puis message par message
+
+        Args:
+            filters (dict): Filtres de la requête
+            candidates (np.ndarray|set): Messages retenus par les étapes précédentes, tous si None
+
+        Returns:
+            set: IDs des messages retenus
+        """
+        return set(self.indexing.filter_index.select(self.filter_mask(filters, candidates)))
+
+    def _apply_message_filters(self, message_id, message_data, filters):
+        """Applique les filtres additionnels à un message"""
+        # Filtre type de message (sent/received) par rapport à l'utilisateur central
         if filters.get('message_type'):
             message_type = filters['message_type']
 
-            if message_type == 'sent':
-                # Vérifier si le message a été envoyé par l'utilisateur central
-                is_sent = False
-                for user_id, _, edge_data in self.indexing.graph.in_edges(message_id, data=True):
-                    if edge_data.get('type') == 'SENT':
-                        user_data = self.indexing.user_nodes.get(user_id, {})
-                        if user_data.get('is_central_user', False):
-                            is_sent = True
-                            break
-                if not is_sent:
-                    return False
+            if message_type == 'sent' and message_id not in self.indexing.sent_by_central:
+                return False
 
-            elif message_type == 'received':
-                # Vérifier si le message a été reçu par l'utilisateur central
-                is_received = False
-                for _, user_id, edge_data in self.indexing.graph.out_edges(message_id, data=True):
-                    if edge_data.get('type') in ['RECEIVED', 'CC', 'BCC']:
-                        user_data = self.indexing.user_nodes.get(user_id, {})
-                        if user_data.get('is_central_user', False):
-                            is_received = True
-                            break
-                if not is_received:
-                    return False
+            if message_type == 'received' and message_id not in self.indexing.received_by_central:
+                return False
 
         # Filtre types de pièces jointes spécifiques
         if filters.get('attachment_types'):
@@ -238,53 +319,72 @@ class SearchService:
             if not required_types.intersection(attachment_extensions):
                 return False
 
-        #  Filtre destinataire spécifique (complément de search_by_user)
+        # Filtre destinataire spécifique (complément de search_by_user)
         if filters.get('recipient_name'):
             recipient_name = filters['recipient_name'].lower()
             found = False
 
-            # Vérifier dans les relations du graphe
-            for _, user_id, edge_data in self.indexing.graph.out_edges(message_id, data=True):
-                if edge_data.get('type') in ['RECEIVED', 'CC', 'BCC']:
-                    user_data = self.indexing.user_nodes.get(user_id, {})
-                    if recipient_name in user_data.get('name', '').lower():
-                        found = True
-                        break
+            for user_ids in self.indexing.get_message_recipients(message_id).values():
+                if any(recipient_name in self.indexing.user_nodes.get(user_id, {}).get('name', '').lower()
+                       for user_id in user_ids):
+                    found = True
+                    break
 
             if not found:
                 return False
 
-        # Filtres existants...
+        # Filtre pièces jointes
         if filters.get('has_attachments') is not None:
             message_has_attachments = message_data.get('has_attachments', False)
             if filters['has_attachments'] != message_has_attachments:
                 return False
 
+        # Filtre nom contact (nom du message ou expéditeur indexé)
+        if filters.get('contact_name'):
+            sender_name = message_data.get('sender_name', '').lower()
+            filter_name = filters['contact_name'].lower()
+            if filter_name not in sender_name:
+                sender_id = self.indexing.message_sender_index.get(message_id)
+                sender_data = self.indexing.user_nodes.get(sender_id, {}) if sender_id is not None else {}
+                if filter_name not in sender_data.get('name', '').lower():
+                    return False
+
+        # Filtre messages non lus
         if filters.get('is_unread') and not message_data.get('is_unread', True):
             return False
 
+        # Filtre messages importants (False = messages non importants)
         if filters.get('is_important') and not message_data.get('is_important'):
             return False
 
+        if filters.get('is_important') is False and message_data.get('is_important'):
+            return False
+
         if filters.get('is_archived') and not message_data.get('is_archived', False):
             return False
 
+        # Filtre labels (au moins un des labels demandés)
+        if filters.get('labels'):
+            if not set(filters['labels']).intersection(message_data.get('labels', []) or []):
+                return False
+
         return True
 
-    def search_by_topic(self, filters, query=''):
+    def search_by_topic(self, filters, query='', candidates=None):
         """
         Recherche par topics avec mapping flexible
 
         Args:
             filters (dict): Filtres incluant topic_ids
             query (str): Requête textuelle optionnelle
+            candidates (np.ndarray|set): Messages retenus par les étapes précédentes, tous si None
 
         Returns:
-            dict: Scores par message_id
+            ScoreTable: Scores par message_id
         """
         topic_ids = filters.get('topic_ids', [])
         if not topic_ids:
-            return {}
+            return ScoreTable(self.indexing.filter_index)
 
         # Dédupliquer et étendre les topics
         topic_ids = list(set(topic_ids))
@@ -292,141 +392,44 @@ class SearchService:
 
         logger.logger.info(f"Topics étendus: {expanded_topics}")
 
-        results = defaultdict(lambda: defaultdict(float))
-
-        # Chercher dans tous les messages
-        for message_id, message_data in self.indexing.message_nodes.items():
-            score = self._calculate_topic_score(message_data, expanded_topics)
-
-            if score > 0 and self._apply_message_filters(message_id, message_data, filters):
-                results[message_id]['content'] = score
+        # Additionner les contributions précalculées de chaque terme (topics, sujet, contenu)
+        scores = ScoreArrays(self.indexing.filter_index)
+        for topic in expanded_topics:
+            postings = self.indexing.get_topic_postings(topic)
+            doc_ids = scores.locate(postings)
+            values = np.fromiter(postings.values(), dtype=np.float64, count=len(postings))
+            indexed = doc_ids >= 0
+            scores.add('content', doc_ids[indexed], values[indexed])
+        scores.restrict(candidates)
+
+        # Filtrer en conservant l'ordre des messages dans l'index
+        with current_profile().stage('filtering') as stage:
+            self._filter_scores(scores, filters)
+            results = scores.to_table()
+            stage.set_count(len(results))
 
         logger.logger.info(f"🎯 {len(results)} message(s) trouvé(s) par topics")
-        return dict(results)
+        return results
 
     def search_combined(self, query, filters):
         """
-        Recherche combinée avec fusion des scores (version améliorée)
+        Recherche combinée avec fusion des scores
+
+        Les sous-recherches sont ordonnées par le planificateur selon leur sélectivité
+        estimée : les étapes suivantes ne calculent que les messages encore candidats.
 
         Args:
             query (str): Requête textuelle
             filters (dict): Filtres multiples
 
         Returns:
-            dict: Scores combinés par message_id
+            ScoreTable: Scores combinés par message_id
         """
-        combined_results = defaultdict(lambda: defaultdict(float))
-        all_results = []
-
-        #  Gérer les cas de négation spécialement
-        has_negation = (
-                filters.get('has_attachments') is False or
-                filters.get('is_important') is False
-        )
-
-        # Déterminer si on a plusieurs filtres
-        active_filters = []
-        if filters.get('topic_ids'):
-            active_filters.append('topics')
-        if filters.get('has_attachments') is not None:
-            active_filters.append('attachments')
-        if filters.get('contact_name') or filters.get('contact_email'):
-            active_filters.append('sender')
-        if filters.get('recipient_name') or filters.get('recipient_email'):
-            active_filters.append('recipient')
-        if filters.get('date_from'):
-            active_filters.append('temporal')
-        if filters.get('message_type'):
-            active_filters.append('message_type')
-
-        has_multiple_filters = len(active_filters) > 1
-
-        # Exécuter les différents types de recherche
-        search_results = {}
-
-        # Recherche par contenu
-        if query:
-            search_results['content'] = self.search_by_content(query, filters)
-            all_results.append(set(search_results['content'].keys()))
-
-        # Recherche par topics
-        if filters.get('topic_ids'):
-            search_results['topics'] = self.search_by_topic(filters, query)
-            all_results.append(set(search_results['topics'].keys()))
-
-        # Recherche par utilisateur (expéditeur ou destinataire)
-        if any(filters.get(k) for k in ['contact_name', 'contact_email', 'recipient_name', 'recipient_email']):
-            search_results['user'] = self.search_by_user(filters, query)
-            all_results.append(set(search_results['user'].keys()))
-
-        # Recherche temporelle
-        if filters.get('date_from'):
-            search_results['temporal'] = self.search_by_temporal(filters, query)
-            all_results.append(set(search_results['temporal'].keys()))
-
-        # Pour les filtres de négation ou d'état, on doit chercher dans TOUS les messages
-        if has_negation or filters.get('message_type'):
-            # Parcourir tous les messages et appliquer les filtres
-            all_messages = set()
-            for message_id, message_data in self.indexing.message_nodes.items():
-                if self._apply_message_filters(message_id, message_data, filters):
-                    all_messages.add(message_id)
-
-            # Si on a d'autres résultats, faire l'intersection
-            if all_results:
-                valid_messages = all_messages.intersection(
-                    set.intersection(*all_results) if has_multiple_filters else set.union(*all_results)
-                )
-            else:
-                valid_messages = all_messages
-        else:
-            # Logique existante pour fusion normale
-            if has_multiple_filters and all_results:
-                valid_messages = set.intersection(*all_results)
-            else:
-                valid_messages = set()
-                for result_set in all_results:
-                    valid_messages.update(result_set)
-
-        # Combiner les scores pour les messages valides
-        for message_id in valid_messages:
-            for search_type, results in search_results.items():
-                if message_id in results:
-                    for score_type, score_value in results[message_id].items():
-                        combined_results[message_id][score_type] += score_value
-
-        return dict(combined_results)
+        return self.planner.execute(query, filters)
 
     def _find_matching_users(self, contact_email, contact_name):
-        """Trouve les utilisateurs correspondant aux critères"""
-        matching_users = []
-
-        for user_id, user_data in self.indexing.user_nodes.items():
-            email = user_data.get('email', '').lower()
-            name = user_data.get('name', '').lower()
-
-            match_score = 0
-
-            # Match par email
-            if contact_email:
-                if contact_email == email:
-                    match_score = 1.0
-                elif contact_email in email or email in contact_email:
-                    match_score = 0.8
-
-            # Match par nom
-            if contact_name and match_score == 0:
-                if contact_name == name:
-                    match_score = 1.0
-                elif contact_name in name or name in contact_name:
-                    match_score = 0.9
-                elif ' ' in name and contact_name == name.split()[0]:
-                    match_score = 0.85
-
-            if match_score > 0:
-                matching_users.append((user_id, match_score))
-
-        return matching_users
+        """Trouve les utilisateurs correspondant aux critères via l'index des contacts"""
+        return self.indexing.get_contact_index().find(contact_email, contact_name)
 
     def _expand_topics(self, topic_ids):
         """Étend les topics avec leurs synonymes"""
@@ -438,61 +441,3 @@ class SearchService:
                 expanded_topics.update(TOPIC_MAPPINGS[topic_id.lower()])
 
         return expanded_topics
-
-    def _calculate_topic_score(self, message_data, expanded_topics):
-        """Calcule le score de topic pour un message"""
-        score = 0.0
-
-        # Score pour topics explicites du message
-        message_topics = [t.lower() for t in message_data.get('topics', [])]
-        topic_overlap = set(message_topics).intersection(expanded_topics)
-        if topic_overlap:
-            score += len(topic_overlap) * 2.0
-
-        # Score pour termes dans le sujet
-        subject = message_data.get('subject', '').lower()
-        for topic in expanded_topics:
-            if topic in subject:
-                score += 1.5
-
-        # Score pour termes dans le contenu
-        content = message_data.get('content', '').lower()
-        for topic in expanded_topics:
-            if topic in content:
-                score += 1.0
-
-        return score
-
-    def _apply_message_filters(self, message_id, message_data, filters):
-        """Applique les filtres additionnels à un message"""
-        # Filtre pièces jointes
-        if filters.get('has_attachments') is not None:
-            message_has_attachments = message_data.get('has_attachments', False)
-            if filters['has_attachments'] != message_has_attachments:
-                return False
-
-        # Filtre nom contact (vérification via graphe)
-        if filters.get('contact_name'):
-            sender_name = message_data.get('sender_name', '').lower()
-            filter_name = filters['contact_name'].lower()
-            if filter_name not in sender_name:
-                # Vérifier aussi via les relations du graphe
-                sender_found = False
-                for user_id, _, edge_data in self.indexing.graph.in_edges(message_id, data=True):
-                    if edge_data.get('type') == 'SENT':
-                        user_data = self.indexing.user_nodes.get(user_id, {})
-                        if filter_name in user_data.get('name', '').lower():
-                            sender_found = True
-                            break
-                if not sender_found:
-                    return False
-
-        # Filtre messages non lus
-        if filters.get('is_unread') and not message_data.get('is_unread', True):
-            return False
-
-        # Filtre messages importants
-        if filters.get('is_important') and not message_data.get('is_important'):
-            return False
-
-        return True
\ No newline at end of file
@@ -0,0 +1,162 @@
+"""
+Analyseur de texte pour l'index inversé.
+
+Le même pipeline est appliqué aux messages indexés et aux requêtes :
+nettoyage (balises HTML, URLs, fragments base64), tokenisation, suppression
+des mots vides, normalisation Unicode avec suppression des accents et
+racinisation légère optionnelle. Le contenu et le nombre de tokens par
+message sont bornés pour limiter la mémoire de l'index.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+from .config import TFIDF_CONFIG, TEXT_ANALYZER_CONFIG
+
+_MARKUP_PATTERNS = (
+    re.compile(r'<[^<>]{1,500}>'),  # Balises HTML
+    re.compile(r'&#?[a-zA-Z0-9]{1,10};'),  # Entités HTML
+    re.compile(r'(?:https?://|www\.)\S+', re.IGNORECASE),  # URLs
+    re.compile(r'[A-Za-z0-9+/=]{40,}')  # Fragments base64 et identifiants encodés
+)
+
+
+def fold_accents(text):
+    """
+    Normalise un texte en minuscules sans accents
+
+    Args:
+        text (str): Texte à normaliser
+
+    Returns:
+        str: Texte normalisé (NFKD, marques combinantes supprimées)
+    """
+    text = text.lower()
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def light_stem(term):
+    """
+    Racinisation légère FR/EN : pluriels en s/x puis e finaux
+
+    Le radical reste un préfixe du terme, ce qui permet de le rechercher
+    par sous-chaîne dans un sujet normalisé.
+
+    Args:
+        term (str): Terme normalisé
+
+    Returns:
+        str: Radical
+    """
+    if len(term) > 4 and term[-1] in 'sx' and term[-2] not in 'su':
+        term = term[:-1]
+    for _ in range(2):
+        if len(term) > 4 and term[-1] == 'e':
+            term = term[:-1]
+    return term
+
+
+class TextAnalyzer:
+    """Transforme un texte en termes d'index"""
+
+    def __init__(self, config=None):
+        """
+        Initialise l'analyseur
+
+        Args:
+            config (dict): Options remplaçant celles de TEXT_ANALYZER_CONFIG
+        """
+        self.config = {**TEXT_ANALYZER_CONFIG, **(config or {})}
+        self.pattern = re.compile(TFIDF_CONFIG['pattern'])
+        self.min_term_length = TFIDF_CONFIG['min_term_length']
+        self.stopwords = frozenset(
+            word for words in self.config['stopwords'].values() for word in words
+        )
+        # Les mots vides sont comparés aux tokens avant et après normalisation
+        self.stopwords |= frozenset(fold_accents(word) for word in self.stopwords)
+        # Caches par instance : les termes dépendent de la configuration
+        self.term = lru_cache(maxsize=65536)(self._term)
+        self.normalize_field = lru_cache(maxsize=4096)(self._normalize_field)
+
+    def _term(self, token):
+        """Terme d'index d'un token en minuscules, None si c'est un mot vide ou un token ignoré"""
+        if len(token) < self.min_term_length or len(token) > self.config['max_token_length'] \
+                or token in self.stopwords:
+            return None
+        if self.config['fold_accents']:
+            token = fold_accents(token)
+            if token in self.stopwords:
+                return None
+        if self.config['stemming']:
+            token = light_stem(token)
+        return token
+
+    def clean(self, text):
+        """Supprime balises, entités, URLs et fragments encodés"""
+        if self.config['strip_markup']:
+            for pattern in _MARKUP_PATTERNS:
+                text = pattern.sub(' ', text)
+        return text
+
+    def analyze(self, text, max_tokens=None):
+        """
+        Découpe un texte en termes d'index, dans l'ordre du texte
+
+        Args:
+            text (str): Texte à analyser
+            max_tokens (int): Nombre maximum de termes retournés, illimité si None
+
+        Returns:
+            list: Termes normalisés (avec répétitions)
+        """
+        terms = []
+        for token in self.pattern.findall(self.clean(text).lower()):
+            term = self.term(token)
+            if term is not None:
+                terms.append(term)
+                if max_tokens is not None and len(terms) >= max_tokens:
+                    break
+        return terms
+
+    def analyze_message(self, subject, content):
+        """
+        Termes indexés d'un message : sujet complet et contenu borné
+
+        Args:
+            subject (str): Sujet du message
+            content (str): Contenu du message
+
+        Returns:
+            list: Termes normalisés (avec répétitions)
+        """
+        content = (content or '')[:self.config['max_body_chars']]
+        return self.analyze(f"{subject or ''} {content}", self.config['max_tokens'])
+
+    def query_terms(self, query):
+        """
+        Termes distincts d'une requête
+
+        Args:
+            query (str): Requête textuelle
+
+        Returns:
+            set: Termes normalisés
+        """
+        return set(self.analyze(query or ''))
+
+    def _normalize_field(self, text):
+        """Champ normalisé comme les termes (pour les recherches par sous-chaîne)"""
+        text = text or ''
+        return fold_accents(text) if self.config['fold_accents'] else text.lower()
+
+    def signature(self):
+        """Options qui déterminent les termes indexés (invalide un index persisté si elles changent)"""
+        return {
+            key: self.config[key]
+            for key in ('stopwords', 'fold_accents', 'stemming', 'strip_markup', 'max_token_length',
+                        'max_body_chars', 'max_tokens', 'max_df_ratio', 'max_df_min_documents')
+        }
@@ -0,0 +1,73 @@
+import json
+import pytest
+from datetime import datetime, timedelta
+from backend.app.services.email_graph.processor import EmailGraphProcessor
+
+
+CENTRAL_USER = "user@company.com"
+
+
+def make_search_emails(count=24):
+    """Construit un petit jeu d'emails déterministe pour les tests de recherche."""
+    base_date = datetime(2025, 3, 1, 10, 0, 0)
+    contacts = [
+        ("marie.dupont@company.com", "Marie Dupont"),
+        ("pierre.martin@client.com", "Pierre Martin"),
+        ("support@service.com", "Support Service"),
+    ]
+    templates = [
+        ("Facture mensuelle", "Veuillez trouver la facture des services.", ["facturation"],
+         [{"filename": "facture.pdf"}]),
+        ("Projet X - Mise à jour", "Le projet avance bien, voici le planning.", ["projet"], []),
+        ("Réunion équipe", "Compte-rendu de la réunion et notes importantes.", ["meeting", "important"],
+         [{"filename": "notes.docx"}]),
+    ]
+
+    emails = []
+    for i in range(count):
+        contact_email, _ = contacts[i % len(contacts)]
+        subject, content, topics, attachments = templates[i % len(templates)]
+        sent = i % 4 == 0
+
+        emails.append({
+            "Message-ID": f"msg{i:03d}@company.com",
+            "Thread-ID": f"thread{i // 3:03d}",
+            "From": CENTRAL_USER if sent else contact_email,
+            "To": contact_email if sent else CENTRAL_USER,
+            "Subject": subject,
+            "Content": content,
+            "Date": (base_date - timedelta(days=i)).isoformat(),
+            "has_attachments": bool(attachments),
+            "attachment_count": len(attachments),
+            "Attachments": attachments,
+            "is_important": "important" in topics,
+            "is_unread": i % 2 == 0,
+            "topics": topics,
+            "Labels": ["WORK"] if i % 2 else ["INBOX"],
+        })
+
+    return emails
+
+
+def build_processor(emails):
+    """Construit un processeur dont le graphe contient les emails donnés."""
+    processor = EmailGraphProcessor()
+    processor.process_graph(json.dumps({"mails": emails, "central_user": CENTRAL_USER}))
+    return processor
+
+
+def build_graph(emails):
+    """Construit le graphe d'emails via le processeur."""
+    return build_processor(emails).graph
+
+
+@pytest.fixture
+def search_emails():
+    """Fixture pour le jeu d'emails de recherche."""
+    return make_search_emails()
+
+
+@pytest.fixture
+def search_graph(search_emails):
+    """Fixture pour un graphe d'emails prêt à être indexé."""
+    return build_graph(search_emails)
@@ -0,0 +1,87 @@
+import random
+import pytest
+from backend.app.services.email_graph.search.contact_index import ContactLookupIndex
+from backend.app.services.email_graph.search.search_manager import GraphSearchEngine
+
+
+def linear_scan(user_nodes, contact_email, contact_name):
+    """Référence : parcours linéaire des utilisateurs avec les scores historiques."""
+    matching_users = []
+    for user_id, user_data in user_nodes.items():
+        email = user_data.get('email', '').lower()
+        name = user_data.get('name', '').lower()
+        match_score = 0
+        if contact_email:
+            if contact_email == email:
+                match_score = 1.0
+            elif contact_email in email or email in contact_email:
+                match_score = 0.8
+        if contact_name and match_score == 0:
+            if contact_name == name:
+                match_score = 1.0
+            elif contact_name in name or name in contact_name:
+                match_score = 0.9
+            elif ' ' in name and contact_name == name.split()[0]:
+                match_score = 0.85
+        if match_score > 0:
+            matching_users.append((user_id, match_score))
+    return matching_users
+
+
+@pytest.fixture
+def user_nodes():
+    """Fixture pour un carnet d'adresses synthétique avec cas limites."""
+    rng = random.Random(7)
+    first_names = ["marie", "pierre", "jean", "sophie", "luc", "anne", "marc"]
+    last_names = ["dupont", "martin", "bernard", "durand", "petit"]
+    domains = ["company.com", "client.com", "mail.fr"]
+
+    users = {}
+    for i in range(300):
+        first, last = rng.choice(first_names), rng.choice(last_names)
+        name = rng.choice([f"{first} {last}", first, f"{first}.{last}", ""])
+        users[f"user-{i}"] = {'type': 'user', 'email': f"{first}.{last}{i}@{rng.choice(domains)}", 'name': name}
+    users["user-empty"] = {'type': 'user', 'email': '', 'name': 'Sans Email'}
+    return users
+
+
+QUERIES = [
+    ("", "marie"), ("", "marie dupont"), ("", "ma"), ("", "Dupont"), ("", "x"),
+    ("marie.dupont3@company.com", ""), ("client.com", ""), ("@", ""), ("pierre", "pierre"),
+    ("inconnu@nulle.part", "personne"), ("", "jean bernard durand"), ("luc.petit", "anne"),
+]
+
+
+class TestContactLookupIndex:
+    """Tests pour l'index de recherche des contacts."""
+
+    @pytest.mark.parametrize("contact_email,contact_name", QUERIES)
+    def test_matches_linear_scan(self, user_nodes, contact_email, contact_name):
+        """Test que l'index reproduit exactement les scores et l'ordre du parcours linéaire."""
+        index = ContactLookupIndex.build(user_nodes)
+        contact_email, contact_name = contact_email.lower(), contact_name.lower()
+
+        assert index.find(contact_email, contact_name) == linear_scan(user_nodes, contact_email, contact_name)
+
+    def test_incremental_add(self, user_nodes):
+        """Test l'ajout d'un utilisateur après construction."""
+        index = ContactLookupIndex.build(user_nodes)
+        index.add_user("user-new", {'email': 'zoe.zephyr@client.com', 'name': 'zoe zephyr'})
+        user_nodes["user-new"] = {'email': 'zoe.zephyr@client.com', 'name': 'zoe zephyr'}
+
+        assert index.find('', 'zoe') == linear_scan(user_nodes, '', 'zoe')
+        assert ("user-new", 1.0) in index.find('zoe.zephyr@client.com', '')
+
+    def test_engine_uses_index_for_new_users(self, search_graph):
+        """Test que les utilisateurs ajoutés par indexation incrémentale sont trouvables."""
+        engine = GraphSearchEngine(search_graph)
+        engine.search({'query_type': 'contact', 'semantic_text': '', 'filters': {'contact_name': 'marie'}})
+
+        search_graph.add_node("user-new", type="user", email="nadia.nouveau@client.com", name="nadia nouveau")
+        search_graph.add_node("msg-new@company.com", type="message", subject="Bonjour",
+                              content="Premier message", date="2025-03-02T09:00:00")
+        search_graph.add_edge("user-new", "msg-new@company.com", type="SENT")
+        engine.index_messages(["msg-new@company.com"])
+
+        results = engine.search({'query_type': 'contact', 'semantic_text': '', 'filters': {'contact_name': 'nadia'}})
+        assert [r.message_id for r in results] == ["msg-new@company.com"]
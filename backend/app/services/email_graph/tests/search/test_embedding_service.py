@@ -0,0 +1,159 @@
+import zlib
+import numpy as np
+import pytest
+from backend.app.services.email_graph.search.embedding_service import SearchEmbeddingService
+from backend.app.services.email_graph.search.search_manager import GraphSearchEngine
+from backend.app.services.email_graph.tests.search.conftest import build_processor, make_search_emails
+
+
+SYNONYMS = {"invoice": "facture", "bill": "facture", "meeting": "réunion"}
+DIMENSION = 64
+
+
+def fake_encoder(texts):
+    """Encodeur déterministe : sac de mots haché, avec quelques synonymes."""
+    vectors = np.zeros((len(texts), DIMENSION), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for token in text.lower().split():
+            token = SYNONYMS.get(token, token)
+            vectors[row, zlib.crc32(token.encode('utf-8')) % DIMENSION] += 1.0
+    return vectors
+
+
+@pytest.fixture
+def engine(search_graph):
+    """Fixture pour un moteur de recherche avec encodeur de test."""
+    return GraphSearchEngine(search_graph, embedding_encoder=fake_encoder)
+
+
+class TestSearchEmbeddingService:
+    """Tests pour l'encodage et la recherche exacte par similarité."""
+
+    def test_search_matches_exact_ranking(self):
+        """Test que la recherche par blocs correspond au tri exact en float32."""
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((500, 32)).astype(np.float32)
+        service = SearchEmbeddingService(encoder=lambda texts: vectors[[int(t) for t in texts]])
+        nodes = {f"m{i}": {'subject': str(i)} for i in range(len(vectors))}
+        service.build(nodes)
+
+        results = service.search("7", top_k=10, min_similarity=-1.0)
+
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        expected = np.argsort(-(normalized @ normalized[7]), kind='stable')[:10]
+        assert list(results) == [f"m{i}" for i in expected]
+        assert next(iter(results)) == "m7"
+        assert all(a >= b for a, b in zip(list(results.values()), list(results.values())[1:]))
+
+    def test_disabled_without_encoder(self, monkeypatch):
+        """Test qu'aucun résultat dense n'est produit sans modèle."""
+        import backend.app.services.email_graph.search.embedding_service as module
+        monkeypatch.setattr(module, 'SENTENCE_TRANSFORMERS_AVAILABLE', False)
+        service = SearchEmbeddingService()
+
+        assert not service.enabled
+        assert service.search("facture") == {}
+
+    def test_vectors_are_float16(self, engine):
+        """Test que les vecteurs sont stockés en demi-précision."""
+        service = engine.indexing_service.embedding_service
+        engine.indexing_service.ensure_embeddings()
+
+        assert service.vectors.dtype == np.float16
+        assert len(service) == len(engine.indexing_service.message_nodes)
+
+
+class TestDenseContentSearch:
+    """Tests pour l'intégration de la recherche dense dans la recherche par contenu."""
+
+    def test_synonym_found_by_dense_score(self, engine):
+        """Test qu'un synonyme absent du texte retrouve les messages par embeddings."""
+        results = engine.search({'query_type': 'semantic', 'semantic_text': 'invoice', 'filters': {}, 'limit': 50})
+
+        assert results
+        assert all(r.dense_score > 0 for r in results)
+        assert all('facture' in r.subject.lower() for r in results)
+        assert 'dense' in results[0].to_dict()['scores']
+
+    def test_filters_apply_to_dense_results(self, engine):
+        """Test que les filtres s'appliquent aussi aux résultats denses."""
+        results = engine.search({
+            'query_type': 'semantic', 'semantic_text': 'invoice', 'filters': {'is_unread': True}, 'limit': 50
+        })
+        unread = {
+            message_id for message_id, data in engine.indexing_service.message_nodes.items()
+            if data.get('is_unread', True)
+        }
+
+        assert results
+        assert {r.message_id for r in results} <= unread
+
+    def test_incremental_indexing_encodes_new_messages(self):
+        """Test que l'indexation incrémentale encode les nouveaux messages."""
+        emails = make_search_emails(30)
+        processor = build_processor(emails[:24])
+        engine = GraphSearchEngine(processor.graph, embedding_encoder=fake_encoder)
+        engine.indexing_service.ensure_embeddings()
+
+        for email in emails[24:]:
+            processor.email_processing_service.process_single_email(email)
+        engine.update_graph(processor.graph)
+
+        service = engine.indexing_service.embedding_service
+        assert len(service) == len(engine.indexing_service.message_nodes)
+        assert set(service.message_ids) == set(engine.indexing_service.message_nodes)
+
+    def test_persisted_embeddings_are_reloaded(self, search_graph, tmp_path):
+        """Test que la matrice persistée est rechargée sans réencoder."""
+        first = GraphSearchEngine(search_graph, index_path=str(tmp_path), embedding_encoder=fake_encoder)
+        query = {'query_type': 'semantic', 'semantic_text': 'invoice', 'filters': {}, 'limit': 50}
+        first_results = [r.message_id for r in first.search(query)]
+        calls = []
+
+        def counting_encoder(texts):
+            calls.append(len(texts))
+            return fake_encoder(texts)
+
+        second = GraphSearchEngine(search_graph, index_path=str(tmp_path), embedding_encoder=counting_encoder)
+
+        assert calls == []
+        assert [r.message_id for r in second.search(query)] == first_results
+        assert calls == [1]
+
+
+class TestLazyEmbeddings:
+    """Tests pour l'encodage différé des messages."""
+
+    def test_disabled_by_default(self, monkeypatch, search_graph):
+        """Test que la recherche dense est optionnelle sans encodeur fourni."""
+        import backend.app.services.email_graph.search.embedding_service as module
+        monkeypatch.setattr(module, 'SENTENCE_TRANSFORMERS_AVAILABLE', True)
+        engine = GraphSearchEngine(search_graph)
+
+        assert not engine.indexing_service.embedding_service.enabled
+
+    def test_encoded_at_first_dense_query(self, search_graph):
+        """Test que les messages ne sont encodés ni à la construction ni par les recherches sans texte."""
+        calls = []
+
+        def counting_encoder(texts):
+            calls.append(len(texts))
+            return fake_encoder(texts)
+
+        engine = GraphSearchEngine(search_graph, embedding_encoder=counting_encoder)
+        engine.search({'query_type': 'combined', 'semantic_text': '', 'filters': {'topic_ids': ['projet']}})
+        assert calls == []
+
+        engine.search({'query_type': 'semantic', 'semantic_text': 'invoice', 'filters': {}, 'limit': 50})
+        assert sum(calls) == len(engine.indexing_service.message_nodes) + 1
+
+    def test_query_not_encoded_without_dense_weight(self, search_graph, monkeypatch):
+        """Test que la requête n'est pas encodée quand le score dense ne compte pas."""
+        from backend.app.services.email_graph.search.config import SCORING_WEIGHTS
+        monkeypatch.setitem(SCORING_WEIGHTS, 'dense', 0.0)
+        engine = GraphSearchEngine(search_graph, embedding_encoder=lambda texts: pytest.fail("encodage inutile"))
+
+        results = engine.search({'query_type': 'semantic', 'semantic_text': 'facture', 'filters': {}, 'limit': 50})
+
+        assert results
+        assert all(r.dense_score == 0 for r in results)
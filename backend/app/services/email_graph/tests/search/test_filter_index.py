@@ -0,0 +1,120 @@
+import pytest
+import networkx as nx
+from backend.app.services.email_graph.search.filter_index import FilterBitmapIndex
+from backend.app.services.email_graph.search.search_manager import GraphSearchEngine
+
+
+FILTER_COMBINATIONS = [
+    {'message_type': 'sent'},
+    {'message_type': 'received', 'has_attachments': True},
+    {'has_attachments': False},
+    {'is_important': False},
+    {'is_important': True, 'is_unread': True},
+    {'attachment_types': ['pdf']},
+    {'attachment_types': ['pdf', 'docx'], 'message_type': 'received'},
+    {'labels': ['WORK']},
+    {'labels': ['INBOX', 'WORK'], 'is_unread': True},
+    {'is_archived': True},
+]
+
+
+class TestFilterBitmapIndex:
+    """Tests pour l'index de filtres par bitmaps."""
+
+    def test_evaluate_combines_bitmaps(self):
+        """Test l'évaluation AND/OR/NOT des bitmaps."""
+        index = FilterBitmapIndex()
+        index.set_message("m1", {'important', 'label:WORK'})
+        index.set_message("m2", {'label:INBOX', 'unread'})
+        index.set_message("m3", {'important', 'unread', 'label:INBOX'})
+
+        assert index.evaluate({}) is None
+        assert index.select(index.evaluate({'is_important': True, 'is_unread': True})) == ["m3"]
+        assert index.select(index.evaluate({'is_important': False})) == ["m2"]
+        assert index.select(index.evaluate({'labels': ['WORK', 'INBOX']})) == ["m1", "m2", "m3"]
+        assert index.select(index.evaluate({'labels': ['SPAM']})) == []
+
+    def test_grows_and_updates(self):
+        """Test l'agrandissement des bitmaps et la mise à jour d'un message."""
+        index = FilterBitmapIndex()
+        for i in range(3000):
+            index.set_message(f"m{i}", {'unread'} if i % 2 else set())
+
+        assert int(index.evaluate({'is_unread': True}).sum()) == 1500
+
+        index.set_message("m1", set())
+        assert not index.contains(index.evaluate({'is_unread': True}), "m1")
+
+    def test_serialization_roundtrip(self):
+        """Test la compression et la reconstruction des bitmaps."""
+        index = FilterBitmapIndex()
+        for i in range(13):
+            index.set_message(f"m{i}", {'important'} if i % 3 == 0 else {'label:WORK'})
+
+        names, packed = index.to_arrays()
+        restored = FilterBitmapIndex.from_arrays(index.message_ids, names, packed)
+
+        for name in names:
+            assert (restored.bitmap(name) == index.bitmap(name)).all()
+
+
+class TestBitmapFilters:
+    """Tests de cohérence entre bitmaps et filtres par message."""
+
+    @pytest.mark.parametrize("filters", FILTER_COMBINATIONS)
+    def test_mask_matches_message_filters(self, search_graph, filters):
+        """Test que le masque retient exactement les messages acceptés par les filtres."""
+        engine = GraphSearchEngine(search_graph)
+        search_service = engine.search_service
+        indexing = engine.indexing_service
+
+        mask = indexing.filter_index.evaluate(filters)
+        expected = [
+            message_id for message_id, data in indexing.message_nodes.items()
+            if search_service._apply_message_filters(message_id, data, filters)
+        ]
+
+        assert indexing.filter_index.select(mask) == expected
+
+    def test_negation_filter_in_combined_search(self, search_graph):
+        """Test que is_important=False exclut les messages importants."""
+        engine = GraphSearchEngine(search_graph)
+        results = engine.search({
+            'query_type': 'combined', 'semantic_text': 'réunion notes',
+            'filters': {'is_important': False}, 'limit': 100
+        })
+
+        assert all(not r.is_important for r in results)
+
+    def test_refresh_after_attribute_change(self, search_graph):
+        """Test que les bitmaps suivent les changements d'état des messages."""
+        engine = GraphSearchEngine(search_graph)
+        indexing = engine.indexing_service
+        message_id = next(m for m, d in indexing.message_nodes.items() if d.get('is_unread'))
+
+        search_graph.nodes[message_id]['is_unread'] = False
+        indexing.refresh_message_attributes([message_id])
+
+        assert not indexing.filter_index.contains(indexing.filter_index.evaluate({'is_unread': True}), message_id)
+
+    def test_bitmaps_survive_persistence(self, search_graph, tmp_path):
+        """Test que les bitmaps rechargés sont identiques aux bitmaps construits."""
+        built = GraphSearchEngine(search_graph, index_path=tmp_path).indexing_service.filter_index
+        loaded = GraphSearchEngine(search_graph, index_path=tmp_path).indexing_service.filter_index
+
+        assert loaded.message_ids == built.message_ids
+        for filters in FILTER_COMBINATIONS:
+            assert loaded.select(loaded.evaluate(filters)) == built.select(built.evaluate(filters))
+
+    def test_bitmaps_follow_persisted_doc_order(self, search_graph, tmp_path):
+        """Test que les bitmaps rechargés suivent la table des documents, pas l'ordre du graphe."""
+        search_graph.graph['version'] = 1
+        built = GraphSearchEngine(search_graph, index_path=tmp_path).indexing_service.filter_index
+
+        reordered = nx.MultiDiGraph(version=1)
+        reordered.add_nodes_from(reversed(list(search_graph.nodes(data=True))))
+        reordered.add_edges_from(search_graph.edges(keys=True, data=True))
+        loaded = GraphSearchEngine(reordered, index_path=tmp_path).indexing_service.filter_index
+
+        for filters in FILTER_COMBINATIONS:
+            assert sorted(loaded.select(loaded.evaluate(filters))) == sorted(built.select(built.evaluate(filters)))
@@ -0,0 +1,111 @@
+from backend.app.services.email_graph.search.config import INDEX_STORE_CONFIG
+from backend.app.services.email_graph.search.search_manager import GraphSearchEngine
+from backend.app.services.email_graph.tests.search.conftest import build_graph, build_processor
+
+
+QUERIES = [
+    {'query_type': 'semantic', 'semantic_text': 'facture projet réunion', 'filters': {}, 'limit': 100},
+    {'query_type': 'contact', 'semantic_text': '', 'filters': {'contact_name': 'Pierre'}, 'limit': 100},
+    {'query_type': 'time_range', 'semantic_text': '', 'filters': {'date_from': '2025-02-05',
+                                                                  'date_to': '2025-02-15'}, 'limit': 100},
+]
+
+
+def snapshot(engine, query):
+    return sorted((r.message_id, round(r.total_score, 6)) for r in engine.search(dict(query)))
+
+
+class TestIncrementalIndexing:
+    """Tests pour l'indexation incrémentale des nouveaux messages."""
+
+    def test_update_graph_matches_full_build(self, search_emails):
+        """Test qu'une mise à jour incrémentale équivaut à une reconstruction complète."""
+        processor = build_processor(search_emails[:16])
+        engine = GraphSearchEngine(processor.graph)
+
+        for email in search_emails[16:]:
+            processor.email_processing_service.process_single_email(email)
+        engine.update_graph(processor.graph)
+        engine.indexing_service.refresh_graph_metrics()
+        fresh = GraphSearchEngine(processor.graph)
+
+        for section in ('index_stats', 'graph_info'):
+            assert engine.get_search_statistics()[section] == fresh.get_search_statistics()[section]
+        for query in QUERIES:
+            assert snapshot(engine, query) == snapshot(fresh, query)
+
+    def test_idf_follows_document_frequency(self, search_graph):
+        """Test que l'IDF est recalculé à partir de N et DF."""
+        engine = GraphSearchEngine(search_graph)
+        idf_before = engine.indexing_service.get_idf('budget')
+
+        search_graph.add_node("msg-new@company.com", type="message", subject="Budget",
+                              content="Budget annuel", date="2025-03-02T09:00:00")
+        assert engine.index_messages(["msg-new@company.com"]) == 1
+        assert engine.index_messages(["msg-new@company.com"]) == 0
+
+        assert engine.indexing_service.document_frequency['budget'] == 1
+        assert engine.indexing_service.get_idf('budget') < idf_before
+
+    def test_pagerank_refresh_is_deferred(self, search_graph):
+        """Test que le PageRank n'est recalculé qu'une fois le budget de fraîcheur épuisé."""
+        engine = GraphSearchEngine(search_graph)
+        indexing = engine.indexing_service
+
+        search_graph.add_node("msg-new@company.com", type="message", subject="Note",
+                              content="Courte note", date="2025-03-02T09:00:00")
+        engine.index_messages(["msg-new@company.com"])
+        assert indexing.pending_metric_updates == 1
+
+        indexing.refresh_graph_metrics()
+        assert indexing.pending_metric_updates == 0
+
+    def test_foreign_graph_triggers_rebuild(self, search_emails):
+        """Test qu'un graphe sans les nœuds indexés force une reconstruction complète."""
+        engine = GraphSearchEngine(build_graph(search_emails))
+        smaller_graph = build_graph(search_emails[:10])
+
+        engine.update_graph(smaller_graph)
+        assert engine.get_search_statistics()['index_stats']['messages'] == 10
+
+    def test_incremental_update_appends_delta_segment(self, search_emails, tmp_path, monkeypatch):
+        """Test qu'une mise à jour persistée écrit un segment sans réécrire les tableaux."""
+        monkeypatch.setitem(INDEX_STORE_CONFIG, 'max_delta_ratio', 1.0)
+        processor = build_processor(search_emails[:16])
+        engine = GraphSearchEngine(processor.graph, index_path=tmp_path)
+        store = engine.index_store
+        files_before = store.read_manifest()['files']
+
+        new_ids = [email["Message-ID"] for email in search_emails[16:]]
+        for email in search_emails[16:]:
+            processor.email_processing_service.process_single_email(email)
+        engine.update_graph(processor.graph, added_message_ids=new_ids)
+        engine.flush_index()
+
+        manifest = store.read_manifest()
+        assert manifest['files'] == files_before
+        assert len(manifest['deltas']) == 1
+        assert manifest['total_messages'] == len(search_emails)
+
+        reloaded = GraphSearchEngine(processor.graph, index_path=tmp_path)
+        assert store.read_manifest()['deltas'] == manifest['deltas']
+        for query in QUERIES:
+            assert snapshot(reloaded, query) == snapshot(engine, query)
+
+    def test_new_graph_refreshes_only_changed_messages(self, search_emails):
+        """Test qu'un nouveau graphe ne rafraîchit que les messages modifiés."""
+        engine = GraphSearchEngine(build_graph(search_emails))
+        contact_index = engine.indexing_service.get_contact_index()
+
+        new_graph = engine.graph.copy()
+        new_graph.nodes["msg001@company.com"]['is_important'] = True
+        refreshed = []
+        refresh = engine.indexing_service.refresh_message_attributes
+        engine.indexing_service.refresh_message_attributes = lambda ids: refreshed.extend(ids) or refresh(ids)
+
+        engine.update_graph(new_graph)
+
+        assert refreshed == ["msg001@company.com"]
+        assert engine.indexing_service.contact_index is contact_index
+        filter_index = engine.indexing_service.filter_index
+        assert filter_index.contains(filter_index.evaluate({'is_important': True}), "msg001@company.com")
@@ -0,0 +1,106 @@
+import numpy as np
+from backend.app.services.email_graph.search.search_manager import GraphSearchEngine
+from backend.app.services.email_graph.search.index_store import (
+    SearchIndexStore,
+    StringTable,
+    PostingsView,
+    compute_graph_fingerprint
+)
+
+
+def result_ids(engine, semantic_query):
+    return sorted(r.message_id for r in engine.search(dict(semantic_query, limit=100)))
+
+
+class TestStringTable:
+    """Tests pour la table de chaînes encodées."""
+
+    def test_roundtrip_and_lookup(self):
+        """Test l'encodage et la recherche dichotomique."""
+        strings = sorted(["réunion", "facture", "projet", "zèbre"])
+        table = StringTable(*StringTable.encode(strings))
+
+        assert len(table) == 4
+        assert [table[i] for i in range(len(table))] == strings
+        assert table.index("projet") == strings.index("projet")
+        assert table.index("absent") == -1
+
+
+class TestPostingsView:
+    """Tests pour la vue paresseuse sur les postings."""
+
+    def test_behaves_like_defaultdict(self):
+        """Test l'accès, l'ajout et la suppression de clés."""
+        docs = StringTable(*StringTable.encode(["m1", "m2", "m3"]))
+        keys = StringTable(*StringTable.encode(["a", "b"]))
+        view = PostingsView(keys, [0, 2, 3], np.array([0, 2, 1]), docs)
+
+        assert view["a"] == {"m1", "m3"}
+        assert "c" not in view
+        view["c"].add("m2")
+        assert len(view) == 3
+        del view["b"]
+        assert sorted(view) == ["a", "c"]
+
+
+class TestSearchIndexStore:
+    """Tests pour la persistance des index."""
+
+    def test_reload_matches_fresh_build(self, search_graph, tmp_path):
+        """Test qu'un index rechargé donne les mêmes résultats qu'un index construit."""
+        built = GraphSearchEngine(search_graph, index_path=tmp_path)
+        store = SearchIndexStore(tmp_path)
+        assert store.is_valid_for(compute_graph_fingerprint(search_graph))
+
+        reloaded = GraphSearchEngine(search_graph, index_path=tmp_path)
+        assert reloaded.get_search_statistics()['index_stats'] == built.get_search_statistics()['index_stats']
+
+        queries = [
+            {'query_type': 'semantic', 'semantic_text': 'facture services', 'filters': {}},
+            {'query_type': 'contact', 'semantic_text': '', 'filters': {'contact_name': 'Marie'}},
+            {'query_type': 'time_range', 'semantic_text': '', 'filters': {'date_from': '2025-02-20',
+                                                                          'date_to': '2025-02-27'}},
+        ]
+        for query in queries:
+            assert result_ids(reloaded, query) == result_ids(built, query)
+
+    def test_subject_terms_reloaded(self, search_graph, tmp_path):
+        """Test que les termes du sujet sont persistés et que le sujet n'est pas renormalisé à la requête."""
+        built = GraphSearchEngine(search_graph, index_path=tmp_path)
+        reloaded = GraphSearchEngine(search_graph, index_path=tmp_path)
+        term = reloaded.indexing_service.analyzer.term('facture')
+
+        assert set(reloaded.indexing_service.subject_term_index[term]) == built.indexing_service.subject_term_index[term]
+
+        reloaded.indexing_service.analyzer.normalize_field = None
+        scores = reloaded.search_service.search_by_content('facture', {})
+        assert scores == built.search_service.search_by_content('facture', {})
+
+    def test_rebuild_on_graph_change(self, search_graph, tmp_path):
+        """Test que l'index est reconstruit quand le graphe change."""
+        GraphSearchEngine(search_graph, index_path=tmp_path)
+        old_fingerprint = compute_graph_fingerprint(search_graph)
+
+        search_graph.add_node("msg-new@company.com", type="message", subject="Budget annuel",
+                              content="Nouveau budget", date="2025-03-02T09:00:00")
+        new_fingerprint = compute_graph_fingerprint(search_graph)
+        assert new_fingerprint != old_fingerprint
+
+        engine = GraphSearchEngine(search_graph, index_path=tmp_path)
+        assert SearchIndexStore(tmp_path).is_valid_for(new_fingerprint)
+        assert "msg-new@company.com" in result_ids(
+            engine, {'query_type': 'semantic', 'semantic_text': 'budget', 'filters': {}}
+        )
+
+    def test_same_length_edit_changes_fingerprint(self, search_graph):
+        """Test qu'une modification de contenu de même longueur change l'empreinte."""
+        message_id = next(n for n, d in search_graph.nodes(data=True) if d.get('type') == 'message')
+        old_fingerprint = compute_graph_fingerprint(search_graph)
+
+        search_graph.nodes[message_id]['subject'] = search_graph.nodes[message_id]['subject'].swapcase()
+        assert compute_graph_fingerprint(search_graph) != old_fingerprint
+
+    def test_graph_version_overrides_checksum(self, search_graph):
+        """Test que la version explicite du graphe sert d'empreinte."""
+        search_graph.graph['version'] = 42
+        assert compute_graph_fingerprint(search_graph) == "version:42"
@@ -0,0 +1,62 @@
+import pytest
+from backend.app.services.email_graph.search.search_manager import GraphSearchEngine
+from backend.app.services.email_graph.tests.search.conftest import CENTRAL_USER
+
+
+def traverse_relations(graph, message_id):
+    """Relations d'un message obtenues par parcours direct du graphe."""
+    sender = next((u for u, _, d in graph.in_edges(message_id, data=True) if d.get('type') == 'SENT'), None)
+    recipients = {'to': [], 'cc': [], 'bcc': []}
+    thread = None
+    for _, v, d in graph.out_edges(message_id, data=True):
+        role = {'RECEIVED': 'to', 'CC': 'cc', 'BCC': 'bcc'}.get(d.get('type'))
+        if role:
+            recipients[role].append(v)
+        elif d.get('type') == 'PART_OF_THREAD' and thread is None:
+            thread = v
+    return sender, recipients, thread
+
+
+class TestMessageRelationTables:
+    """Tests pour les tables plates message -> expéditeur/destinataires/thread."""
+
+    @pytest.mark.parametrize("persisted", [False, True])
+    def test_tables_match_graph(self, search_graph, tmp_path, persisted):
+        """Test que les tables précalculées correspondent aux relations du graphe."""
+        if persisted:
+            GraphSearchEngine(search_graph, index_path=tmp_path)
+        engine = GraphSearchEngine(search_graph, index_path=tmp_path if persisted else None)
+        indexing = engine.indexing_service
+
+        for message_id in indexing.message_nodes:
+            sender, recipients, thread = traverse_relations(search_graph, message_id)
+            assert indexing.message_sender_index.get(message_id) == sender
+            assert indexing.get_message_recipients(message_id) == recipients
+            assert indexing.message_thread_index.get(message_id) == thread
+
+            sender_email = search_graph.nodes[sender].get('email')
+            assert (message_id in indexing.sent_by_central) == (sender_email == CENTRAL_USER)
+
+    def test_message_type_filter(self, search_graph):
+        """Test le filtre sent/received basé sur l'utilisateur central."""
+        engine = GraphSearchEngine(search_graph)
+        query = {'query_type': 'combined', 'semantic_text': 'facture projet réunion', 'limit': 100}
+
+        sent = engine.search(dict(query, filters={'message_type': 'sent'}))
+        received = engine.search(dict(query, filters={'message_type': 'received'}))
+
+        assert sent and all(r.sender_email == CENTRAL_USER for r in sent)
+        assert received and all(r.sender_email != CENTRAL_USER for r in received)
+        assert len(sent) + len(received) == len(engine.indexing_service.message_nodes)
+
+    def test_result_enrichment_uses_tables(self, search_graph):
+        """Test que l'enrichissement des résultats expose expéditeur, destinataires et thread."""
+        engine = GraphSearchEngine(search_graph)
+        results = engine.search({'query_type': 'semantic', 'semantic_text': 'facture', 'filters': {}})
+
+        assert results
+        for result in results:
+            assert result.sender_email
+            assert result.recipients
+            assert result.thread_id is not None
+            assert result.thread_size >= 1
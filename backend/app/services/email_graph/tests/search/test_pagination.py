@@ -0,0 +1,97 @@
+import pytest
+from backend.app.services.email_graph.search.search_manager import GraphSearchEngine
+
+
+QUERY = {'query_type': 'semantic', 'semantic_text': 'facture projet réunion notes', 'filters': {}}
+
+
+@pytest.fixture
+def engine(search_graph):
+    """Fixture pour un moteur de recherche indexé."""
+    return GraphSearchEngine(search_graph)
+
+
+class TestLazyEnrichment:
+    """Tests pour le classement top-k et l'enrichissement paresseux."""
+
+    def test_top_k_matches_full_sort(self, engine):
+        """Test que la sélection top-k correspond au tri complet des résultats."""
+        everything = engine.search(dict(QUERY, limit=1000))
+        top = engine.search(dict(QUERY, limit=5))
+
+        assert len(everything) > 5
+        expected = sorted(everything, key=lambda r: r.total_score, reverse=True)[:5]
+        assert [r.message_id for r in top] == [r.message_id for r in expected]
+
+    def test_total_scores_use_weighted_components(self, engine):
+        """Test que le score total pondère les composants du résultat."""
+        results = engine.search(dict(QUERY, limit=3))
+
+        assert results and all(r.total_score > 0 for r in results)
+
+    def test_only_page_is_hydrated(self, engine, monkeypatch):
+        """Test que seuls les résultats de la page sont enrichis."""
+        calls = []
+        original = engine.result_service._create_single_result
+
+        def tracking(message_id, *args):
+            calls.append(message_id)
+            return original(message_id, *args)
+
+        monkeypatch.setattr(engine.result_service, '_create_single_result', tracking)
+        page = engine.search_page(dict(QUERY, limit=3))
+
+        assert page.total > 3
+        assert len(calls) == 3
+
+
+class TestPagination:
+    """Tests pour la pagination offset/curseur."""
+
+    def test_cursor_walks_all_results(self, engine):
+        """Test que le parcours par curseur couvre le classement complet sans doublon."""
+        everything = [r.message_id for r in engine.search(dict(QUERY, limit=1000))]
+
+        collected = []
+        page = engine.search_page(dict(QUERY, limit=4))
+        collected.extend(r.message_id for r in page.results)
+        while page.next_cursor:
+            page = engine.search_page(dict(QUERY, limit=4), cursor=page.next_cursor)
+            collected.extend(r.message_id for r in page.results)
+
+        assert collected == everything
+        assert page.total == len(everything)
+
+    def test_offset_reuses_cached_ranking(self, engine, monkeypatch):
+        """Test que la page suivante ne relance pas la recherche."""
+        first = engine.search_page(dict(QUERY, limit=2))
+
+        def fail(*args, **kwargs):
+            raise AssertionError("recherche relancée")
+
+        monkeypatch.setattr(engine, '_execute_search_by_mode', fail)
+        second = engine.search_page(dict(QUERY, limit=2), offset=2)
+
+        assert second.offset == 2
+        assert not {r.message_id for r in first.results} & {r.message_id for r in second.results}
+
+    def test_cursor_bound_to_query(self, engine):
+        """Test qu'un curseur ne peut pas être utilisé pour une autre requête."""
+        page = engine.search_page(dict(QUERY, limit=2))
+        other = {'query_type': 'semantic', 'semantic_text': 'facture', 'filters': {}, 'limit': 2}
+
+        with pytest.raises(ValueError):
+            engine.search_page(other, cursor=page.next_cursor)
+        with pytest.raises(ValueError):
+            engine.search_page(other, cursor="pas-un-curseur")
+
+    def test_index_update_invalidates_ranking(self, engine, search_graph):
+        """Test qu'un nouveau message indexé invalide les classements en cache."""
+        query = {'query_type': 'semantic', 'semantic_text': 'budget', 'filters': {}, 'limit': 10}
+        assert engine.search_page(query).total == 0
+
+        search_graph.add_node("msg-new@company.com", type="message", subject="Budget",
+                              content="Budget annuel", date="2025-03-02T09:00:00")
+        engine.index_messages(["msg-new@company.com"])
+
+        assert engine.search_page(query).total == 1
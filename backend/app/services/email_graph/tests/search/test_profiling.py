@@ -0,0 +1,138 @@
+import pytest
+from backend.app.services.email_graph.search.profiling import (
+    NULL_PROFILE, LatencyHistogram, SearchProfile, SearchProfiler, current_profile
+)
+from backend.app.services.email_graph.search.search_manager import GraphSearchEngine
+
+
+CONTENT_QUERY = {'query_type': 'semantic', 'semantic_text': 'facture', 'filters': {}, 'limit': 5}
+COMBINED_QUERY = {
+    'query_type': 'combined', 'semantic_text': 'facture',
+    'filters': {'topic_ids': ['facturation'], 'recipient_name': 'marie'}, 'limit': 5
+}
+
+
+@pytest.fixture
+def engine(search_graph):
+    """Fixture pour un moteur de recherche indexé."""
+    return GraphSearchEngine(search_graph)
+
+
+def stage_names(page):
+    return [stage['name'] for stage in page.profile['stages']]
+
+
+class TestDisabledProfiling:
+    """Tests du comportement par défaut, sans profilage."""
+
+    def test_no_debug_section(self, engine):
+        """Test que la page ne contient pas de section debug par défaut."""
+        page = engine.search_page(CONTENT_QUERY)
+
+        assert page.profile is None
+        assert 'debug' not in page.to_dict()
+        assert engine.get_search_statistics()['profiling']['profiled_searches'] == 0
+
+    def test_null_profile_outside_search(self, engine):
+        """Test que le profil courant est neutre en dehors d'une recherche profilée."""
+        engine.search_page(CONTENT_QUERY, profile=True)
+
+        assert current_profile() is NULL_PROFILE
+        with NULL_PROFILE.stage('x') as stage:
+            stage.set_count(3)
+
+
+class TestSearchProfile:
+    """Tests des profils par requête."""
+
+    def test_stages_and_counts(self, engine):
+        """Test les étapes mesurées et le nombre de candidats de chacune."""
+        page = engine.search_page(CONTENT_QUERY, profile=True)
+        profile = page.profile
+        stages = {stage['name']: stage for stage in profile['stages']}
+
+        assert stage_names(page) == [
+            'mode_detection', 'filtering', 'candidates.content', 'fusion', 'top_k', 'enrichment'
+        ]
+        assert profile['mode'] == 'content'
+        assert stages['candidates.content']['count'] == page.total
+        assert stages['fusion']['count'] == page.total
+        assert stages['enrichment']['count'] == len(page.results)
+        assert profile['total_ms'] > 0
+        assert page.to_dict()['debug']['profile'] == profile
+
+    def test_combined_plan_stages(self, engine):
+        """Test que les étapes du plan combiné sont mesurées avec leurs candidats."""
+        page = engine.search_page(COMBINED_QUERY, profile=True)
+        stages = {stage['name']: stage for stage in page.profile['stages']}
+        plan = engine.search_service.planner.last_plan
+
+        assert page.profile['mode'] == 'combined'
+        assert 'planning' in stages
+        for name, _, count in plan:
+            assert stages[f'combined.{name}']['count'] == count
+
+    def test_cached_page_is_annotated(self, engine):
+        """Test qu'une page servie depuis le cache est signalée sans étapes de recherche."""
+        engine.search_page(CONTENT_QUERY)
+        page = engine.search_page(CONTENT_QUERY, profile=True)
+
+        assert page.profile['cache'] == 'page'
+        assert page.profile['stages'] == []
+
+    def test_results_unchanged(self, engine):
+        """Test que le profilage ne modifie pas les résultats."""
+        plain = engine.search_page(COMBINED_QUERY)
+        engine._result_cache.clear()
+        engine._ranking_cache.clear()
+        profiled = engine.search_page(COMBINED_QUERY, profile=True)
+
+        assert [r.message_id for r in profiled.results] == [r.message_id for r in plain.results]
+        assert [r.total_score for r in profiled.results] == [r.total_score for r in plain.results]
+
+    def test_repeated_stage_accumulates(self):
+        """Test qu'une étape mesurée plusieurs fois est cumulée."""
+        profile = SearchProfile()
+        with profile.stage('filtering', count=2):
+            pass
+        with profile.stage('filtering', count=3):
+            pass
+
+        assert profile.stages == [{'name': 'filtering', 'ms': profile.stages[0]['ms'], 'count': 5, 'calls': 2}]
+
+
+class TestProfilerStatistics:
+    """Tests des histogrammes agrégés."""
+
+    def test_histograms_in_statistics(self, engine):
+        """Test que les statistiques exposent les histogrammes des étapes profilées."""
+        engine.profiler.set_enabled(True)
+        engine.search_page(CONTENT_QUERY)
+        engine.search_page({**CONTENT_QUERY, 'semantic_text': 'projet'})
+
+        stats = engine.get_search_statistics()['profiling']
+        assert stats['profiled_searches'] == 2
+        assert stats['stages']['total']['count'] == 2
+        assert stats['stages']['enrichment']['count'] == 2
+        assert stats['stages']['enrichment']['mean_candidates'] > 0
+        assert sum(stats['stages']['total']['buckets'].values()) == 2
+
+    def test_sampling(self):
+        """Test que l'échantillonnage exclut les recherches non tirées."""
+        profiler = SearchProfiler(enabled=True, sample_rate=0.0)
+
+        assert profiler.begin() is NULL_PROFILE
+        assert profiler.begin(force=True).enabled
+        profiler.end(current_profile())
+
+    def test_histogram_percentiles(self):
+        """Test les percentiles de l'histogramme à seuils fixes."""
+        histogram = LatencyHistogram([1, 10, 100])
+        for value in [0.5] * 50 + [5] * 45 + [50] * 4 + [500]:
+            histogram.observe(value)
+
+        assert histogram.percentile(0.5) == 1
+        assert histogram.percentile(0.95) == 10
+        assert histogram.percentile(0.99) == 100
+        assert histogram.percentile(1.0) == 500
+        assert histogram.to_dict()['buckets'] == {'<=1': 50, '<=10': 45, '<=100': 4, '>100': 1}
@@ -0,0 +1,97 @@
+from backend.app.services.email_graph.search.query_cache import QueryResultCache
+from backend.app.services.email_graph.search.search_manager import GraphSearchEngine
+
+
+QUERY = {'query_type': 'semantic', 'semantic_text': 'Facture  services', 'filters': {'is_unread': True}, 'limit': 5}
+
+
+class TestQueryResultCache:
+    """Tests pour le cache LRU/TTL des requêtes."""
+
+    def test_lru_eviction(self):
+        """Test l'éviction de l'entrée la moins récemment utilisée."""
+        cache = QueryResultCache(max_entries=2)
+        cache.put('a', 1, 'A')
+        cache.put('b', 1, 'B')
+        cache.get('a', 1)
+        cache.put('c', 1, 'C')
+
+        assert cache.get('b', 1) is None
+        assert cache.get('a', 1) == 'A'
+        assert cache.get_stats()['evictions'] == 1
+
+    def test_version_change_invalidates(self):
+        """Test que le changement de version vide le cache."""
+        cache = QueryResultCache(max_entries=4)
+        cache.put('a', 1, 'A')
+
+        assert cache.get('a', 2) is None
+        assert cache.get_stats()['invalidations'] == 1
+
+    def test_ttl_expiration(self, monkeypatch):
+        """Test l'expiration des entrées trop anciennes."""
+        now = [100.0]
+        monkeypatch.setattr('backend.app.services.email_graph.search.query_cache.time.monotonic', lambda: now[0])
+        cache = QueryResultCache(max_entries=4, ttl_seconds=10)
+        cache.put('a', 1, 'A')
+
+        now[0] += 5
+        assert cache.get('a', 1) == 'A'
+        now[0] += 20
+        assert cache.get('a', 1) is None
+        assert cache.get_stats()['expirations'] == 1
+
+
+class TestSearchCaching:
+    """Tests pour le cache de résultats du moteur de recherche."""
+
+    def test_identical_query_served_from_cache(self, search_graph, monkeypatch):
+        """Test qu'une requête équivalente ne relance ni recherche ni enrichissement."""
+        engine = GraphSearchEngine(search_graph)
+        first = engine.search(dict(QUERY))
+
+        def fail(*args, **kwargs):
+            raise AssertionError("recherche relancée")
+
+        monkeypatch.setattr(engine, '_execute_search_by_mode', fail)
+        monkeypatch.setattr(engine.result_service, 'create_search_results', fail)
+        again = engine.search(dict(QUERY, semantic_text=' facture services ', confidence=0.9))
+
+        assert [r.message_id for r in again] == [r.message_id for r in first]
+        stats = engine.get_search_statistics()['query_cache']
+        assert stats['hits'] == 1 and stats['misses'] == 1
+
+    def test_different_limit_is_a_different_entry(self, search_graph):
+        """Test que la limite fait partie de la clé du cache."""
+        engine = GraphSearchEngine(search_graph)
+        engine.search(dict(QUERY))
+        results = engine.search(dict(QUERY, limit=1))
+
+        assert len(results) == 1
+        assert engine.get_search_statistics()['query_cache']['misses'] == 2
+
+    def test_index_update_invalidates(self, search_graph):
+        """Test que l'indexation d'un nouveau message invalide le cache."""
+        engine = GraphSearchEngine(search_graph)
+        query = {'query_type': 'semantic', 'semantic_text': 'budget', 'filters': {}}
+        assert engine.search(query) == []
+
+        search_graph.add_node("msg-new@company.com", type="message", subject="Budget",
+                              content="Budget annuel", date="2025-03-02T09:00:00")
+        engine.index_messages(["msg-new@company.com"])
+
+        assert [r.message_id for r in engine.search(query)] == ["msg-new@company.com"]
+        assert engine.get_search_statistics()['query_cache']['invalidations'] == 1
+
+    def test_clear_caches(self, search_graph):
+        """Test que clear_caches force une nouvelle recherche sans toucher aux index."""
+        engine = GraphSearchEngine(search_graph)
+        first = engine.search(dict(QUERY))
+        index_version = engine.indexing_service.index_version
+
+        engine.clear_caches()
+        again = engine.search(dict(QUERY))
+
+        assert [r.message_id for r in again] == [r.message_id for r in first]
+        assert engine.get_search_statistics()['query_cache']['misses'] == 2
+        assert engine.indexing_service.index_version == index_version
@@ -0,0 +1,122 @@
+import pytest
+from collections import defaultdict
+from backend.app.services.email_graph.search.config import COMBINED_SEARCH_CONFIG
+from backend.app.services.email_graph.search.search_manager import GraphSearchEngine
+
+
+COMBINED_FILTERS = [
+    ('facture', {'topic_ids': ['facturation'], 'contact_email': 'marie.dupont@company.com'}),
+    ('réunion notes', {'topic_ids': ['meeting'], 'date_from': '2025-02-01', 'date_to': '2025-02-20'}),
+    ('projet', {'message_type': 'received', 'contact_name': 'pierre'}),
+    ('', {'topic_ids': ['projet'], 'recipient_name': 'Pierre'}),
+    ('facture', {'is_important': False, 'topic_ids': ['facturation']}),
+    ('', {'has_attachments': False}),
+    ('notes', {'topic_ids': ['meeting']}),
+    ('', {'topic_ids': ['projet'], 'date_from': '2025-02-15', 'date_to': '2025-03-01', 'contact_name': 'pierre'}),
+]
+
+
+def reference_combined(search, query, filters):
+    """Référence : sous-recherches complètes puis intersection ou union, comme avant le planificateur."""
+    search_results = {}
+    if query:
+        search_results['content'] = search.search_by_content(query, filters)
+    if filters.get('topic_ids'):
+        search_results['topics'] = search.search_by_topic(filters, query)
+    if any(filters.get(k) for k in ['contact_name', 'contact_email', 'recipient_name', 'recipient_email']):
+        search_results['user'] = search.search_by_user(filters, query)
+    if filters.get('date_from'):
+        search_results['temporal'] = search.search_by_temporal(filters, query)
+
+    all_results = [set(results) for results in search_results.values()]
+    active = [filters.get('topic_ids'), filters.get('has_attachments') is not None,
+              filters.get('contact_name') or filters.get('contact_email'),
+              filters.get('recipient_name') or filters.get('recipient_email'),
+              filters.get('date_from'), filters.get('message_type')]
+    multiple = sum(1 for a in active if a) > 1
+
+    combined = set.intersection(*all_results) if multiple and all_results else set().union(*all_results)
+    if filters.get('has_attachments') is False or filters.get('is_important') is False or filters.get('message_type'):
+        scanned = search.scan_filters(filters)
+        combined = scanned & combined if all_results else scanned
+
+    merged = defaultdict(lambda: defaultdict(float))
+    for message_id in combined:
+        for results in search_results.values():
+            for score_type, value in results.get(message_id, {}).items():
+                merged[message_id][score_type] += value
+    return {message_id: dict(scores) for message_id, scores in merged.items()}
+
+
+@pytest.fixture
+def engine(search_graph):
+    """Fixture pour un moteur de recherche indexé."""
+    return GraphSearchEngine(search_graph)
+
+
+class TestCombinedSearchPlanner:
+    """Tests pour le planificateur de la recherche combinée."""
+
+    @pytest.mark.parametrize("query,filters", COMBINED_FILTERS)
+    def test_matches_unplanned_combination(self, engine, query, filters):
+        """Test que les étapes restreintes donnent les mêmes scores que les sous-recherches complètes."""
+        search = engine.search_service
+        planned = {message_id: dict(scores) for message_id, scores in search.search_combined(query, filters).items()}
+
+        assert planned == reference_combined(search, query, filters)
+
+    def test_selective_stage_runs_first(self, engine):
+        """Test que l'étape la plus sélective est exécutée en premier et réduit les suivantes."""
+        search = engine.search_service
+        filters = {'topic_ids': ['facturation'], 'contact_email': 'marie.dupont@company.com'}
+
+        search.search_combined('facture réunion projet', filters)
+        plan = search.planner.last_plan
+
+        assert [name for name, _, _ in plan] == ['user', 'topics', 'content']
+        assert [estimate for _, estimate, _ in plan] == sorted(estimate for _, estimate, _ in plan)
+        assert all(plan[i + 1][2] <= plan[i][2] for i in range(len(plan) - 1))
+
+    def test_later_stages_score_only_survivors(self, engine, monkeypatch):
+        """Test que les étapes suivantes ne calculent que les candidats restants."""
+        search = engine.search_service
+        seen = []
+        original = search.scoring._calculate_freshness_score
+
+        def tracking(message_data):
+            seen.append(message_data.get('subject'))
+            return original(message_data)
+
+        monkeypatch.setattr(search.scoring, '_calculate_freshness_score', tracking)
+        search.search_combined('facture réunion projet', {
+            'topic_ids': ['facturation'], 'contact_email': 'marie.dupont@company.com'
+        })
+
+        assert seen and set(seen) == {'Facture mensuelle'}
+
+    def test_empty_stage_short_circuits(self, engine, monkeypatch):
+        """Test qu'une intersection vide arrête le plan."""
+        search = engine.search_service
+        monkeypatch.setattr(search, 'search_by_content', lambda *args: pytest.fail("étape inutile exécutée"))
+
+        results = search.search_combined('facture', {'topic_ids': ['facturation'], 'contact_email': 'absent@nowhere.com'})
+
+        assert results == {}
+        assert search.planner.last_plan[-1][2] is None
+
+    @pytest.mark.parametrize("query,filters", COMBINED_FILTERS)
+    def test_parallel_execution(self, engine, monkeypatch, query, filters):
+        """Test que l'exécution sur le pool de threads donne les mêmes résultats."""
+        search = engine.search_service
+        sequential = search.search_combined(query, filters)
+        monkeypatch.setitem(COMBINED_SEARCH_CONFIG, 'parallel', True)
+
+        assert search.search_combined(query, filters) == sequential
+
+    def test_results_follow_index_order(self, engine):
+        """Test que l'ordre des résultats est déterministe (ordre de l'index)."""
+        search = engine.search_service
+        results = search.search_combined('', {'topic_ids': ['projet', 'meeting']})
+        positions = engine.indexing_service.filter_index.positions
+
+        assert list(results) == sorted(results, key=positions.__getitem__)
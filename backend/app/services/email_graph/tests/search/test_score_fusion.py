@@ -0,0 +1,83 @@
+import random
+import numpy as np
+import pytest
+from backend.app.services.email_graph.search.config import SCORING_WEIGHTS
+from backend.app.services.email_graph.search.scoring_service import FusedScores, SearchScoringService
+from backend.app.services.email_graph.search.search_manager import GraphSearchEngine
+
+
+def reference_totals(score_components):
+    """Référence : double boucle Python sur les composants et les poids."""
+    totals = {}
+    message_ids = set()
+    for scores in score_components.values():
+        message_ids.update(scores)
+    for message_id in message_ids:
+        total = 0.0
+        for score_type, weight in SCORING_WEIGHTS.items():
+            total += score_components.get(score_type, {}).get(message_id, 0.0) * weight
+        totals[message_id] = total
+    return totals
+
+
+class TestFusedScores:
+    """Tests pour la sélection top-k vectorisée."""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_top_matches_stable_sort(self, seed):
+        """Test que chaque page correspond au tri stable par score décroissant."""
+        rng = random.Random(seed)
+        message_ids = [f"m{i}" for i in range(200)]
+        totals = np.array([rng.choice([0.0, 0.5, 1.0, rng.random()]) for _ in message_ids])
+        fused = FusedScores(message_ids, totals)
+
+        expected = sorted(zip(message_ids, totals.tolist()), key=lambda item: item[1], reverse=True)
+        for offset, limit in [(0, 10), (10, 10), (0, 1), (195, 10), (0, 500), (300, 5)]:
+            assert fused.top(offset, limit) == expected[offset:offset + limit]
+
+    def test_empty(self):
+        """Test le classement sans candidat."""
+        assert FusedScores([], np.zeros(0)).top(0, 10) == []
+
+
+class TestScoreFusion:
+    """Tests pour la fusion pondérée des composants."""
+
+    def test_calculate_total_scores_adapter(self):
+        """Test que l'adaptateur dict reproduit la somme pondérée historique."""
+        rng = random.Random(3)
+        components = {
+            score_type: {f"m{i}": rng.random() for i in rng.sample(range(50), 20)}
+            for score_type in ('content', 'temporal', 'user', 'graph', 'inconnu')
+        }
+
+        totals = SearchScoringService(indexing_service=None).calculate_total_scores(components)
+
+        assert dict(totals) == reference_totals(components)
+        assert totals['absent'] == 0.0
+
+    def test_fuse_scores_skips_unindexed_messages(self, search_graph):
+        """Test que la fusion ignore les messages absents de l'index."""
+        engine = GraphSearchEngine(search_graph)
+        message_id = next(iter(engine.indexing_service.message_nodes))
+
+        fused = engine.scoring_service.fuse_scores({
+            message_id: {'content': 1.0, 'user': 0.5},
+            'absent@company.com': {'content': 3.0}
+        })
+
+        assert fused.message_ids == [message_id]
+        assert fused.totals.tolist() == [SCORING_WEIGHTS['content'] + 0.5 * SCORING_WEIGHTS['user']]
+
+    def test_score_table_matches_dict_fusion(self, search_graph):
+        """Test que la fusion des vecteurs par position reproduit la fusion des dicts."""
+        engine = GraphSearchEngine(search_graph)
+        filters = {'topic_ids': ['facturation', 'meeting']}
+        results = engine.search_service.search_combined('facture réunion projet', filters)
+
+        fused = engine.scoring_service.fuse_scores(results)
+        expected = engine.scoring_service.fuse_scores({message_id: scores for message_id, scores in results.items()})
+
+        assert len(fused) == len(results) > 0
+        assert list(fused.message_ids) == expected.message_ids
+        assert fused.top(0, len(results)) == expected.top(0, len(results))
@@ -0,0 +1,67 @@
+import json
+from collections import Counter
+from backend.app.services.email_graph.benchmarks.synthetic_mailbox import SyntheticMailboxGenerator, CENTRAL_USER
+from backend.app.services.email_graph.benchmarks import search_benchmark
+from backend.app.services.email_graph.benchmarks.search_benchmark import compare_reports, run_benchmark
+
+
+class TestSyntheticMailbox:
+    """Tests pour le générateur de boîtes mail synthétiques."""
+
+    def test_reproducible(self):
+        """Test qu'une même graine produit la même boîte."""
+        first = SyntheticMailboxGenerator(seed=3).generate(500)
+        second = SyntheticMailboxGenerator(seed=3).generate(500)
+        other = SyntheticMailboxGenerator(seed=4).generate(500)
+
+        assert len(first) == 500
+        assert first == second
+        assert first != other
+
+    def test_distributions(self):
+        """Test les threads multi-messages et la concentration des contacts."""
+        emails = SyntheticMailboxGenerator(seed=0).generate(2000)
+
+        thread_sizes = Counter(email["Thread-ID"] for email in emails)
+        assert 1.5 < len(emails) / len(thread_sizes) < 3.5
+        assert max(thread_sizes.values()) > 3
+
+        contacts = Counter(email["From"] for email in emails if email["From"] != CENTRAL_USER)
+        top_share = sum(count for _, count in contacts.most_common(10)) / sum(contacts.values())
+        assert top_share > 0.2
+        assert len({email["Message-ID"] for email in emails}) == len(emails)
+
+
+class TestSearchBenchmark:
+    """Tests pour le rapport de benchmark."""
+
+    def test_report_is_json_serializable(self):
+        """Test qu'un petit benchmark produit un rapport complet."""
+        report = run_benchmark([150], queries_per_mode=3)
+        run = report['runs'][0]
+
+        assert json.loads(json.dumps(report)) == report
+        assert run['messages'] == 150
+        assert run['index_stats']['messages'] == 150
+        assert {'content', 'temporal', 'contact', 'topic', 'combined'} <= set(run['queries'])
+        assert all(stats['p50_ms'] <= stats['p99_ms'] for stats in run['queries'].values())
+
+    def test_compare_reports_flags_regressions(self):
+        """Test la détection des régressions entre deux rapports."""
+        def report(p50, index_build):
+            return {'runs': [{
+                'messages': 1000, 'graph_build_s': 1.0, 'index_build_s': index_build,
+                'memory_mb': {'peak': 100.0}, 'queries': {'content': {'p50_ms': p50, 'p95_ms': 5.0}}
+            }]}
+
+        assert compare_reports(report(2.0, 1.0), report(2.1, 1.0)) == []
+        assert compare_reports(report(2.0, 1.0), report(3.0, 1.5)) == [
+            (1000, 'index_build_s', 1.0, 1.5),
+            (1000, 'content.p50_ms', 2.0, 3.0)
+        ]
+
+    def test_memory_without_psutil(self, monkeypatch):
+        """Test que la mesure mémoire reste disponible sans psutil."""
+        monkeypatch.setattr(search_benchmark, 'PSUTIL_AVAILABLE', False)
+
+        assert search_benchmark.memory_usage_mb() > 0
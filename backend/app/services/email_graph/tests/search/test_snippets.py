@@ -0,0 +1,123 @@
+import pytest
+from backend.app.services.email_graph.search.config import SNIPPET_CONFIG
+from backend.app.services.email_graph.search.search_manager import GraphSearchEngine
+from backend.app.services.email_graph.tests.search.conftest import build_graph, make_search_emails
+
+
+FILLER = "texte sans rapport " * 20
+
+
+@pytest.fixture
+def engine():
+    """Fixture pour un moteur dont un message a un long contenu."""
+    emails = make_search_emails()
+    emails[0]["Content"] = (
+        "Budget initial évoqué. " + FILLER
+        + "Le budget du projet Atlas est validé <urgent> & confirmé. " + FILLER + "Fin du projet."
+    )
+    return GraphSearchEngine(build_graph(emails))
+
+
+def snippet_for(engine, query, message_id="msg000@company.com"):
+    content = engine.indexing_service.message_nodes[message_id]['content']
+    return engine.result_service._create_content_snippet(message_id, content, query)
+
+
+class TestSnippetWindow:
+    """Tests pour la sélection de la meilleure fenêtre de termes."""
+
+    def test_single_term_matches_previous_window(self, engine):
+        """Test qu'un terme unique donne la même fenêtre que l'ancien calcul."""
+        content = engine.indexing_service.message_nodes["msg000@company.com"]['content']
+        snippet, matched_terms, _ = snippet_for(engine, "atlas")
+
+        position = content.lower().find("atlas")
+        expected = content[position - SNIPPET_CONFIG['context_before']:position + SNIPPET_CONFIG['context_after']]
+        assert snippet == "..." + expected + "..."
+        assert matched_terms == ["atlas"]
+
+    def test_multi_term_window(self, engine):
+        """Test que la fenêtre retenue couvre le plus de termes distincts."""
+        snippet, matched_terms, _ = snippet_for(engine, "budget atlas validé")
+
+        assert "budget du projet Atlas est validé" in snippet
+        assert "Budget initial" not in snippet
+        assert matched_terms == ["budget", "atlas", "validé"]
+
+    def test_all_matched_terms_reported(self, engine):
+        """Test que tous les termes présents sont retournés, pas seulement les meilleurs."""
+        _, matched_terms, _ = snippet_for(engine, "projet budget absent")
+
+        assert matched_terms == ["budget", "projet"]
+
+    def test_whole_tokens_only(self, engine):
+        """Test qu'un fragment de mot n'est pas considéré comme une occurrence."""
+        snippet, matched_terms, highlighted = snippet_for(engine, "budg")
+
+        assert matched_terms == []
+        assert snippet.startswith("Budget initial")
+
+
+class TestHighlighting:
+    """Tests pour la mise en évidence des termes."""
+
+    def test_markup_and_escaping(self, engine):
+        """Test les balises autour des termes et l'échappement HTML du contenu."""
+        _, _, highlighted = snippet_for(engine, "atlas validé")
+
+        pre, post = SNIPPET_CONFIG['highlight_pre'], SNIPPET_CONFIG['highlight_post']
+        assert f"{pre}Atlas{post} est {pre}validé{post}" in highlighted
+        assert "&lt;urgent&gt; &amp; confirmé" in highlighted
+        assert "<urgent>" not in highlighted
+
+    def test_result_exposes_highlighted_snippet(self, engine):
+        """Test que les résultats de recherche exposent l'extrait mis en évidence."""
+        results = engine.search({'query_type': 'semantic', 'semantic_text': 'atlas', 'filters': {}, 'limit': 5})
+
+        assert results[0].message_id == "msg000@company.com"
+        data = results[0].to_dict()
+        assert SNIPPET_CONFIG['highlight_pre'] in data['highlighted_snippet']
+        assert data['matched_terms'] == ["atlas"]
+
+
+class TestTokenOffsetsCache:
+    """Tests pour le cache des positions des tokens."""
+
+    def test_offsets_point_into_original_content(self, engine):
+        """Test que les positions correspondent au texte original (majuscules et accents)."""
+        content = engine.indexing_service.message_nodes["msg000@company.com"]['content']
+        offsets = engine.indexing_service.get_token_offsets("msg000@company.com")
+
+        assert [content[a:b] for a, b in offsets["budget"]] == ["Budget", "budget"]
+        assert content[slice(*offsets["évoqué"][0])] == "évoqué"
+
+    def test_term_tokens_point_to_offsets(self, engine):
+        """Test que les formes du contenu sont regroupées par terme analysé."""
+        indexing = engine.indexing_service
+        offsets = indexing.get_token_offsets("msg000@company.com")
+        term_tokens = indexing.get_term_tokens("msg000@company.com")
+
+        assert term_tokens[indexing.analyzer.term("budget")] == ["budget"]
+        assert "évoqué" in term_tokens[indexing.analyzer.term("evoque")]
+        assert all(token in offsets for tokens in term_tokens.values() for token in tokens)
+
+    def test_cache_is_bounded(self, engine, monkeypatch):
+        """Test que le cache LRU respecte sa taille maximale."""
+        monkeypatch.setitem(SNIPPET_CONFIG, 'max_cached_offsets', 3)
+        indexing = engine.indexing_service
+        message_ids = list(indexing.message_nodes)[:5]
+
+        for message_id in message_ids:
+            indexing.get_token_offsets(message_id)
+
+        assert list(indexing.token_offsets_cache) == message_ids[2:]
+
+    def test_refresh_invalidates_offsets(self, engine):
+        """Test que le rafraîchissement d'un message invalide ses positions."""
+        indexing = engine.indexing_service
+        indexing.get_token_offsets("msg000@company.com")
+        indexing.message_nodes["msg000@company.com"]['content'] = "Nouveau contenu"
+
+        indexing.refresh_message_attributes(["msg000@company.com"])
+
+        assert list(indexing.get_token_offsets("msg000@company.com")) == ["nouveau", "contenu"]
@@ -0,0 +1,131 @@
+import base64
+import pytest
+from backend.app.services.email_graph.search.config import TEXT_ANALYZER_CONFIG
+from backend.app.services.email_graph.search.search_manager import GraphSearchEngine
+from backend.app.services.email_graph.search.text_analyzer import TextAnalyzer, fold_accents, light_stem
+from backend.app.services.email_graph.tests.search.conftest import build_graph, make_search_emails
+
+
+RAW_ANALYZER = {
+    'stopwords': {}, 'fold_accents': False, 'strip_markup': False, 'max_token_length': 10 ** 6,
+    'max_body_chars': 10 ** 6, 'max_tokens': None, 'max_df_ratio': 1.0
+}
+
+QUERIES = ['facture services', 'projet planning', 'réunion notes importantes', 'mise à jour', 'compte rendu']
+
+
+def result_ids(engine, text):
+    return [r.message_id for r in engine.search({'query_type': 'semantic', 'semantic_text': text, 'filters': {}})]
+
+
+@pytest.fixture
+def noisy_graph():
+    """Fixture pour un graphe dont tous les messages partagent une formule de politesse."""
+    emails = make_search_emails()
+    for email in emails:
+        email["Content"] += " Cordialement."
+    return build_graph(emails)
+
+
+class TestTextAnalyzer:
+    """Tests pour l'analyse des textes indexés."""
+
+    def test_stopwords_and_accents(self):
+        """Test la suppression des mots vides et des accents."""
+        analyzer = TextAnalyzer()
+
+        assert analyzer.analyze("Voici les notes de la Réunion avec l'équipe") == ['notes', 'reunion', 'equipe']
+        assert fold_accents("Été ÇA") == "ete ca"
+
+    def test_markup_is_stripped(self):
+        """Test que balises HTML, entités, URLs et fragments base64 ne sont pas indexés."""
+        analyzer = TextAnalyzer()
+        encoded = base64.b64encode(bytes(range(60))).decode()
+        text = f'<p class="body">Budget&nbsp;validé</p> <a href="https://track.example.com/abc?id=42">lien</a> {encoded}'
+
+        assert analyzer.analyze(text) == ['budget', 'valide', 'lien']
+
+    def test_message_caps(self, monkeypatch):
+        """Test les limites de longueur du contenu, du nombre de tokens et de la taille d'un token."""
+        monkeypatch.setitem(TEXT_ANALYZER_CONFIG, 'max_body_chars', 20)
+        monkeypatch.setitem(TEXT_ANALYZER_CONFIG, 'max_tokens', 3)
+        analyzer = TextAnalyzer()
+
+        assert analyzer.analyze_message("Sujet", "alpha beta gamma delta epsilon") == ['sujet', 'alpha', 'beta']
+        assert analyzer.analyze_message("Sujet", "gamma delta epsilon alpha") == ['sujet', 'gamma', 'delta']
+        assert analyzer.analyze_message("Sujet", "a" * 19 + " beta") == ['sujet', 'a' * 19]
+        assert TextAnalyzer().analyze("alpha " + "x" * 35) == ['alpha']
+
+    def test_light_stemming(self):
+        """Test que la racinisation légère rapproche les formes fléchies."""
+        analyzer = TextAnalyzer({'stemming': True})
+
+        assert len({analyzer.term(t) for t in ('facture', 'factures')}) == 1
+        assert len({analyzer.term(t) for t in ('validé', 'validée', 'validées')}) == 1
+        assert light_stem('meetings') == 'meeting'
+        assert light_stem('status') == 'status'
+
+
+class TestAnalyzedIndex:
+    """Tests de l'index construit avec l'analyseur."""
+
+    def test_accent_insensitive_search(self, search_graph):
+        """Test qu'une requête sans accents trouve les messages accentués."""
+        engine = GraphSearchEngine(search_graph)
+
+        assert result_ids(engine, 'reunion') == result_ids(engine, 'Réunion')
+        assert result_ids(engine, 'reunion')
+
+    def test_stopword_query(self, search_graph):
+        """Test qu'une requête composée de mots vides ne renvoie rien."""
+        engine = GraphSearchEngine(search_graph)
+
+        assert 'des' not in engine.indexing_service.inverted_index
+        assert result_ids(engine, 'les des avec') == []
+
+    def test_relevance_matches_raw_tokenization(self, search_graph, monkeypatch):
+        """Test que les requêtes de test retournent les mêmes messages qu'avec la tokenisation brute."""
+        analyzed = GraphSearchEngine(search_graph)
+        for key, value in RAW_ANALYZER.items():
+            monkeypatch.setitem(TEXT_ANALYZER_CONFIG, key, value)
+        raw = GraphSearchEngine(search_graph)
+
+        assert len(analyzed.indexing_service.inverted_index) < len(raw.indexing_service.inverted_index)
+        for query in QUERIES:
+            assert result_ids(analyzed, query)
+            assert set(result_ids(analyzed, query)) == set(result_ids(raw, query))
+
+
+class TestVocabularyPruning:
+    """Tests du seuil max-df."""
+
+    @pytest.fixture(autouse=True)
+    def small_corpus(self, monkeypatch):
+        monkeypatch.setitem(TEXT_ANALYZER_CONFIG, 'max_df_min_documents', 10)
+
+    def test_frequent_terms_are_pruned(self, noisy_graph):
+        """Test que les termes présents dans presque tous les messages sont retirés."""
+        indexing = GraphSearchEngine(noisy_graph).indexing_service
+
+        assert indexing.pruned_terms == {'cordialement'}
+        assert 'cordialement' not in indexing.inverted_index
+        assert 'cordialement' not in indexing.document_frequency
+        assert 'facture' in indexing.inverted_index
+        assert indexing.get_index_stats()['pruned_terms'] == 1
+
+    def test_pruned_terms_stay_out_incrementally(self, noisy_graph):
+        """Test qu'un message ajouté n'indexe pas un terme élagué."""
+        engine = GraphSearchEngine(noisy_graph)
+        noisy_graph.add_node("msg-new@company.com", type="message", subject="Budget",
+                             content="Budget validé. Cordialement", date="2025-03-02T09:00:00")
+        engine.index_messages(["msg-new@company.com"])
+
+        assert 'cordialement' not in engine.indexing_service.inverted_index
+        assert "msg-new@company.com" in engine.indexing_service.inverted_index['budget']
+
+    def test_pruned_terms_are_persisted(self, noisy_graph, tmp_path):
+        """Test que les termes élagués sont rechargés avec l'index persisté."""
+        GraphSearchEngine(noisy_graph, index_path=tmp_path)
+        reloaded = GraphSearchEngine(noisy_graph, index_path=tmp_path)
+
+        assert reloaded.indexing_service.pruned_terms == {'cordialement'}
@@ -0,0 +1,69 @@
+import pytest
+from backend.app.services.email_graph.search.search_manager import GraphSearchEngine
+
+
+def reference_topic_scores(message_nodes, expanded_topics):
+    """Référence : parcours complet avec les poids historiques (2.0 / 1.5 / 1.0)."""
+    scores = {}
+    for message_id, data in message_nodes.items():
+        topics = {t.lower() for t in data.get('topics', [])}
+        subject = data.get('subject', '').lower()
+        content = data.get('content', '').lower()
+        score = len(topics & expanded_topics) * 2.0
+        score += sum(1.5 for t in expanded_topics if t in subject)
+        score += sum(1.0 for t in expanded_topics if t in content)
+        if score > 0:
+            scores[message_id] = score
+    return scores
+
+
+TOPIC_QUERIES = [['facturation'], ['meeting', 'projet'], ['important'], ['planning'], ['inexistant']]
+
+
+class TestTopicIndex:
+    """Tests pour l'index inversé des topics."""
+
+    @pytest.mark.parametrize("topic_ids", TOPIC_QUERIES)
+    def test_matches_full_scan(self, search_graph, topic_ids):
+        """Test que les scores et l'ordre correspondent au parcours complet."""
+        engine = GraphSearchEngine(search_graph)
+        search_service = engine.search_service
+        expanded = search_service._expand_topics(topic_ids)
+
+        results = search_service.search_by_topic({'topic_ids': topic_ids})
+        expected = reference_topic_scores(engine.indexing_service.message_nodes, expanded)
+
+        assert list(results) == list(expected)
+        assert {m: s['content'] for m, s in results.items()} == expected
+
+    def test_incremental_messages_update_postings(self, search_graph):
+        """Test que les termes précalculés et mis en cache suivent les nouveaux messages."""
+        engine = GraphSearchEngine(search_graph)
+        indexing = engine.indexing_service
+        indexing.get_topic_postings('planning')
+
+        search_graph.add_node("msg-new@company.com", type="message", subject="Facture et planning",
+                              content="Planning de facturation", topics=["Facturation"],
+                              date="2025-03-02T09:00:00")
+        engine.index_messages(["msg-new@company.com"])
+
+        assert indexing.get_topic_postings('facturation')["msg-new@company.com"] == 3.0
+        assert indexing.get_topic_postings('facture')["msg-new@company.com"] == 1.5
+        assert indexing.get_topic_postings('planning')["msg-new@company.com"] == 2.5
+
+    def test_filters_applied_to_postings(self, search_graph):
+        """Test que les filtres booléens restreignent les résultats par topic."""
+        engine = GraphSearchEngine(search_graph)
+        results = engine.search_service.search_by_topic({'topic_ids': ['facturation'], 'is_unread': True})
+
+        assert results
+        assert all(engine.indexing_service.message_nodes[m].get('is_unread') for m in results)
+
+    def test_persisted_topic_index(self, search_graph, tmp_path):
+        """Test que l'index des topics rechargé donne les mêmes scores."""
+        built = GraphSearchEngine(search_graph, index_path=tmp_path)
+        loaded = GraphSearchEngine(search_graph, index_path=tmp_path)
+
+        for topic_ids in TOPIC_QUERIES:
+            filters = {'topic_ids': topic_ids}
+            assert loaded.search_service.search_by_topic(filters) == built.search_service.search_by_topic(filters)
@@ -15,16 +15,28 @@ Usage:
     # Lancer avec uvicorn app:app
 """
 
-from .main import app
-from .parsing.query_parser import get_query_parser
-from .query_transformer import get_query_transformer
-from .llm_engine import get_query_parser as get_llm_parser
-from .models import (
-    NaturalLanguageRequest,
-    SemanticQuery,
-    SearchFilter,
-    QueryType
-)
+import importlib
+
+# Exports chargés à la demande : importer un sous-module (utils, parsing, tests)
+# ne charge ni l'application FastAPI, ni spaCy, ni le LLM
+_EXPORTS = {
+    "app": (".main", "app"),
+    "get_query_parser": (".parsing.query_parser", "get_query_parser"),
+    "get_query_transformer": (".query_transformer", "get_query_transformer"),
+    "get_llm_parser": (".llm_engine", "get_query_parser"),
+    "NaturalLanguageRequest": (".models", "NaturalLanguageRequest"),
+    "SemanticQuery": (".models", "SemanticQuery"),
+    "SearchFilter": (".models", "SearchFilter"),
+    "QueryType": (".models", "QueryType"),
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _EXPORTS[name]
+    return getattr(importlib.import_module(module_name, __name__), attribute)
+
 
 __version__ = "1.0.0"
 __all__ = [
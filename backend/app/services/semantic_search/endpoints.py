@@ -5,6 +5,7 @@ Endpoint principal: /semantic-search/parse
 
 debuguerBreakpoint = True
 
+import logging
 import time
 from typing import Dict, Any
 from fastapi import APIRouter, HTTPException, Depends
@@ -16,6 +17,15 @@ from backend.app.services.semantic_search.models import (
     SemanticQuery
 )
 from backend.app.services.semantic_search.llm_engine import get_query_parser, MistralQueryParser
+from backend.app.services.semantic_search.llm_executor import (
+    get_llm_executor,
+    LLMQueueFullError,
+    LLMTimeoutError
+)
+from backend.app.services.semantic_search.llm_scheduler import get_batch_scheduler
+from backend.app.services.semantic_search.model_loader import get_model_loader, ComponentState
+
+logger = logging.getLogger(__name__)
 
 # Router pour les endpoints de recherche sémantique
 router = APIRouter(prefix="/semantic-search", tags=["semantic-search"])
@@ -26,6 +36,42 @@ async def get_parser() -> MistralQueryParser:
     return get_query_parser()
 
 
+async def parse_without_blocking(parser: MistralQueryParser, query: str, user_context: Dict[str, Any] = None):
+    """
+    Parse une requête sans bloquer la boucle d'événements
+
+    La génération LLM passe par l'ordonnanceur par micro-lots et l'exécuteur
+    dédié. Si la file est pleine, si le délai est dépassé ou si le modèle est
+    encore en chargement, la requête est parsée par le parser heuristique
+    (regex + spaCy).
+
+    Returns:
+        Tuple (résultat parsé, statut LLM: 'ok', 'loading', 'unavailable', 'queue_full' ou 'timeout')
+    """
+    if not parser.model:
+        if get_model_loader().state('llm') not in (ComponentState.PENDING, ComponentState.LOADING):
+            # Pas de modèle : le fallback à règles est immédiat
+            return parser.parse_query(query, user_context), 'unavailable'
+        # Modèle en cours de chargement : parser heuristique (regex, puis spaCy dès qu'il est prêt)
+        status = 'loading'
+    else:
+        try:
+            result = await get_batch_scheduler().parse(query, user_context)
+            return result, 'ok'
+        except LLMQueueFullError as e:
+            status = 'queue_full'
+            logger.warning("%s, utilisation du parser heuristique", e)
+        except LLMTimeoutError as e:
+            status = 'timeout'
+            logger.warning("%s, utilisation du parser heuristique", e)
+
+    # Import tardif : le parser heuristique charge spaCy
+    from backend.app.services.semantic_search.query_transformer import get_query_transformer
+    result = get_query_transformer().transform_heuristic(query)
+    result['_meta'] = {'model_used': 'heuristic', 'original_query': query, 'parsing_method': status}
+    return result, status
+
+
 @router.post("/parse", response_model=Dict[str, Any])
 async def parse_natural_language_query(
         request: NaturalLanguageRequest,
@@ -47,10 +93,9 @@ async def parse_natural_language_query(
     start_time = time.time()
 
     try:
-        # Parser la requête avec le LLM
-        parsed_result = parser.parse_query(
-            query=request.query,
-            user_context=request.user_context
+        # Parser la requête avec le LLM (hors de la boucle d'événements)
+        parsed_result, llm_status = await parse_without_blocking(
+            parser, request.query, request.user_context
         )
 
         # Validation avec Pydantic
@@ -58,7 +103,7 @@ async def parse_natural_language_query(
             semantic_query = SemanticQuery(**parsed_result)
         except ValidationError as e:
             # Si validation échoue, utiliser fallback
-            print(f"⚠️ Validation échouée, utilisation du fallback: {e}")
+            logger.warning("Validation échouée, utilisation du fallback: %s", e)
             fallback_result = parser._fallback_parser(request.query)
             semantic_query = SemanticQuery(**fallback_result)
 
@@ -70,7 +115,8 @@ async def parse_natural_language_query(
             "processing_time_ms": processing_time,
             "model_info": {
                 "used_llm": parsed_result.get('_meta', {}).get('model_used', 'unknown'),
-                "parsing_confidence": 0.9 if 'mistral' in str(parsed_result.get('_meta', {})) else 0.6
+                "parsing_confidence": 0.9 if 'mistral' in str(parsed_result.get('_meta', {})) else 0.6,
+                "llm_status": llm_status
             }
         }
 
@@ -87,11 +133,18 @@ async def parse_natural_language_query(
 async def health_check():
     """Vérification de l'état du service de recherche sémantique"""
     parser = get_query_parser()
+    loader = get_model_loader()
 
     return {
         "status": "healthy",
+        "ready": not loader.is_loading(),
+        "components": loader.get_status(),
         "llm_available": parser.model is not None,
         "model_path": parser.config.model_path,
+        "llm_prefix_cache": parser.get_prefix_cache_stats(),
+        "llm_generation": parser.get_generation_stats(),
+        "llm_executor": get_llm_executor().get_stats(),
+        "llm_batching": get_batch_scheduler().get_stats(),
         "service": "semantic-search"
     }
 
@@ -106,11 +159,12 @@ async def test_query_parsing(
     Utile pendant le développement.
     """
     try:
-        result = parser.parse_query(query)
+        result, llm_status = await parse_without_blocking(parser, query)
         return {
             "original_query": query,
             "parsed_result": result,
-            "model_used": result.get('_meta', {}).get('model_used', 'unknown')
+            "model_used": result.get('_meta', {}).get('model_used', 'unknown'),
+            "llm_status": llm_status
         }
     except Exception as e:
         return {
@@ -5,15 +5,16 @@ Optimisé avec inférence rapide et faible consommation.
 
 import json
 import time
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 
 # Import du système LangChain
 from .utils.langchain_helpers import get_langchain_parser
+from .utils.json_grammar import build_output_schema, schema_to_gbnf, estimate_token_budget
 
 # Import conditionnel pour compatibilité
 try:
-    from llama_cpp import Llama
+    from llama_cpp import Llama, LlamaGrammar
 
     LLAMA_CPP_AVAILABLE = True
 except ImportError:
@@ -35,6 +36,9 @@ class LLMConfig:
     use_mlock: bool = True  # OK sur serveur
     low_vram: bool = False  # Pas de contrainte VRAM
 
+    prefix_cache: bool = True  # Évaluer le préfixe fixe du prompt au chargement et restaurer son état
+    json_grammar: bool = True  # Décodage contraint par la grammaire JSON (SemanticQuery / SearchFilter)
+
 
 class MistralQueryParser:
     """
@@ -42,24 +46,49 @@ class MistralQueryParser:
     Transforme le langage naturel en structure JSON sémantique.
     """
 
-    def __init__(self, config: LLMConfig = None):
+    def __init__(self, config: LLMConfig = None, load_model: bool = True):
         self.config = config or LLMConfig()
-        self.model: Optional[Llama] = None
+        self.model: Optional["Llama"] = None
 
         # Initialiser le parser LangChain
         self.langchain_parser = get_langchain_parser()
+        self.prompt_prefix = self._build_prompt_prefix()
+
+        # État llama.cpp après évaluation du préfixe fixe (rempli au chargement du modèle)
+        self.prefix_tokens: List[int] = []
+        self.prefix_state = None
+        self.prefix_stats = {'reused': 0, 'restored': 0}
+
+        # Grammaire JSON (compilée au chargement du modèle) et schéma servant au budget de tokens
+        self.grammar = None
+        self.grammar_schema = None
+        self.generation_stats = {
+            'generations': 0, 'generated_tokens': 0, 'budget_tokens': 0, 'truncated': 0, 'invalid_json': 0
+        }
 
-        self._load_model()
+        if load_model:
+            self.load_model()
+
+    def load_model(self) -> bool:
+        """
+        Charge le modèle Mistral 7B GGUF
+
+        Peut être appelé depuis un thread de chargement : le modèle n'est visible
+        (self.model) qu'une fois la grammaire et le cache du préfixe prêts.
+
+        Returns:
+            True si le modèle est chargé
+        """
+        if self.model is not None:
+            return True
 
-    def _load_model(self):
-        """Charge le modèle Mistral 7B GGUF"""
         if not LLAMA_CPP_AVAILABLE:
             print("⚠️ llama-cpp-python non disponible, parser désactivé")
-            return
+            return False
 
         try:
             # Configuration optimisée serveur
-            self.model = Llama(
+            model = Llama(
                 model_path=self.config.model_path,
                 n_ctx=self.config.n_ctx,
                 n_threads=self.config.n_threads,
@@ -72,15 +101,115 @@ class MistralQueryParser:
             print("✅ Modèle Mistral 7B chargé avec succès")
         except Exception as e:
             print(f"❌ Erreur lors du chargement du modèle: {e}")
-            self.model = None
+            return False
 
-    def _build_prompt(self, query: str, user_context: Dict[str, Any] = None) -> str:
-        """Construit un prompt plus strict pour forcer la sortie JSON pure."""
+        self._load_grammar()
+        self._cache_prompt_prefix(model)
+        self.model = model
+        return True
+
+    def _load_grammar(self):
+        """Compile la grammaire GBNF dérivée des modèles SemanticQuery / SearchFilter"""
+        if not self.config.json_grammar:
+            return
+
+        try:
+            schema = build_output_schema()
+            self.grammar = LlamaGrammar.from_string(schema_to_gbnf(schema), verbose=False)
+            self.grammar_schema = schema
+            print("✅ Grammaire JSON chargée")
+        except Exception as e:
+            print(f"⚠️ Grammaire JSON indisponible: {e}")
+            self.grammar = None
+            self.grammar_schema = None
+
+    def _max_tokens(self, query: str) -> int:
+        """Budget de tokens d'une génération (dérivé du schéma et de la longueur de la requête avec la grammaire)"""
+        if not self.grammar:
+            return self.config.max_tokens
+        return min(self.config.max_tokens, estimate_token_budget(self.grammar_schema, len(query)))
+
+    def _cache_prompt_prefix(self, model: "Llama"):
+        """Évalue une fois le préfixe fixe du prompt et sauvegarde l'état llama.cpp (cache KV)"""
+        if not self.config.prefix_cache:
+            return
+
+        try:
+            start_time = time.time()
+            # Même tokenisation que create_completion (BOS et tokens spéciaux comme [INST])
+            self.prefix_tokens = model.tokenize(self.prompt_prefix.encode('utf-8'), special=True)
+            model.reset()
+            model.eval(self.prefix_tokens)
+            self.prefix_state = model.save_state()
+            prefix_time = (time.time() - start_time) * 1000
+            print(f"✅ Préfixe du prompt en cache ({len(self.prefix_tokens)} tokens, {prefix_time:.0f} ms)")
+        except Exception as e:
+            print(f"⚠️ Cache du préfixe indisponible: {e}")
+            self.prefix_tokens = []
+            self.prefix_state = None
+
+    def _restore_prompt_prefix(self):
+        """
+        Garantit que le contexte commence par le préfixe évalué
+
+        llama.cpp n'évalue que les tokens qui suivent le plus long préfixe commun
+        avec le contexte courant : seule la partie propre à la requête est calculée.
+        """
+        if self.prefix_state is None:
+            return
+
+        prefix_length = len(self.prefix_tokens)
+        if self.model.n_tokens >= prefix_length and \
+                list(self.model.input_ids[:prefix_length]) == self.prefix_tokens:
+            # Le préfixe est encore dans le cache KV (génération précédente)
+            self.prefix_stats['reused'] += 1
+            return
+
+        self.model.load_state(self.prefix_state)
+        self.prefix_stats['restored'] += 1
+
+    def get_prefix_cache_stats(self) -> Dict[str, Any]:
+        """Statistiques du cache du préfixe (tokens, réutilisations, restaurations)"""
+        return {
+            'enabled': self.prefix_state is not None,
+            'prefix_tokens': len(self.prefix_tokens),
+            **self.prefix_stats
+        }
+
+    def _record_generation(self, response: Dict[str, Any], response_text: str, max_tokens: int):
+        """Comptabilise une génération (tokens produits, budget, troncature, JSON invalide)"""
+        self.generation_stats['generations'] += 1
+        self.generation_stats['generated_tokens'] += response.get('usage', {}).get('completion_tokens', 0)
+        self.generation_stats['budget_tokens'] += max_tokens
+        if response['choices'][0].get('finish_reason') == 'length':
+            self.generation_stats['truncated'] += 1
+
+        try:
+            valid = isinstance(json.loads(response_text), dict)
+        except ValueError:
+            valid = False
+        if not valid:
+            self.generation_stats['invalid_json'] += 1
+
+    def get_generation_stats(self) -> Dict[str, Any]:
+        """Statistiques de génération (tokens moyens, budget moyen, taux de sorties JSON invalides)"""
+        generations = self.generation_stats['generations']
+        mean_budget = round(self.generation_stats['budget_tokens'] / generations) if generations else self.config.max_tokens
+        return {
+            'json_grammar': self.grammar is not None,
+            'max_tokens': mean_budget,
+            **self.generation_stats,
+            'mean_generated_tokens': self.generation_stats['generated_tokens'] / generations if generations else 0.0,
+            'parse_failure_rate': self.generation_stats['invalid_json'] / generations if generations else 0.0
+        }
+
+    def _build_prompt_prefix(self) -> str:
+        """Construit la partie fixe du prompt (instructions et exemples), identique pour toutes les requêtes."""
 
         # Instructions LangChain (gardées pour compatibilité)
         format_instructions = self.langchain_parser.get_format_instructions()
 
-        system_prompt = f"""[INST] Tu dois analyser une requête email et retourner UNIQUEMENT du JSON valide.
+        return f"""[INST] Tu dois analyser une requête email et retourner UNIQUEMENT du JSON valide.
 
     IMPORTANT: Réponds SEULEMENT avec le JSON, AUCUN autre texte.
 
@@ -96,11 +225,15 @@ class MistralQueryParser:
     factures hier → {{"query_type": "combined", "semantic_text": "factures", "filters": {{"topic_ids": ["facturation"], "date_from": "2024-01-28"}}}}
     emails test → {{"query_type": "semantic", "semantic_text": "emails test", "filters": {{}}}}
 
-    Query: {query}
+"""
 
-    Réponse (JSON uniquement): [/INST]"""
+    def _build_prompt(self, query: str, user_context: Dict[str, Any] = None) -> str:
+        """Construit un prompt plus strict pour forcer la sortie JSON pure."""
 
-        return system_prompt
+        # Le préfixe fixe vient en premier : llama.cpp réutilise son cache KV d'une requête à l'autre
+        return self.prompt_prefix + f"""    Query: {query}
+
+    Réponse (JSON uniquement): [/INST]"""
 
     def parse_query(self, query: str, user_context: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -121,17 +254,21 @@ class MistralQueryParser:
 
         try:
             prompt = self._build_prompt(query, user_context)
+            max_tokens = self._max_tokens(query)
+            self._restore_prompt_prefix()
 
             # Génération avec paramètres optimisés
             response = self.model(
                 prompt,
-                max_tokens=self.config.max_tokens,
+                max_tokens=max_tokens,
                 temperature=self.config.temperature,
                 stop=["[/INST]", "\n\n", "Query:"],
-                echo=False
+                echo=False,
+                grammar=self.grammar
             )
 
             response_text = response['choices'][0]['text'].strip()
+            self._record_generation(response, response_text, max_tokens)
             print(f"🔍 Réponse LLM brute: {response_text}")
 
             # Parser avec LangChain (validation + correction auto)
@@ -177,6 +314,34 @@ class MistralQueryParser:
             print(f"❌ Erreur lors de la génération LLM: {e}")
             return self._fallback_parser(query)
 
+    def parse_batch(
+            self,
+            requests: List[Tuple[str, Optional[Dict[str, Any]]]],
+            on_result: Optional[Callable[[int, Dict[str, Any]], None]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse plusieurs requêtes à la suite sur le même contexte llama.cpp.
+
+        Les générations sont sérialisées : llama.cpp réévalue seulement les tokens qui
+        suivent le plus long préfixe commun avec le prompt précédent. Le préfixe fixe
+        n'est donc évalué qu'une fois, et les requêtes sont triées pour que des
+        requêtes proches ("emails de Marie", "emails de Marie hier") se suivent.
+
+        Args:
+            requests: Liste de tuples (requête, contexte utilisateur)
+            on_result: Appelé avec (indice, résultat) dès qu'une requête est parsée, sans attendre le lot
+
+        Returns:
+            Résultats dans l'ordre des requêtes
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+        for index in sorted(range(len(requests)), key=lambda i: requests[i][0]):
+            query, user_context = requests[index]
+            results[index] = self.parse_query(query, user_context)
+            if on_result is not None:
+                on_result(index, results[index])
+        return results
+
     def _fallback_parser(self, query: str) -> Dict[str, Any]:
         """
         Parser de fallback basique utilisant des règles simples.
@@ -228,9 +393,14 @@ class MistralQueryParser:
 _parser_instance: Optional[MistralQueryParser] = None
 
 
-def get_query_parser() -> MistralQueryParser:
-    """Singleton pour éviter de recharger le modèle"""
+def get_query_parser(load_model: bool = True) -> MistralQueryParser:
+    """
+    Singleton pour éviter de recharger le modèle
+
+    Args:
+        load_model: Charger le modèle à la création (sinon via load_model(), ex: ModelLoader)
+    """
     global _parser_instance
     if _parser_instance is None:
-        _parser_instance = MistralQueryParser()
+        _parser_instance = MistralQueryParser(load_model=load_model)
     return _parser_instance
\ No newline at end of file
@@ -0,0 +1,184 @@
+"""
+Exécuteur dédié aux inférences LLM pour Accord.
+Sort les générations Mistral de la boucle d'événements FastAPI.
+
+Les appels passent par un pool de threads borné (llama.cpp libère le GIL
+pendant l'inférence) précédé d'une file d'attente de taille fixe. Quand la
+file est pleine ou qu'un appel dépasse son délai, l'appelant reçoit une
+exception et utilise le parser heuristique (regex + spaCy).
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+
+@dataclass
+class LLMExecutorConfig:
+    """Configuration de l'exécuteur LLM"""
+    max_workers: int = 1  # Un seul contexte llama.cpp : les générations sont sérialisées
+    max_queue_size: int = 4  # Requêtes en attente au-delà des workers occupés
+    timeout_seconds: float = 15.0  # Délai maximum (attente + génération) par requête
+    wait_window: int = 1000  # Nombre de temps d'attente conservés pour les statistiques
+
+
+class LLMQueueFullError(RuntimeError):
+    """File d'attente LLM pleine (backpressure)"""
+
+
+class LLMTimeoutError(RuntimeError):
+    """Délai dépassé pour une requête LLM"""
+
+
+class LLMExecutor:
+    """
+    Pool borné pour les appels au LLM, avec file d'attente, délai et statistiques
+    """
+
+    def __init__(self, config: LLMExecutorConfig = None):
+        self.config = config or LLMExecutorConfig()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.config.max_workers,
+            thread_name_prefix='llm-inference'
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._wait_times = deque(maxlen=self.config.wait_window)
+
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self.errors = 0
+
+    def _dispatch(self, fn: Callable, *args, **kwargs) -> Future:
+        """Place un appel dans la file, ou lève LLMQueueFullError si elle est pleine"""
+        with self._lock:
+            capacity = self.config.max_workers + self.config.max_queue_size
+            if self._queued + self._running >= capacity:
+                self.rejected += 1
+                raise LLMQueueFullError(
+                    f"file LLM pleine ({self._queued} en attente, {self._running} en cours)"
+                )
+            self._queued += 1
+            self.submitted += 1
+
+        enqueued_at = time.perf_counter()
+
+        def task():
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._wait_times.append((time.perf_counter() - enqueued_at) * 1000)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        future = self._executor.submit(task)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: Future):
+        """Met à jour les compteurs à la fin (ou à l'annulation) d'un appel"""
+        with self._lock:
+            if future.cancelled():
+                # Annulé avant d'avoir démarré : il occupait encore une place dans la file
+                self._queued -= 1
+                self.cancelled += 1
+            elif future.exception() is not None:
+                self.errors += 1
+            else:
+                self.completed += 1
+
+    def _timeout(self, future: Future) -> LLMTimeoutError:
+        """Annule un appel encore en attente et construit l'erreur de délai"""
+        # Une génération déjà démarrée ne peut pas être interrompue : elle garde son worker
+        future.cancel()
+        with self._lock:
+            self.timeouts += 1
+        return LLMTimeoutError(f"délai LLM dépassé ({self.config.timeout_seconds}s)")
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Exécute un appel LLM sans bloquer la boucle d'événements
+
+        Args:
+            fn: Fonction à exécuter (ex: MistralQueryParser.parse_query)
+            timeout: Délai en secondes (défaut: configuration)
+
+        Returns:
+            Résultat de la fonction
+
+        Raises:
+            LLMQueueFullError: File d'attente pleine
+            LLMTimeoutError: Délai dépassé
+        """
+        future = self._dispatch(fn, *args, **kwargs)
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                timeout or self.config.timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            raise self._timeout(future)
+
+    def call(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Exécute un appel LLM depuis du code synchrone, avec la même file et le même délai
+
+        Raises:
+            LLMQueueFullError: File d'attente pleine
+            LLMTimeoutError: Délai dépassé
+        """
+        future = self._dispatch(fn, *args, **kwargs)
+        try:
+            return future.result(timeout=timeout or self.config.timeout_seconds)
+        except FutureTimeoutError:
+            raise self._timeout(future)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistiques de la file (profondeur, temps d'attente, rejets, délais)"""
+        with self._lock:
+            waits = sorted(self._wait_times)
+            return {
+                'queue_depth': self._queued,
+                'running': self._running,
+                'max_workers': self.config.max_workers,
+                'max_queue_size': self.config.max_queue_size,
+                'timeout_seconds': self.config.timeout_seconds,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'timeouts': self.timeouts,
+                'cancelled': self.cancelled,
+                'errors': self.errors,
+                'wait_ms': {
+                    'mean': sum(waits) / len(waits) if waits else 0.0,
+                    'p95': waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0,
+                    'max': waits[-1] if waits else 0.0
+                }
+            }
+
+    def shutdown(self, wait: bool = False):
+        """Arrête le pool (les appels en attente sont annulés)"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# Instance globale partagée : toutes les générations passent par le même pool
+_executor_instance: Optional[LLMExecutor] = None
+
+
+def get_llm_executor() -> LLMExecutor:
+    """Récupère l'instance singleton de l'exécuteur LLM"""
+    global _executor_instance
+    if _executor_instance is None:
+        _executor_instance = LLMExecutor()
+    return _executor_instance
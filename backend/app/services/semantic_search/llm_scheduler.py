@@ -0,0 +1,203 @@
+"""
+Ordonnanceur par micro-lots des requêtes LLM pour Accord.
+
+Les requêtes /parse concurrentes sont regroupées pendant quelques
+millisecondes puis envoyées ensemble à l'exécuteur LLM :
+- les requêtes identiques (même texte, même contexte) ne sont générées qu'une fois ;
+- le lot est généré à la suite sur le même contexte llama.cpp, qui réutilise
+  le cache KV du préfixe fixe du prompt (MistralQueryParser.parse_batch).
+
+L'API haut niveau de llama-cpp-python ne décode qu'une séquence à la fois :
+les générations d'un lot sont donc sérialisées, pas décodées ensemble. Chaque
+résultat est transmis dès sa génération, et le délai du lot auprès de
+l'exécuteur croît avec le nombre de requêtes distinctes : un lot plein ne fait
+pas expirer les appelants dont la propre attente reste dans leur délai.
+"""
+
+import asyncio
+import copy
+import json
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+from .llm_executor import LLMExecutor, LLMQueueFullError, LLMTimeoutError, get_llm_executor
+
+
+@dataclass
+class BatchSchedulerConfig:
+    """Configuration de l'ordonnanceur par micro-lots"""
+    batch_window_ms: float = 5.0  # Attente maximale avant l'envoi d'un lot
+    max_batch_size: int = 8  # Requêtes par lot (envoi immédiat une fois atteint)
+    max_pending: int = 32  # Requêtes en attente ou en cours au-delà desquelles on refuse
+    stats_window: int = 1000  # Nombre de latences et tailles de lots conservées
+
+
+class LLMBatchScheduler:
+    """
+    Regroupe les requêtes concurrentes en lots générés par l'exécuteur LLM
+    """
+
+    def __init__(self, parser, executor: LLMExecutor = None, config: BatchSchedulerConfig = None):
+        self.parser = parser
+        self.executor = executor or get_llm_executor()
+        self.config = config or BatchSchedulerConfig()
+
+        self._pending: List[tuple] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._in_flight = 0
+        # La boucle ne garde qu'une référence faible aux tâches : on conserve celles des lots en cours
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.requests = 0
+        self.batches = 0
+        self.deduplicated = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self._latencies = deque(maxlen=self.config.stats_window)
+        self._batch_sizes = deque(maxlen=self.config.stats_window)
+
+    async def parse(
+            self,
+            query: str,
+            user_context: Optional[Dict[str, Any]] = None,
+            timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Parse une requête avec le LLM dans le prochain lot
+
+        Args:
+            query: Requête utilisateur
+            user_context: Contexte utilisateur optionnel
+            timeout: Délai en secondes (défaut: délai de l'exécuteur)
+
+        Returns:
+            Résultat de MistralQueryParser.parse_query
+
+        Raises:
+            LLMQueueFullError: Trop de requêtes en attente
+            LLMTimeoutError: Délai dépassé
+        """
+        if len(self._pending) + self._in_flight >= self.config.max_pending:
+            self.rejected += 1
+            raise LLMQueueFullError(
+                f"ordonnanceur LLM saturé ({len(self._pending)} en attente, {self._in_flight} en cours)"
+            )
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # Un appelant qui a abandonné (délai) ne doit pas laisser d'exception non lue
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._pending.append((query, user_context, future))
+        self.requests += 1
+
+        if len(self._pending) >= self.config.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.config.batch_window_ms / 1000, self._flush)
+
+        start_time = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(
+                asyncio.shield(future),
+                timeout or self.executor.config.timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise LLMTimeoutError(f"délai LLM dépassé ({timeout or self.executor.config.timeout_seconds}s)")
+
+        self._latencies.append((time.perf_counter() - start_time) * 1000)
+        return result
+
+    def _flush(self):
+        """Envoie les requêtes en attente comme un lot"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            self._in_flight += len(batch)
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _batch_timeout(self, unique_count: int) -> float:
+        """Délai du lot auprès de l'exécuteur : le délai d'une requête par génération du lot"""
+        return self.executor.config.timeout_seconds * unique_count
+
+    @staticmethod
+    def _deliver(futures: List[asyncio.Future], result: Dict[str, Any]):
+        """Transmet un résultat à tous les appelants d'une requête (copie pour les doublons)"""
+        for index, future in enumerate(futures):
+            if not future.done():
+                future.set_result(result if index == 0 else copy.deepcopy(result))
+
+    async def _run_batch(self, batch: List[tuple]):
+        """Génère un lot (requêtes identiques fusionnées) et distribue les résultats"""
+        groups: "OrderedDict[tuple, tuple]" = OrderedDict()
+        for query, user_context, future in batch:
+            key = (query, json.dumps(user_context or {}, sort_keys=True, default=str))
+            groups.setdefault(key, (query, user_context, []))[2].append(future)
+
+        unique = list(groups.values())
+        self.batches += 1
+        self.deduplicated += len(batch) - len(unique)
+        self._batch_sizes.append(len(batch))
+
+        loop = asyncio.get_running_loop()
+
+        def on_result(index: int, result: Dict[str, Any]):
+            # Appelé depuis le thread de l'exécuteur après chaque génération
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._deliver, unique[index][2], result)
+
+        try:
+            results = await self.executor.run(
+                self.parser.parse_batch,
+                [(query, user_context) for query, user_context, _ in unique],
+                on_result=on_result,
+                timeout=self._batch_timeout(len(unique))
+            )
+            for (_, _, futures), result in zip(unique, results):
+                self._deliver(futures, result)
+        except Exception as e:
+            for _, _, futures in unique:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+        finally:
+            self._in_flight -= len(batch)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistiques des lots (taille moyenne, déduplication, latences)"""
+        latencies = sorted(self._latencies)
+
+        def percentile(ratio):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * ratio))] if latencies else 0.0
+
+        return {
+            'pending': len(self._pending),
+            'in_flight': self._in_flight,
+            'requests': self.requests,
+            'batches': self.batches,
+            'mean_batch_size': sum(self._batch_sizes) / len(self._batch_sizes) if self._batch_sizes else 0.0,
+            'deduplicated': self.deduplicated,
+            'rejected': self.rejected,
+            'timeouts': self.timeouts,
+            'latency_ms': {'p50': percentile(0.5), 'p95': percentile(0.95), 'p99': percentile(0.99)}
+        }
+
+
+# Instance globale : un seul ordonnanceur devant le modèle partagé
+_scheduler_instance: Optional[LLMBatchScheduler] = None
+
+
+def get_batch_scheduler() -> LLMBatchScheduler:
+    """Récupère l'instance singleton de l'ordonnanceur"""
+    global _scheduler_instance
+    if _scheduler_instance is None:
+        from .llm_engine import get_query_parser
+        _scheduler_instance = LLMBatchScheduler(get_query_parser())
+    return _scheduler_instance
@@ -0,0 +1,156 @@
+"""
+Chargement des modèles en arrière-plan pour Accord.
+
+Le service répond dès le démarrage avec les patterns regex ; spaCy et le
+modèle Mistral sont chargés dans des threads séparés et pris en compte
+automatiquement dès qu'ils sont prêts :
+- regex : patterns compilés, prêt immédiatement ;
+- spacy : modèle NER attaché à l'EntityExtractor ;
+- llm : modèle GGUF (grammaire JSON et cache du préfixe compris).
+"""
+
+import threading
+import time
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+COMPONENTS = ('regex', 'spacy', 'llm')
+
+
+class ComponentState(str, Enum):
+    """État de chargement d'un composant"""
+    PENDING = "pending"  # Pas encore démarré
+    LOADING = "loading"  # Chargement en cours
+    READY = "ready"  # Utilisable
+    UNAVAILABLE = "unavailable"  # Dépendance ou modèle absent : le service s'en passe
+
+
+class ModelLoader:
+    """
+    Charge les composants du parsing en arrière-plan et expose leur état
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states: Dict[str, Dict[str, Any]] = {
+            name: {'state': ComponentState.PENDING, 'load_time_ms': None, 'error': None}
+            for name in COMPONENTS
+        }
+        self._done = {name: threading.Event() for name in COMPONENTS}
+        self._started = False
+
+    def start(self):
+        """
+        Prépare le parsing regex puis lance le chargement de spaCy et du LLM
+
+        Les parsers sont créés sans modèle (rapide) : le transformer les
+        récupère via les singletons et sert des parses regex immédiatement.
+        """
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+
+        from .parsing.query_parser import get_query_parser as get_nlp_parser
+        from .llm_engine import get_query_parser as get_llm_parser
+        from .query_transformer import get_query_transformer
+
+        def load_regex():
+            get_nlp_parser(load_spacy=False)
+            get_llm_parser(load_model=False)
+            get_query_transformer()
+            return True
+
+        self._load('regex', load_regex)
+
+        threading.Thread(target=self._load, args=('spacy', self._load_spacy),
+                         name='model-loader-spacy', daemon=True).start()
+        threading.Thread(target=self._load, args=('llm', lambda: get_llm_parser().load_model()),
+                         name='model-loader-llm', daemon=True).start()
+
+    @staticmethod
+    def _load_spacy() -> bool:
+        """Charge le modèle spaCy et l'attache à l'extracteur d'entités"""
+        from .parsing.base_parser import load_spacy_model
+        from .parsing.query_parser import get_query_parser as get_nlp_parser
+
+        nlp_model = load_spacy_model()
+        if nlp_model is None:
+            return False
+        get_nlp_parser().entity_extractor.attach_spacy_model(nlp_model)
+        return True
+
+    def _load(self, name: str, loader: Callable[[], bool]):
+        """Exécute le chargement d'un composant et enregistre son état"""
+        self._set(name, state=ComponentState.LOADING)
+        start_time = time.time()
+        try:
+            loaded = loader()
+            state = ComponentState.READY if loaded else ComponentState.UNAVAILABLE
+            load_time = (time.time() - start_time) * 1000
+            self._set(name, state=state, load_time_ms=load_time)
+            print(f"{'✅' if loaded else '⚠️'} Composant {name}: {state.value} ({load_time:.0f} ms)")
+        except Exception as e:
+            self._set(name, state=ComponentState.UNAVAILABLE, error=str(e))
+            print(f"❌ Erreur lors du chargement de {name}: {e}")
+        finally:
+            self._done[name].set()
+
+    def _set(self, name: str, **values):
+        """Met à jour l'état d'un composant"""
+        with self._lock:
+            self._states[name].update(values)
+
+    def state(self, name: str) -> ComponentState:
+        """État d'un composant"""
+        with self._lock:
+            return self._states[name]['state']
+
+    def is_ready(self, name: str) -> bool:
+        """Le composant est-il utilisable"""
+        return self.state(name) == ComponentState.READY
+
+    def is_loading(self) -> bool:
+        """Un composant est-il encore en attente ou en chargement"""
+        with self._lock:
+            if not self._started:
+                # Chargement synchrone classique (scripts, tests) : rien n'est en attente
+                return False
+            return any(
+                entry['state'] in (ComponentState.PENDING, ComponentState.LOADING)
+                for entry in self._states.values()
+            )
+
+    def wait(self, name: Optional[str] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Attend la fin du chargement
+
+        Args:
+            name: Composant (tous si None)
+            timeout: Délai en secondes par composant
+
+        Returns:
+            True si le chargement est terminé (prêt ou indisponible)
+        """
+        names = [name] if name else COMPONENTS
+        return all(self._done[component].wait(timeout) for component in names)
+
+    def get_status(self) -> Dict[str, Any]:
+        """État de chaque composant (pour /health)"""
+        with self._lock:
+            return {
+                name: {**entry, 'state': entry['state'].value}
+                for name, entry in self._states.items()
+            }
+
+
+# Instance globale : un seul chargement par processus
+_loader_instance: Optional[ModelLoader] = None
+
+
+def get_model_loader() -> ModelLoader:
+    """Récupère l'instance singleton du chargeur de modèles"""
+    global _loader_instance
+    if _loader_instance is None:
+        _loader_instance = ModelLoader()
+    return _loader_instance
@@ -3,18 +3,17 @@ Configuration et imports de base pour le parsing
 """
 
 import re
+import importlib.util
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 import pytz
 import calendar
 
 
-# Import conditionnel de spaCy pour NER 
-try:
-    import spacy
-    SPACY_AVAILABLE = True
-except ImportError:
-    SPACY_AVAILABLE = False
+# Import conditionnel de spaCy pour NER : vérifié sans importer le module,
+# importé seulement au chargement du modèle (import coûteux au démarrage)
+SPACY_AVAILABLE = importlib.util.find_spec("spacy") is not None
+if not SPACY_AVAILABLE:
     raise RuntimeError("spaCy n'est pas installé ")
 
 
@@ -62,23 +61,51 @@ ENGLISH_INDICATORS = [
 ]
 
 
+# Modèles spaCy essayés dans l'ordre
+SPACY_MODELS = ['fr_core_news_sm', 'en_core_web_sm']
+
+# Composants spaCy inutiles à la NER (exclus au chargement)
+SPACY_NON_NER_COMPONENTS = ['tagger', 'morphologizer', 'parser', 'senter', 'attribute_ruler', 'lemmatizer']
+
+
 # === FONCTIONS UTILITAIRES COMMUNES ===
 
-def load_spacy_model():
-    """Charge le modèle spaCy si disponible """
+def load_spacy_model(ner_only: bool = True):
+    """
+    Charge le modèle spaCy si disponible
+
+    Seuls doc.ents sont utilisés : par défaut le pipeline est réduit à la NER
+    (morphologie, parser et lemmatiseur ne sont pas chargés).
+
+    Args:
+        ner_only: Ne charger que les composants nécessaires à la NER
+
+    Returns:
+        Modèle spaCy ou None
+    """
     if not SPACY_AVAILABLE:
         return None
 
-    try:
-        # Essayer le modèle français en premier
-        return spacy.load("fr_core_news_sm")
-    except OSError:
+    import spacy
+
+    exclude = SPACY_NON_NER_COMPONENTS if ner_only else []
+
+    # Essayer le modèle français en premier, puis fallback sur modèle anglais
+    for model_name in SPACY_MODELS:
         try:
-            # Fallback sur modèle anglais
-            return spacy.load("en_core_web_sm")
+            nlp_model = spacy.load(model_name, exclude=exclude)
         except OSError:
-            print("⚠️ Aucun modèle spaCy disponible, utilisation des patterns uniquement")
-            return None
+            continue
+
+        # Le tok2vec partagé n'est utile que si la NER l'écoute
+        # (fr_core_news_sm : la NER a son propre tok2vec)
+        if ner_only and 'tok2vec' in nlp_model.pipe_names:
+            if 'ner' not in nlp_model.get_pipe('tok2vec').listening_components:
+                nlp_model.remove_pipe('tok2vec')
+        return nlp_model
+
+    print("⚠️ Aucun modèle spaCy disponible, utilisation des patterns uniquement")
+    return None
 
 
 def get_month_number(month_name: str) -> int:
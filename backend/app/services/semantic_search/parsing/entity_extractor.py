@@ -12,7 +12,15 @@ from .base_parser import (
     load_spacy_model,
     is_valid_email
 )
-from backend.app.services.semantic_search.patterns import get_patterns, is_blacklisted_name
+from backend.app.services.semantic_search.patterns import (
+    get_patterns,
+    get_compiled_patterns,
+    is_blacklisted_name
+)
+
+# Préfixes retirés des noms de contacts et forme attendue d'un nom de personne
+CONTACT_PREFIX_PATTERN = re.compile(r'^(de|from|par|by|à|to|pour|for)\s+', re.IGNORECASE)
+PERSON_NAME_PATTERN = re.compile(r"^[A-Z][a-z]+(?:[-'\s][A-Z][a-z]+)*$")
 
 
 class EntityExtractor:
@@ -20,11 +28,20 @@ class EntityExtractor:
     Extracteur d'entités
     """
 
-    def __init__(self):
-        """Initialise l'extracteur """
-        self.nlp_model = load_spacy_model()
+    def __init__(self, load_spacy: bool = True):
+        """
+        Initialise l'extracteur
+
+        Args:
+            load_spacy: Charger spaCy maintenant (sinon patterns seuls jusqu'à attach_spacy_model)
+        """
+        self.nlp_model = load_spacy_model() if load_spacy else None
         self._load_patterns()
 
+    def attach_spacy_model(self, nlp_model):
+        """Active l'extraction spaCy avec un modèle chargé en arrière-plan"""
+        self.nlp_model = nlp_model
+
     def _load_patterns(self):
         """Charge les patterns enrichis """
         # Charger tous les patterns en mode auto
@@ -36,12 +53,37 @@ class EntityExtractor:
         self.patterns_fr = get_patterns('fr', 'all')
         self.patterns_en = get_patterns('en', 'all')
 
-    def _extract_entities(self, query: str, language: str) -> List[ParsedEntity]:
-        """Extrait les entités nommées avec patterns enrichis """
+        # Patterns compilés (une alternation par catégorie), par langue
+        self.compiled_patterns = {
+            language: {
+                category: get_compiled_patterns(language, category)
+                for category in ('temporal', 'contact', 'topic')
+            }
+            for language in ('auto', 'fr', 'en')
+        }
+
+    def _extract_entities(
+            self,
+            query: str,
+            language: str,
+            use_spacy: bool = True,
+            spacy_entities: Optional[List[ParsedEntity]] = None
+    ) -> List[ParsedEntity]:
+        """
+        Extrait les entités nommées avec patterns enrichis
+
+        Args:
+            query: Requête nettoyée
+            language: Langue détectée
+            use_spacy: Utiliser la NER spaCy (False pour le palier regex)
+            spacy_entities: Entités spaCy déjà calculées par lot (voir _extract_entities_spacy_batch)
+        """
         entities = []
 
         # 1. Extraction avec spaCy si disponible
-        if self.nlp_model:
+        if use_spacy and spacy_entities is not None:
+            entities.extend(spacy_entities)
+        elif use_spacy and self.nlp_model:
             entities.extend(self._extract_entities_spacy(query))
 
         # 2. Extraction avec patterns enrichis
@@ -53,28 +95,64 @@ class EntityExtractor:
 
         return entities
 
+    def _add_spacy_entities(self, query: str, language: str, pattern_entities: List[ParsedEntity]) -> List[ParsedEntity]:
+        """
+        Ajoute les entités spaCy aux entités des patterns déjà extraites (palier regex)
+
+        Args:
+            query: Requête nettoyée
+            language: Langue détectée
+            pattern_entities: Entités du palier regex (patterns seuls)
+        """
+        entities = self._extract_entities_spacy(query) if self.nlp_model else []
+        entities.extend(pattern_entities)
+
+        entities = self._deduplicate_entities(entities)
+        return self._validate_entities(entities, language)
+
     def _extract_entities_spacy(self, query: str) -> List[ParsedEntity]:
         """Extraction d'entités avec spaCy """
-        entities = []
-
         try:
-            doc = self.nlp_model(query)
+            return self._entities_from_doc(self.nlp_model(query))
+        except Exception as e:
+            print(f"⚠️ Erreur spaCy NER: {e}")
+            return []
+
+    def _extract_entities_spacy_batch(self, queries: List[str], batch_size: int = 64) -> List[List[ParsedEntity]]:
+        """
+        Extraction d'entités spaCy sur un lot de requêtes avec nlp.pipe
 
-            for ent in doc.ents:
-                # Mapper les labels spaCy vers nos types
-                entity_type = self._map_spacy_label(ent.label_)
+        Args:
+            queries: Requêtes nettoyées
+            batch_size: Taille des lots passés au modèle
 
-                if entity_type:
-                    entity = ParsedEntity(
-                        type=entity_type,
-                        value=ent.text.strip(),
-                        original=ent.text,
-                        confidence=0.8  # Confiance de base pour spaCy
-                    )
-                    entities.append(entity)
+        Returns:
+            Entités spaCy de chaque requête (listes vides sans modèle)
+        """
+        if not self.nlp_model:
+            return [[] for _ in queries]
 
+        try:
+            return [self._entities_from_doc(doc) for doc in self.nlp_model.pipe(queries, batch_size=batch_size)]
         except Exception as e:
             print(f"⚠️ Erreur spaCy NER: {e}")
+            return [[] for _ in queries]
+
+    def _entities_from_doc(self, doc) -> List[ParsedEntity]:
+        """Convertit les entités d'un Doc spaCy en ParsedEntity"""
+        entities = []
+        for ent in doc.ents:
+            # Mapper les labels spaCy vers nos types
+            entity_type = self._map_spacy_label(ent.label_)
+
+            if entity_type:
+                entity = ParsedEntity(
+                    type=entity_type,
+                    value=ent.text.strip(),
+                    original=ent.text,
+                    confidence=0.8  # Confiance de base pour spaCy
+                )
+                entities.append(entity)
 
         return entities
 
@@ -88,105 +166,96 @@ class EntityExtractor:
 
         # Sélectionner les patterns selon la langue
         if language == 'auto':
-            patterns_data = self.all_patterns
+            compiled = self.compiled_patterns['auto']
         else:
-            patterns_data = self.patterns_fr if language == 'fr' else self.patterns_en
+            compiled = self.compiled_patterns['fr' if language == 'fr' else 'en']
 
         # Extraction temporelle
-        temporal_patterns = patterns_data.get('temporal', {})
-        for pattern, config in temporal_patterns.items():
-            matches = re.finditer(pattern, query, re.IGNORECASE)
-            for match in matches:
+        for match in compiled['temporal'].finditer(query):
+            config = match.value
+            try:
+                normalized_value = self._normalize_temporal_entity(match.group(), config)
+
+                # Gérer les plages de dates qui retournent un dict
+                if isinstance(normalized_value, dict) and 'start' in normalized_value:
+                    # Créer deux entités pour la plage
+                    entity_start = ParsedEntity(
+                        type='TEMPORAL',
+                        value=normalized_value['start'],
+                        original=match.group(),
+                        confidence=0.9
+                    )
+                    entity_end = ParsedEntity(
+                        type='TEMPORAL',
+                        value=normalized_value['end'],
+                        original=match.group(),
+                        confidence=0.9
+                    )
+                    entities.extend([entity_start, entity_end])
+                else:
+                    entity = ParsedEntity(
+                        type='TEMPORAL',
+                        value=normalized_value,
+                        original=match.group(),
+                        confidence=0.9
+                    )
+                    entities.append(entity)
+            except Exception as e:
+                print(f"⚠️ Erreur normalisation temporelle: {e}")
+
+        # Extraction de contacts
+        for match in compiled['contact'].finditer(query):
+            contact_type = match.value
+            if contact_type in ['from_contact', 'to_contact', 'team_contact']:
                 try:
-                    normalized_value = self._normalize_temporal_entity(match.group(), config)
-
-                    # Gérer les plages de dates qui retournent un dict
-                    if isinstance(normalized_value, dict) and 'start' in normalized_value:
-                        # Créer deux entités pour la plage
-                        entity_start = ParsedEntity(
-                            type='TEMPORAL',
-                            value=normalized_value['start'],
-                            original=match.group(),
-                            confidence=0.9
-                        )
-                        entity_end = ParsedEntity(
-                            type='TEMPORAL',
-                            value=normalized_value['end'],
-                            original=match.group(),
-                            confidence=0.9
-                        )
-                        entities.extend([entity_start, entity_end])
-                    else:
+                    # Le nom est généralement le dernier groupe capturé
+                    name = match.groups()[-1].strip() if match.groups() else match.group().strip()
+
+                    # Nettoyer le nom
+                    name = CONTACT_PREFIX_PATTERN.sub('', name)
+
+                    # Validation du nom
+                    if self._is_valid_person_name(name, language):
                         entity = ParsedEntity(
-                            type='TEMPORAL',
-                            value=normalized_value,
+                            type='PERSON',
+                            value=name.title(),
                             original=match.group(),
-                            confidence=0.9
+                            confidence=0.7
                         )
                         entities.append(entity)
-                except Exception as e:
-                    print(f"⚠️ Erreur normalisation temporelle: {e}")
 
-        # Extraction de contacts
-        contact_patterns = patterns_data.get('contact', {})
-        for pattern, contact_type in contact_patterns.items():
-            if contact_type in ['from_contact', 'to_contact', 'team_contact']:
-                matches = re.finditer(pattern, query, re.IGNORECASE)
-                for match in matches:
-                    try:
-                        # Le nom est généralement le dernier groupe capturé
-                        name = match.groups()[-1].strip() if match.groups() else match.group().strip()
-
-                        # Nettoyer le nom
-                        name = re.sub(r'^(de|from|par|by|à|to|pour|for)\s+', '', name, flags=re.IGNORECASE)
-
-                        # Validation du nom
-                        if self._is_valid_person_name(name, language):
+                        # Ajouter un marqueur pour le type de contact
+                        if contact_type == 'to_contact':
                             entity = ParsedEntity(
-                                type='PERSON',
-                                value=name.title(),
+                                type='RECIPIENT_MARKER',
+                                value='recipient',
                                 original=match.group(),
-                                confidence=0.7
+                                confidence=0.9
                             )
                             entities.append(entity)
-
-                            # Ajouter un marqueur pour le type de contact
-                            if contact_type == 'to_contact':
-                                entity = ParsedEntity(
-                                    type='RECIPIENT_MARKER',
-                                    value='recipient',
-                                    original=match.group(),
-                                    confidence=0.9
-                                )
-                                entities.append(entity)
-                    except Exception as e:
-                        print(f"⚠️ Erreur extraction contact: {e}")
+                except Exception as e:
+                    print(f"⚠️ Erreur extraction contact: {e}")
 
             elif contact_type == 'email_address':
-                matches = re.finditer(pattern, query, re.IGNORECASE)
-                for match in matches:
-                    email = match.group().strip().lower()
-                    if is_valid_email(email):
-                        entity = ParsedEntity(
-                            type='EMAIL',
-                            value=email,
-                            original=match.group(),
-                            confidence=0.95
-                        )
-                        entities.append(entity)
+                email = match.group().strip().lower()
+                if is_valid_email(email):
+                    entity = ParsedEntity(
+                        type='EMAIL',
+                        value=email,
+                        original=match.group(),
+                        confidence=0.95
+                    )
+                    entities.append(entity)
 
         # Extraction de topics
-        topic_patterns = patterns_data.get('topic', {})
-        for pattern, topic_type in topic_patterns.items():
-            matches = re.finditer(pattern, query, re.IGNORECASE)
-            for match in matches:
-                entity = ParsedEntity(
-                    type='TOPIC',
-                    value=topic_type,
-                    original=match.group(),
-                    confidence=0.8
-                )
-                entities.append(entity)
+        for match in compiled['topic'].finditer(query):
+            entity = ParsedEntity(
+                type='TOPIC',
+                value=match.value,
+                original=match.group(),
+                confidence=0.8
+            )
+            entities.append(entity)
 
         return entities
 
@@ -206,8 +275,7 @@ class EntityExtractor:
             return False
 
         # Pattern de nom réaliste
-        name_pattern = r"^[A-Z][a-z]+(?:[-'\s][A-Z][a-z]+)*$"
-        if not re.match(name_pattern, name_clean):
+        if not PERSON_NAME_PATTERN.match(name_clean):
             return False
 
         # Rejeter les mots trop génériques
@@ -3,10 +3,9 @@ Détecteur d'intention pour les requêtes en langage naturel.
 
 """
 
-import re
 from typing import List
 from .types import ParsedEntity, IntentType
-from backend.app.services.semantic_search.patterns import get_patterns
+from backend.app.services.semantic_search.patterns import get_patterns, get_compiled_patterns
 
 
 class IntentDetector:
@@ -27,6 +26,12 @@ class IntentDetector:
         self.patterns_fr = get_patterns('fr', 'all')
         self.patterns_en = get_patterns('en', 'all')
 
+        # Patterns compilés : un ensemble par intention et par langue, actions combinées FR + EN
+        self.compiled_intents = {
+            language: get_compiled_patterns(language, 'intent') for language in ('auto', 'fr', 'en')
+        }
+        self.compiled_actions = get_compiled_patterns('auto', 'action')
+
     def _detect_intent(self, query: str, entities: List[ParsedEntity], language: str) -> IntentType:
         """Détecte l'intention principale avec patterns enrichis"""
 
@@ -35,26 +40,15 @@ class IntentDetector:
 
         # Sélectionner les patterns d'intention selon la langue
         if language == 'auto':
-            intent_patterns = self.all_patterns.get('intent', {})
+            intent_patterns = self.compiled_intents['auto']
         else:
-            patterns_data = self.patterns_fr if language == 'fr' else self.patterns_en
-            intent_patterns = patterns_data.get('intent', {})
+            intent_patterns = self.compiled_intents['fr' if language == 'fr' else 'en']
 
-        # 1. Scoring basé sur les patterns spécifiques
-        for intent_name, patterns_by_lang in intent_patterns.items():
+        # 1. Scoring basé sur les patterns spécifiques (un point par pattern présent)
+        for intent_name, compiled in intent_patterns.items():
             if intent_name in ['search_contact', 'search_temporal', 'search_attachment', 'search_thread']:
                 intent_enum = getattr(IntentType, intent_name.upper(), IntentType.UNKNOWN)
-
-                # Patterns pour la langue détectée
-                patterns_list = patterns_by_lang.get(language, []) if language != 'auto' else []
-                if language == 'auto':
-                    # Combiner FR + EN
-                    patterns_list.extend(patterns_by_lang.get('fr', []))
-                    patterns_list.extend(patterns_by_lang.get('en', []))
-
-                for pattern in patterns_list:
-                    if re.search(pattern, query, re.IGNORECASE):
-                        intent_scores[intent_enum] += 1.0
+                intent_scores[intent_enum] += 1.0 * len(compiled.search(query))
 
         # 2. Scoring basé sur les entités détectées
         entity_type_counts = {}
@@ -70,13 +64,12 @@ class IntentDetector:
                 intent_scores[IntentType.SEARCH_TOPIC] += 0.6 * count
 
         # 3. Patterns d'action spécifiques
-        action_patterns = self.all_patterns.get('action', {})
-        for pattern, action_type in action_patterns.items():
-            if re.search(pattern, query, re.IGNORECASE):
-                if action_type in ['has_attachment', 'without_attachment']:
-                    intent_scores[IntentType.SEARCH_ATTACHMENT] += 1.2
-                elif action_type == 'in_thread':
-                    intent_scores[IntentType.SEARCH_THREAD] += 1.0
+        for match in self.compiled_actions.search(query):
+            action_type = match.value
+            if action_type in ['has_attachment', 'without_attachment']:
+                intent_scores[IntentType.SEARCH_ATTACHMENT] += 1.2
+            elif action_type == 'in_thread':
+                intent_scores[IntentType.SEARCH_THREAD] += 1.0
 
         # 4. Détection requête combinée
         unique_entity_types = set(e.type for e in entities)
@@ -16,17 +16,49 @@ from .intent_detector import IntentDetector
 from .validator import EntityValidator
 from .confidence_calculator import ConfidenceCalculator
 
+# Plage de jours dans un mois ("entre le 2 et le 10 avril")
+DATE_RANGE_PATTERN = re.compile(
+    r'entre\s+le\s+(\d{1,2})\s+et\s+le\s+(\d{1,2})\s+(janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre)',
+    re.IGNORECASE
+)
+ATTACHMENT_TYPES_PATTERN = re.compile(r'\b(pdf|doc|docx|xls|xlsx|ppt|pptx|zip|jpg|png|gif)\b')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def compile_stopwords(stopwords: List[str]) -> Optional[re.Pattern]:
+    """
+    Compile les mots vides en une seule alternation
+
+    Les mots sont délimités par des frontières de mot : les supprimer en une
+    passe donne le même texte que de les supprimer un par un.
+
+    Args:
+        stopwords: Mots vides (pris littéralement)
+
+    Returns:
+        Expression compilée, None si la liste est vide
+    """
+    if not stopwords:
+        return None
+    alternatives = '|'.join(re.escape(stopword) for stopword in dict.fromkeys(stopwords))
+    return re.compile(rf'\b(?:{alternatives})\b', re.IGNORECASE)
+
 
 class NaturalLanguageQueryParser:
     """
     Parseur principal pour les requêtes en langage naturel..
     """
 
-    def __init__(self):
-        """Initialise le parser avec tous ses composants """
+    def __init__(self, load_spacy: bool = True):
+        """
+        Initialise le parser avec tous ses composants
+
+        Args:
+            load_spacy: Charger spaCy maintenant (sinon regex seules jusqu'à son chargement)
+        """
         # Initialiser les composants modulaires
         self.language_detector = LanguageDetector()
-        self.entity_extractor = EntityExtractor()
+        self.entity_extractor = EntityExtractor(load_spacy=load_spacy)
         self.intent_detector = IntentDetector()
         self.validator = EntityValidator()
         self.confidence_calculator = ConfidenceCalculator()
@@ -36,7 +68,7 @@ class NaturalLanguageQueryParser:
 
     def _load_patterns(self):
         """Charge les patterns enrichis"""
-        from backend.app.services.semantic_search.patterns import get_patterns, get_stopwords
+        from backend.app.services.semantic_search.patterns import get_patterns, get_compiled_patterns, get_stopwords
 
         # Charger tous les patterns en mode auto (FR + EN)
         self.all_patterns = get_patterns('auto', 'all')
@@ -44,19 +76,33 @@ class NaturalLanguageQueryParser:
         # Patterns spécifiques par langue
         self.patterns_fr = get_patterns('fr', 'all')
         self.patterns_en = get_patterns('en', 'all')
+        self.compiled_actions = get_compiled_patterns('auto', 'action')
 
         # Stopwords
         self.stopwords_fr = get_stopwords('fr')
         self.stopwords_en = get_stopwords('en')
         self.stopwords_auto = get_stopwords('auto')
+        self.stopword_patterns = {
+            'fr': compile_stopwords(self.stopwords_fr),
+            'en': compile_stopwords(self.stopwords_en),
+            'auto': compile_stopwords(self.stopwords_auto)
+        }
 
-    def parse_query(self, query: str, context: QueryContext = None) -> Dict[str, Any]:
+    def parse_query(
+            self,
+            query: str,
+            context: QueryContext = None,
+            use_spacy: bool = True,
+            spacy_entities: Optional[List[ParsedEntity]] = None
+    ) -> Dict[str, Any]:
         """
         Parse une requête en langage naturel - Méthode principale originale conservée
 
         Args:
             query: Requête utilisateur
             context: Contexte optionnel
+            use_spacy: Utiliser la NER spaCy (False: patterns regex seuls)
+            spacy_entities: Entités spaCy déjà calculées par parse_queries
 
         Returns:
             Dictionnaire avec intention, entités et métadonnées
@@ -71,8 +117,47 @@ class NaturalLanguageQueryParser:
         cleaned_query = clean_query(query)
 
         # Extraire les entités avec patterns adaptés à la langue
-        entities = self.entity_extractor._extract_entities(cleaned_query, language)
+        entities = self.entity_extractor._extract_entities(
+            cleaned_query, language, use_spacy=use_spacy, spacy_entities=spacy_entities
+        )
+
+        return self._build_result(query, cleaned_query, language, entities, context)
+
+    def add_spacy_entities(self, regex_result: Dict[str, Any], context: QueryContext = None) -> Dict[str, Any]:
+        """
+        Complète un résultat du palier regex (parse_query avec use_spacy=False) par la NER spaCy
+
+        La langue, la requête nettoyée et les entités des patterns sont reprises
+        du résultat regex : seule la NER est exécutée avant de recalculer
+        l'intention, les filtres et la confiance.
+
+        Args:
+            regex_result: Résultat de parse_query(query, use_spacy=False)
+            context: Contexte optionnel
 
+        Returns:
+            Dictionnaire avec intention, entités et métadonnées (comme parse_query)
+        """
+        cleaned_query = regex_result['cleaned_query']
+        if not cleaned_query:
+            return regex_result
+
+        language = regex_result['language']
+        entities = self.entity_extractor._add_spacy_entities(
+            cleaned_query, language, [ParsedEntity(**entity) for entity in regex_result['entities']]
+        )
+
+        return self._build_result(regex_result['original_query'], cleaned_query, language, entities, context)
+
+    def _build_result(
+            self,
+            query: str,
+            cleaned_query: str,
+            language: str,
+            entities: List[ParsedEntity],
+            context: QueryContext = None
+    ) -> Dict[str, Any]:
+        """Construit le résultat de parsing à partir des entités extraites"""
         # Détecter l'intention
         intent = self.intent_detector._detect_intent(cleaned_query, entities, language)
 
@@ -110,6 +195,34 @@ class NaturalLanguageQueryParser:
             }
         }
 
+    def parse_queries(
+            self,
+            queries: List[str],
+            context: QueryContext = None,
+            batch_size: int = 64
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse un lot de requêtes (évaluation hors ligne, tests)
+
+        La NER spaCy est exécutée une seule fois sur tout le lot avec nlp.pipe
+        au lieu d'un appel au modèle par requête.
+
+        Args:
+            queries: Requêtes utilisateur
+            context: Contexte optionnel commun au lot
+            batch_size: Taille des lots passés à spaCy
+
+        Returns:
+            Résultats de parse_query, dans l'ordre des requêtes
+        """
+        cleaned_queries = [clean_query(query) if query else '' for query in queries]
+        spacy_entities = self.entity_extractor._extract_entities_spacy_batch(cleaned_queries, batch_size)
+
+        return [
+            self.parse_query(query, context, spacy_entities=entities)
+            for query, entities in zip(queries, spacy_entities)
+        ]
+
     def _extract_filters(self, query: str, entities: List[ParsedEntity], context: QueryContext = None) -> Dict[str, Any]:
         """Extrait les filtres avec support du contexte et négation"""
         filters = {}
@@ -127,10 +240,7 @@ class NaturalLanguageQueryParser:
                 filters['date_from'] = temporal_entities[0].value
 
         # Gérer les plages temporelles complexes
-        date_range_match = re.search(
-            r'entre\s+le\s+(\d{1,2})\s+et\s+le\s+(\d{1,2})\s+(janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre)',
-            query, re.IGNORECASE
-        )
+        date_range_match = DATE_RANGE_PATTERN.search(query)
         if date_range_match:
             start_day, end_day, month = date_range_match.groups()
             month_num = self._get_month_number(month)
@@ -170,30 +280,28 @@ class NaturalLanguageQueryParser:
         elif any(pattern in query_lower for pattern in ['reçu', 'reçus', 'inbox', 'received']):
             filters['message_type'] = 'received'
 
-        # Gestion de la négation et des actions
-        action_patterns = self.all_patterns.get('action', {})
-        for pattern, action_type in action_patterns.items():
-            match = re.search(pattern, query, re.IGNORECASE)
-            if match:
-                if action_type == 'without_attachment':
-                    filters['has_attachments'] = False
-                elif action_type == 'without_importance':
-                    filters['is_important'] = False
-                elif action_type == 'sent_by_me':
-                    filters['message_type'] = 'sent'
-                elif action_type == 'received_by_me':
-                    filters['message_type'] = 'received'
-                elif action_type == 'has_attachment':
-                    filters['has_attachments'] = True
-                elif action_type == 'unread':
-                    filters['is_unread'] = True
-                elif action_type == 'important':
-                    filters['is_important'] = True
-                elif action_type == 'archived':
-                    filters['is_archived'] = True
+        # Gestion de la négation et des actions (dans l'ordre du catalogue)
+        for match in self.compiled_actions.search(query):
+            action_type = match.value
+            if action_type == 'without_attachment':
+                filters['has_attachments'] = False
+            elif action_type == 'without_importance':
+                filters['is_important'] = False
+            elif action_type == 'sent_by_me':
+                filters['message_type'] = 'sent'
+            elif action_type == 'received_by_me':
+                filters['message_type'] = 'received'
+            elif action_type == 'has_attachment':
+                filters['has_attachments'] = True
+            elif action_type == 'unread':
+                filters['is_unread'] = True
+            elif action_type == 'important':
+                filters['is_important'] = True
+            elif action_type == 'archived':
+                filters['is_archived'] = True
 
         # Types de pièces jointes spécifiques
-        attachment_types = re.findall(r'\b(pdf|doc|docx|xls|xlsx|ppt|pptx|zip|jpg|png|gif)\b', query_lower)
+        attachment_types = ATTACHMENT_TYPES_PATTERN.findall(query_lower)
         if attachment_types:
             filters['attachment_types'] = list(set(attachment_types))
             if 'has_attachments' not in filters:
@@ -219,17 +327,15 @@ class NaturalLanguageQueryParser:
                 pattern = re.escape(entity.original)
                 semantic_text = re.sub(pattern, '', semantic_text, flags=re.IGNORECASE)
 
-        # Supprimer les mots-outils selon la langue
-        stopwords = self.stopwords_auto if language == 'auto' else (
-            self.stopwords_fr if language == 'fr' else self.stopwords_en
+        # Supprimer les mots-outils selon la langue, en une seule passe
+        stopword_pattern = self.stopword_patterns['auto'] if language == 'auto' else (
+            self.stopword_patterns['fr'] if language == 'fr' else self.stopword_patterns['en']
         )
-
-        for stopword in stopwords:
-            pattern = r'\b' + re.escape(stopword) + r'\b'
-            semantic_text = re.sub(pattern, '', semantic_text, flags=re.IGNORECASE)
+        if stopword_pattern is not None:
+            semantic_text = stopword_pattern.sub('', semantic_text)
 
         # Nettoyer les espaces multiples
-        semantic_text = re.sub(r'\s+', ' ', semantic_text).strip()
+        semantic_text = WHITESPACE_PATTERN.sub(' ', semantic_text).strip()
 
         # Si le texte devient trop court, utiliser la requête originale
         if len(semantic_text) < 3:
@@ -267,9 +373,14 @@ class NaturalLanguageQueryParser:
 _parser_instance: Optional[NaturalLanguageQueryParser] = None
 
 
-def get_query_parser() -> NaturalLanguageQueryParser:
-    """Récupère l'instance singleton du parser"""
+def get_query_parser(load_spacy: bool = True) -> NaturalLanguageQueryParser:
+    """
+    Récupère l'instance singleton du parser
+
+    Args:
+        load_spacy: Charger spaCy à la création (ignoré si l'instance existe déjà)
+    """
     global _parser_instance
     if _parser_instance is None:
-        _parser_instance = NaturalLanguageQueryParser()
+        _parser_instance = NaturalLanguageQueryParser(load_spacy=load_spacy)
     return _parser_instance
\ No newline at end of file
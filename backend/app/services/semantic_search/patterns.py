@@ -3,9 +3,130 @@ Patterns enrichis multilingues pour l'extraction d'entités et la détection d'i
 Supporte français et anglais avec fallback automatique.
 """
 
-from typing import Dict, Any, List
+import re
+from typing import Dict, Any, List, Optional, Tuple
 
 
+class PatternMatch:
+    """Correspondance d'un pattern du catalogue (interface de re.Match limitée à ce pattern)"""
+
+    __slots__ = ('pattern', 'value', 'index', '_match', '_group', '_inner')
+
+    def __init__(self, pattern: str, value: Any, index: int, match: re.Match, group: int, inner: int):
+        self.pattern = pattern
+        self.value = value
+        self.index = index
+        self._match = match
+        self._group = group
+        self._inner = inner
+
+    def group(self, n: int = 0) -> Optional[str]:
+        """Texte reconnu (n=0) ou groupe capturé n du pattern"""
+        return self._match.group(self._group + n)
+
+    def groups(self) -> Tuple[Optional[str], ...]:
+        """Groupes capturés du pattern"""
+        return tuple(self._match.group(self._group + n) for n in range(1, self._inner + 1))
+
+    def start(self) -> int:
+        return self._match.start(self._group)
+
+    def end(self) -> int:
+        return self._match.end(self._group)
+
+
+class CompiledPatternSet:
+    """
+    Patterns d'une catégorie fusionnés en une seule expression compilée
+
+    La requête est parcourue une seule fois par l'alternation de tous les
+    patterns. À chaque position où elle correspond, une seconde expression, où
+    chaque pattern est une alternative nommée placée dans un lookahead, capture
+    toutes les alternatives qui correspondent à cette position. Les résultats
+    sont identiques à un re.finditer / re.search par pattern (insensible à la
+    casse), y compris pour les correspondances chevauchantes.
+    """
+
+    def __init__(self, patterns):
+        """
+        Compile l'ensemble des patterns
+
+        Args:
+            patterns: Dictionnaire pattern -> valeur, ou liste de patterns (valeur None)
+        """
+        items = list(patterns.items()) if isinstance(patterns, dict) else [(p, None) for p in patterns]
+        self.patterns = [pattern for pattern, _ in items]
+        self.values = [value for _, value in items]
+        self._regex = None
+        if not items:
+            return
+
+        self._regex = re.compile('|'.join(f'(?:{pattern})' for pattern in self.patterns), re.IGNORECASE)
+        self._captures = re.compile(
+            ''.join(f'(?:(?=(?P<p{i}>{pattern})))?' for i, pattern in enumerate(self.patterns)), re.IGNORECASE
+        )
+        self._groups = [self._captures.groupindex[f'p{i}'] for i in range(len(items))]
+        self._inner = [re.compile(pattern).groups for pattern in self.patterns]
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _scan(self, text: str, first_only: bool) -> Dict[int, List[PatternMatch]]:
+        """Correspondances par pattern, sans chevauchement pour un même pattern (comme re.finditer)"""
+        found = {}
+        if self._regex is None:
+            return found
+
+        ends = {}
+        hit = self._regex.search(text)
+        while hit is not None:
+            position = hit.start()
+            match = self._captures.match(text, position)
+            captured = match.group(*self._groups) if len(self._groups) > 1 else (match.group(self._groups[0]),)
+            for index, value in enumerate(captured):
+                if value is None:
+                    continue
+                if first_only and index in found:
+                    continue
+                if position < ends.get(index, 0):
+                    continue
+                group = self._groups[index]
+                # Une correspondance vide avance d'un caractère, comme re.finditer
+                ends[index] = max(match.end(group), position + 1)
+                found.setdefault(index, []).append(PatternMatch(
+                    self.patterns[index], self.values[index], index, match, group, self._inner[index]
+                ))
+            # Les correspondances d'autres patterns peuvent commencer dans celle-ci
+            # (en fin de texte, une correspondance vide se répéterait indéfiniment)
+            hit = self._regex.search(text, position + 1) if position < len(text) else None
+        return found
+
+    def finditer(self, text: str) -> List[PatternMatch]:
+        """
+        Toutes les correspondances de tous les patterns
+
+        Args:
+            text: Texte à analyser
+
+        Returns:
+            Correspondances dans l'ordre du catalogue, puis dans l'ordre du texte
+        """
+        found = self._scan(text, first_only=False)
+        return [match for index in sorted(found) for match in found[index]]
+
+    def search(self, text: str) -> List[PatternMatch]:
+        """
+        Première correspondance de chaque pattern présent dans le texte
+
+        Args:
+            text: Texte à analyser
+
+        Returns:
+            Correspondances dans l'ordre du catalogue
+        """
+        found = self._scan(text, first_only=True)
+        return [found[index][0] for index in sorted(found)]
+
 
 class EmailPatterns:
     """Gestionnaire centralisé de tous les patterns email"""
@@ -17,6 +138,7 @@ class EmailPatterns:
         self._init_action_patterns()
         self._init_intent_patterns()
         self._init_validation_patterns()
+        self._compile_patterns()
 
     def _init_temporal_patterns(self):
         """Patterns pour détection temporelle enrichie"""
@@ -448,6 +570,35 @@ class EmailPatterns:
             }
         }
 
+    def _compile_patterns(self):
+        """Compile chaque catégorie une seule fois, pour chaque langue"""
+        self.compiled_patterns = {}
+        for language in ('fr', 'en', 'auto'):
+            patterns = self.get_patterns(language, 'all')
+            compiled = {
+                category: CompiledPatternSet(patterns.get(category, {}))
+                for category in ('temporal', 'contact', 'topic', 'action')
+            }
+            # Intentions : un ensemble par intention, avec les patterns de la langue
+            compiled['intent'] = {
+                intent_name: CompiledPatternSet(patterns_by_lang.get(language, []))
+                for intent_name, patterns_by_lang in patterns.get('intent', {}).items()
+            }
+            self.compiled_patterns[language] = compiled
+
+    def get_compiled_patterns(self, language: str = 'auto', category: str = 'temporal'):
+        """
+        Récupère les patterns compilés d'une catégorie
+
+        Args:
+            language: 'fr', 'en', ou 'auto' pour combiner
+            category: 'temporal', 'contact', 'topic', 'action' ou 'intent'
+
+        Returns:
+            CompiledPatternSet, ou dictionnaire intention -> CompiledPatternSet pour 'intent'
+        """
+        return self.compiled_patterns.get(language, self.compiled_patterns['auto'])[category]
+
     def get_patterns(self, language: str = 'auto', category: str = 'all') -> Dict[str, Any]:
         """
         Récupère les patterns selon la langue et la catégorie
@@ -538,6 +689,11 @@ def get_patterns(language: str = 'auto', category: str = 'all') -> Dict[str, Any
     return get_email_patterns().get_patterns(language, category)
 
 
+def get_compiled_patterns(language: str = 'auto', category: str = 'temporal'):
+    """Fonction utilitaire pour récupérer les patterns compilés"""
+    return get_email_patterns().get_compiled_patterns(language, category)
+
+
 def is_blacklisted_name(name: str, language: str = 'auto') -> bool:
     """Fonction utilitaire pour vérifier la blacklist"""
     return get_email_patterns().is_blacklisted_name(name, language)
@@ -0,0 +1,160 @@
+"""
+Cache LRU des requêtes transformées pour Accord.
+Évite de relancer spaCy, les patterns et le LLM pour une requête répétée.
+
+Les dates relatives ("hier", "last week") sont résolues au jour près : une
+entrée calculée aujourd'hui reste exacte jusqu'au prochain changement de jour,
+dans le fuseau de l'utilisateur ou en UTC (fuseau de résolution du parser),
+puis elle expire et la requête est de nouveau résolue.
+"""
+
+import copy
+import threading
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+import pytz
+
+
+@dataclass
+class QueryCacheConfig:
+    """Configuration du cache des requêtes"""
+    enabled: bool = True
+    max_entries: int = 512  # Requêtes conservées (LRU)
+    default_timezone: str = "UTC"  # Fuseau utilisé si le contexte n'en fournit pas
+
+
+def normalize_query(query: str) -> str:
+    """Normalise le texte d'une requête (Unicode NFC, espaces)"""
+    return ' '.join(unicodedata.normalize('NFC', query or '').split())
+
+
+class ParsedQueryCache:
+    """
+    Cache LRU des résultats de transformation, valable pour la journée de l'utilisateur
+    """
+
+    def __init__(self, config: QueryCacheConfig = None):
+        self.config = config or QueryCacheConfig()
+        self._entries: "OrderedDict[Tuple, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def _timezone(self, user_context: Optional[Dict[str, Any]]):
+        """Fuseau de l'utilisateur (UTC si absent ou inconnu)"""
+        context = user_context or {}
+        name = context.get('timezone') or context.get('time_zone') or self.config.default_timezone
+        try:
+            return pytz.timezone(name)
+        except Exception:
+            return pytz.UTC
+
+    def make_key(
+            self,
+            query: str,
+            user_context: Optional[Dict[str, Any]] = None,
+            central_user_email: Optional[str] = None
+    ) -> Tuple:
+        """
+        Construit la clé d'une requête
+
+        Args:
+            query: Requête utilisateur
+            user_context: Contexte utilisateur (fuseau horaire)
+            central_user_email: Utilisateur central
+
+        Returns:
+            Clé (requête normalisée, fuseau, utilisateur central)
+        """
+        context = user_context or {}
+        central_user = central_user_email or context.get('central_user_email') or ''
+        return normalize_query(query), self._timezone(user_context).zone, central_user.lower()
+
+    def current_day(self, user_context: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Jour de référence des dates relatives
+
+        Args:
+            user_context: Contexte utilisateur (fuseau horaire)
+
+        Returns:
+            Date du jour dans le fuseau de l'utilisateur, suivie de la date UTC si elle diffère
+        """
+        local_day = datetime.now(self._timezone(user_context)).strftime('%Y-%m-%d')
+        utc_day = datetime.now(pytz.UTC).strftime('%Y-%m-%d')
+        return local_day if local_day == utc_day else f"{local_day}/{utc_day}"
+
+    def get(self, key: Tuple, day: str) -> Optional[Dict[str, Any]]:
+        """
+        Récupère un résultat calculé le même jour
+
+        Args:
+            key: Clé de la requête
+            day: Date du jour de l'utilisateur
+
+        Returns:
+            Copie du résultat, None si absent ou expiré
+        """
+        if not self.config.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] != day:
+                # Changement de jour : les dates relatives doivent être résolues de nouveau
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+    def put(self, key: Tuple, day: str, result: Dict[str, Any]):
+        """
+        Enregistre un résultat pour la journée en cours
+
+        Args:
+            key: Clé de la requête
+            day: Date du jour de l'utilisateur
+            result: Résultat de la transformation
+        """
+        if not self.config.enabled:
+            return
+
+        with self._lock:
+            self._entries[key] = (day, copy.deepcopy(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.config.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Vide le cache"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistiques du cache (taux de succès)"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.config.enabled,
+                'size': len(self._entries),
+                'max_entries': self.config.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'expirations': self.expirations,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
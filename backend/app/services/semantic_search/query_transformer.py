@@ -5,6 +5,8 @@ Gère la fusion LLM + heuristiques et la validation des requêtes.
 """
 
 import json
+import logging
+import threading
 import time
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
@@ -12,6 +14,21 @@ from datetime import datetime, timedelta
 from backend.app.services.semantic_search.models import SemanticQuery, SearchFilter, QueryType, NaturalLanguageRequest
 from backend.app.services.semantic_search.parsing.query_parser import get_query_parser, IntentType
 from backend.app.services.semantic_search.llm_engine import get_query_parser as get_llm_parser
+from backend.app.services.semantic_search.query_cache import ParsedQueryCache, QueryCacheConfig
+from backend.app.services.semantic_search.model_loader import get_model_loader
+from backend.app.services.semantic_search.tiered_parsing import (
+    TIERS,
+    TieredParsingConfig,
+    gate_tier,
+    result_signature
+)
+from backend.app.services.semantic_search.llm_executor import (
+    get_llm_executor,
+    LLMQueueFullError,
+    LLMTimeoutError
+)
+
+logger = logging.getLogger(__name__)
 
 
 class QueryTransformationStrategy:
@@ -163,9 +180,22 @@ class SemanticQueryTransformer:
     Combine heuristiques NLP et LLM pour maximum de robustesse.
     """
 
-    def __init__(self):
+    def __init__(self, cache_config: QueryCacheConfig = None, tier_config: TieredParsingConfig = None):
         self.nlp_parser = get_query_parser()
         self.llm_parser = get_llm_parser()
+        self.llm_executor = get_llm_executor()
+        self.model_loader = get_model_loader()
+
+        # Cache des requêtes transformées (par requête, fuseau et utilisateur central)
+        self.cache = ParsedQueryCache(cache_config)
+
+        # Seuils de confiance des paliers regex → spaCy → LLM et coût de chaque palier
+        self.tier_config = tier_config or TieredParsingConfig()
+        self._tier_lock = threading.Lock()
+        self.tier_stats = {
+            tier: {'runs': 0, 'total_latency_ms': 0.0, 'changed_by_next': 0, 'final': 0}
+            for tier in TIERS
+        }
 
         # Mapping des intentions vers transformations
         self.transformation_strategies = {
@@ -190,26 +220,21 @@ class SemanticQueryTransformer:
             Structure sémantique complète pour la recherche
         """
         start_time = time.time()
-        # 1. Parse avec heuristiques NLP
-        nlp_result = self.nlp_parser.parse_query(request.query)
-        #nlp_result = {'confidence':0}
 
-        # 2. Parse avec LLM (si disponible et confiance NLP faible)
-        llm_result = None
-        use_llm = (
-                nlp_result.get('confidence', 0) < 0.8 or
-                nlp_result.get('intent') == IntentType.UNKNOWN.value
-        )
-
-        if use_llm and self.llm_parser.model:
-            print("lancement LLM")
-            try:
-                llm_result = self.llm_parser.parse_query(
-                    request.query,
-                    request.user_context or {}
-                )
-            except Exception as e:
-                print(f"⚠️ Erreur LLM, utilisation NLP uniquement: {e}")
+        # 0. Requête déjà transformée aujourd'hui pour ce contexte
+        cache_key = self.cache.make_key(request.query, request.user_context, request.central_user_email)
+        cache_day = self.cache.current_day(request.user_context)
+        cached = self.cache.get(cache_key, cache_day)
+        if cached is not None:
+            cached['processing_info']['transformation_time_ms'] = (time.time() - start_time) * 1000
+            cached['processing_info']['cache'] = 'hit'
+            return cached
+
+        # 1-2. Paliers regex → spaCy → LLM, arrêtés dès que la confiance suffit
+        tier_run = self._run_tiers(request)
+        nlp_result = tier_run['nlp_result']
+        llm_result = tier_run['llm_result']
+        llm_failed = tier_run['llm_failed']
 
         # 3. Fusion intelligente des résultats
         merged_result = self._merge_parsing_results(nlp_result, llm_result)
@@ -222,15 +247,22 @@ class SemanticQueryTransformer:
 
         # 6. Ajout métadonnées
         transformation_time = (time.time() - start_time) * 1000
+        models_loading = self.model_loader.is_loading()
 
-        return {
+        result = {
             'success': True,
             'semantic_query': validated_query,
             'processing_info': {
                 'transformation_time_ms': transformation_time,
                 'parsing_method': self._get_parsing_method_used(nlp_result, llm_result),
                 'confidence': merged_result.get('confidence', 0.5),
-                'original_intent': merged_result.get('intent', 'unknown')
+                'original_intent': merged_result.get('intent', 'unknown'),
+                'cache': 'miss',
+                'models_loading': models_loading,
+                'tiers': [
+                    {key: value for key, value in tier.items() if key != 'signature'}
+                    for tier in tier_run['tiers']
+                ]
             },
             'debug_info': {
                 'nlp_result': nlp_result,
@@ -239,6 +271,148 @@ class SemanticQueryTransformer:
             }
         }
 
+        # Un échec du LLM (y compris son fallback à règles) n'est pas mis en cache : la requête sera retentée.
+        # Pendant le chargement de spaCy / du LLM non plus : le résultat s'améliorera ensuite
+        if not llm_failed and not models_loading:
+            self.cache.put(cache_key, cache_day, result)
+
+        return result
+
+    def _run_tiers(self, request: NaturalLanguageRequest, run_all: bool = False) -> Dict[str, Any]:
+        """
+        Exécute les paliers de parsing jusqu'à atteindre le seuil de confiance de l'intention
+
+        Args:
+            request: Requête en langage naturel
+            run_all: Exécuter tous les paliers disponibles (évaluation hors ligne)
+
+        Returns:
+            Résultat heuristique final, résultat LLM, échec LLM et détail des
+            paliers (latence, intention, confiance, changement par le palier suivant)
+        """
+        tiers: List[Dict[str, Any]] = []
+        available = {'regex'}
+        if self.nlp_parser.entity_extractor.nlp_model is not None:
+            available.add('spacy')
+
+        def add_tier(name: str, tier_start: float, result: Dict[str, Any]):
+            tiers.append({
+                'tier': name,
+                'latency_ms': (time.time() - tier_start) * 1000,
+                'intent': result.get('intent', 'unknown'),
+                'confidence': result.get('confidence', 0),
+                'signature': result_signature(result),
+                'changed': None  # Renseigné si le palier suivant est exécuté
+            })
+
+        def should_stop(name: str, result: Dict[str, Any]) -> bool:
+            return not run_all and self.tier_config.should_stop(gate_tier(name, available), result)
+
+        # Palier 1 : patterns regex seuls
+        tier_start = time.time()
+        nlp_result = self.nlp_parser.parse_query(request.query, use_spacy=False)
+        add_tier('regex', tier_start, nlp_result)
+        stop = should_stop('regex', nlp_result)
+
+        # Palier 2 : NER spaCy ajoutée aux entités du palier regex (si le modèle est chargé)
+        if not stop and 'spacy' in available:
+            tier_start = time.time()
+            nlp_result = self.nlp_parser.add_spacy_entities(nlp_result)
+            add_tier('spacy', tier_start, nlp_result)
+            stop = should_stop('spacy', nlp_result)
+
+        # Palier 3 : LLM, fusionné avec le résultat heuristique
+        llm_result = None
+        llm_failed = False
+        if not stop and self.llm_parser.model:
+            logger.debug("Palier LLM : %s", request.query)
+            tier_start = time.time()
+            try:
+                # Même file bornée que l'API : une seule génération à la fois sur le modèle
+                llm_result = self.llm_executor.call(
+                    self.llm_parser.parse_query,
+                    request.query,
+                    request.user_context or {}
+                )
+                # Le parser LLM retombe sur ses règles en cas d'erreur : même traitement qu'un échec
+                if (llm_result.get('_meta') or {}).get('model_used') == 'fallback':
+                    llm_failed = True
+                add_tier('llm', tier_start, self._merge_parsing_results(nlp_result, llm_result))
+            except (LLMQueueFullError, LLMTimeoutError) as e:
+                logger.warning("LLM indisponible, utilisation NLP uniquement: %s", e)
+                llm_failed = True
+            except Exception as e:
+                logger.warning("Erreur LLM, utilisation NLP uniquement: %s", e)
+                llm_failed = True
+
+        for previous, following in zip(tiers, tiers[1:]):
+            previous['changed'] = previous['signature'] != following['signature']
+        self._record_tiers(tiers)
+
+        return {'nlp_result': nlp_result, 'llm_result': llm_result, 'llm_failed': llm_failed, 'tiers': tiers}
+
+    def transform_heuristic(self, query: str) -> Dict[str, Any]:
+        """
+        Transforme une requête avec le parser heuristique seul (regex + spaCy)
+
+        Utilisé quand le LLM est saturé ou trop lent.
+
+        Args:
+            query: Requête utilisateur
+
+        Returns:
+            Structure sémantique validée
+        """
+        nlp_result = self.nlp_parser.parse_query(query)
+        semantic_query = self._apply_transformation_strategy(nlp_result)
+        return self._validate_and_clean(semantic_query)
+
+    def evaluate_tiers(self, query: str, user_context: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Exécute tous les paliers disponibles sur une requête, sans seuil (évaluation hors ligne)
+
+        Args:
+            query: Requête utilisateur
+            user_context: Contexte utilisateur optionnel
+
+        Returns:
+            Détail de chaque palier (latence, intention, confiance, signature du résultat)
+        """
+        request = NaturalLanguageRequest(query=query, user_context=user_context)
+        return self._run_tiers(request, run_all=True)['tiers']
+
+    def _record_tiers(self, tiers: List[Dict[str, Any]]):
+        """Comptabilise les paliers exécutés pour une requête"""
+        with self._tier_lock:
+            for tier in tiers:
+                stats = self.tier_stats[tier['tier']]
+                stats['runs'] += 1
+                stats['total_latency_ms'] += tier['latency_ms']
+                if tier['changed']:
+                    stats['changed_by_next'] += 1
+            if tiers:
+                self.tier_stats[tiers[-1]['tier']]['final'] += 1
+
+    def get_tier_stats(self) -> Dict[str, Any]:
+        """Coût des paliers (exécutions, latence moyenne, part des résultats modifiés par le palier suivant)"""
+        with self._tier_lock:
+            return {
+                tier: {
+                    'runs': stats['runs'],
+                    'final': stats['final'],
+                    'mean_latency_ms': stats['total_latency_ms'] / stats['runs'] if stats['runs'] else 0.0,
+                    'changed_by_next_rate': (
+                        stats['changed_by_next'] / (stats['runs'] - stats['final'])
+                        if stats['runs'] > stats['final'] else 0.0
+                    )
+                }
+                for tier, stats in self.tier_stats.items()
+            }
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Statistiques du cache des requêtes transformées"""
+        return self.cache.get_stats()
+
     # Combine intelligemment les résultats NLP (spaCy+regex) et LLM (Mistral)
     def _merge_parsing_results(
             self,
@@ -601,6 +601,34 @@ class QueryTester:
 
         return results_summary
 
+    @staticmethod
+    def test_heuristic_parsing(pipeline: AccordPipeline, batch_size: int = 64) -> Dict[str, int]:
+        """Parse toutes les requêtes de test en un lot (NER spaCy via nlp.pipe), sans LLM ni recherche"""
+        test_queries = QueryTester.get_all_test_queries()
+
+        print("\n" + "=" * 80)
+        print("🧪 PARSING HEURISTIQUE PAR LOT")
+        print("=" * 80)
+
+        if not pipeline.query_transformer:
+            pipeline.initialize_nlp()
+
+        start_time = time.time()
+        parsed_queries = pipeline.query_transformer.nlp_parser.parse_queries(test_queries, batch_size=batch_size)
+        parse_time = (time.time() - start_time) * 1000
+
+        intent_counts = {}
+        for parsed in parsed_queries:
+            intent_counts[parsed['intent']] = intent_counts.get(parsed['intent'], 0) + 1
+
+        print(f"✅ {len(test_queries)} requêtes parsées en {parse_time:.0f}ms "
+              f"({parse_time / len(test_queries):.2f}ms par requête)")
+        print("\n📊 Distribution des intentions:")
+        for intent, count in sorted(intent_counts.items(), key=lambda x: x[1], reverse=True):
+            print(f"   {intent}: {count}")
+
+        return intent_counts
+
 
 def main():
     """Point d'entrée principal avec options de ligne de commande"""
@@ -647,6 +675,7 @@ def main():
     if args.mode == 'basic':
         QueryTester.test_basic_queries(pipeline)
     else:
+        QueryTester.test_heuristic_parsing(pipeline)
         QueryTester.test_all_queries(pipeline)
 
     # Afficher les statistiques finales
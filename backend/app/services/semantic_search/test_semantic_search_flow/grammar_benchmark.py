@@ -0,0 +1,98 @@
+"""
+Mesure du décodage JSON contraint de MistralQueryParser.
+
+Génère les mêmes requêtes sans puis avec la grammaire JSON dérivée de
+SemanticQuery / SearchFilter, et rapporte pour chaque mode le nombre moyen
+de tokens générés, le taux de sorties JSON invalides, les générations
+tronquées par le budget de tokens et la latence.
+
+Usage:
+    python -m backend.app.services.semantic_search.test_semantic_search_flow.grammar_benchmark \\
+        --model-path models/mistral-7b-instruct.Q4_K_M.gguf --repeat 2
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from backend.app.services.semantic_search.llm_engine import LLMConfig, MistralQueryParser
+from backend.app.services.semantic_search.test_semantic_search_flow.prefix_cache_benchmark import (
+    QUERIES, percentile
+)
+
+
+def run_mode(parser, queries, repeat, grammar):
+    """
+    Parse les requêtes avec ou sans grammaire
+
+    Args:
+        parser (MistralQueryParser): Parser chargé avec sa grammaire
+        queries (list): Requêtes à parser
+        repeat (int): Nombre de passages
+        grammar: Grammaire à utiliser (None pour la génération libre)
+
+    Returns:
+        dict: Statistiques de génération et latences
+    """
+    parser.grammar = grammar
+    parser.generation_stats = {key: 0 for key in parser.generation_stats}
+
+    latencies = []
+    for _ in range(repeat):
+        for query in queries:
+            start_time = time.perf_counter()
+            parser.parse_query(query)
+            latencies.append((time.perf_counter() - start_time) * 1000)
+
+    latencies.sort()
+    return {
+        **parser.get_generation_stats(),
+        "latency_ms": {"mean": sum(latencies) / len(latencies), "p50": percentile(latencies, 0.5),
+                       "p95": percentile(latencies, 0.95)}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tokens générés et échecs de parsing avec et sans grammaire JSON")
+    parser.add_argument("--model-path", required=True, help="Modèle GGUF")
+    parser.add_argument("--n-gpu-layers", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="Passages par mode")
+    parser.add_argument("--queries", help="Fichier de requêtes (une par ligne)")
+    parser.add_argument("--output", help="Fichier JSON du rapport")
+    args = parser.parse_args()
+
+    queries = QUERIES
+    if args.queries:
+        with open(args.queries, encoding="utf-8") as f:
+            queries = [line.strip() for line in f if len(line.strip()) >= 3]
+
+    query_parser = MistralQueryParser(LLMConfig(
+        model_path=args.model_path,
+        n_gpu_layers=args.n_gpu_layers,
+        use_mlock=False
+    ))
+    if query_parser.model is None or query_parser.grammar is None:
+        print("❌ Modèle ou grammaire JSON indisponible")
+        sys.exit(1)
+
+    grammar = query_parser.grammar
+    report = {
+        "free": run_mode(query_parser, queries, args.repeat, None),
+        "grammar": run_mode(query_parser, queries, args.repeat, grammar)
+    }
+
+    print(f"📊 {len(queries)} requêtes x {args.repeat}")
+    for mode, stats in report.items():
+        print(f"   {mode:<8} budget moyen {stats['max_tokens']} tokens, "
+              f"{stats['mean_generated_tokens']:.1f} tokens générés en moyenne, "
+              f"JSON invalide {stats['parse_failure_rate']:.0%}, tronquées {stats['truncated']}, "
+              f"latence p50 {stats['latency_ms']['p50']:.0f} ms")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Test de charge de l'endpoint /semantic-search/parse.
+
+Envoie des requêtes concurrentes au service lancé (uvicorn) et rapporte le
+débit, les percentiles de latence, la répartition des statuts LLM (ok,
+queue_full, timeout...) et les statistiques de l'exécuteur et des
+micro-lots exposées par /health.
+
+Usage:
+    python backend/app/services/semantic_search/test_semantic_search_flow/load_test.py \\
+        --url http://localhost:8000 --requests 200 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+
+import httpx
+
+QUERIES = [
+    "emails de Marie hier",
+    "factures de la semaine dernière",
+    "messages de pierre.martin@client.com avec pièce jointe",
+    "réunion avec l'équipe Marketing en mars",
+    "emails from John Smith last week",
+    "newsletter non lus cette semaine",
+    "documents pdf de Jean entre le 2 et le 10 avril",
+    "emails envoyés à Paul avant-hier",
+    "contrat urgent fin juin",
+    "conversation avec Claire sur le projet Atlas",
+]
+
+
+def percentile(values, ratio):
+    """Percentile d'une liste triée"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * ratio))]
+
+
+async def run_load_test(url, total_requests, concurrency, queries, timeout):
+    """
+    Exécute le test de charge
+
+    Args:
+        url (str): URL de base du service
+        total_requests (int): Nombre total de requêtes
+        concurrency (int): Requêtes simultanées
+        queries (list): Requêtes tirées au hasard
+        timeout (float): Délai HTTP par requête en secondes
+
+    Returns:
+        dict: Rapport (débit, latences, statuts)
+    """
+    latencies = []
+    statuses = Counter()
+    errors = Counter()
+    remaining = iter(range(total_requests))
+
+    async with httpx.AsyncClient(base_url=url, timeout=timeout) as client:
+        async def worker():
+            for _ in remaining:
+                payload = {"query": random.choice(queries)}
+                start_time = time.perf_counter()
+                try:
+                    response = await client.post("/semantic-search/parse", json=payload)
+                    latencies.append((time.perf_counter() - start_time) * 1000)
+                    if response.status_code != 200:
+                        errors[f"http_{response.status_code}"] += 1
+                        continue
+                    statuses[response.json().get("model_info", {}).get("llm_status", "unknown")] += 1
+                except httpx.HTTPError as e:
+                    errors[type(e).__name__] += 1
+
+        start_time = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start_time
+
+        try:
+            health = (await client.get("/semantic-search/health")).json()
+        except httpx.HTTPError:
+            health = {}
+
+    latencies.sort()
+    return {
+        "requests": total_requests,
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+            "p50": percentile(latencies, 0.5),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": latencies[-1] if latencies else 0.0
+        },
+        "llm_status": dict(statuses),
+        "errors": dict(errors),
+        "llm_executor": health.get("llm_executor"),
+        "llm_batching": health.get("llm_batching")
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge de /semantic-search/parse")
+    parser.add_argument("--url", default="http://localhost:8000", help="URL de base du service")
+    parser.add_argument("--requests", type=int, default=200, help="Nombre total de requêtes")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requêtes simultanées")
+    parser.add_argument("--queries", help="Fichier de requêtes (une par ligne)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Délai HTTP par requête (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Fichier JSON du rapport")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    queries = QUERIES
+    if args.queries:
+        with open(args.queries, encoding="utf-8") as f:
+            queries = [line.strip() for line in f if len(line.strip()) >= 3]
+
+    report = asyncio.run(run_load_test(args.url, args.requests, args.concurrency, queries, args.timeout))
+
+    print(f"📊 {report['requests']} requêtes, concurrence {report['concurrency']}")
+    print(f"   Débit: {report['throughput_rps']:.2f} req/s")
+    latency = report["latency_ms"]
+    print(f"   Latence: p50 {latency['p50']:.0f} ms, p95 {latency['p95']:.0f} ms, "
+          f"p99 {latency['p99']:.0f} ms, max {latency['max']:.0f} ms")
+    print(f"   Statuts LLM: {report['llm_status']}")
+    if report["errors"]:
+        print(f"   ⚠️ Erreurs: {report['errors']}")
+    if report["llm_batching"]:
+        batching = report["llm_batching"]
+        print(f"   Lots: {batching['batches']} (taille moyenne {batching['mean_batch_size']:.1f}), "
+              f"{batching['deduplicated']} requêtes dédupliquées")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
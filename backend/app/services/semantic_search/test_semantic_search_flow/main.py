@@ -9,6 +9,7 @@ Cas complexe : spaCy + LLM fusionnés (qualité)
 
 """
 import time
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
@@ -20,6 +21,7 @@ from fastapi.responses import JSONResponse
 debuguerBreakpoint = True
 from backend.app.services.semantic_search.endpoints import router
 from backend.app.services.semantic_search.llm_engine import get_query_parser
+from backend.app.services.semantic_search.model_loader import get_model_loader
 from backend.app.services.semantic_search.query_transformer import get_query_transformer
 
 # Configuration du logging
@@ -29,56 +31,60 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-debuguerBreakpoint = True
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Gestionnaire de cycle de vie de l'application"""
 
-    # Startup
-    logger.info("🚀 Démarrage du service de recherche sémantique Accord")
-
-    # Pré-chargement des modèles pour optimiser les premières requêtes
-    logger.info("📥 Pré-chargement des composants...")
+async def run_sanity_check(loader):
+    """
+    Test de sanité au démarrage, une fois spaCy et le LLM chargés
+        - Vérifier que le pipeline complet fonctionne (LLM + transformer)
+        - Mesurer les performances une fois les modèles prêts
+        - S'assurer que tous les composants sont correctement chargés
+    """
+    # Attente dans un thread : la boucle d'événements continue de servir les requêtes
+    await asyncio.to_thread(loader.wait)
 
     try:
-        # Initialiser le parser LLM
-        debuguerBreakpoint = True
         llm_parser = get_query_parser()
         if llm_parser.model:
             logger.info("✅ Modèle LLM Mistral 7B chargé")
         else:
             logger.warning("⚠️ Modèle LLM non disponible, fallback activé")
 
-        # Initialiser le transformer
-        transformer = get_query_transformer()
-        logger.info("✅ Query transformer initialisé")
-
-        # Test de sanité au demarrage
-        """
-            - Vérifier que le pipeline complet fonctionne (LLM + transformer)
-            - Mesurer les performances au démarrage
-            - S'assurer que tous les composants sont correctement chargés
-        """
-        test_query = "emails de test"
-        start_time = time.time()
         from backend.app.services.semantic_search.models import NaturalLanguageRequest
         # crée un objet Pydantic pour encapsuler la requête,
-        test_request = NaturalLanguageRequest(query=test_query)
-        debuguerBreakpoint = True
-        result = transformer.transform_query(test_request) #Go to : query_transformer.transform_query
+        test_request = NaturalLanguageRequest(query="emails de test")
+        start_time = time.time()
+        result = await asyncio.to_thread(get_query_transformer().transform_query, test_request)
         print(result)
 
-
         test_time = (time.time() - start_time) * 1000
-        logger.info(f"✅ Test de sanité réussi en {test_time:.1f}ms")
+        logger.info(f"✅ Test de sanité réussi en {test_time:.1f}ms (composants: {loader.get_status()})")
 
     except Exception as e:
-        logger.error(f"❌ Erreur lors de l'initialisation: {e}")
+        logger.error(f"❌ Erreur lors du test de sanité: {e}")
+
+
+debuguerBreakpoint = True
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Gestionnaire de cycle de vie de l'application"""
+
+    # Startup
+    logger.info("🚀 Démarrage du service de recherche sémantique Accord")
+
+    # Parsing regex prêt immédiatement ; spaCy et le LLM se chargent en arrière-plan
+    # et sont utilisés par le transformer dès qu'ils sont prêts (voir /health)
+    start_time = time.time()
+    loader = get_model_loader()
+    loader.start()
+    logger.info(f"📥 Chargement des modèles lancé en arrière-plan ({(time.time() - start_time) * 1000:.1f}ms)")
+
+    sanity_task = asyncio.create_task(run_sanity_check(loader))
     logger.info("🎯 Service de recherche sémantique prêt")
 
     yield
 
     # Shutdown
+    sanity_task.cancel()
     logger.info("🛑 Arrêt du service de recherche sémantique")
 
 
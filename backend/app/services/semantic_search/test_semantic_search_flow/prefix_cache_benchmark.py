@@ -0,0 +1,152 @@
+"""
+Mesure du cache KV du préfixe de prompt de MistralQueryParser.
+
+Compare, sur le même modèle GGUF et les mêmes requêtes, le temps jusqu'au
+premier token (TTFT) et la latence totale de génération :
+- full : contexte vidé avant chaque requête, le prompt entier est évalué ;
+- implicit : chemin précédent, llama.cpp réutilise seulement le préfixe commun
+  avec le prompt précédent resté dans le contexte ;
+- prefix_state : contexte vidé puis état du préfixe restauré, seule la partie
+  propre à la requête est évaluée.
+
+Usage:
+    python -m backend.app.services.semantic_search.test_semantic_search_flow.prefix_cache_benchmark \\
+        --model-path models/mistral-7b-instruct.Q4_K_M.gguf --n-gpu-layers 0 --repeat 3
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from backend.app.services.semantic_search.llm_engine import LLMConfig, MistralQueryParser
+
+MODES = ("full", "implicit", "prefix_state")
+
+QUERIES = [
+    "emails de Marie hier",
+    "factures de la semaine dernière",
+    "emails from John Smith last week",
+    "documents pdf de Jean entre le 2 et le 10 avril",
+    "conversation avec Claire sur le projet Atlas",
+]
+
+
+def percentile(values, ratio):
+    """Percentile d'une liste triée"""
+    return values[min(len(values) - 1, int(len(values) * ratio))] if values else 0.0
+
+
+def time_generation(parser, prompt):
+    """
+    Génère une réponse en streaming
+
+    Args:
+        parser (MistralQueryParser): Parser chargé
+        prompt (str): Prompt complet
+
+    Returns:
+        tuple: (TTFT en ms, latence totale en ms, tokens générés)
+    """
+    start_time = time.perf_counter()
+    first_token_ms = None
+    generated = 0
+    for _ in parser.model(
+            prompt,
+            max_tokens=parser.config.max_tokens,
+            temperature=parser.config.temperature,
+            stop=["[/INST]", "\n\n", "Query:"],
+            echo=False,
+            stream=True
+    ):
+        if first_token_ms is None:
+            first_token_ms = (time.perf_counter() - start_time) * 1000
+        generated += 1
+    total_ms = (time.perf_counter() - start_time) * 1000
+    return first_token_ms or total_ms, total_ms, generated
+
+
+def run_benchmark(parser, queries, repeat):
+    """
+    Exécute chaque mode sur les requêtes
+
+    Args:
+        parser (MistralQueryParser): Parser chargé avec le cache du préfixe
+        queries (list): Requêtes à générer
+        repeat (int): Nombre de passages par mode
+
+    Returns:
+        dict: Rapport par mode (TTFT et latence totale)
+    """
+    report = {"prefix_tokens": len(parser.prefix_tokens)}
+    for mode in MODES:
+        ttfts, totals, tokens = [], [], 0
+        for _ in range(repeat):
+            for query in queries:
+                prompt = parser._build_prompt(query)
+                restore_start = time.perf_counter()
+                if mode != "implicit":
+                    parser.model.reset()
+                if mode == "prefix_state":
+                    parser._restore_prompt_prefix()
+                restore_ms = (time.perf_counter() - restore_start) * 1000
+
+                ttft, total, generated = time_generation(parser, prompt)
+                ttfts.append(ttft + restore_ms)
+                totals.append(total + restore_ms)
+                tokens += generated
+
+        ttfts.sort()
+        totals.sort()
+        report[mode] = {
+            "requests": len(totals),
+            "ttft_ms": {"mean": sum(ttfts) / len(ttfts), "p50": percentile(ttfts, 0.5),
+                        "p95": percentile(ttfts, 0.95)},
+            "total_ms": {"mean": sum(totals) / len(totals), "p50": percentile(totals, 0.5),
+                         "p95": percentile(totals, 0.95)},
+            "generated_tokens": tokens / len(totals)
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TTFT et latence avec et sans cache du préfixe de prompt")
+    parser.add_argument("--model-path", required=True, help="Modèle GGUF")
+    parser.add_argument("--n-gpu-layers", type=int, default=0, help="0 pour mesurer sur CPU")
+    parser.add_argument("--n-threads", type=int, default=-1)
+    parser.add_argument("--repeat", type=int, default=1, help="Passages par mode")
+    parser.add_argument("--queries", help="Fichier de requêtes (une par ligne)")
+    parser.add_argument("--output", help="Fichier JSON du rapport")
+    args = parser.parse_args()
+
+    queries = QUERIES
+    if args.queries:
+        with open(args.queries, encoding="utf-8") as f:
+            queries = [line.strip() for line in f if len(line.strip()) >= 3]
+
+    query_parser = MistralQueryParser(LLMConfig(
+        model_path=args.model_path,
+        n_gpu_layers=args.n_gpu_layers,
+        n_threads=args.n_threads,
+        use_mlock=False
+    ))
+    if query_parser.model is None or query_parser.prefix_state is None:
+        print("❌ Modèle ou cache du préfixe indisponible")
+        sys.exit(1)
+
+    report = run_benchmark(query_parser, queries, args.repeat)
+
+    print(f"📊 Préfixe: {report['prefix_tokens']} tokens, {len(queries)} requêtes x {args.repeat}")
+    for mode in MODES:
+        stats = report[mode]
+        print(f"   {mode:<13} TTFT p50 {stats['ttft_ms']['p50']:.0f} ms (moy. {stats['ttft_ms']['mean']:.0f}), "
+              f"total p50 {stats['total_ms']['p50']:.0f} ms (moy. {stats['total_ms']['mean']:.0f}), "
+              f"{stats['generated_tokens']:.1f} tokens générés")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
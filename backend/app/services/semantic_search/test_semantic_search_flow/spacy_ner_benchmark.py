@@ -0,0 +1,162 @@
+"""
+Mesure de la NER spaCy utilisée par EntityExtractor.
+
+Compare, sur les mêmes requêtes nettoyées :
+- full : pipeline complet (morphologie, parser, lemmatiseur, NER), un appel par requête ;
+- ner : pipeline réduit à la NER (chargement par défaut), un appel par requête ;
+- ner_pipe : pipeline réduit, requêtes traitées par lots avec nlp.pipe.
+
+Rapporte la latence NER par requête, le temps de chargement et la mémoire
+allouée par chaque modèle (tracemalloc), ainsi que la part de requêtes dont
+les entités restent identiques au pipeline complet.
+
+Usage:
+    python -m backend.app.services.semantic_search.test_semantic_search_flow.spacy_ner_benchmark \\
+        --repeat 20 --batch-size 64
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+from backend.app.services.semantic_search.parsing.base_parser import clean_query, load_spacy_model
+
+MODES = ("full", "ner", "ner_pipe")
+
+QUERIES = [
+    "emails de Marie hier",
+    "factures de la semaine dernière",
+    "emails from John Smith last week",
+    "documents pdf de Jean entre le 2 et le 10 avril",
+    "conversation avec Claire sur le projet Atlas",
+    "messages de Pierre Martin avec pièces jointes",
+    "réunion avec Sophie à Montréal",
+    "rapport trimestriel envoyé par Thomas Dubois",
+    "emails importants non lus",
+    "contrat de Google reçu le mois dernier",
+    "newsletter",
+    "emails de sophie.durand@company.com sur le budget",
+]
+
+
+def percentile(values, ratio):
+    """Percentile d'une liste triée"""
+    return values[min(len(values) - 1, int(len(values) * ratio))] if values else 0.0
+
+
+def load_measured(ner_only):
+    """
+    Charge le modèle spaCy en mesurant le temps et la mémoire allouée
+
+    Args:
+        ner_only (bool): Pipeline réduit à la NER
+
+    Returns:
+        tuple: (modèle, temps de chargement en ms, mémoire allouée en Mo)
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start_time = time.perf_counter()
+    nlp_model = load_spacy_model(ner_only=ner_only)
+    load_time = (time.perf_counter() - start_time) * 1000
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return nlp_model, load_time, allocated / 1e6
+
+
+def run_mode(nlp_model, queries, repeat, batch_size, use_pipe):
+    """
+    Exécute la NER sur les requêtes
+
+    Args:
+        nlp_model: Modèle spaCy chargé
+        queries (list): Requêtes nettoyées
+        repeat (int): Nombre de passages
+        batch_size (int): Taille des lots pour nlp.pipe
+        use_pipe (bool): Traiter chaque passage en un lot avec nlp.pipe
+
+    Returns:
+        tuple: (latences par requête en ms, entités de chaque requête)
+    """
+    latencies = []
+    entities = []
+    for _ in range(repeat):
+        if use_pipe:
+            start_time = time.perf_counter()
+            docs = list(nlp_model.pipe(queries, batch_size=batch_size))
+            per_query = (time.perf_counter() - start_time) * 1000 / len(queries)
+            latencies.extend([per_query] * len(queries))
+        else:
+            docs = []
+            for query in queries:
+                start_time = time.perf_counter()
+                docs.append(nlp_model(query))
+                latencies.append((time.perf_counter() - start_time) * 1000)
+        entities = [[(ent.text, ent.label_) for ent in doc.ents] for doc in docs]
+
+    latencies.sort()
+    return latencies, entities
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latence et mémoire de la NER spaCy, pipeline complet ou réduit")
+    parser.add_argument("--repeat", type=int, default=10, help="Passages par mode")
+    parser.add_argument("--batch-size", type=int, default=64, help="Taille des lots pour nlp.pipe")
+    parser.add_argument("--queries", help="Fichier de requêtes (une par ligne)")
+    parser.add_argument("--output", help="Fichier JSON du rapport")
+    args = parser.parse_args()
+
+    queries = QUERIES
+    if args.queries:
+        with open(args.queries, encoding="utf-8") as f:
+            queries = [line.strip() for line in f if len(line.strip()) >= 3]
+    queries = [clean_query(query) for query in queries]
+
+    # Import de spaCy hors mesure : seul le chargement des modèles est comparé
+    import spacy
+    spacy.blank("fr")
+
+    models = {}
+    for name, ner_only in (("ner", True), ("full", False)):
+        nlp_model, load_time, memory_mb = load_measured(ner_only)
+        if nlp_model is None:
+            print("❌ Modèle spaCy indisponible")
+            sys.exit(1)
+        models[name] = {"model": nlp_model, "load_time_ms": load_time, "memory_mb": memory_mb}
+
+    # Premier appel hors mesure (allocation des buffers)
+    for entry in models.values():
+        entry["model"](queries[0])
+
+    report = {}
+    reference = None
+    for mode in MODES:
+        entry = models["full" if mode == "full" else "ner"]
+        latencies, entities = run_mode(entry["model"], queries, args.repeat, args.batch_size, mode == "ner_pipe")
+        if reference is None:
+            reference = entities
+        report[mode] = {
+            "pipeline": entry["model"].pipe_names,
+            "load_time_ms": entry["load_time_ms"],
+            "memory_mb": entry["memory_mb"],
+            "latency_ms": {"mean": sum(latencies) / len(latencies), "p50": percentile(latencies, 0.5),
+                           "p95": percentile(latencies, 0.95)},
+            "same_entities_rate": sum(a == b for a, b in zip(entities, reference)) / len(queries)
+        }
+
+    print(f"📊 {len(queries)} requêtes x {args.repeat}")
+    for mode, stats in report.items():
+        print(f"   {mode:<9} {'+'.join(stats['pipeline'])}: "
+              f"latence moyenne {stats['latency_ms']['mean']:.2f} ms/requête (p95 {stats['latency_ms']['p95']:.2f}), "
+              f"mémoire du modèle {stats['memory_mb']:.0f} Mo, chargement {stats['load_time_ms']:.0f} ms, "
+              f"entités identiques {stats['same_entities_rate']:.0%}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
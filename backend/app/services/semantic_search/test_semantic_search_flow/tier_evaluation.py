@@ -0,0 +1,144 @@
+"""
+Évaluation hors ligne du parsing par paliers (regex → spaCy → LLM).
+
+Rejoue un journal de requêtes en exécutant tous les paliers sur chacune,
+mesure la latence de chaque palier et la fréquence à laquelle le palier
+suivant change le résultat, puis recommande les seuils de confiance par
+intention qui minimisent les appels LLM à exactitude égale.
+
+Le journal contient une requête par ligne, ou une ligne JSON par requête :
+    {"query": "emails de Marie hier", "expected": {"intent": "search_contact", "filters": {...}}}
+Sans "expected", la référence est le résultat du dernier palier (LLM si disponible).
+
+Usage:
+    python -m backend.app.services.semantic_search.test_semantic_search_flow.tier_evaluation \\
+        --log queries.log --output tier_thresholds.json
+"""
+
+import argparse
+import json
+from collections import defaultdict
+from dataclasses import asdict
+
+from backend.app.services.semantic_search.query_transformer import SemanticQueryTransformer
+from backend.app.services.semantic_search.query_cache import QueryCacheConfig
+from backend.app.services.semantic_search.tiered_parsing import (
+    TIERS,
+    TieredParsingConfig,
+    recommend_thresholds,
+    result_signature,
+    simulate
+)
+
+
+def read_log(path):
+    """
+    Lit le journal de requêtes
+
+    Args:
+        path (str): Fichier texte (une requête par ligne) ou JSON lines
+
+    Returns:
+        list: Entrées {'query', 'expected' (optionnel), 'user_context' (optionnel)}
+    """
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                entry = json.loads(line)
+            else:
+                entry = {"query": line}
+            if len(entry.get("query", "")) >= 3:
+                entries.append(entry)
+    return entries
+
+
+def evaluate(transformer, entries):
+    """
+    Exécute tous les paliers sur chaque requête du journal
+
+    Args:
+        transformer (SemanticQueryTransformer): Transformer avec spaCy et LLM chargés
+        entries (list): Entrées du journal
+
+    Returns:
+        tuple: (enregistrements pour simulate, statistiques par palier)
+    """
+    records = []
+    tier_stats = defaultdict(lambda: {"runs": 0, "latency_ms": 0.0, "changed_by_next": 0})
+
+    for entry in entries:
+        tiers = transformer.evaluate_tiers(entry["query"], entry.get("user_context"))
+        for tier in tiers:
+            stats = tier_stats[tier["tier"]]
+            stats["runs"] += 1
+            stats["latency_ms"] += tier["latency_ms"]
+            stats["changed_by_next"] += 1 if tier["changed"] else 0
+
+        expected = entry.get("expected")
+        records.append({
+            "query": entry["query"],
+            "tiers": {
+                tier["tier"]: {
+                    "intent": tier["intent"],
+                    "confidence": tier["confidence"],
+                    "signature": tier["signature"]
+                }
+                for tier in tiers
+            },
+            "reference": result_signature(expected) if expected else tiers[-1]["signature"]
+        })
+
+    summary = {
+        tier: {
+            "runs": stats["runs"],
+            "mean_latency_ms": stats["latency_ms"] / stats["runs"],
+            "changed_by_next_rate": stats["changed_by_next"] / stats["runs"]
+        }
+        for tier, stats in tier_stats.items()
+    }
+    return records, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recommande les seuils du parsing par paliers à partir d'un journal")
+    parser.add_argument("--log", required=True, help="Journal de requêtes (texte ou JSON lines)")
+    parser.add_argument("--output", help="Fichier JSON des seuils recommandés et du rapport")
+    args = parser.parse_args()
+
+    entries = read_log(args.log)
+    # Pas de cache : chaque requête du journal est réellement évaluée
+    transformer = SemanticQueryTransformer(cache_config=QueryCacheConfig(enabled=False))
+    records, tier_summary = evaluate(transformer, entries)
+
+    baseline = TieredParsingConfig()
+    current = simulate(records, baseline)
+    recommended_config, recommended = recommend_thresholds(records, baseline)
+
+    print(f"📊 {len(records)} requêtes rejouées")
+    for tier in TIERS:
+        if tier in tier_summary:
+            stats = tier_summary[tier]
+            print(f"   {tier:<6} latence moyenne {stats['mean_latency_ms']:.1f} ms, "
+                  f"résultat changé par le palier suivant: {stats['changed_by_next_rate']:.0%}")
+    for name, outcome in (("actuels", current), ("recommandés", recommended)):
+        print(f"   Seuils {name}: {outcome['llm_calls']} appels LLM, {outcome['spacy_calls']} appels spaCy, "
+              f"exactitude {outcome['accuracy']:.1%}")
+    print(f"   Seuils regex recommandés: {recommended_config.regex_thresholds}")
+    print(f"   Seuils spaCy recommandés: {recommended_config.spacy_thresholds}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "recommended_config": asdict(recommended_config),
+                "current": current,
+                "recommended": recommended,
+                "tiers": tier_summary
+            }, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
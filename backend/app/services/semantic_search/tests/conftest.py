@@ -0,0 +1,24 @@
+import pytest
+
+REFERENCE_QUERIES = [
+    "emails de Marie Dupont la semaine dernière", "factures de pierre.martin@client.com avec pièce jointe",
+    "messages sans pièce jointe reçus hier", "réunion avec l'équipe Marketing en mars", "emails from John Smith last week",
+    "invoices sent to Sarah yesterday", "emails envoyés à Paul avant-hier", "rapport mensuel du 3 au 15 mars",
+    "documents pdf de Jean entre le 2 et le 10 avril", "newsletter non lus cette semaine", "urgent contrat fin juin",
+    "conversation avec Claire sur le projet Atlas", "messages importants sans importance",
+    "emails reçus de support@service.com", "devis et commande de la société Acme", "day before yesterday meeting notes",
+    "projet orion il y a 2 semaines", "threads about the budget update", "emails archivés de décembre",
+    "attachments xlsx from Nicolas in 3 weeks", "brouillons de la semaine prochaine", "livraison colis suivi",
+    "mot de passe compte sécurité", "bug erreur urgent hier", "emails du 2025-01-01 au 2025-02-01", "12/03/2025 facture",
+    "emails for the team Sales", "tout le monde réunion lundi", "réponse à Marie sur le devis",
+    "messages envoyés par moi le mois dernier", "what did Pierre send me today",
+    "emails with attachment from Emma about report", "sans fichier important de Luc", "important starred emails",
+    "notes de réunion compte-rendu", "promo réduction offre", "aujourd'hui", "hier", "facture", "Marie",
+    "EMAILS DE MARIE HIER", "Le mail et les Messages de la Direction pour l'équipe",
+]
+
+
+@pytest.fixture(scope='session')
+def reference_queries():
+    """Requêtes de référence (français, anglais, casse mixte)"""
+    return REFERENCE_QUERIES
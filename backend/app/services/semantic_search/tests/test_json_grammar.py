@@ -0,0 +1,82 @@
+import json
+import re
+
+import pytest
+from backend.app.services.semantic_search.utils.json_grammar import (
+    CHARS_PER_TOKEN,
+    TOKEN_BUDGET_MARGIN,
+    build_output_schema,
+    estimate_token_budget,
+    schema_to_gbnf
+)
+
+# Jetons GBNF : littéral, classe de caractères, règle, opérateur
+GBNF_TOKEN = re.compile(r'"((?:[^"\\]|\\.)*)"|(\[(?:[^\]\\]|\\.)*\])|([a-z0-9-]+)|([()?*|])|\s+')
+
+LONG_QUERY = ("rapport trimestriel de l'équipe marketing sur la campagne de lancement du produit "
+              "Atlas envoyé par Marie-Hélène Dubois-Lefebvre avec les annexes budgétaires et le "
+              "compte-rendu de la réunion du comité de direction")
+
+
+def gbnf_to_regex(grammar):
+    """Traduit la grammaire (sans récursion) en expression régulière équivalente"""
+    rules = dict(line.split(' ::= ', 1) for line in grammar.splitlines())
+
+    def convert(body):
+        parts = []
+        for match in GBNF_TOKEN.finditer(body):
+            literal, char_class, rule, operator = match.groups()
+            if literal is not None:
+                parts.append(re.escape(json.loads(f'"{literal}"')))
+            elif char_class is not None:
+                parts.append(char_class)
+            elif rule is not None:
+                parts.append(f'(?:{convert(rules[rule])})')
+            elif operator is not None:
+                parts.append('(?:' if operator == '(' else operator)
+        return ''.join(parts)
+
+    return re.compile(convert(rules['root']), re.S)
+
+
+@pytest.fixture(scope='module')
+def grammar_regex():
+    return gbnf_to_regex(schema_to_gbnf(build_output_schema()))
+
+
+class TestJsonGrammar:
+    """Tests pour la grammaire GBNF dérivée de SemanticQuery / SearchFilter."""
+
+    @pytest.mark.parametrize('output', [
+        '{"query_type": "contact", "semantic_text": "emails", "filters": {"contact_name": "Marie"}}',
+        '{"query_type": "semantic", "semantic_text": "emails test", "filters": {}}',
+        '{"query_type": "semantic", "semantic_text": "' + LONG_QUERY + '", "filters": {}}',
+        '{"query_type": "combined", "semantic_text": "rapport", "filters": {"contact_name": "Marie-Hélène '
+        'Dubois-Lefebvre", "topic_ids": ["campagne de lancement du produit Atlas", "comité de direction"]}}',
+        '{"query_type":"combined","semantic_text":"","filters":{"contact_email":"marie-helene.dubois-lefebvre@'
+        'marketing.example.com","date_from":"2025-01-01","date_to":"2025-03-31","has_attachments":true,'
+        '"labels":["a","b","c"],"thread_id":"t1","contact_name":"Marie"}}',
+    ])
+    def test_accepts_valid_outputs(self, grammar_regex, output):
+        """Test que les sorties valides, y compris longues, sont acceptées sans troncature."""
+        assert grammar_regex.fullmatch(output)
+
+    @pytest.mark.parametrize('output', [
+        '{"query_type": "unknown", "semantic_text": "x", "filters": {}}',
+        '{"query_type": "semantic", "semantic_text": "x"}',
+        '{"query_type": "semantic", "semantic_text": "x", "filters": {"date_from": "hier"}}',
+        '{"query_type": "semantic", "semantic_text": "x", "filters": {"unknown": "x"}}',
+        '{"query_type": "semantic", "semantic_text": "a\nb", "filters": {}}',
+    ])
+    def test_rejects_invalid_outputs(self, grammar_regex, output):
+        """Test que les sorties hors schéma sont rejetées."""
+        assert not grammar_regex.fullmatch(output)
+
+    def test_token_budget_follows_query_length(self):
+        """Test que le budget couvre, avec sa marge, une sortie recopiant une requête longue."""
+        schema = build_output_schema()
+        output = ('{"query_type": "combined", "semantic_text": "' + LONG_QUERY + '", "filters": '
+                  '{"contact_name": "Marie-Hélène Dubois-Lefebvre", "topic_ids": ["campagne de lancement"]}}')
+
+        assert estimate_token_budget(schema, len(LONG_QUERY)) > estimate_token_budget(schema, 10)
+        assert estimate_token_budget(schema, len(LONG_QUERY)) * CHARS_PER_TOKEN >= TOKEN_BUDGET_MARGIN * len(output)
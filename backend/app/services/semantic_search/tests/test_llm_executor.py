@@ -0,0 +1,127 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from backend.app.services.semantic_search.llm_executor import (
+    LLMExecutor,
+    LLMExecutorConfig,
+    LLMQueueFullError,
+    LLMTimeoutError
+)
+
+
+def blocking(gate, value=None):
+    """Génération factice : bloque jusqu'à l'ouverture de `gate`"""
+    gate.wait(5)
+    return value
+
+
+@pytest.fixture
+def make_executor():
+    executors = []
+
+    def factory(**config):
+        executor = LLMExecutor(LLMExecutorConfig(**config))
+        executors.append(executor)
+        return executor
+
+    yield factory
+    for executor in executors:
+        executor.shutdown(wait=True)
+
+
+def counters(executor, *keys):
+    stats = executor.get_stats()
+    return tuple(stats[key] for key in keys)
+
+
+class TestLLMExecutor:
+    """Tests pour le pool borné des appels LLM."""
+
+    def test_rejects_beyond_workers_and_queue(self, make_executor):
+        """Test le refus au-delà de max_workers + max_queue_size, puis l'écoulement de la file."""
+        executor = make_executor(max_workers=1, max_queue_size=2)
+        gate = threading.Event()
+
+        async def scenario():
+            accepted = [asyncio.ensure_future(executor.run(blocking, gate, index)) for index in range(3)]
+            await asyncio.sleep(0.05)
+            assert counters(executor, 'running', 'queue_depth', 'submitted') == (1, 2, 3)
+
+            with pytest.raises(LLMQueueFullError):
+                await executor.run(blocking, gate)
+            assert counters(executor, 'rejected', 'submitted') == (1, 3)
+
+            gate.set()
+            return await asyncio.gather(*accepted)
+
+        assert asyncio.run(scenario()) == [0, 1, 2]
+        executor.shutdown(wait=True)
+        assert counters(executor, 'running', 'queue_depth', 'completed', 'rejected') == (0, 0, 3, 1)
+
+    def test_queued_timeout_cancels_and_frees_slot(self, make_executor):
+        """Test qu'un appel expiré encore en file est annulé et libère sa place."""
+        executor = make_executor(max_workers=1, max_queue_size=1)
+        gate = threading.Event()
+        running = threading.Thread(target=executor.call, args=(blocking, gate), kwargs={'timeout': 5})
+        running.start()
+        time.sleep(0.05)
+
+        with pytest.raises(LLMTimeoutError):
+            executor.call(blocking, gate, timeout=0.05)
+        assert counters(executor, 'timeouts', 'cancelled', 'queue_depth', 'running') == (1, 1, 0, 1)
+
+        # La place libérée accepte un nouvel appel
+        queued = threading.Thread(target=executor.call, args=(blocking, gate, 'ok'), kwargs={'timeout': 5})
+        queued.start()
+        time.sleep(0.05)
+        assert counters(executor, 'queue_depth', 'rejected') == (1, 0)
+
+        gate.set()
+        running.join()
+        queued.join()
+        executor.shutdown(wait=True)
+        assert counters(executor, 'submitted', 'completed', 'cancelled', 'timeouts') == (3, 2, 1, 1)
+
+    def test_running_timeout_keeps_worker(self, make_executor):
+        """Test qu'une génération démarrée n'est pas annulée par le délai : elle se termine."""
+        executor = make_executor(max_workers=1)
+
+        with pytest.raises(LLMTimeoutError):
+            executor.call(time.sleep, 0.2, timeout=0.05)
+        assert counters(executor, 'timeouts', 'cancelled', 'running') == (1, 0, 1)
+
+        executor.shutdown(wait=True)
+        assert counters(executor, 'running', 'completed', 'cancelled') == (0, 1, 0)
+
+    def test_errors_are_counted(self, make_executor):
+        """Test que l'exception de la fonction remonte à l'appelant et est comptée."""
+        executor = make_executor()
+
+        def fail():
+            raise ValueError("génération impossible")
+
+        with pytest.raises(ValueError):
+            executor.call(fail)
+        executor.shutdown(wait=True)
+        assert counters(executor, 'errors', 'completed', 'running') == (1, 0, 0)
+
+    def test_run_does_not_block_event_loop(self, make_executor):
+        """Test que run laisse la boucle d'événements avancer pendant la génération et que call attend le résultat."""
+        executor = make_executor()
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        async def scenario():
+            result, _ = await asyncio.gather(executor.run(lambda: time.sleep(0.1) or 'run'), ticker())
+            return result
+
+        assert asyncio.run(scenario()) == 'run'
+        assert len(ticks) == 5 and ticks[-1] - ticks[0] < 0.1
+        assert executor.call(lambda: 'call') == 'call'
+        assert executor.get_stats()['submitted'] == 2
@@ -0,0 +1,181 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from backend.app.services.semantic_search.llm_executor import (
+    LLMExecutor,
+    LLMExecutorConfig,
+    LLMQueueFullError,
+    LLMTimeoutError
+)
+from backend.app.services.semantic_search.llm_scheduler import BatchSchedulerConfig, LLMBatchScheduler
+
+
+class StubParser:
+    """Parser factice : une génération de `delay` secondes par requête, bloqué tant que `gate` est fermé"""
+
+    def __init__(self, delay=0.0, gate=None, error=None):
+        self.delay = delay
+        self.gate = gate
+        self.error = error
+        self.batches = []
+
+    def parse_batch(self, requests, on_result=None):
+        self.batches.append([query for query, _ in requests])
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.error is not None:
+            raise self.error
+
+        results = []
+        for index, (query, _) in enumerate(requests):
+            time.sleep(self.delay)
+            results.append({'query_type': 'semantic', 'semantic_text': query})
+            if on_result is not None:
+                on_result(index, results[-1])
+        return results
+
+
+@pytest.fixture
+def make_scheduler():
+    executors = []
+
+    def factory(parser, timeout=1.0, **config):
+        executor = LLMExecutor(LLMExecutorConfig(timeout_seconds=timeout))
+        executors.append(executor)
+        return LLMBatchScheduler(parser, executor, BatchSchedulerConfig(**config))
+
+    yield factory
+    for executor in executors:
+        executor.shutdown(wait=True)
+
+
+async def drain(scheduler):
+    """Attend la fin des lots en cours"""
+    while scheduler._tasks:
+        await asyncio.gather(*list(scheduler._tasks))
+
+
+class TestLLMBatchScheduler:
+    """Tests pour l'ordonnanceur par micro-lots."""
+
+    def test_deduplicates_identical_requests(self, make_scheduler):
+        """Test que les requêtes identiques d'un lot ne sont générées qu'une fois."""
+        parser = StubParser()
+        scheduler = make_scheduler(parser)
+
+        async def scenario():
+            results = await asyncio.gather(*(scheduler.parse(query) for query in ['a', 'a', 'b', 'a']))
+            await drain(scheduler)
+            return results
+
+        results = asyncio.run(scenario())
+
+        assert parser.batches == [['a', 'b']]
+        assert [result['semantic_text'] for result in results] == ['a', 'a', 'b', 'a']
+        assert results[0] == results[1] and results[0] is not results[1]
+        stats = scheduler.get_stats()
+        assert (stats['batches'], stats['deduplicated'], stats['in_flight']) == (1, 2, 0)
+
+    def test_flushes_when_batch_is_full(self, make_scheduler):
+        """Test l'envoi immédiat d'un lot plein, sans attendre la fenêtre."""
+        parser = StubParser()
+        scheduler = make_scheduler(parser, batch_window_ms=10_000, max_batch_size=2)
+
+        async def scenario():
+            await asyncio.wait_for(asyncio.gather(scheduler.parse('a'), scheduler.parse('b')), 1.0)
+            await drain(scheduler)
+
+        asyncio.run(scenario())
+        assert parser.batches == [['a', 'b']]
+
+    def test_flushes_after_window(self, make_scheduler):
+        """Test qu'une requête seule part à la fin de la fenêtre."""
+        parser = StubParser()
+        scheduler = make_scheduler(parser, batch_window_ms=20, max_batch_size=8)
+
+        async def scenario():
+            start_time = time.perf_counter()
+            result = await scheduler.parse('a')
+            await drain(scheduler)
+            return result, time.perf_counter() - start_time
+
+        result, elapsed = asyncio.run(scenario())
+        assert result['semantic_text'] == 'a'
+        assert elapsed >= 0.02
+        assert parser.batches == [['a']]
+
+    def test_rejects_beyond_max_pending(self, make_scheduler):
+        """Test le refus des requêtes au-delà de max_pending (en attente ou en cours)."""
+        gate = threading.Event()
+        scheduler = make_scheduler(StubParser(gate=gate), batch_window_ms=0, max_pending=2)
+
+        async def scenario():
+            accepted = [asyncio.ensure_future(scheduler.parse(query)) for query in ['a', 'b']]
+            await asyncio.sleep(0.01)
+            with pytest.raises(LLMQueueFullError):
+                await scheduler.parse('c')
+            gate.set()
+            await asyncio.gather(*accepted)
+            await drain(scheduler)
+
+        asyncio.run(scenario())
+        stats = scheduler.get_stats()
+        assert (stats['requests'], stats['rejected'], stats['in_flight']) == (2, 1, 0)
+
+    def test_caller_timeout_keeps_shared_batch(self, make_scheduler):
+        """Test que l'expiration d'un appelant n'annule pas le lot partagé avec les autres."""
+        parser = StubParser(delay=0.1)
+        scheduler = make_scheduler(parser)
+
+        async def scenario():
+            results = await asyncio.gather(
+                scheduler.parse('a', timeout=0.02), scheduler.parse('a'), return_exceptions=True
+            )
+            await drain(scheduler)
+            return results
+
+        impatient, patient = asyncio.run(scenario())
+        assert isinstance(impatient, LLMTimeoutError)
+        assert patient['semantic_text'] == 'a'
+        assert parser.batches == [['a']]
+        assert scheduler.get_stats()['timeouts'] == 1
+
+    def test_slow_batch_only_times_out_late_callers(self, make_scheduler):
+        """Test qu'un lot plus long que le délai d'une requête n'expire que pour les appelants hors délai."""
+        parser = StubParser(delay=0.1)
+        scheduler = make_scheduler(parser, timeout=0.25)
+        queries = ['q0', 'q1', 'q2', 'q3', 'q4']
+
+        async def scenario():
+            results = await asyncio.gather(
+                scheduler.parse('q0'),
+                *(scheduler.parse(query, timeout=1.0) for query in queries[1:4]),
+                scheduler.parse('q4'),
+                return_exceptions=True
+            )
+            await drain(scheduler)
+            return results
+
+        results = asyncio.run(scenario())
+
+        # 5 générations de 0,1 s : q0 arrive dans son délai de 0,25 s, q4 non
+        assert [result['semantic_text'] for result in results[:4]] == queries[:4]
+        assert isinstance(results[4], LLMTimeoutError)
+        assert parser.batches == [queries]
+        executor_stats = scheduler.executor.get_stats()
+        assert (executor_stats['timeouts'], executor_stats['completed']) == (0, 1)
+
+    def test_parser_error_reaches_callers(self, make_scheduler):
+        """Test que l'erreur du lot est transmise aux appelants et que la tâche est libérée."""
+        scheduler = make_scheduler(StubParser(error=ValueError("génération impossible")))
+
+        async def scenario():
+            results = await asyncio.gather(scheduler.parse('a'), scheduler.parse('b'), return_exceptions=True)
+            await drain(scheduler)
+            return results
+
+        results = asyncio.run(scenario())
+        assert all(isinstance(result, ValueError) for result in results)
+        assert not scheduler._tasks and scheduler.get_stats()['in_flight'] == 0
@@ -0,0 +1,56 @@
+import re
+
+import pytest
+from backend.app.services.semantic_search.patterns import CompiledPatternSet, get_compiled_patterns, get_patterns
+
+CATEGORIES = ('temporal', 'contact', 'topic', 'action')
+
+
+def pattern_sets(language):
+    """Paires (ensemble compilé, patterns d'origine) de toutes les catégories et intentions"""
+    patterns = get_patterns(language, 'all')
+    for category in CATEGORIES:
+        yield get_compiled_patterns(language, category), list(patterns.get(category, {}))
+    for intent, compiled in get_compiled_patterns(language, 'intent').items():
+        yield compiled, list(patterns['intent'][intent].get(language, []))
+
+
+def describe(index, match):
+    return index, match.group(), match.start(), match.end(), match.groups()
+
+
+class TestCompiledPatternSet:
+    """Tests pour l'alternation compilée des patterns d'une catégorie."""
+
+    @pytest.mark.parametrize('language', ['fr', 'en', 'auto'])
+    def test_matches_per_pattern_loop(self, reference_queries, language):
+        """Test que finditer et search donnent les correspondances d'une boucle re.finditer / re.search par pattern."""
+        for compiled, patterns in pattern_sets(language):
+            assert compiled.patterns == patterns
+            for query in reference_queries:
+                expected = [
+                    describe(index, match)
+                    for index, pattern in enumerate(patterns)
+                    for match in re.finditer(pattern, query, re.IGNORECASE)
+                ]
+                first = [
+                    describe(index, match)
+                    for index, match in enumerate(re.search(pattern, query, re.IGNORECASE) for pattern in patterns)
+                    if match is not None
+                ]
+
+                assert [describe(m.index, m) for m in compiled.finditer(query)] == expected
+                assert [describe(m.index, m) for m in compiled.search(query)] == first
+
+    def test_overlapping_and_empty_matches(self):
+        """Test les correspondances chevauchantes entre patterns et les correspondances vides."""
+        compiled = CompiledPatternSet({r'\bsemaine\b': 'w', r'la semaine (\w+)': 'lw', r'x*': 'empty'})
+        text = 'la semaine dernière, semaine'
+
+        expected = [
+            describe(index, match)
+            for index, pattern in enumerate(compiled.patterns)
+            for match in re.finditer(pattern, text, re.IGNORECASE)
+        ]
+        assert [describe(m.index, m) for m in compiled.finditer(text)] == expected
+        assert [m.value for m in compiled.search(text)] == ['w', 'lw', 'empty']
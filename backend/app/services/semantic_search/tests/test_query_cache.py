@@ -0,0 +1,173 @@
+from datetime import datetime, timezone
+
+import pytest
+from backend.app.services.semantic_search import query_cache, query_transformer
+from backend.app.services.semantic_search.llm_executor import LLMTimeoutError
+from backend.app.services.semantic_search.models import NaturalLanguageRequest
+from backend.app.services.semantic_search.query_cache import ParsedQueryCache
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Horloge figée du module query_cache : clock(instant UTC)"""
+    def freeze(instant):
+        class FrozenDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return instant.astimezone(tz) if tz else instant.replace(tzinfo=None)
+
+        monkeypatch.setattr(query_cache, 'datetime', FrozenDatetime)
+
+    return freeze
+
+
+class TestParsedQueryCache:
+    """Tests pour le cache des requêtes transformées."""
+
+    @pytest.mark.parametrize('tz_name, computed_at, before_midnight, after_midnight', [
+        # Montréal (UTC-5) : minuit local = 05:00 UTC
+        ('America/Montreal', utc(2025, 1, 16, 1, 0), utc(2025, 1, 16, 4, 59, 30), utc(2025, 1, 16, 5, 0, 30)),
+        # Tokyo (UTC+9) : minuit local = 15:00 UTC la veille
+        ('Asia/Tokyo', utc(2025, 1, 15, 3, 0), utc(2025, 1, 15, 14, 59, 30), utc(2025, 1, 15, 15, 0, 30)),
+    ])
+    def test_expires_at_user_midnight(self, clock, tz_name, computed_at, before_midnight, after_midnight):
+        """Test un succès juste avant minuit dans le fuseau de l'utilisateur et un échec juste après."""
+        cache = ParsedQueryCache()
+        context = {'timezone': tz_name}
+        key = cache.make_key('emails d\'hier', context)
+
+        clock(computed_at)
+        cache.put(key, cache.current_day(context), {'date_from': '2025-01-14'})
+
+        clock(before_midnight)
+        assert cache.get(key, cache.current_day(context)) == {'date_from': '2025-01-14'}
+
+        clock(after_midnight)
+        assert cache.get(key, cache.current_day(context)) is None
+        stats = cache.get_stats()
+        assert (stats['hits'], stats['misses'], stats['expirations'], stats['size']) == (1, 1, 1, 0)
+
+    def test_expires_at_utc_midnight(self, clock):
+        """Test qu'une entrée expire aussi au changement de jour UTC (fuseau de résolution du parser)."""
+        cache = ParsedQueryCache()
+        context = {'timezone': 'America/Montreal'}
+        key = cache.make_key('emails d\'hier', context)
+
+        clock(utc(2025, 1, 15, 23, 59))
+        cache.put(key, cache.current_day(context), {'date_from': '2025-01-14'})
+
+        clock(utc(2025, 1, 16, 0, 1))
+        assert cache.get(key, cache.current_day(context)) is None
+        assert cache.get_stats()['expirations'] == 1
+
+    def test_current_day_includes_utc_day_when_different(self, clock):
+        """Test que le jour de référence porte aussi la date UTC quand elle diffère."""
+        cache = ParsedQueryCache()
+        clock(utc(2025, 1, 16, 2, 0))
+
+        assert cache.current_day({'timezone': 'America/Montreal'}) == '2025-01-15/2025-01-16'
+        assert cache.current_day({'timezone': 'Asia/Tokyo'}) == '2025-01-16'
+        assert cache.current_day() == '2025-01-16'
+
+    def test_key_normalization(self):
+        """Test la normalisation NFC et des espaces, la casse étant conservée."""
+        cache = ParsedQueryCache()
+
+        assert cache.make_key('  emails de\tMarie \n') == cache.make_key('emails de Marie')
+        assert cache.make_key('réunion') == cache.make_key('réunion')
+        assert cache.make_key('emails de Marie') != cache.make_key('emails de marie')
+        assert cache.make_key('a', {'time_zone': 'Asia/Tokyo'}) == cache.make_key('a', {'timezone': 'Asia/Tokyo'})
+        assert cache.make_key('a', {'timezone': 'Nowhere/Unknown'})[1] == 'UTC'
+        assert cache.make_key('a', central_user_email='Marie@Example.com')[2] == 'marie@example.com'
+
+    def test_returns_copies(self):
+        """Test que le résultat renvoyé peut être modifié sans altérer l'entrée."""
+        cache = ParsedQueryCache()
+        key = cache.make_key('facture')
+        cache.put(key, '2025-01-15', {'filters': {}})
+
+        cache.get(key, '2025-01-15')['filters']['labels'] = ['x']
+        assert cache.get(key, '2025-01-15') == {'filters': {}}
+
+
+class StubNLPParser:
+    """Parser heuristique factice : confiance trop basse pour s'arrêter avant le LLM"""
+
+    class entity_extractor:
+        nlp_model = None
+
+    def parse_query(self, query, use_spacy=True):
+        return {
+            'original_query': query, 'cleaned_query': query, 'intent': 'search_semantic',
+            'semantic_text': query, 'entities': [], 'filters': {}, 'confidence': 0.4, 'language': 'fr'
+        }
+
+
+class StubLLMParser:
+    model = object()
+
+    def __init__(self, model_used='mistral', error=None):
+        self.model_used = model_used
+        self.error = error
+
+    def parse_query(self, query, user_context=None):
+        if self.error is not None:
+            raise self.error
+        return {'query_type': 'contact', 'semantic_text': 'emails', 'filters': {'contact_name': 'Marie'},
+                '_meta': {'model_used': self.model_used}}
+
+
+class StubExecutor:
+    def call(self, fn, *args, **kwargs):
+        return fn(*args, **kwargs)
+
+
+class StubModelLoader:
+    def __init__(self, loading):
+        self.loading = loading
+
+    def is_loading(self):
+        return self.loading
+
+
+@pytest.fixture
+def make_transformer(monkeypatch):
+    def factory(model_used='mistral', error=None, loading=False):
+        monkeypatch.setattr(query_transformer, 'get_query_parser', StubNLPParser)
+        monkeypatch.setattr(query_transformer, 'get_llm_parser', lambda: StubLLMParser(model_used, error))
+        monkeypatch.setattr(query_transformer, 'get_llm_executor', StubExecutor)
+        monkeypatch.setattr(query_transformer, 'get_model_loader', lambda: StubModelLoader(loading))
+        return query_transformer.SemanticQueryTransformer()
+
+    return factory
+
+
+class TestTransformerCaching:
+    """Tests pour la mise en cache des requêtes transformées."""
+
+    def test_llm_result_is_cached(self, make_transformer):
+        """Test qu'un résultat du LLM est servi depuis le cache à la requête suivante."""
+        transformer = make_transformer()
+        request = NaturalLanguageRequest(query='emails de Marie')
+
+        assert transformer.transform_query(request)['processing_info']['cache'] == 'miss'
+        assert transformer.transform_query(request)['processing_info']['cache'] == 'hit'
+
+    @pytest.mark.parametrize('options', [
+        {'model_used': 'fallback'},
+        {'error': LLMTimeoutError("délai LLM dépassé")},
+        {'error': RuntimeError("génération impossible")},
+        {'loading': True},
+    ], ids=['llm_fallback', 'llm_timeout', 'llm_error', 'models_loading'])
+    def test_not_cached(self, make_transformer, options):
+        """Test qu'un échec ou un repli du LLM, ou un chargement en cours, n'est pas mis en cache."""
+        transformer = make_transformer(**options)
+        request = NaturalLanguageRequest(query='emails de Marie')
+
+        assert transformer.transform_query(request)['processing_info']['cache'] == 'miss'
+        assert transformer.transform_query(request)['processing_info']['cache'] == 'miss'
+        assert transformer.get_cache_stats()['size'] == 0
@@ -0,0 +1,36 @@
+import re
+
+import pytest
+from backend.app.services.semantic_search.parsing.query_parser import compile_stopwords
+from backend.app.services.semantic_search.patterns import get_stopwords
+
+
+def strip_one_by_one(text, stopwords):
+    """Suppression d'origine : un re.sub par mot vide"""
+    for stopword in stopwords:
+        text = re.sub(r'\b' + re.escape(stopword) + r'\b', '', text, flags=re.IGNORECASE)
+    return text
+
+
+class TestCompileStopwords:
+    """Tests pour la suppression des mots vides en une passe."""
+
+    @pytest.mark.parametrize('language', ['fr', 'en', 'auto'])
+    def test_single_pass_matches_per_word_loop(self, reference_queries, language):
+        """Test que l'alternation donne le même texte que la suppression mot par mot."""
+        stopwords = get_stopwords(language)
+        pattern = compile_stopwords(stopwords)
+
+        for query in reference_queries:
+            assert pattern.sub('', query) == strip_one_by_one(query, stopwords)
+
+    def test_overlapping_stopwords(self):
+        """Test des mots vides préfixes l'un de l'autre et répétés."""
+        stopwords = ['a', 'an', 'and', 'an', 'the']
+        text = 'an apple and a banana, the end and-an'
+
+        assert compile_stopwords(stopwords).sub('', text) == strip_one_by_one(text, stopwords)
+
+    def test_empty_list(self):
+        """Test qu'une liste vide ne compile pas d'expression."""
+        assert compile_stopwords([]) is None
@@ -0,0 +1,102 @@
+import pytest
+from backend.app.services.semantic_search.tiered_parsing import (
+    TieredParsingConfig,
+    gate_tier,
+    recommend_thresholds,
+    simulate
+)
+
+INTENTS = ['search_semantic', 'search_contact', 'search_temporal', 'search_combined', 'unknown']
+CONFIDENCES = [0.0, 0.3, 0.79, 0.8, 0.95, 1.0]
+
+
+def record(reference, **tiers):
+    """Requête évaluée à tous les paliers : palier=(intention, confiance, signature)"""
+    return {
+        'tiers': {
+            tier: {'intent': intent, 'confidence': confidence, 'signature': signature}
+            for tier, (intent, confidence, signature) in tiers.items()
+        },
+        'reference': reference
+    }
+
+
+RECORDS = [
+    # Contact déjà correct après spaCy malgré une confiance de 0.7 : l'appel LLM est superflu
+    record('A', regex=('search_contact', 0.6, 'A'), spacy=('search_contact', 0.7, 'A'),
+           llm=('search_contact', 0.9, 'A')),
+    # Date relative corrigée par le LLM
+    record('B', regex=('search_temporal', 0.5, 'B0'), spacy=('search_temporal', 0.75, 'B0'),
+           llm=('search_temporal', 0.9, 'B')),
+    # Intention inconnue : seul le LLM répond correctement
+    record('C', regex=('unknown', 0.3, 'C0'), spacy=('unknown', 0.3, 'C0'), llm=('search_semantic', 0.8, 'C')),
+    # Confiant dès les patterns
+    record('D', regex=('search_semantic', 0.9, 'D'), spacy=('search_semantic', 0.9, 'D'),
+           llm=('search_semantic', 0.9, 'D')),
+    # Le LLM dégraderait un résultat spaCy correct
+    record('E', regex=('search_contact', 0.5, 'E0'), spacy=('search_contact', 0.85, 'E'),
+           llm=('search_contact', 0.9, 'E2')),
+    # spaCy non chargé : le résultat regex est comparé aux seuils du palier spacy
+    record('F', regex=('search_temporal', 0.7, 'F0'), llm=('search_temporal', 0.9, 'F')),
+]
+
+
+class TestTieredParsingConfig:
+    """Tests pour les seuils des paliers regex → spaCy → LLM."""
+
+    @pytest.mark.parametrize('intent', INTENTS)
+    @pytest.mark.parametrize('confidence', CONFIDENCES)
+    def test_default_reproduces_old_rule(self, intent, confidence):
+        """Test que la configuration par défaut appelle le LLM sous 0.8 ou pour une intention inconnue."""
+        config = TieredParsingConfig()
+        result = {'intent': intent, 'confidence': confidence}
+        calls_llm = confidence < 0.8 or intent == 'unknown'
+
+        # spaCy chargé : toujours exécuté après les regex, puis l'ancienne règle
+        assert not config.should_stop(gate_tier('regex', {'regex', 'spacy', 'llm'}), result)
+        assert config.should_stop(gate_tier('spacy', {'regex', 'spacy', 'llm'}), result) == (not calls_llm)
+        # spaCy absent : l'ancienne règle s'applique au résultat regex
+        assert config.should_stop(gate_tier('regex', {'regex', 'llm'}), result) == (not calls_llm)
+
+    def test_simulate_default(self):
+        """Test le rejeu des requêtes avec les seuils par défaut."""
+        outcome = simulate(RECORDS, TieredParsingConfig())
+
+        assert outcome['spacy_calls'] == 5
+        assert outcome['llm_calls'] == 4  # A, B, C et F
+        assert outcome['correct'] == 6
+
+
+class TestRecommendThresholds:
+    """Tests pour la recommandation de seuils par descente par coordonnées."""
+
+    def test_never_loses_a_correct_answer(self):
+        """Test que la recommandation garde les réponses correctes et économise des appels."""
+        baseline = simulate(RECORDS, TieredParsingConfig())
+        config, outcome = recommend_thresholds(RECORDS)
+
+        assert outcome['correct'] >= baseline['correct']
+        assert outcome['llm_calls'] < baseline['llm_calls']
+        assert outcome['spacy_calls'] <= baseline['spacy_calls']
+        # Requêtes qui ont besoin du LLM : il est toujours appelé
+        assert not config.should_stop('spacy', RECORDS[1]['tiers']['spacy'])
+        assert not config.should_stop('spacy', RECORDS[2]['tiers']['spacy'])
+        assert not config.should_stop('spacy', RECORDS[5]['tiers']['regex'])
+
+    @pytest.mark.parametrize('index', range(len(RECORDS)))
+    def test_subsets_never_lose_correct_answers(self, index):
+        """Test la garantie sur chaque sous-ensemble obtenu en retirant une requête."""
+        records = RECORDS[:index] + RECORDS[index + 1:]
+        baseline = simulate(records, TieredParsingConfig())
+        _, outcome = recommend_thresholds(records)
+
+        assert outcome['correct'] >= baseline['correct']
+        assert outcome['llm_calls'] <= baseline['llm_calls']
+
+    def test_keeps_baseline_when_nothing_to_save(self):
+        """Test qu'une configuration sans gain possible n'est pas dégradée."""
+        records = [RECORDS[1], RECORDS[2]]
+        _, outcome = recommend_thresholds(records)
+
+        assert outcome == simulate(records, TieredParsingConfig())
+        assert outcome['llm_calls'] == 2
@@ -0,0 +1,163 @@
+"""
+Parsing par paliers de confiance pour Accord.
+
+Une requête passe par des paliers de coût croissant et s'arrête dès que la
+confiance atteint le seuil de son intention :
+1. regex : patterns seuls ;
+2. spacy : patterns + NER spaCy ;
+3. llm : Mistral, fusionné avec le résultat du palier précédent.
+
+Les seuils par défaut reproduisent l'ancienne règle (LLM sous 0.8 de
+confiance ou intention inconnue, spaCy toujours exécuté). Ils se règlent
+à partir d'un journal de requêtes avec recommend_thresholds.
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+TIERS = ('regex', 'spacy', 'llm')
+
+# Seuil qui n'est jamais atteint : la requête passe toujours au palier suivant
+NEVER = 1.01
+
+# Seuils candidats évalués hors ligne
+CANDIDATE_THRESHOLDS = [round(0.3 + 0.05 * step, 2) for step in range(15)] + [NEVER]
+
+
+@dataclass
+class TieredParsingConfig:
+    """Seuils de confiance (par intention) pour s'arrêter après un palier"""
+    regex_thresholds: Dict[str, float] = field(default_factory=dict)
+    spacy_thresholds: Dict[str, float] = field(default_factory=lambda: {'unknown': NEVER})
+    default_regex_threshold: float = NEVER  # spaCy est exécuté s'il est chargé
+    default_spacy_threshold: float = 0.8  # Ancienne règle d'appel au LLM
+
+    def threshold(self, tier: str, intent: str) -> float:
+        """
+        Seuil pour s'arrêter après un palier
+
+        Args:
+            tier: 'regex' ou 'spacy'
+            intent: Intention détectée par ce palier
+
+        Returns:
+            Confiance minimale
+        """
+        if tier == 'regex':
+            return self.regex_thresholds.get(intent, self.default_regex_threshold)
+        return self.spacy_thresholds.get(intent, self.default_spacy_threshold)
+
+    def should_stop(self, tier: str, result: Dict[str, Any]) -> bool:
+        """Le résultat de ce palier est-il assez confiant pour s'arrêter"""
+        return result.get('confidence', 0) >= self.threshold(tier, result.get('intent', 'unknown'))
+
+
+def gate_tier(tier: str, available: Any) -> str:
+    """
+    Seuils à appliquer après un palier
+
+    Sans spaCy, le résultat regex est le résultat heuristique final : il est
+    comparé aux seuils du palier spacy, comme avant l'introduction des paliers.
+
+    Args:
+        tier: Palier exécuté
+        available: Paliers disponibles ('spacy' absent si le modèle n'est pas chargé)
+    """
+    return 'spacy' if tier == 'regex' and 'spacy' not in available else tier
+
+
+def result_signature(result: Optional[Dict[str, Any]]) -> Optional[Tuple[str, str]]:
+    """
+    Signature comparable d'un résultat (intention et filtres)
+
+    Le texte sémantique est ignoré : il varie d'un palier à l'autre sans
+    changer les résultats de recherche.
+    """
+    if not result:
+        return None
+    return result.get('intent', 'unknown'), json.dumps(result.get('filters', {}), sort_keys=True, default=str)
+
+
+def simulate(records: List[Dict[str, Any]], config: TieredParsingConfig) -> Dict[str, Any]:
+    """
+    Rejoue des requêtes déjà évaluées à tous les paliers avec une configuration
+
+    Args:
+        records: Une entrée par requête : {'tiers': {palier: {'intent', 'confidence',
+                 'signature'}}, 'reference': signature attendue}
+        config: Seuils à évaluer
+
+    Returns:
+        Nombre d'appels LLM, d'appels spaCy et de réponses correctes
+    """
+    llm_calls = spacy_calls = correct = 0
+    for record in records:
+        tiers = record['tiers']
+        final = None
+        for tier in TIERS:
+            if tier not in tiers:
+                continue
+            final = tiers[tier]
+            if tier == 'spacy':
+                spacy_calls += 1
+            elif tier == 'llm':
+                llm_calls += 1
+            if tier != 'llm' and config.should_stop(gate_tier(tier, tiers), final):
+                break
+        if final is not None and final['signature'] == record['reference']:
+            correct += 1
+
+    return {
+        'queries': len(records),
+        'llm_calls': llm_calls,
+        'spacy_calls': spacy_calls,
+        'correct': correct,
+        'accuracy': correct / len(records) if records else 0.0
+    }
+
+
+def recommend_thresholds(
+        records: List[Dict[str, Any]],
+        baseline: TieredParsingConfig = None
+) -> Tuple[TieredParsingConfig, Dict[str, Any]]:
+    """
+    Cherche les seuils qui minimisent les appels LLM sans perdre de réponses correctes
+
+    Descente par coordonnées : pour chaque palier (spacy puis regex) et chaque
+    intention observée, parmi les seuils qui gardent au moins autant de
+    réponses correctes que la configuration de référence, on retient celui
+    qui économise le plus d'appels LLM, puis d'appels spaCy.
+
+    Args:
+        records: Requêtes évaluées à tous les paliers (voir simulate)
+        baseline: Configuration de référence (défaut: seuils actuels)
+
+    Returns:
+        Tuple (configuration recommandée, résultat de simulate)
+    """
+    baseline = baseline or TieredParsingConfig()
+    target = simulate(records, baseline)['correct']
+
+    config = TieredParsingConfig(
+        regex_thresholds=dict(baseline.regex_thresholds),
+        spacy_thresholds=dict(baseline.spacy_thresholds),
+        default_regex_threshold=baseline.default_regex_threshold,
+        default_spacy_threshold=baseline.default_spacy_threshold
+    )
+
+    for tier, thresholds in (('spacy', config.spacy_thresholds), ('regex', config.regex_thresholds)):
+        intents = sorted({record['tiers'][tier]['intent'] for record in records if tier in record['tiers']})
+        for intent in intents:
+            best, best_cost = config.threshold(tier, intent), None
+            for candidate in CANDIDATE_THRESHOLDS:
+                thresholds[intent] = candidate
+                outcome = simulate(records, config)
+                if outcome['correct'] < target:
+                    continue
+                cost = (outcome['llm_calls'], outcome['spacy_calls'], -candidate)
+                if best_cost is None or cost < best_cost:
+                    best, best_cost = candidate, cost
+            thresholds[intent] = best
+
+    return config, simulate(records, config)
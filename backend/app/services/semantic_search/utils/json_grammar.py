@@ -0,0 +1,217 @@
+"""
+Décodage JSON contraint pour le LLM d'Accord.
+Dérive des modèles SemanticQuery / SearchFilter le schéma de la réponse
+attendue du LLM, puis la grammaire GBNF que llama.cpp applique pendant la
+génération : seule une sortie JSON conforme au schéma peut être produite.
+
+Les chaînes libres ne sont pas bornées par la grammaire (une requête longue
+ne doit pas être tronquée) : le budget de tokens est dérivé de la longueur
+de la requête, dont le texte sémantique et les filtres sont extraits.
+"""
+
+import math
+from enum import Enum
+from typing import Dict, Any, List, Union, get_args, get_origin, get_type_hints
+
+from ..models import SearchFilter, SemanticQuery
+
+# Champs de SemanticQuery produits par le LLM (limit, seuils... restent aux valeurs par défaut)
+LLM_OUTPUT_FIELDS = ('query_type', 'semantic_text', 'filters')
+
+# Filtres lus par QueryTransformer mais absents de SearchFilter
+EXTRA_FILTER_FIELDS = {'contact_name': str}
+
+DATE_FIELDS = ('date_from', 'date_to')
+MAX_ITEMS = 3  # Éléments par liste (topic_ids, labels)
+
+# Texte libre de la sortie, en longueurs de requête : semantic_text et valeurs des filtres
+QUERY_TEXT_COPIES = 2
+
+# Caractères par token (moyenne estimée : JSON court, français/anglais, tokenizer Mistral)
+CHARS_PER_TOKEN = 3.0
+# Marge sur le budget : accents, adresses et dates se découpent en tokens plus courts
+TOKEN_BUDGET_MARGIN = 1.5
+
+
+def _unwrap_optional(annotation):
+    """Optional[X] -> X"""
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _field_schema(name: str, annotation) -> Dict[str, Any]:
+    """Schéma JSON d'un champ à partir de son annotation"""
+    annotation = _unwrap_optional(annotation)
+
+    if annotation is bool:
+        return {'type': 'boolean'}
+    if get_origin(annotation) in (list, List):
+        item_type = get_args(annotation)[0] if get_args(annotation) else str
+        return {'type': 'array', 'items': _field_schema(name, item_type), 'maxItems': MAX_ITEMS}
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return {'type': 'string', 'enum': [member.value for member in annotation]}
+    if isinstance(annotation, type) and issubclass(annotation, SearchFilter):
+        return _filters_schema()
+    if name in DATE_FIELDS:
+        return {'type': 'string', 'format': 'date'}
+    return {'type': 'string'}
+
+
+def _filters_schema() -> Dict[str, Any]:
+    """Schéma des filtres : champs de SearchFilter, tous optionnels, chacun au plus une fois"""
+    fields = {**get_type_hints(SearchFilter), **EXTRA_FILTER_FIELDS}
+    return {
+        'type': 'object',
+        'properties': {name: _field_schema(name, annotation) for name, annotation in fields.items()},
+        'required': [],
+        'maxProperties': len(fields)
+    }
+
+
+def build_output_schema() -> Dict[str, Any]:
+    """
+    Construit le schéma JSON de la réponse du LLM
+
+    Returns:
+        Schéma (objet avec query_type, semantic_text et filters, dans cet ordre)
+    """
+    fields = get_type_hints(SemanticQuery)
+    return {
+        'type': 'object',
+        'properties': {name: _field_schema(name, fields[name]) for name in LLM_OUTPUT_FIELDS},
+        'required': list(LLM_OUTPUT_FIELDS)
+    }
+
+
+def _literal(text: str) -> str:
+    """Littéral GBNF"""
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _repeat(item: str, min_count: int, max_count: int) -> str:
+    """
+    Répétition bornée item{min,max} en options imbriquées
+
+    La syntaxe {m,n} n'existe que dans les versions récentes de llama.cpp.
+    """
+    optional = ''
+    for _ in range(max_count - min_count):
+        optional = f'({item} {optional})?' if optional else f'({item})?'
+    return ' '.join([item] * min_count + ([optional] if optional else []))
+
+
+class _GrammarBuilder:
+    """Traduit un schéma JSON (sous-ensemble utilisé ici) en règles GBNF"""
+
+    def __init__(self):
+        self.rules: Dict[str, str] = {
+            'ws': '[ ]?',
+            'char': r'[^"\\\x00-\x1F\x7F] | "\\" ["\\/bfnrt]',
+            'digit': '[0-9]',
+            'date': '"\\"" digit digit digit digit "-" digit digit "-" digit digit "\\""',
+            'boolean': '"true" | "false"',
+            'string': '"\\"" char* "\\""',
+        }
+
+    def value(self, name: str, schema: Dict[str, Any]) -> str:
+        """Nom de la règle GBNF d'une valeur"""
+        rule = name.replace('_', '-')
+        kind = schema['type']
+
+        if kind == 'boolean':
+            return 'boolean'
+        if kind == 'string' and schema.get('format') == 'date':
+            return 'date'
+        if kind == 'string' and 'enum' in schema:
+            self.rules[rule] = ' | '.join(_literal(f'"{value}"') for value in schema['enum'])
+        elif kind == 'string':
+            return 'string'
+        elif kind == 'array':
+            item = self.value(f'{name}_item', schema['items'])
+            more = _repeat(f'("," ws {item})', 0, schema['maxItems'] - 1)
+            self.rules[rule] = f'"[" ws ({item} {more})? ws "]"'
+        elif kind == 'object':
+            self.rules[rule] = self.object(name, schema)
+        return rule
+
+    def object(self, name: str, schema: Dict[str, Any]) -> str:
+        """Corps de la règle d'un objet (propriétés requises dans l'ordre, optionnelles en nombre borné)"""
+        pairs = {
+            key: f'{_literal(chr(34) + key + chr(34) + ":")} ws {self.value(key, value)}'
+            for key, value in schema['properties'].items()
+        }
+        required = [pairs[key] for key in schema['required']]
+        if required:
+            return '"{" ws ' + ' "," ws '.join(required) + ' ws "}"'
+
+        pair_rule = f'{name.replace("_", "-")}-pair'
+        self.rules[pair_rule] = ' | '.join(pairs.values())
+        more = _repeat(f'("," ws {pair_rule})', 0, schema['maxProperties'] - 1)
+        return f'"{{" ws ({pair_rule} {more})? ws "}}"'
+
+
+def schema_to_gbnf(schema: Dict[str, Any]) -> str:
+    """
+    Génère la grammaire GBNF d'un schéma
+
+    Args:
+        schema: Schéma construit par build_output_schema
+
+    Returns:
+        Grammaire GBNF (règle racine: root)
+    """
+    builder = _GrammarBuilder()
+    root = builder.object('root', schema)
+    lines = [f'root ::= {root}'] + [f'{name} ::= {body}' for name, body in builder.rules.items()]
+    return '\n'.join(lines) + '\n'
+
+
+def max_output_chars(schema: Dict[str, Any]) -> int:
+    """
+    Longueur maximale (en caractères, espaces compris) de la structure d'une sortie conforme au schéma
+
+    Le contenu des chaînes libres n'est pas compté (voir estimate_token_budget).
+
+    Args:
+        schema: Schéma ou sous-schéma
+
+    Returns:
+        Nombre de caractères
+    """
+    kind = schema['type']
+    if kind == 'boolean':
+        return len('false')
+    if kind == 'string' and schema.get('format') == 'date':
+        return len('"YYYY-MM-DD"')
+    if kind == 'string' and 'enum' in schema:
+        return max(len(value) for value in schema['enum']) + 2
+    if kind == 'string':
+        return 2
+    if kind == 'array':
+        count = schema['maxItems']
+        return 4 + count * max_output_chars(schema['items']) + 2 * (count - 1)
+
+    pairs = sorted(
+        (len(key) + 4 + max_output_chars(value) for key, value in schema['properties'].items()),
+        reverse=True
+    )
+    count = len(schema['required']) or schema['maxProperties']
+    return 4 + sum(pairs[:count]) + 2 * (count - 1)
+
+
+def estimate_token_budget(schema: Dict[str, Any], query_length: int) -> int:
+    """
+    Budget de tokens couvrant une sortie conforme au schéma pour une requête
+
+    Args:
+        schema: Schéma de la réponse
+        query_length: Longueur de la requête (en caractères)
+
+    Returns:
+        Nombre de tokens (CHARS_PER_TOKEN caractères par token, avec TOKEN_BUDGET_MARGIN)
+    """
+    chars = max_output_chars(schema) + QUERY_TEXT_COPIES * query_length
+    return math.ceil(chars * TOKEN_BUDGET_MARGIN / CHARS_PER_TOKEN)